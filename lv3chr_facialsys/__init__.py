@@ -1,3 +1,3 @@
-import general; reload(general)
-import control; reload(control)
-import demo; reload(demo)
\ No newline at end of file
+import general
+import control
+import demo
\ No newline at end of file
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: build_suite.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module containing the build benchmark suite, which times the construction of the facial system from the JSON
+database: the full construction, the projection surfaces, and the control zones one at a time.
+
+Each timed call starts from a new scene; the control zone cases start from a scene with the group hierarchy, the
+projection surfaces and the control zones they depend on (see config.G_CONTROL_ZONE_DEPENDENCY_DICT) built, and time
+the control zone's construction along with its scene builder commit.
+In Maya, the projection surfaces are also timed with each projection mode other than config.G_PROJECTION_MODE, as
+"proj_surfaces_<mode>", which includes the baking of the closest-point lookups of the plug-in nodes.
+Note that the backend must be set up (see harness.setup_backend()) before running the suite.
+"""
+
+from benchmark import harness
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_suite_name = 'build'
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def run(repeat=5, warmup=1, data_dir=None, zone_list=None):
+    """
+    :param repeat: the number of timed builds of each case
+    :param warmup: the number of builds made before the timed ones of each case
+    :param data_dir: directory of the JSON database files; the shipped data directory is used if it is None
+    :param zone_list: a list of the controlZoneEnum values of the control zones to time; all if it is None
+    :return: a list of the result dictionaries, see harness.make_result()
+    """
+
+    from general.config import controlZoneEnum, G_CONTROLZONE_LIST, G_CONTROL_ZONE_DEPENDENCY_DICT
+    from general.scene_builder import sceneBuilder
+    from demo import lv3chr_facialsys_demo
+
+    cmds = harness.get_cmds()
+    if zone_list is None:
+        zone_list = [getattr(controlZoneEnum, zone_attr) for zone_attr in G_CONTROLZONE_LIST]
+
+    result_list = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # The full construction
+
+    sample_list = harness.time_call(lambda: lv3chr_facialsys_demo.lc3chr_facialsys_construct(data_dir,
+                                                                                             interactive=False),
+                                    repeat, warmup, setup=harness.new_scene)
+    result_list.append(harness.make_result(g_suite_name, 'full', sample_list,
+                                           info={'node_count': len(cmds.ls())}))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # The projection surfaces
+
+    def setup_group_hierarchy():
+        harness.new_scene()
+        lv3chr_facialsys_demo.setup_group_hierarchy()
+
+    sample_list = harness.time_call(lambda: lv3chr_facialsys_demo.setup_proj_surfaces(data_dir),
+                                    repeat, warmup, setup=setup_group_hierarchy)
+    result_list.append(harness.make_result(g_suite_name, 'proj_surfaces', sample_list,
+                                           info={'node_count': len(cmds.ls())}))
+
+    if harness.backendEnum.maya == harness.get_backend():
+        from general.config import projectionModeEnum, G_PROJECTION_MODE
+
+        for projection_mode in [projectionModeEnum.closest_point_node,
+                                projectionModeEnum.lookup_node,
+                                projectionModeEnum.curve_node]:
+            if projection_mode == G_PROJECTION_MODE:
+                continue
+            prev_projection_mode = harness.set_projection_mode(projection_mode)
+            try:
+                sample_list = harness.time_call(lambda: lv3chr_facialsys_demo.setup_proj_surfaces(data_dir),
+                                                repeat, warmup, setup=setup_group_hierarchy)
+            finally:
+                harness.set_projection_mode(prev_projection_mode)
+            result_list.append(harness.make_result(g_suite_name, 'proj_surfaces_'+projection_mode, sample_list,
+                                                   info={'node_count': len(cmds.ls())}))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # The control zones
+
+    for zone in zone_list:
+        def setup_zone_dependencies():
+            setup_group_hierarchy()
+            lv3chr_facialsys_demo.setup_proj_surfaces(data_dir)
+            dependency_list = G_CONTROL_ZONE_DEPENDENCY_DICT.get(zone, [])
+            if dependency_list:
+                dependency_scene_builder = sceneBuilder()
+                lv3chr_facialsys_demo.setup_ctrl_zones(dependency_scene_builder, data_dir, zone_list=dependency_list)
+                dependency_scene_builder.commit()
+
+        def build_zone():
+            zone_scene_builder = sceneBuilder()
+            lv3chr_facialsys_demo.setup_ctrl_zones(zone_scene_builder, data_dir, zone_list=[zone])
+            zone_scene_builder.commit()
+
+        sample_list = harness.time_call(build_zone, repeat, warmup, setup=setup_zone_dependencies)
+        result_list.append(harness.make_result(g_suite_name, 'zone_'+zone, sample_list,
+                                               info={'node_count': len(cmds.ls())}))
+
+    return result_list
@@ -0,0 +1,171 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: eval_suite.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module containing the evaluation benchmark suite, which measures the evaluation throughput of the rig in poses per
+second, from the controller translations to the bind joint positions.
+
+The offline rig evaluator (see offline_eval.rig_eval) is timed on both backends, for several pose batch sizes and for
+the control zones one at a time; it is skipped if NumPy can not be imported, e.g. in a mayapy without NumPy.
+In Maya, the built rig is timed as well, posing the controllers with cmds.setAttr and reading the world-space bind
+joint positions with cmds.xform, one pose after another: "maya_dg" with config.G_PROJECTION_MODE, and "maya_dg_<mode>"
+with each of the other projection modes (see config.projectionModeEnum), to compare the baked closest-point lookups of
+the plug-in nodes with the "closestPointOnSurface" nodes.
+Note that the backend must be set up (see harness.setup_backend()) before running the suite.
+"""
+
+import random
+import warnings
+
+from benchmark import harness
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_suite_name = 'eval'
+
+g_batch_size_list = [1, 10, 100]
+g_zone_batch_size = 100
+# The number of poses of a timed call on the Maya rig, which is evaluated one pose after another.
+g_maya_pose_count = 20
+
+# The controller translations of the random poses are in [-g_pose_amplitude, g_pose_amplitude].
+g_pose_amplitude = 1.0
+g_pose_seed = 2022
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def get_random_poses(pose_count, ctrl_count, seed=g_pose_seed):
+    """
+    :return: a list of pose_count poses, each a list of ctrl_count [x, y, z] controller translations
+    """
+
+    rand = random.Random(seed)
+    return [[[rand.uniform(-g_pose_amplitude, g_pose_amplitude) for axis_id in range(3)]
+             for ctrl_id in range(ctrl_count)]
+            for pose_id in range(pose_count)]
+
+def run(repeat=5, warmup=1, data_dir=None, zone_list=None):
+    """
+    :param repeat: the number of timed calls of each case
+    :param warmup: the number of calls made before the timed ones of each case
+    :param data_dir: directory of the JSON database files; the shipped data directory is used if it is None
+    :param zone_list: a list of the controlZoneEnum values of the control zones to time; all if it is None
+    :return: a list of the result dictionaries, see harness.make_result()
+    """
+
+    result_list = []
+    result_list.extend(run_offline(repeat, warmup, data_dir, zone_list))
+    if harness.backendEnum.maya == harness.get_backend():
+        from general.config import projectionModeEnum, G_PROJECTION_MODE
+
+        result_list.extend(run_maya(repeat, warmup, data_dir))
+        for projection_mode in [projectionModeEnum.closest_point_node,
+                                projectionModeEnum.lookup_node,
+                                projectionModeEnum.curve_node]:
+            if projection_mode != G_PROJECTION_MODE:
+                result_list.extend(run_maya(repeat, warmup, data_dir, projection_mode))
+    return result_list
+
+def run_offline(repeat=5, warmup=1, data_dir=None, zone_list=None):
+    """ Time the offline rig evaluator.
+    :return: a list of the result dictionaries
+    """
+
+    try:
+        import numpy as np
+        from offline_eval import rig_eval
+    except ImportError:
+        warnings.warn('[benchmark] NumPy is unavailable; the offline evaluation benchmarks are skipped.')
+        return []
+
+    from database import data_cache
+
+    ctrl_crv_data = data_cache.load_store(rig_eval.g_ctrl_crv_data_file_name, data_dir)
+    proj_srf_data = data_cache.load_store(rig_eval.g_proj_srf_data_file_name, data_dir)
+    zone_spec_list = data_cache.load_data(rig_eval.g_zone_spec_file_name, data_dir)['zones']
+
+    result_list = []
+
+    evaluator = rig_eval.rigEvaluator(ctrl_crv_data, proj_srf_data, zone_spec_list=zone_spec_list)
+    if zone_list is None:
+        zone_list = evaluator.get_zone_list()
+    ctrl_count = len(evaluator.get_controller_names())
+    joint_count = len(evaluator.get_joint_names())
+    pose_array = np.asarray(get_random_poses(max(g_batch_size_list+[g_zone_batch_size]), ctrl_count))
+
+    for batch_size in g_batch_size_list:
+        batch_pose_array = pose_array[:batch_size]
+        sample_list = harness.time_call(lambda: evaluator.evaluate(batch_pose_array), repeat, warmup)
+        result_list.append(harness.make_result(g_suite_name, 'offline_batch{}'.format(batch_size), sample_list,
+                                               work_count=batch_size, work_unit='poses',
+                                               info={'controller_count': ctrl_count, 'joint_count': joint_count}))
+
+    for zone in zone_list:
+        zone_evaluator = rig_eval.rigEvaluator(ctrl_crv_data, proj_srf_data, zone_list=[zone],
+                                               zone_spec_list=zone_spec_list)
+        zone_pose_array = pose_array[:g_zone_batch_size, :len(zone_evaluator.get_controller_names())]
+        sample_list = harness.time_call(lambda: zone_evaluator.evaluate(zone_pose_array), repeat, warmup)
+        result_list.append(harness.make_result(g_suite_name, 'offline_zone_'+zone, sample_list,
+                                               work_count=g_zone_batch_size, work_unit='poses',
+                                               info={'controller_count': len(zone_evaluator.get_controller_names()),
+                                                     'joint_count': len(zone_evaluator.get_joint_names())}))
+
+    return result_list
+
+def run_maya(repeat=5, warmup=1, data_dir=None, projection_mode=None):
+    """ Time the rig built in Maya, posing the controllers and reading the bind joint positions pose by pose.
+    The controllers and bind joints are named after the offline rig evaluator's, if it is available.
+
+    :param projection_mode: a config.projectionModeEnum value to build the rig with; G_PROJECTION_MODE if it is None
+    :return: a list of the result dictionaries
+    """
+
+    from demo import lv3chr_facialsys_demo
+
+    cmds = harness.get_cmds()
+
+    harness.new_scene()
+    if projection_mode is None:
+        lv3chr_facialsys_demo.lc3chr_facialsys_construct(data_dir, interactive=False)
+    else:
+        prev_projection_mode = harness.set_projection_mode(projection_mode)
+        try:
+            lv3chr_facialsys_demo.lc3chr_facialsys_construct(data_dir, interactive=False)
+        finally:
+            harness.set_projection_mode(prev_projection_mode)
+
+    try:
+        from offline_eval import rig_eval
+        evaluator = rig_eval.rigEvaluator()
+        ctrl_list = evaluator.get_controller_names()
+        joint_list = evaluator.get_joint_names()
+    except ImportError:
+        ctrl_list = sorted(cmds.ls('*_ctrl', type='transform') or [])
+        joint_list = sorted(cmds.ls('*_bind', type='joint') or [])
+
+    # The translation axes to pose; the locked ones are left out.
+    ctrl_plug_list = []
+    for ctrl in ctrl_list:
+        ctrl_plug_list.append([ctrl+'.translate'+axis if not cmds.getAttr(ctrl+'.translate'+axis, lock=True)
+                               else None
+                               for axis in ['X', 'Y', 'Z']])
+
+    pose_list = get_random_poses(g_maya_pose_count, len(ctrl_list))
+
+    def evaluate_poses():
+        for pose in pose_list:
+            for ctrl_plugs, trans in zip(ctrl_plug_list, pose):
+                for plug, value in zip(ctrl_plugs, trans):
+                    if plug:
+                        cmds.setAttr(plug, value)
+            for joint in joint_list:
+                cmds.xform(joint, query=True, worldSpace=True, translation=True)
+
+    sample_list = harness.time_call(evaluate_poses, repeat, warmup)
+    return [harness.make_result(g_suite_name, 'maya_dg' if projection_mode is None else 'maya_dg_'+projection_mode,
+                                sample_list,
+                                work_count=g_maya_pose_count, work_unit='poses',
+                                info={'controller_count': len(ctrl_list), 'joint_count': len(joint_list)})]
@@ -0,0 +1,330 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: harness.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module containing the benchmark harness: the maya.cmds backend set-up, the timing of the benchmark cases, and the
+storage and comparison of the benchmark results.
+
+The benchmarks run either in mayapy, against Maya, or on a plain Python interpreter, against the recording stand-in of
+maya.cmds (see general.recording_cmds). The backend must be set up with setup_backend() before any module of the
+facial system is imported, since they import maya.cmds on import.
+Note that this module does not import Maya, except in setup_backend().
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import platform
+import subprocess
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_timer = getattr(time, 'perf_counter', time.time)
+
+g_facialsys_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+g_default_results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# The relative change of a benchmark value beyond which the comparison reports it as a regression or an improvement
+g_default_tolerance = 0.1
+
+g_backend = None
+
+# ======================================================================================================================
+class backendEnum(object):
+    maya = 'maya'           # maya.standalone in mayapy, or a Maya session
+    stand_in = 'stand-in'   # the recording stand-in of maya.cmds on a plain Python interpreter
+
+class comparisonStatusEnum(object):
+    unchanged = 'unchanged'
+    improved = 'improved'
+    regressed = 'regressed'
+    added = 'added'         # the case is not in the baseline
+    missing = 'missing'     # the case of the baseline is not in the current results
+
+# Backend Functions ----------------------------------------------------------------------------------------------------
+def setup_backend(backend=None):
+    """ Make maya.cmds importable for the facial system's modules.
+    :param backend: a backendEnum value; if it is None, Maya is used when it can be imported, otherwise the stand-in
+    :return: the backendEnum value set up
+    """
+
+    global g_backend
+
+    if g_facialsys_dir not in sys.path:
+        sys.path.insert(0, g_facialsys_dir)
+
+    maya_cmds = sys.modules.get('maya.cmds')
+    if maya_cmds is not None:
+        # Already running in Maya, or the stand-in has been installed.
+        g_backend = backendEnum.stand_in if hasattr(maya_cmds, 'get_calls') else backendEnum.maya
+        assert backend in [None, g_backend], 'The "{}" backend is already set up.'.format(g_backend)
+        return g_backend
+
+    if backend in [None, backendEnum.maya]:
+        try:
+            import maya.standalone
+            maya.standalone.initialize(name='python')
+            g_backend = backendEnum.maya
+            return g_backend
+        except ImportError:
+            if backendEnum.maya == backend:
+                raise
+            # A failed "import maya.standalone" may leave an empty "maya" package behind.
+            sys.modules.pop('maya', None)
+
+    # The general package imports maya.cmds on import, so the stand-in module is imported from its directory,
+    # before anything else of the facial system.
+    general_dir = os.path.join(g_facialsys_dir, 'general')
+    sys.path.insert(0, general_dir)
+    try:
+        import recording_cmds
+    finally:
+        sys.path.remove(general_dir)
+    recording_cmds.install()
+
+    g_backend = backendEnum.stand_in
+    return g_backend
+
+def get_backend():
+    return g_backend
+
+def get_cmds():
+    """
+    :return: the maya.cmds module, or the recording stand-in of it
+    """
+    return sys.modules['maya.cmds']
+
+def new_scene():
+    """ Start a new empty scene, or clear the scene model of the stand-in.
+    :return: None
+    """
+
+    cmds = get_cmds()
+    if backendEnum.stand_in == g_backend:
+        cmds.reset()
+    else:
+        cmds.file(new=True, force=True)
+
+def set_projection_mode(projection_mode):
+    """ Set the projection mode the translation planes are built with, in place of config.G_PROJECTION_MODE, which
+    control.control_proj_surface has imported into its namespace.
+    :param projection_mode: a config.projectionModeEnum value
+    :return: the projection mode set before
+    """
+
+    from control import control_proj_surface
+
+    prev_projection_mode = control_proj_surface.G_PROJECTION_MODE
+    control_proj_surface.G_PROJECTION_MODE = projection_mode
+    return prev_projection_mode
+
+# Timing Functions -----------------------------------------------------------------------------------------------------
+def time_call(func, repeat=5, warmup=1, setup=None):
+    """ Time the calls to a function. The set-up is not timed.
+
+    :param func: the function to time, taking no arguments
+    :param repeat: the number of timed calls
+    :param warmup: the number of calls made before the timed ones, e.g. to fill the data caches
+    :param setup: a function called before each call, taking no arguments
+    :return: a list of the seconds of the timed calls
+    """
+
+    sample_list = []
+    for call_id in range(warmup+repeat):
+        if setup:
+            setup()
+        start_time = g_timer()
+        func()
+        if call_id >= warmup:
+            sample_list.append(g_timer()-start_time)
+    return sample_list
+
+def get_stats(sample_list):
+    """
+    :param sample_list: a list of the seconds of the timed calls
+    :return: a dictionary of the minimum, median, mean and standard deviation of the samples
+    """
+
+    sorted_list = sorted(sample_list)
+    count = len(sorted_list)
+    mid_id = count // 2
+    median = sorted_list[mid_id] if count % 2 else 0.5*(sorted_list[mid_id-1]+sorted_list[mid_id])
+    mean = sum(sorted_list)/count
+    stdev = math.sqrt(sum([(sample-mean)**2 for sample in sorted_list])/(count-1)) if count > 1 else 0.0
+
+    return {
+        'min': sorted_list[0],
+        'median': median,
+        'mean': mean,
+        'stdev': stdev,
+        'repeat': count
+    }
+
+def make_result(suite, name, sample_list, work_count=None, work_unit=None, info=None):
+    """
+    :param suite: name of the benchmark suite, e.g. "build"
+    :param name: name of the benchmark case, unique in the suite, e.g. "zone_eyelid"
+    :param sample_list: a list of the seconds of the timed calls
+    :param work_count: the amount of work done by each call, e.g. the number of poses evaluated;
+                       if it is given, the value of the result is the throughput of the median call
+    :param work_unit: name of the work, e.g. "poses"
+    :param info: a dictionary of extra information about the case, e.g. the number of created nodes
+    :return: the result dictionary
+    """
+
+    stats = get_stats(sample_list)
+    result = {
+        'suite': suite,
+        'name': name,
+        'stats': stats,
+        'info': info or {}
+    }
+
+    if work_count:
+        result['value'] = work_count/stats['median'] if stats['median'] > 0.0 else float('inf')
+        result['unit'] = '{}/s'.format(work_unit or 'calls')
+        result['higher_is_better'] = True
+    else:
+        result['value'] = stats['median']
+        result['unit'] = 's'
+        result['higher_is_better'] = False
+    return result
+
+def get_result_key(result):
+    return '{}/{}'.format(result['suite'], result['name'])
+
+# Storage Functions ----------------------------------------------------------------------------------------------------
+def get_environment():
+    """
+    :return: a dictionary describing where the benchmarks run, stored along with the results
+    """
+
+    env_dict = {
+        'backend': g_backend,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.node(),
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'maya': None,
+        'numpy': None,
+        'commit': None
+    }
+
+    if backendEnum.maya == g_backend:
+        env_dict['maya'] = get_cmds().about(version=True)
+
+    try:
+        import numpy
+        env_dict['numpy'] = numpy.__version__
+    except ImportError:
+        pass
+
+    try:
+        with open(os.devnull, 'w') as devnull:
+            env_dict['commit'] = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                                         cwd=g_facialsys_dir, stderr=devnull).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+
+    return env_dict
+
+def save_results(result_list, file_path=None):
+    """
+    :param result_list: a list of the result dictionaries, see make_result()
+    :param file_path: path of the JSON file to write; if it is None, a file named after the backend and the time
+                      is written into the default results directory
+    :return: the path of the written file
+    """
+
+    if file_path is None:
+        file_path = os.path.join(g_default_results_dir, '{}_{}.json'.format(g_backend,
+                                                                            time.strftime('%Y%m%d_%H%M%S')))
+
+    results_dir = os.path.dirname(os.path.abspath(file_path))
+    if not os.path.isdir(results_dir):
+        os.makedirs(results_dir)
+
+    with open(file_path, 'w') as results_file:
+        json.dump({'environment': get_environment(), 'results': result_list}, results_file,
+                  indent=4, sort_keys=True)
+    return file_path
+
+def load_results(file_path):
+    """
+    :return: a tuple of the environment dictionary and the list of the result dictionaries
+    """
+
+    with open(file_path, 'r') as results_file:
+        results_data = json.load(results_file)
+    return results_data['environment'], results_data['results']
+
+def compare_results(baseline_list, result_list, tolerance=g_default_tolerance):
+    """
+    :param baseline_list: a list of the baseline result dictionaries
+    :param result_list: a list of the current result dictionaries
+    :param tolerance: the relative change beyond which a case is reported as regressed or improved
+    :return: a list of (result key, comparisonStatusEnum value, baseline value, current value, relative change)
+    """
+
+    baseline_dict = dict((get_result_key(result), result) for result in baseline_list)
+    comparison_list = []
+
+    for result in result_list:
+        key = get_result_key(result)
+        baseline = baseline_dict.pop(key, None)
+        if baseline is None:
+            comparison_list.append((key, comparisonStatusEnum.added, None, result['value'], None))
+            continue
+
+        change = (result['value']-baseline['value'])/baseline['value'] if baseline['value'] else 0.0
+        # The relative change in the direction of a better value.
+        gain = change if result['higher_is_better'] else -change
+
+        status = comparisonStatusEnum.unchanged
+        if gain < -tolerance:
+            status = comparisonStatusEnum.regressed
+        elif gain > tolerance:
+            status = comparisonStatusEnum.improved
+        comparison_list.append((key, status, baseline['value'], result['value'], change))
+
+    for key, baseline in baseline_dict.items():
+        comparison_list.append((key, comparisonStatusEnum.missing, baseline['value'], None, None))
+
+    return comparison_list
+
+def format_results(result_list):
+    """
+    :return: a string of a table of the results
+    """
+
+    line_list = ['{:<36}{:>16}  {:<10}{:>12}{:>12}'.format('case', 'value', 'unit', 'min (s)', 'stdev (s)')]
+    for result in result_list:
+        line_list.append('{:<36}{:>16.4f}  {:<10}{:>12.4f}{:>12.4f}'.format(get_result_key(result),
+                                                                          result['value'],
+                                                                          result['unit'],
+                                                                          result['stats']['min'],
+                                                                          result['stats']['stdev']))
+    return '\n'.join(line_list)
+
+def format_comparison(comparison_list):
+    """
+    :return: a string of a table of the comparison
+    """
+
+    def format_value(value):
+        return '-' if value is None else '{:.4f}'.format(value)
+
+    line_list = ['{:<36}{:<12}{:>16}{:>16}{:>10}'.format('case', 'status', 'baseline', 'current', 'change')]
+    for key, status, baseline_value, value, change in comparison_list:
+        line_list.append('{:<36}{:<12}{:>16}{:>16}{:>10}'.format(key, status,
+                                                               format_value(baseline_value),
+                                                               format_value(value),
+                                                               '-' if change is None else
+                                                               '{:+.1%}'.format(change)))
+    return '\n'.join(line_list)
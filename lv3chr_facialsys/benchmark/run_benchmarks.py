@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: run_benchmarks.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+The command line entry point of the benchmarks, which runs the suites, stores the results and compares them with a
+baseline. Run it with mayapy to benchmark against Maya, or with a plain Python interpreter to benchmark against the
+recording stand-in of maya.cmds, e.g.
+
+    mayapy run_benchmarks.py --suite build --suite eval --repeat 5
+    python run_benchmarks.py --stand-in --save results/baseline.json
+    python run_benchmarks.py --stand-in --compare results/baseline.json
+
+The results are written into the "results" directory next to this file, unless --save gives the path. With --compare,
+the exit code is 1 if any benchmark case regressed beyond the tolerance.
+"""
+
+import os
+import sys
+
+# The benchmark package is imported from the facial system's root directory, also when this file is run as a script.
+g_facialsys_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if g_facialsys_dir not in sys.path:
+    sys.path.insert(0, g_facialsys_dir)
+
+from benchmark import harness
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_suite_list = ['build', 'eval']
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def run_suites(suite_list=None, repeat=5, warmup=1, data_dir=None, zone_list=None):
+    """
+    :param suite_list: a list of the names of the suites to run, from g_suite_list; all if it is None
+    :return: a list of the result dictionaries
+    """
+
+    from benchmark import build_suite
+    from benchmark import eval_suite
+
+    suite_module_dict = {
+        build_suite.g_suite_name: build_suite,
+        eval_suite.g_suite_name: eval_suite
+    }
+
+    result_list = []
+    for suite in suite_list or g_suite_list:
+        result_list.extend(suite_module_dict[suite].run(repeat, warmup, data_dir, zone_list))
+    return result_list
+
+def main(argv=None):
+    """
+    :return: the process exit code
+    """
+
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Benchmark the facial system\'s build and evaluation.')
+    arg_parser.add_argument('--suite', action='append', choices=g_suite_list, default=None,
+                            help='a suite to run; all the suites run if it is not given')
+    arg_parser.add_argument('--zone', action='append', default=None,
+                            help='a control zone to benchmark, e.g. "eyelid"; all the zones if it is not given')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='the number of timed calls of each case')
+    arg_parser.add_argument('--warmup', type=int, default=1, help='the number of untimed calls before them')
+    arg_parser.add_argument('--data-dir', default=None, dest='data_dir',
+                            help='directory of the JSON database files; the shipped data by default')
+    arg_parser.add_argument('--stand-in', action='store_true', dest='stand_in',
+                            help='run against the recording stand-in of maya.cmds, even if Maya is available')
+    arg_parser.add_argument('--save', default=None, help='path of the results JSON file to write')
+    arg_parser.add_argument('--compare', default=None, help='path of the baseline results JSON file')
+    arg_parser.add_argument('--tolerance', type=float, default=harness.g_default_tolerance,
+                            help='the relative change reported as a regression or an improvement')
+    args = arg_parser.parse_args(argv)
+
+    harness.setup_backend(harness.backendEnum.stand_in if args.stand_in else None)
+    sys.stdout.write('Benchmarking against the "{}" backend.\n'.format(harness.get_backend()))
+
+    result_list = run_suites(args.suite, args.repeat, args.warmup, args.data_dir, args.zone)
+    sys.stdout.write(harness.format_results(result_list)+'\n')
+
+    results_path = harness.save_results(result_list, args.save)
+    sys.stdout.write('The results are saved to "{}".\n'.format(results_path))
+
+    if args.compare:
+        baseline_env, baseline_list = harness.load_results(args.compare)
+        if baseline_env.get('backend') != harness.get_backend():
+            sys.stdout.write('Warning: the baseline ran against the "{}" backend.\n'.format(baseline_env.get('backend')))
+
+        comparison_list = harness.compare_results(baseline_list, result_list, args.tolerance)
+        sys.stdout.write(harness.format_comparison(comparison_list)+'\n')
+        if any(harness.comparisonStatusEnum.regressed == comparison[1] for comparison in comparison_list):
+            return 1
+
+    return 0
+
+if '__main__' == __name__:
+    sys.exit(main())
@@ -1,6 +1,5 @@
-import controller; reload(controller)
-import control_curve; reload(control_curve)
-import control_proj_surface; reload(control_proj_surface)
+import controller
+import control_curve
+import control_proj_surface
 
-import zone; reload(zone)
-import control_zone; reload(control_zone)
\ No newline at end of file
+import control_zone
\ No newline at end of file
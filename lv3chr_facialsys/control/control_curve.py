@@ -13,10 +13,10 @@ A module containing the definitions of control curves.
 import warnings
 import maya.cmds as cmds
 
-from general import config; reload(config)
+from general import config
 from general.config import *
 
-from general import hierarchy; reload(hierarchy)
+from general import hierarchy
 
 # ======================================================================================================================
 class controlCurve(object):
@@ -41,6 +41,13 @@ class controlCurve(object):
 
         return self._locator_dict[locator_id]
 
+    def get_locator_param(self, locator_id):
+        """
+        :param locator_id: the locator identity number, starts from 1
+        :return: the parameter on this control curve where the locator is pinned
+        """
+        return float(locator_id-1)
+
     def __init__(self,
                  name_prefix = '',
                  name = 'control_curve',
@@ -62,7 +69,6 @@ class controlCurve(object):
 
         # Create the NURBS curve as the control curve and move it into position.
         self._degree = degree
-        assert len(points) > 0
 
         self._nurbs_crv = cmds.curve(degree=self._degree,
                                      point=points)
@@ -92,7 +98,7 @@ class controlCurve(object):
             cmds.setAttr(loc+'.overrideColor', CTRL_CURVE_LOC_COLOR_INDEX)
 
             pt_on_crv_info_node = cmds.createNode('pointOnCurveInfo', name=name_prefix+'_'+loc_name+'_ptOnCrv')
-            cmds.setAttr(pt_on_crv_info_node+'.parameter', loc_id-1)
+            cmds.setAttr(pt_on_crv_info_node+'.parameter', self.get_locator_param(loc_id))
             cmds.connectAttr(self._nurbs_crv+'.worldSpace[0]', pt_on_crv_info_node+'.inputCurve')
             cmds.connectAttr(pt_on_crv_info_node+'.position', loc+'.translate')
 
@@ -104,4 +110,27 @@ class controlCurve(object):
         return NotImplemented
 
     def get_name(self):
-        return str(self._nurbs_crv)
\ No newline at end of file
+        return str(self._nurbs_crv)
+
+    def get_shape_name(self):
+        """
+        :return: the name of the curve's shape, not of its intermediate original shape if it has one
+        """
+        return cmds.listRelatives(self._nurbs_crv, shapes=True, noIntermediate=True)[0]
+
+    def create_orig_shape(self):
+        """ Create an intermediate copy of the curve's shape under its transform node, keeping the original CVs of
+        the curve once a node drives its shape, as the original shape of a deformer does.
+        :return: the name of the original shape
+        """
+
+        crv_shape = self.get_shape_name()
+
+        orig_crv = cmds.duplicate(self._nurbs_crv)[0]
+        orig_shape = cmds.listRelatives(orig_crv, shapes=True)[0]
+        orig_shape = cmds.parent(orig_shape, self._nurbs_crv, shape=True, relative=True)[0]
+        cmds.delete(orig_crv)
+
+        orig_shape = cmds.rename(orig_shape, crv_shape+'Orig')
+        cmds.setAttr(orig_shape+'.intermediateObject', True)
+        return orig_shape
\ No newline at end of file
@@ -10,12 +10,21 @@
 A module containing the definitions of control-curves projection plane classes
 """
 
+import math
 import warnings
 import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as OpenMaya2
+except ImportError:
+    OpenMaya2 = None    # e.g. with the recording stand-in of maya.cmds installed
 
-from general import config; reload(config)
+from general import config
 from general.config import *
 
+# global variables -----------------------------------------------------------------------------------------------------
+# {(degree, patchesU, patchesV): (CV count in U, CV count in V, U knots, V knots, default CV positions)}
+g_nurbs_plane_topology_dict = {}
+
 # ======================================================================================================================
 class controlTransPlane(object):
     """ translation plane indicating the movement area of facial rig control
@@ -32,10 +41,14 @@ class controlTransPlane(object):
                  rotation = [0.0, 0.0, 0.0],
                  scale = [1.0, 1.0, 1.0],
                  mirror = [1, 1, 1],
-                 cv_list = []):
+                 cv_list = [],
+                 build_mode = None,
+                 projection_mode = None):
         """
         :param cv_list: A list of CV coordinates for the NURBS plane to construct;
                         Note that the maximum length of this list is (patchesU+1) * (patchesV+1).
+        :param build_mode: a buildModeEnum value; G_NURBS_SURFACE_BUILD_MODE is used if it is None
+        :param projection_mode: a projectionModeEnum value; G_PROJECTION_MODE is used if it is None
         """
 
         # Member Variable Definitions ----------------------------------------------------------------------------------
@@ -45,40 +58,30 @@ class controlTransPlane(object):
 
         self._cv_coords = []
         self._nurbs_srf = None
-        # ---------------------------------------------------------------------------------- Member Variable Definitions
 
-        assert len(cv_list) <= (patchesU+1) * (patchesV+1)
+        self._projection_mode = projection_mode
+        if self._projection_mode is None:
+            self._projection_mode = G_PROJECTION_MODE
 
-        self._nurbs_srf = cmds.nurbsPlane(degree=self._degree,
-                                          patchesU=self._patchesU,
-                                          patchesV=self._patchesV)[0]   # Note the [0] indexing
+        # The "lcClosestPointLookup" node answering the closest-point queries of projectionModeEnum.lookup_node,
+        # and the number of positions connected to it
+        self._cls_pt_lookup_node = None
+        self._cls_pt_lookup_input_count = 0
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
 
         if len(cv_list) > 0:
             self._cv_coords = cv_list
 
-            for cv_coord_dict in cv_list:
-                cv_coord_idx = list(cv_coord_dict.keys())[0]
-                idx_u = cv_coord_idx.split(',')[0]
-                idx_v = cv_coord_idx.split(',')[1]
-
-                cv_coord = cv_coord_dict[cv_coord_idx]
-
-                # print('cv_coord: ({},{}) : {}'.format(idx_u, idx_v, cv_coord))
-                assert len(cv_coord) == 3
-                cmds.setAttr(self._nurbs_srf+'.cv[{}][{}]'.format(idx_u, idx_v),
-                             cv_coord[0], cv_coord[1], cv_coord[2])
-
-        cmds.xform(self._nurbs_srf,
-                   translation=translation,
-                   rotation=rotation,
-                   scale=scale)
-        cmds.makeIdentity(self._nurbs_srf, apply=True)
-        cmds.xform(self._nurbs_srf, scale=mirror)
-        # Reverse the surface normals if mirroring along x-axis.
-        if mirror[0] < 0:
-            cmds.reverseSurface(self._nurbs_srf, direction=0) # "0" means "U"
-
-        self._nurbs_srf = cmds.rename(self._nurbs_srf, name_prefix+'_'+name)
+        self._nurbs_srf = create_nurbs_plane(name = name_prefix+'_'+name,
+                                             degree = self._degree,
+                                             patchesU = self._patchesU,
+                                             patchesV = self._patchesV,
+                                             translation = translation,
+                                             rotation = rotation,
+                                             scale = scale,
+                                             mirror = mirror,
+                                             cv_list = cv_list,
+                                             build_mode = build_mode)
 
         cmds.setAttr(self._nurbs_srf+'.overrideEnabled', True)
         cmds.setAttr(self._nurbs_srf+'.overrideColor', COLOR_INDEX_BLACK)
@@ -94,6 +97,56 @@ class controlTransPlane(object):
     def get_name(self):
         return str(self._nurbs_srf)
 
+    def get_projection_mode(self):
+        return self._projection_mode
+
+    def connect_closest_point(self, builder, in_position_plug, node_name, param_u_plug, param_v_plug):
+        """ Project a position onto this translation plane, and drive a pair of UV parameter plugs with the
+        parameters of the closest point.
+
+        In projectionModeEnum.closest_point_node, a "closestPointOnSurface" node is created for the position;
+        in projectionModeEnum.lookup_node, the position is appended to the inputs of this plane's
+        "lcClosestPointLookup" node, which is created and baked along with the first position.
+
+        :param builder: the sceneBuilder instance recording the operations
+        :param in_position_plug: the world-space position plug, e.g. "locatorShape.worldPosition[0]"
+        :param node_name: name of the "closestPointOnSurface" node to create
+        :param param_u_plug: the plug to drive by the U parameter, e.g. "pointOnSurfaceInfo.parameterU"
+        :param param_v_plug: the plug to drive by the V parameter
+        :return: None
+        """
+
+        if projectionModeEnum.closest_point_node == self._projection_mode:
+            cls_pt_on_transplane_node = builder.create_node('closestPointOnSurface', node_name)
+
+            builder.connect_attr(self.get_name()+'.worldSpace[0]', cls_pt_on_transplane_node+'.inputSurface')
+            builder.connect_attr(in_position_plug, cls_pt_on_transplane_node+'.inPosition')
+
+            builder.connect_attr(cls_pt_on_transplane_node+'.parameterU', param_u_plug)
+            builder.connect_attr(cls_pt_on_transplane_node+'.parameterV', param_v_plug)
+            return
+
+        if self._cls_pt_lookup_node is None:
+            from plugin import closest_point_lookup
+            closest_point_lookup.load()
+            self._cls_pt_lookup_node = builder.create_node(closest_point_lookup.g_node_name,
+                                                           self.get_name()+'_clsPtLookup')
+            builder.connect_attr(self.get_name()+'.worldSpace[0]', self._cls_pt_lookup_node+'.inputSurface')
+            # Bake the lookup at build time rather than on the first playback frame.
+            builder.add_post_commit(self._bake_closest_point_lookup, builder)
+
+        input_id = self._cls_pt_lookup_input_count
+        self._cls_pt_lookup_input_count += 1
+
+        builder.connect_attr(in_position_plug, '{}.inPosition[{}]'.format(self._cls_pt_lookup_node, input_id))
+        builder.connect_attr('{}.parameterU[{}]'.format(self._cls_pt_lookup_node, input_id), param_u_plug)
+        builder.connect_attr('{}.parameterV[{}]'.format(self._cls_pt_lookup_node, input_id), param_v_plug)
+
+    def _bake_closest_point_lookup(self, builder):
+        # Keep the actual node name in case Maya renamed the node on commit, then pull an output to bake the lookup.
+        self._cls_pt_lookup_node = builder.get_node_name(self._cls_pt_lookup_node)
+        cmds.getAttr(self._cls_pt_lookup_node+'.parameterU[0]')
+
 # ======================================================================================================================
 class controlProjSurface(object):
     """ projection surface constraining on which the movement area of locator_data
@@ -146,12 +199,21 @@ class controlProjSurface(object):
                  locator_data = [],
                  locator_scale = [1, 1, 1],
                  bind_joint_data = {},
-                 bind_joint_color = COLOR_INDEX_DARK_WHITE):
+                 bind_joint_color = COLOR_INDEX_DARK_WHITE,
+                 build_mode = None,
+                 projection_mode = None):
         """
         :param cv_list: A list of CV coordinates for the NURBS plane to construct;
                         Note that the maximum length of this list is (patchesU+1) * (patchesV+1).
+        :param build_mode: a buildModeEnum value; G_NURBS_SURFACE_BUILD_MODE is used if it is None
+        :param projection_mode: a projectionModeEnum value; G_PROJECTION_MODE is used if it is None;
+                                in projectionModeEnum.curve_node, the locators are left for the control zones to drive
+                                and no "pointOnSurfaceInfo" nodes are created.
         """
 
+        if projection_mode is None:
+            projection_mode = G_PROJECTION_MODE
+
         # Member Variable Definitions ----------------------------------------------------------------------------------
         # NURBS surface construction parameters
         self._degree = degree
@@ -165,40 +227,23 @@ class controlProjSurface(object):
         # The 2-dimensional dictionary format is:
         # {row_id: {col_id: (locator's name, bind joint's name, pointOnSurfaceInfo node's name)}}
         # e.g. {'A': {1: ('fm_eyelidMask_RU_A1_loc', 'fm_eyelidMask_RU_A1_bind', 'fm_eyelidMask_RU_A1_loc_ptOnSrf')}}
+        # The pointOnSurfaceInfo node's name is None in projectionModeEnum.curve_node.
         self._locator_dict = {}
         # ---------------------------------------------------------------------------------- Member Variable Definitions
 
-        assert len(cv_list) <= (patchesU+1) * (patchesV+1)
-
-        self._nurbs_srf = cmds.nurbsPlane(degree=self._degree,
-                                          patchesU=self._patchesU,
-                                          patchesV=self._patchesV)[0]   # Note the [0] indexing
         if len(cv_list) > 0:
             self._cv_coords = cv_list
 
-            for cv_coord_dict in cv_list:
-                cv_coord_idx = list(cv_coord_dict.keys())[0]
-                idx_u = cv_coord_idx.split(',')[0]
-                idx_v = cv_coord_idx.split(',')[1]
-
-                cv_coord = cv_coord_dict[cv_coord_idx]
-
-                # print('cv_coord: ({},{}) : {}'.format(idx_u, idx_v, cv_coord))
-                assert len(cv_coord) == 3
-                cmds.setAttr(self._nurbs_srf+'.cv[{}][{}]'.format(idx_u, idx_v),
-                             cv_coord[0], cv_coord[1], cv_coord[2])
-
-        cmds.xform(self._nurbs_srf,
-                   translation=translation,
-                   rotation=rotation,
-                   scale=scale)
-        cmds.makeIdentity(self._nurbs_srf, apply=True)
-        cmds.xform(self._nurbs_srf, scale=mirror)
-        # Reverse the surface normals if mirroring along x-axis.
-        if mirror[0] < 0:
-            cmds.reverseSurface(self._nurbs_srf, direction=0) # "0" means "U"
-
-        self._nurbs_srf = cmds.rename(self._nurbs_srf, name_prefix+'_'+name)
+        self._nurbs_srf = create_nurbs_plane(name = name_prefix+'_'+name,
+                                             degree = self._degree,
+                                             patchesU = self._patchesU,
+                                             patchesV = self._patchesV,
+                                             translation = translation,
+                                             rotation = rotation,
+                                             scale = scale,
+                                             mirror = mirror,
+                                             cv_list = cv_list,
+                                             build_mode = build_mode)
         # cmds.toggle(self._nurbs_srf, template=True)
         cmds.select(deselect=True)
 
@@ -230,19 +275,17 @@ class controlProjSurface(object):
             cmds.setAttr(loc+'.overrideEnabled', True)
             cmds.setAttr(loc+'.overrideColor', PROJ_SURFACE_LOC_COLOR_INDEX)
 
-            pt_on_srf_info_node = cmds.createNode('pointOnSurfaceInfo', name=name_prefix+'_'+loc_name+'_ptOnSrf')
-            # cmds.setAttr(pt_on_srf_info_node+'.parameterU', loc_param_uv[0])
-            # cmds.setAttr(pt_on_srf_info_node+'.parameterV', loc_param_uv[1])
-            cmds.connectAttr(self._nurbs_srf+'.worldSpace[0]', pt_on_srf_info_node+'.inputSurface')
-            cmds.connectAttr(pt_on_srf_info_node+'.position', loc+'.translate')
+            pt_on_srf_info_node = None
+            if projectionModeEnum.curve_node != projection_mode:
+                pt_on_srf_info_node = cmds.createNode('pointOnSurfaceInfo', name=name_prefix+'_'+loc_name+'_ptOnSrf')
+                # cmds.setAttr(pt_on_srf_info_node+'.parameterU', loc_param_uv[0])
+                # cmds.setAttr(pt_on_srf_info_node+'.parameterV', loc_param_uv[1])
+                cmds.connectAttr(self._nurbs_srf+'.worldSpace[0]', pt_on_srf_info_node+'.inputSurface')
+                cmds.connectAttr(pt_on_srf_info_node+'.position', loc+'.translate')
 
             cmds.select(deselect=True)
 
             # Create a joint to pin this locator onto the target skinning mesh.
-            bind_jnt_data_keys = bind_joint_data.keys()
-            assert 'suffix' in bind_jnt_data_keys
-            assert 'radius' in bind_jnt_data_keys
-
             bind_jnt_name = name_prefix+'_'+loc_name.rsplit('_', 1)[0]+'_'+bind_joint_data['suffix']
             bind_jnt_radius = bind_joint_data['radius']
             if 'FB' in name:
@@ -277,4 +320,168 @@ class controlProjSurface(object):
         return NotImplemented
 
     def get_name(self):
-        return str(self._nurbs_srf)
\ No newline at end of file
+        return str(self._nurbs_srf)
+
+# NURBS Plane Construction Functions -----------------------------------------------------------------------------------
+def create_nurbs_plane(name,
+                       degree = 1,
+                       patchesU = 4,
+                       patchesV = 6,
+                       translation = [0.0, 0.0, 0.0],
+                       rotation = [0.0, 0.0, 0.0],
+                       scale = [1.0, 1.0, 1.0],
+                       mirror = [1, 1, 1],
+                       cv_list = [],
+                       build_mode = None):
+    """ Create a NURBS plane whose CVs are set by the cv_list and then frozen with the transformation.
+    If the plane is mirrored along the x-axis, its U direction is reversed to keep the surface normals.
+
+    :param name: name of the NURBS plane to create
+    :param cv_list: a list of CV coordinates formatted in [{"u,v": [x, y, z]}]
+    :param build_mode: a buildModeEnum value; G_NURBS_SURFACE_BUILD_MODE is used if it is None.
+                       Without the OpenMaya API, the plane is always built through maya.cmds.
+    :return: the name of the created NURBS plane's transform node
+    """
+
+    if build_mode is None:
+        build_mode = G_NURBS_SURFACE_BUILD_MODE
+
+    if buildModeEnum.api == build_mode and OpenMaya2 is not None:
+        return create_nurbs_plane_api(name, degree, patchesU, patchesV,
+                                      translation, rotation, scale, mirror, cv_list)
+
+    return create_nurbs_plane_cmds(name, degree, patchesU, patchesV,
+                                   translation, rotation, scale, mirror, cv_list)
+
+def create_nurbs_plane_cmds(name, degree, patchesU, patchesV, translation, rotation, scale, mirror, cv_list):
+    """ The buildModeEnum.cmds construction path of create_nurbs_plane(), which edits a cmds.nurbsPlane CV by CV.
+    :return: the name of the created NURBS plane's transform node
+    """
+
+    nurbs_srf = cmds.nurbsPlane(degree=degree,
+                                patchesU=patchesU,
+                                patchesV=patchesV)[0]   # Note the [0] indexing
+
+    for cv_coord_dict in cv_list:
+        cv_coord_idx = list(cv_coord_dict.keys())[0]
+        idx_u = cv_coord_idx.split(',')[0]
+        idx_v = cv_coord_idx.split(',')[1]
+
+        cv_coord = cv_coord_dict[cv_coord_idx]
+
+        # print('cv_coord: ({},{}) : {}'.format(idx_u, idx_v, cv_coord))
+        cmds.setAttr(nurbs_srf+'.cv[{}][{}]'.format(idx_u, idx_v),
+                     cv_coord[0], cv_coord[1], cv_coord[2])
+
+    cmds.xform(nurbs_srf,
+               translation=translation,
+               rotation=rotation,
+               scale=scale)
+    cmds.makeIdentity(nurbs_srf, apply=True)
+    cmds.xform(nurbs_srf, scale=mirror)
+    # Reverse the surface normals if mirroring along x-axis.
+    if mirror[0] < 0:
+        cmds.reverseSurface(nurbs_srf, direction=0) # "0" means "U"
+
+    return cmds.rename(nurbs_srf, name)
+
+def create_nurbs_plane_api(name, degree, patchesU, patchesV, translation, rotation, scale, mirror, cv_list):
+    """ The buildModeEnum.api construction path of create_nurbs_plane().
+    The CVs are transformed, reversed for mirroring and handed over to MFnNurbsSurface.create in one call,
+    which gives the same surface as the cmds path: the same knots, CV positions and transform node scaling.
+
+    :return: the name of the created NURBS plane's transform node
+    """
+
+    num_cvs_u, num_cvs_v, knots_u, knots_v, default_cv_coords, cv_tweak_is_relative = \
+        get_nurbs_plane_topology(degree, patchesU, patchesV)
+
+    # Fill in the CV grid, in which the V index varies fastest.
+    # The cmds path sets the CVs of a plane with construction history, where Maya may keep them as tweaks
+    # relative to the default CV positions.
+    cv_coords = list(default_cv_coords)
+    for cv_coord_dict in cv_list:
+        cv_coord_idx = list(cv_coord_dict.keys())[0]
+        idx_u, idx_v = [int(idx) for idx in cv_coord_idx.split(',')]
+
+        cv_coord = cv_coord_dict[cv_coord_idx]
+        if cv_tweak_is_relative:
+            cv_coord = [default_coord+tweak for default_coord, tweak in zip(default_cv_coords[idx_u*num_cvs_v + idx_v],
+                                                                             cv_coord)]
+        cv_coords[idx_u*num_cvs_v + idx_v] = cv_coord
+
+    # Bake the transformation, like cmds.makeIdentity(apply=True) does.
+    xform_mat = OpenMaya2.MTransformationMatrix()
+    xform_mat.setScale(scale, OpenMaya2.MSpace.kTransform)
+    xform_mat.setRotation(OpenMaya2.MEulerRotation(*[math.radians(angle) for angle in rotation]))
+    xform_mat.setTranslation(OpenMaya2.MVector(translation), OpenMaya2.MSpace.kTransform)
+    xform_mat = xform_mat.asMatrix()
+
+    cv_pts = OpenMaya2.MPointArray([OpenMaya2.MPoint(cv_coord)*xform_mat for cv_coord in cv_coords])
+
+    # Reverse the U direction if mirroring along x-axis, like cmds.reverseSurface(direction=0) does.
+    if mirror[0] < 0:
+        cv_pts = OpenMaya2.MPointArray([cv_pts[idx_u*num_cvs_v + idx_v]
+                                        for idx_u in reversed(range(num_cvs_u))
+                                        for idx_v in range(num_cvs_v)])
+        knots_u = [knots_u[0]+knots_u[-1]-knot for knot in reversed(knots_u)]
+
+    nurbs_srf_fn = OpenMaya2.MFnNurbsSurface()
+    nurbs_srf_xform_obj = nurbs_srf_fn.create(cv_pts, knots_u, knots_v, degree, degree,
+                                              OpenMaya2.MFnNurbsSurface.kOpen, OpenMaya2.MFnNurbsSurface.kOpen,
+                                              False)
+
+    # cmds.makeIdentity(apply=True) keeps the pivots at the frozen translation, which the mirror scales about.
+    nurbs_srf_xform_fn = OpenMaya2.MFnTransform(nurbs_srf_xform_obj)
+    nurbs_srf_xform_fn.setRotatePivot(OpenMaya2.MPoint(translation), OpenMaya2.MSpace.kTransform, False)
+    nurbs_srf_xform_fn.setScalePivot(OpenMaya2.MPoint(translation), OpenMaya2.MSpace.kTransform, False)
+    nurbs_srf_xform_fn.setScale(mirror)
+    nurbs_srf = nurbs_srf_xform_fn.setName(name)
+    OpenMaya2.MFnDependencyNode(nurbs_srf_xform_fn.child(0)).setName(nurbs_srf+'Shape')
+
+    # Add the surface to the default shading group, like cmds.nurbsPlane does.
+    cmds.sets(nurbs_srf, edit=True, forceElement='initialShadingGroup')
+
+    return nurbs_srf
+
+def get_nurbs_plane_topology(degree, patchesU, patchesV):
+    """ Query the knot vectors and the default CV positions of a cmds.nurbsPlane once per topology,
+    so that the API construction path parameterizes its surfaces exactly like the cmds construction path.
+    It also probes whether setting a CV of a plane with construction history, as the cmds path does,
+    moves the CV to the given position or offsets it from the default position by the given values.
+
+    :return: a tuple of (CV count in U, CV count in V, U knots, V knots, default CV coordinates,
+             whether the CV coordinates set with construction history are relative)
+    """
+
+    topology_key = (degree, patchesU, patchesV)
+    if topology_key not in g_nurbs_plane_topology_dict:
+        tmp_nurbs_srf = cmds.nurbsPlane(degree=degree,
+                                        patchesU=patchesU,
+                                        patchesV=patchesV,
+                                        constructionHistory=True)[0]
+
+        sel_list = OpenMaya2.MSelectionList()
+        sel_list.add(tmp_nurbs_srf)
+        nurbs_srf_dag_path = sel_list.getDagPath(0)
+        nurbs_srf_fn = OpenMaya2.MFnNurbsSurface(nurbs_srf_dag_path)
+        default_cv_coords = [[pt.x, pt.y, pt.z] for pt in nurbs_srf_fn.cvPositions(OpenMaya2.MSpace.kObject)]
+
+        # The first CV is at a corner of the plane, so setting it to the origin tells the two behaviors apart.
+        cmds.setAttr(tmp_nurbs_srf+'.cv[0][0]', 0.0, 0.0, 0.0)
+        nurbs_srf_fn = OpenMaya2.MFnNurbsSurface(nurbs_srf_dag_path)
+        probe_pt = nurbs_srf_fn.cvPosition(0, 0, OpenMaya2.MSpace.kObject)
+        cv_tweak_is_relative = not probe_pt.isEquivalent(OpenMaya2.MPoint(0.0, 0.0, 0.0))
+
+        g_nurbs_plane_topology_dict[topology_key] = (
+            nurbs_srf_fn.numCVsInU,
+            nurbs_srf_fn.numCVsInV,
+            list(nurbs_srf_fn.knotsInU()),
+            list(nurbs_srf_fn.knotsInV()),
+            default_cv_coords,
+            cv_tweak_is_relative
+        )
+
+        cmds.delete(tmp_nurbs_srf)
+
+    return g_nurbs_plane_topology_dict[topology_key]
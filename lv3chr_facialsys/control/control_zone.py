@@ -8,22 +8,53 @@
 
 """
 A module organizing the control elements
+
+All the control zones are built by one pipeline, driven by the zone spec data/control_zone_spec.json:
+control curves -> blend-shape target curves -> follow controller -> controllers -> utility nodes -> blend-shapes ->
+follow blend -> connections -> follows -> projections onto the projection surfaces -> skin binding of the projection
+surfaces.
+Each zone of the spec lists its units, i.e. the control zones to build, by their direction, control curve IDs and
+variables; each stage of the spec is a list of entries formatted with those variables (see controlZone).
 """
 
+import itertools
 import warnings
 import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as OpenMaya2
+except ImportError:
+    OpenMaya2 = None    # e.g. with the recording stand-in of maya.cmds installed
 
-from general import config; reload(config)
+from general import config
 from general.config import *
 
-from general import hierarchy; reload(hierarchy)
+from general import hierarchy
+from general.hierarchy import groupKindEnum
+from general import scene_builder
+from general.scene_builder import sceneBuilder
+
+from database import data_cache
 
-import control_curve; reload(control_curve)
+import control_curve
 from control_curve import controlCurve
 
-import controller; reload(controller)
+import controller
 from controller import controller
 
+# global variables -----------------------------------------------------------------------------------------------------
+g_zone_spec_file_name = 'control_zone_spec.json'
+
+# The kinds of the references to the control elements of a control zone in the zone spec, e.g. "controller:R.translateX"
+class zoneRefKindEnum(object):
+    curve = 'curve'             # a control curve, by its ID
+    bstarget = 'bstarget'       # a blend-shape target curve, by its ID
+    controller = 'controller'   # a controller, by its ID
+    follow = 'follow'           # an attribute of the follow controller, e.g. "follow:eyelid_up_follow_b"
+    node = 'node'               # a utility node, by its ID
+    blendshape = 'blendshape'   # a blend-shape node, by its ID
+    bsweight = 'bsweight'       # the weight of a target of a blend-shape node, e.g. "bsweight:curve.right_side_up"
+    scene = 'scene'             # a node in the scene by its name, e.g. a controller of another control zone
+
 # ======================================================================================================================
 class controlZone(object):
     """ A control zone organizes the controllers, the control curves, and the locator_data as well as the bind joints
@@ -31,6 +62,25 @@ class controlZone(object):
 
     For eyelid module, a control zone should contain 4 control curves, 4*5 locators, and 5 controllers binding to
     5 joints as a unit to transfer the translations of controllers to the locators on a projection plane.
+
+    The control elements are described by the zone spec instead of per-zone code. The strings of a stage entry are
+    str.format() templates of the variables: "zone", "direction", the unit's variables, the entry's "vars", and the
+    ones the entry iterates by its "for_each" dictionary ({variable name: list of values}; a dictionary value binds
+    several variables at once). Iterating "crv" (null for all) goes through the unit's control curve IDs and binds
+    "crv_lc", the lower-case ID, as well. The names of the created elements are bound as "curves", "controllers" and
+    "follow_ctrl", e.g. "{controllers[A]}". An entry with "directions" is only built for the units of those directions.
+
+    The follow behaviours, e.g. the eye corners following their adjacent controllers, are described by the "follows"
+    stage. Each of its entries adds a follower, which averages the translations of its "drivers" and drives its
+    "outputs", one plug per axis, scaled per axis by its "weights" (plugs or values) and its constant "scale";
+    null skips an axis. In followModeEnum.utility_nodes, the followers are computed by "plusMinusAverage" and
+    "multiplyDivide" nodes, named after the entry's "utility_names" ({"average", "scale" or "weight": node name}) or
+    else the "follow_node" spec's "utility_prefix"; in followModeEnum.plugin_nodes, by one "lcFacialFollow" node per
+    control unit (see plugin.facial_follow), named after its "name".
+    Likewise, the control curves following the "source" control curve by their follow weights are described by the
+    "follow_blend" stage: in followModeEnum.utility_nodes, each of them gets a "blendShape" node targeting the source
+    curve, named after the curve and the "name_suffix"; in followModeEnum.plugin_nodes, they are all blended by one
+    "lcCrvFollowBlend" node (see plugin.curve_follow_blend), named after the "name".
     """
 
     def get_ctrlcrv_count(self):
@@ -40,22 +90,24 @@ class controlZone(object):
         return len(self._controller_dict)
 
     def __init__(self,
-                 zone = controlZoneEnum.eyelid,
-                 direction = controlZoneDirEnum.right,
+                 zone_spec = None,
+                 unit_spec = None,
                  ctrl_crv_data = None,
-                 ctrlproj_transplane_LRUD       = None,
-                 ctrlproj_transplane_LRFB_list  = [],
-                 ctrlproj_transplane_UDFB_list  = [],
-                 ctrlproj_projsurface_LRUD      = None,
-                 ctrlproj_projsurface_LRFB_list = [],
-                 ctrlproj_projsurface_UDFB_list = []
+                 crv_projsrf_dict = None,
+                 scene_builder = None,
+                 follow_mode = None
                  ):
         """
-        :param zone: the facial zone this control unit manages
-        :param direction: the direction in which the controllers of this control unit move
+        :param zone_spec: the spec of the facial zone this control unit belongs to, see get_zone_spec()
+        :param unit_spec: the spec of this control unit in the zone spec's "units"
         :param ctrl_crv_data: the control curves' and controllers' construction data
-        :param ctrlproj_transplane: the controllers translation plane this control unit belongs to
-        :param ctrlproj_projsurface: the controllers translation-projection surface this control unit belongs to
+        :param crv_projsrf_dict: the translation planes and the projection surfaces of the facial system,
+                                 by their keys in the zone spec's "projections", e.g. "eyelid_transplane_RU"
+        :param scene_builder: the sceneBuilder instance recording the utility node creations, parenting and
+                              connections of this control unit; if it is None, this control unit commits its own
+                              builder when built. The curves, controllers, blend-shape nodes and added attributes are
+                              created through maya.cmds right away, outside of the builder.
+        :param follow_mode: a followModeEnum value; G_FOLLOW_MODE is used if it is None
         """
 
         # Member Variable Definitions ----------------------------------------------------------------------------------
@@ -63,16 +115,12 @@ class controlZone(object):
         self._ctrl_crv_dict = {
             # 'A': None,
         }
-        # The keys of this dictionary are:
-        #   'original'
-        #   'right_side_up', 'middle_side_up', 'left_side_up'
-        #   'right_side_left, 'middle_side_left', 'left_side_left',
-        #   'right_side_front', 'middle_side_front', 'left_side_front'
+        # The keys of this dictionary are the blend-shape targets' IDs in the zone spec, e.g. 'right_side_up'.
         self._ctrl_crv_bs_dict = {
             # 'original': None,
         }
 
-        # The keys of this dictionary are follow controller's IDs.
+        # The name of the follow controller
         self._follow_ctrl = None
 
         # The keys of this dictionary are controllers' IDs.
@@ -80,15 +128,708 @@ class controlZone(object):
             # 'A': None,
         }
 
+        # The keys of these dictionaries are the utility nodes' and the blend-shape nodes' IDs in the zone spec.
+        self._node_dict = {}
+        self._blendshape_dict = {}
+
+        self._follow_mode = follow_mode
+        if self._follow_mode is None:
+            self._follow_mode = G_FOLLOW_MODE
+        if followModeEnum.plugin_nodes == self._follow_mode and OpenMaya2 is None:
+            warnings.warn('The follow plug-in nodes need the Maya Python API 2.0; the utility nodes are used instead.')
+            self._follow_mode = followModeEnum.utility_nodes
+
+        # The name of the "lcFacialFollow" node computing the follow behaviours in followModeEnum.plugin_nodes
+        self._follow_node = None
+        # The name of the "lcCrvFollowBlend" node blending the follower control curves towards the source curve in
+        # followModeEnum.plugin_nodes
+        self._follow_blend_node = None
+
+        self._zone_spec = zone_spec
+        self._unit_spec = unit_spec
         self._ctrl_crv_data = ctrl_crv_data
-        self._direction = direction
-
-        self._ctrlproj_transplane_LRUD          = ctrlproj_transplane_LRUD
-        self._ctrlproj_transplane_LRFB_list     = ctrlproj_transplane_LRFB_list
-        self._ctrlproj_transplane_UDFB_list     = ctrlproj_transplane_UDFB_list
-        self._ctrlproj_projsurface_LRUD         = ctrlproj_projsurface_LRUD
-        self._ctrlproj_projsurface_LRFB_list    = ctrlproj_projsurface_LRFB_list
-        self._ctrlproj_projsurface_UDFB_list    = ctrlproj_projsurface_UDFB_list
+        self._crv_projsrf_dict = crv_projsrf_dict
+
+        self._owns_scene_builder = scene_builder is None
+        self._scene_builder = scene_builder
+        if self._owns_scene_builder:
+            self._scene_builder = sceneBuilder()
         # ---------------------------------------------------------------------------------- Member Variable Definitions
 
-        assert None != self._ctrl_crv_data
\ No newline at end of file
+        assert None != self._zone_spec
+        assert None != self._unit_spec
+        assert None != self._ctrl_crv_data
+
+        self._zone = self._zone_spec['zone']
+        self._direction = self._unit_spec['direction']
+        self._ctrl_crv_id_list = list(self._unit_spec['curve_ids'])
+
+    def get_zone(self):
+        return self._zone
+
+    def get_direction(self):
+        return self._direction
+
+    def get_scene_builder(self):
+        return self._scene_builder
+
+    def get_follow_mode(self):
+        return self._follow_mode
+
+    def build(self):
+        """ Build the control elements of this control unit, one stage after another.
+        :return: None
+        """
+
+        self._build_ctrl_curves()
+        self._build_ctrlcrv_bs_targets()
+        self._build_follow_controller()
+        self._build_controllers()
+        self._build_controller_attrs()
+        self._build_nodes()
+        self._build_blendshapes()
+        self._build_follow_blend()
+        self._build_connections()
+        self._build_follows()
+        self._build_projections()
+
+        # The skin binding needs the projecting relationships above to be in the scene.
+        for bind_spec in self._zone_spec.get('projsurface_binds', []):
+            self._scene_builder.add_post_commit(self.bind_projsurfaces,
+                                                self._format(bind_spec['projsurface'], self._get_vars()),
+                                                self._format(bind_spec['joint_projsurface'], self._get_vars()),
+                                                bind_spec['axis'],
+                                                bind_spec.get('max_influences'))
+
+        self._commit_scene_builder()
+
+    # Build Stages -----------------------------------------------------------------------------------------------------
+    def _build_ctrl_curves(self):
+        """ Create the control curves, and parent them and their locators to their groups.
+        """
+
+        curve_spec = self._zone_spec['curves']
+        ctrlcrv_data = self._ctrl_crv_data[curve_spec['data']]
+        name_prefix = self._ctrl_crv_data[curve_spec['name_prefix']]
+
+        group_direction = self._format(curve_spec['group_direction'], self._get_vars())
+        row_loc_list = []
+
+        for crv_id in self._ctrl_crv_id_list:
+            dir_ctrlcrv_data = ctrlcrv_data[self._format(curve_spec['key'], self._get_vars(crv=crv_id))]
+            ctrl_crv = controlCurve(name_prefix = name_prefix,
+                                    name = dir_ctrlcrv_data['name'],
+                                    degree = ctrlcrv_data['degree'],
+                                    translation = dir_ctrlcrv_data['xform']['translation'],
+                                    points = dir_ctrlcrv_data['points'],
+                                    locator_data = dir_ctrlcrv_data['locators'],
+                                    locator_scale = ctrlcrv_data['locator_scale'])
+
+            row_loc_list.extend([(crv_id, ctrl_crv.get_locator_info(locator_id=loc_id)[0])
+                                 for loc_id in ctrl_crv.get_locator_ids()])
+            self._ctrl_crv_dict[crv_id] = ctrl_crv
+
+        self._scene_builder.parent([self._ctrl_crv_dict[crv_id].get_name() for crv_id in self._ctrl_crv_id_list],
+                                   hierarchy.get_group_name(self._zone, groupKindEnum.ctrlzone, group_direction))
+        hierarchy.parent_to_row_groups(self._scene_builder.parent, self._zone, groupKindEnum.ctrlzone_loc,
+                                       group_direction, row_loc_list)
+
+        cmds.select(deselect=True)
+
+    def _build_ctrlcrv_bs_targets(self):
+        """ Create the curves serving as blend-shape targets for the control curves.
+        """
+
+        group_target_dict = {}
+
+        for target_spec in self._zone_spec.get('ctrlcrv_bs', []):
+            ctrlcrv_bs_data = self._ctrl_crv_data[target_spec['data']]
+            name_prefix = self._ctrl_crv_data[target_spec['name_prefix']]
+
+            for var_dict in self._iterate(target_spec):
+                dir_ctrlcrv_bs_data = ctrlcrv_bs_data[self._format(target_spec['key'], var_dict)]
+                var_dict['name'] = dir_ctrlcrv_bs_data['name']
+
+                bs_nurbs_crv = cmds.curve(degree=ctrlcrv_bs_data['degree'],
+                                          point=dir_ctrlcrv_bs_data['points'])
+                cmds.xform(bs_nurbs_crv, translation=dir_ctrlcrv_bs_data['xform']['translation'])
+                bs_nurbs_crv = cmds.rename(bs_nurbs_crv,
+                                           name_prefix+'_'+self._format(target_spec['name'], var_dict))
+
+                cmds.setAttr(bs_nurbs_crv+'.overrideEnabled', True)
+                cmds.setAttr(bs_nurbs_crv+'.overrideColor',
+                             getattr(config, self._format(target_spec['color'], var_dict)))
+                cmds.toggle(bs_nurbs_crv, controlVertex=True)
+
+                group_name = hierarchy.get_group_name(self._zone, groupKindEnum.ctrlcrv_bs,
+                                                      self._format(target_spec['group_direction'], var_dict))
+                group_target_dict.setdefault(group_name, []).append(bs_nurbs_crv)
+
+                self._ctrl_crv_bs_dict[self._format(target_spec['id'], var_dict)] = bs_nurbs_crv
+
+        cmds.select(deselect=True)
+        for group_name in sorted(group_target_dict):
+            self._scene_builder.parent(group_target_dict[group_name], group_name)
+
+    def _build_follow_controller(self):
+        """ Create the control curve follow controller, if it has not been created by another control unit.
+        """
+
+        follow_spec = self._zone_spec['follow_controller']
+        follow_ctrl_data = self._ctrl_crv_data[follow_spec['data']]
+        follow_ctrl_dir = self._format(follow_spec['key'], self._get_vars())
+
+        follow_ctrl = follow_ctrl_data[follow_ctrl_dir]['name']
+
+        # If the follow controller has not been created, make one.
+        if not cmds.objExists(follow_ctrl):
+
+            follow_ctrl_crv = cmds.curve(degree=follow_ctrl_data['degree'],
+                                         point=follow_ctrl_data['points'])
+
+            cmds.xform(follow_ctrl_crv,
+                       translation=follow_ctrl_data[follow_ctrl_dir]['xform']['translation'],
+                       scale=follow_ctrl_data[follow_ctrl_dir]['xform']['scale'])
+
+            follow_ctrl_crv = cmds.rename(follow_ctrl_crv, follow_ctrl_data[follow_ctrl_dir]['name'])
+
+            follow_data_dict = follow_ctrl_data['follow_data']
+            for follow_attr in sorted(follow_data_dict):
+                cmds.addAttr(follow_ctrl, longName=follow_attr, attributeType='float',
+                             defaultValue=follow_data_dict[follow_attr], minValue=0.0, maxValue=1.0, keyable=True)
+
+            cmds.setAttr(follow_ctrl+'.overrideEnabled', True)
+            cmds.setAttr(follow_ctrl+'.overrideColor', getattr(config, self._format(follow_spec['color'],
+                                                                                     self._get_vars())))
+
+            self._scene_builder.parent(follow_ctrl, hierarchy.get_group_name(self._zone, groupKindEnum.zone))
+
+            cmds.select(deselect=True)
+
+        self._follow_ctrl = follow_ctrl
+
+    def _build_controllers(self):
+        """ Create the controllers, and parent their offset groups to their groups.
+        """
+
+        group_ofs_grp_dict = {}
+
+        for controller_spec in self._zone_spec.get('controllers', []):
+            controller_data = self._ctrl_crv_data[controller_spec['data']]
+            name_prefix = self._ctrl_crv_data[controller_spec['name_prefix']]
+            relative = controller_spec.get('relative', False)
+
+            for var_dict in self._iterate(controller_spec):
+                dir_ctrl_data = controller_data[self._format(controller_spec['key'], var_dict)]
+                rig_controller = controller(name = name_prefix+'_'+dir_ctrl_data['name'],
+                                            degree = controller_data['degree'],
+                                            color = getattr(config, self._format(controller_spec['color'], var_dict)),
+                                            points = controller_data[self._format(controller_spec['points_key'],
+                                                                                  var_dict)],
+                                            translation_ofs = dir_ctrl_data['xform']['translation_ofs'],
+                                            translation = dir_ctrl_data['xform']['translation'],
+                                            lock_trans_axes = controller_data['lock_trans_axes'],
+                                            lock_rot_axes = controller_data['lock_rot_axes'])
+
+                group_name = hierarchy.get_group_name(self._zone, groupKindEnum.ctrl,
+                                                      self._format(controller_spec['group_direction'], var_dict))
+                group_ofs_grp_dict.setdefault((group_name, relative), []).append(rig_controller.get_offset_group())
+
+                self._controller_dict[self._format(controller_spec['id'], var_dict)] = rig_controller
+
+        for group_name, relative in sorted(group_ofs_grp_dict):
+            self._scene_builder.parent(group_ofs_grp_dict[(group_name, relative)], group_name, relative=relative)
+
+    def _build_controller_attrs(self):
+        """ Add the keyable float attributes of the controllers, e.g. the follow weights of the adjacent controllers.
+        """
+
+        for attr_spec in self._zone_spec.get('controller_attrs', []):
+            for var_dict in self._iterate(attr_spec):
+                ctrl_name = self._controller_dict[self._format(attr_spec['controller'], var_dict)].get_name()
+                for attr, default_value in attr_spec['attrs'].items():
+                    cmds.addAttr(ctrl_name, longName=attr, attributeType='float',
+                                 defaultValue=default_value, minValue=0.0, maxValue=1.0, keyable=True)
+
+    def _build_nodes(self):
+        """ Queue the creations of the utility nodes of the "nodes" stage, e.g. "multiplyDivide" nodes.
+        """
+
+        builder = self._scene_builder
+
+        for node_spec in self._zone_spec.get('nodes', []):
+            for var_dict in self._iterate(node_spec):
+                node = builder.create_node(node_spec['type'], self._format(node_spec['name'], var_dict))
+                for attr, value in node_spec.get('attrs', {}).items():
+                    builder.set_attr(node+'.'+attr, value)
+
+                self._node_dict[self._format(node_spec['id'], var_dict)] = node
+
+    def _build_blendshapes(self):
+        """ Create the blend-shape nodes on the control curves and the blend-shape target curves.
+        """
+
+        for bs_spec in self._zone_spec.get('blendshapes', []):
+            for var_dict in self._iterate(bs_spec):
+                base = self._resolve_ref(self._format(bs_spec['base'], var_dict))
+                target_list = [self._resolve_ref(self._format(target, var_dict)) for target in bs_spec['targets']]
+
+                # The initial weights are given either as values or as the plugs to read them from.
+                weight_list = []
+                for target, weight in bs_spec.get('weights', {}).items():
+                    target_id = target_list.index(self._resolve_ref(self._format(target, var_dict)))
+                    if not isinstance(weight, (int, float)):
+                        weight_plug = self._resolve_ref(self._format(weight, var_dict))
+                        assert cmds.objExists(weight_plug)
+                        weight = cmds.getAttr(weight_plug)
+                    weight_list.append((target_id, weight))
+
+                bs_kwargs = {'name': base+bs_spec['name_suffix']}
+                if weight_list:
+                    bs_kwargs['weight'] = weight_list
+                bs_node = cmds.blendShape(*(target_list+[base]), **bs_kwargs)[0]
+
+                if bs_spec.get('support_negative_weights', False):
+                    cmds.setAttr(bs_node+'.supportNegativeWeights', True)
+
+                self._blendshape_dict[self._format(bs_spec['id'], var_dict)] = bs_node
+
+        cmds.select(deselect=True)
+
+    def _build_follow_blend(self):
+        """ Blend the follower control curves towards the source control curve by their follow weights, see the class
+        documentation.
+        """
+
+        follow_blend_spec = self._zone_spec.get('follow_blend')
+        if follow_blend_spec is None:
+            return
+
+        if followModeEnum.utility_nodes == self._follow_mode:
+            self._build_follow_blendshapes(follow_blend_spec)
+        else:
+            self._build_follow_blend_node(follow_blend_spec)
+
+        cmds.select(deselect=True)
+
+    def _build_follow_blendshapes(self, follow_blend_spec):
+        """ Create a blend-shape node on each follower control curve, targeting the source control curve, and queue the
+        connections of their weights from the follow weights.
+        """
+
+        source_crv = self._ctrl_crv_dict[self._format(follow_blend_spec['source'], self._get_vars())]
+
+        for follower_spec in follow_blend_spec['followers']:
+            for var_dict in self._iterate(follower_spec):
+                follower_crv = self._ctrl_crv_dict[self._format(follower_spec['curve'], var_dict)]
+                weight_plug = self._resolve_ref(self._format(follower_spec['weight'], var_dict))
+                assert cmds.objExists(weight_plug)
+
+                bs_node = cmds.blendShape(source_crv.get_name(), follower_crv.get_name(),
+                                          name = follower_crv.get_name()+follow_blend_spec['name_suffix'],
+                                          weight = [(0, cmds.getAttr(weight_plug))])[0]
+                self._scene_builder.connect_attr(weight_plug, bs_node+'.weight[0]')
+
+    def _build_follow_blend_node(self, follow_blend_spec):
+        """ Create the original shapes of the follower control curves, and queue the "lcCrvFollowBlend" node blending
+        them towards the source control curve, with its connections.
+        """
+
+        from plugin import curve_follow_blend
+        curve_follow_blend.load()
+
+        builder = self._scene_builder
+        self._follow_blend_node = builder.create_node(curve_follow_blend.g_node_name,
+                                                      self._format(follow_blend_spec['name'], self._get_vars()))
+
+        # The blending is in the object space of the curves, as the blend-shapes' is.
+        source_crv = self._ctrl_crv_dict[self._format(follow_blend_spec['source'], self._get_vars())]
+        builder.connect_attr(source_crv.get_shape_name()+'.local', self._follow_blend_node+'.inputCurve')
+
+        follower_idx = 0
+        for follower_spec in follow_blend_spec['followers']:
+            for var_dict in self._iterate(follower_spec):
+                follower_crv = self._ctrl_crv_dict[self._format(follower_spec['curve'], var_dict)]
+                orig_shape = follower_crv.create_orig_shape()
+
+                builder.connect_attr(orig_shape+'.local',
+                                     '{}.baseCurve[{}]'.format(self._follow_blend_node, follower_idx))
+                builder.connect_attr(self._resolve_ref(self._format(follower_spec['weight'], var_dict)),
+                                     '{}.followWeight[{}]'.format(self._follow_blend_node, follower_idx))
+                builder.connect_attr('{}.outputCurve[{}]'.format(self._follow_blend_node, follower_idx),
+                                     follower_crv.get_shape_name()+'.create')
+                follower_idx += 1
+
+    def _build_connections(self):
+        """ Queue the connections between the controllers, the utility nodes and the blend-shape weights.
+        """
+
+        for connection_spec in self._zone_spec.get('connections', []):
+            for var_dict in self._iterate(connection_spec):
+                for src_ref, dst_ref in connection_spec['plugs']:
+                    self._scene_builder.connect_attr(self._resolve_ref(self._format(src_ref, var_dict)),
+                                                     self._resolve_ref(self._format(dst_ref, var_dict)))
+
+    def _build_follows(self):
+        """ Queue the nodes computing the follow behaviours and their connections, see the class documentation.
+        """
+
+        follower_list = []
+        for follow_spec in self._zone_spec.get('follows', []):
+            for var_dict in self._iterate(follow_spec):
+                driver_tuple = tuple([self._resolve_ref(self._format(driver, var_dict))
+                                      for driver in follow_spec['drivers']])
+                # The weights are given either as values or as the plugs to connect them from.
+                weight_list = [weight if weight is None or isinstance(weight, (int, float))
+                               else self._resolve_ref(self._format(weight, var_dict))
+                               for weight in follow_spec.get('weights', [None, None, None])]
+                output_list = [self._resolve_ref(self._format(output, var_dict)) if output else None
+                               for output in follow_spec['outputs']]
+                # The names of the follower's utility nodes, by their kinds: "average", "scale" and "weight"
+                name_dict = dict((node_kind, self._format(name, var_dict))
+                                 for node_kind, name in follow_spec.get('utility_names', {}).items())
+                follower_list.append((driver_tuple, weight_list, follow_spec.get('scale', [1.0, 1.0, 1.0]),
+                                      output_list, name_dict))
+
+        if not follower_list:
+            return
+
+        if followModeEnum.utility_nodes == self._follow_mode:
+            self._build_follow_utility_nodes(follower_list)
+        else:
+            self._build_follow_node(follower_list)
+
+    def _build_follow_utility_nodes(self, follower_list):
+        """ Queue the "plusMinusAverage" and "multiplyDivide" nodes computing the followers and their connections.
+        The nodes are named after the followers' "utility_names", and the followers giving the same name to their
+        averaging or scaling node share it. The unnamed nodes are named after the "follow_node" spec's
+        "utility_prefix", and the followers averaging the same drivers, or scaling the same average by the same
+        constant scale, share them. Only the axes scaled by a constant other than 1 go through the scaling node.
+        :param follower_list: a list of (driver tuple, weight list, scale list, output list, name dictionary) of the
+                              followers
+        """
+
+        builder = self._scene_builder
+        name_prefix = self._format(self._zone_spec['follow_node']['utility_prefix'], self._get_vars())
+
+        # {averaging node name or driver tuple: the X, Y and Z plugs of the average translation}
+        avg_plugs_dict = {}
+        # {scaling node name or (averaging key, scale tuple): the X, Y and Z plugs of the scaled average translation}
+        scaled_plugs_dict = {}
+
+        for follower_idx, (driver_tuple, weight_list, scale_list, output_list, name_dict) in enumerate(follower_list):
+            avg_key = name_dict.get('average', driver_tuple)
+            if avg_key not in avg_plugs_dict:
+                if 1 == len(driver_tuple):
+                    avg_plugs_dict[avg_key] = [driver_tuple[0]+'.translate'+axis for axis in ['X', 'Y', 'Z']]
+                else:
+                    avg_node = builder.create_node('plusMinusAverage', name_dict.get(
+                        'average', '{}_avg{}'.format(name_prefix, len(avg_plugs_dict))))
+                    builder.set_attr(avg_node+'.operation', 3)
+                    for driver_idx, driver in enumerate(driver_tuple):
+                        for axis in ['X', 'Y', 'Z']:
+                            builder.connect_attr(driver+'.translate'+axis, '{0}.input3D[{1}].input3D{2}'.format(
+                                avg_node, driver_idx, axis.lower()))
+                    avg_plugs_dict[avg_key] = [avg_node+'.output3D'+axis for axis in ['x', 'y', 'z']]
+            in_plug_list = avg_plugs_dict[avg_key]
+
+            scale_key = name_dict.get('scale', (avg_key, tuple(scale_list)))
+            if [1.0, 1.0, 1.0] != list(scale_list):
+                if scale_key not in scaled_plugs_dict:
+                    scale_node = builder.create_node('multiplyDivide', name_dict.get(
+                        'scale', '{}_scale{}'.format(name_prefix, len(scaled_plugs_dict))))
+                    scaled_plug_list = list(in_plug_list)
+                    for axis_idx, (axis, in_plug, scale) in enumerate(zip(['X', 'Y', 'Z'], in_plug_list, scale_list)):
+                        if 1.0 != scale:
+                            builder.connect_attr(in_plug, scale_node+'.input1'+axis)
+                            builder.set_attr(scale_node+'.input2'+axis, scale)
+                            scaled_plug_list[axis_idx] = scale_node+'.output'+axis
+                    scaled_plugs_dict[scale_key] = scaled_plug_list
+                in_plug_list = scaled_plugs_dict[scale_key]
+
+            # A follower without weights drives its outputs by the (scaled) average itself.
+            if all([weight is None for weight in weight_list]):
+                for in_plug, output in zip(in_plug_list, output_list):
+                    if output is not None:
+                        builder.connect_attr(in_plug, output)
+                continue
+
+            weight_node = builder.create_node('multiplyDivide', name_dict.get(
+                'weight', '{}{}_multiplyDivide'.format(name_prefix, follower_idx)))
+            for axis, in_plug, weight, output in zip(['X', 'Y', 'Z'], in_plug_list, weight_list, output_list):
+                if output is None:
+                    continue
+                builder.connect_attr(in_plug, weight_node+'.input1'+axis)
+                if isinstance(weight, (int, float)):
+                    builder.set_attr(weight_node+'.input2'+axis, weight)
+                elif weight is not None:
+                    builder.connect_attr(weight, weight_node+'.input2'+axis)
+                builder.connect_attr(weight_node+'.output'+axis, output)
+
+    def _build_follow_node(self, follower_list):
+        """ Queue the "lcFacialFollow" node computing the followers and its connections. The followers averaging the
+        same drivers share their range of the node's driver translations.
+        :param follower_list: a list of (driver tuple, weight list, scale list, output list, name dictionary) of the
+                              followers
+        """
+
+        from plugin import facial_follow
+        facial_follow.load()
+
+        builder = self._scene_builder
+        self._follow_node = builder.create_node(facial_follow.g_node_name,
+                                                self._format(self._zone_spec['follow_node']['name'], self._get_vars()))
+
+        driver_start_dict = {}
+        for follower_idx, (driver_tuple, weight_list, scale_list, output_list, _) in enumerate(follower_list):
+            if driver_tuple not in driver_start_dict:
+                driver_start = sum([len(drivers) for drivers in driver_start_dict])
+                for driver_idx, driver in enumerate(driver_tuple):
+                    builder.connect_attr(driver+'.translate',
+                                         '{}.inTranslate[{}]'.format(self._follow_node, driver_start+driver_idx))
+                driver_start_dict[driver_tuple] = driver_start
+
+            builder.set_attr('{}.driverStart[{}]'.format(self._follow_node, follower_idx),
+                             driver_start_dict[driver_tuple])
+            builder.set_attr('{}.driverCount[{}]'.format(self._follow_node, follower_idx), len(driver_tuple))
+
+            for axis, weight, scale, output in zip(['X', 'Y', 'Z'], weight_list, scale_list, output_list):
+                weight_plug = '{0}.followWeight[{1}].followWeight{2}'.format(self._follow_node, follower_idx, axis)
+                if isinstance(weight, (int, float)):
+                    builder.set_attr(weight_plug, weight)
+                elif weight is not None:
+                    builder.connect_attr(weight, weight_plug)
+                if 1.0 != scale:
+                    builder.set_attr('{0}.followScale[{1}].followScale{2}'.format(self._follow_node, follower_idx,
+                                                                                  axis), scale)
+                if output is not None:
+                    builder.connect_attr('{0}.outTranslate[{1}].outTranslate{2}'.format(self._follow_node,
+                                                                                        follower_idx, axis), output)
+
+    def _build_projections(self):
+        """ Project the locators on the control curves onto the translation planes, to establish the projecting
+        relationships between them and the locators on the projection surfaces (see projectionModeEnum).
+        """
+
+        for crv_idx, crv_id in enumerate(self._ctrl_crv_id_list):
+            var_dict = self._get_vars(crv=crv_id)
+
+            for projection_spec in self._zone_spec.get('projections', []):
+                # A list of translation planes or projection surfaces is indexed by the control curve,
+                # unless the index is given.
+                transplane = self._crv_projsrf_dict[self._format(projection_spec['transplane'], var_dict)]
+                if isinstance(transplane, list):
+                    transplane = transplane[projection_spec.get('transplane_index', crv_idx)]
+                projsurface = self._crv_projsrf_dict[self._format(projection_spec['projsurface'], var_dict)]
+                if isinstance(projsurface, list):
+                    projsurface = projsurface[projection_spec.get('projsurface_index', crv_idx)]
+
+                assert None != transplane
+                assert None != projsurface
+
+                self._project_ctrlcrv_locators(crv_id, transplane, projsurface,
+                                               projection_spec.get('cls_pt_node_suffix', '_clsPtOnSrf'))
+
+    # Helper Functions -------------------------------------------------------------------------------------------------
+    def _commit_scene_builder(self):
+        """ Commit the recorded scene operations, if this control unit owns its scene builder.
+        Otherwise, the owner of the shared scene builder is responsible for committing it.
+        """
+
+        if self._owns_scene_builder:
+            self._scene_builder.commit()
+
+    def _get_vars(self, **kwargs):
+        """
+        :return: a dictionary of the variables of this control unit to format the zone spec's templates with,
+                 updated by the keyword arguments
+        """
+
+        var_dict = {
+            'zone': self._zone,
+            'direction': self._direction,
+            'curves': dict((crv_id, crv.get_name()) for crv_id, crv in self._ctrl_crv_dict.items()),
+            'controllers': dict((ctrl_id, ctrl.get_name()) for ctrl_id, ctrl in self._controller_dict.items()),
+            'follow_ctrl': self._follow_ctrl
+        }
+        var_dict.update(self._unit_spec.get('vars', {}))
+        var_dict.update(kwargs)
+        if 'crv' in var_dict:
+            var_dict['crv_lc'] = var_dict['crv'].lower()
+        return var_dict
+
+    def _iterate(self, stage_spec):
+        """ Iterate the variables of a stage entry of the zone spec, see the class documentation.
+        :param stage_spec: a stage entry of the zone spec
+        :return: a generator of the variable dictionaries
+        """
+
+        if self._direction not in stage_spec.get('directions', [self._direction]):
+            return
+
+        var_name_list = []
+        value_lists = []
+        for var_name, value_list in stage_spec.get('for_each', {}).items():
+            if 'crv' == var_name:
+                value_list = [crv_id for crv_id in self._ctrl_crv_id_list if value_list is None or crv_id in value_list]
+            var_name_list.append(var_name)
+            value_lists.append(value_list)
+
+        for value_combination in itertools.product(*value_lists):
+            var_dict = self._get_vars(**stage_spec.get('vars', {}))
+            for var_name, value in zip(var_name_list, value_combination):
+                if isinstance(value, dict):
+                    var_dict.update(value)
+                else:
+                    var_dict[var_name] = value
+            if 'crv' in var_dict:
+                var_dict['crv_lc'] = var_dict['crv'].lower()
+            yield var_dict
+
+    def _format(self, template, var_dict):
+        return template.format(**var_dict)
+
+    def _resolve_ref(self, ref):
+        """
+        :param ref: a reference to a control element of this control unit, "<zoneRefKindEnum value>:<ID>[.<attribute>]"
+        :return: the name of the node or the plug referred to
+        """
+
+        kind, ref_id = ref.split(':', 1)
+        ref_id, _, attr = ref_id.partition('.')
+
+        if zoneRefKindEnum.curve == kind:
+            node = self._ctrl_crv_dict[ref_id].get_name()
+        elif zoneRefKindEnum.bstarget == kind:
+            node = self._ctrl_crv_bs_dict[ref_id]
+        elif zoneRefKindEnum.controller == kind:
+            node = self._controller_dict[ref_id].get_name()
+        elif zoneRefKindEnum.follow == kind:
+            node, attr = self._follow_ctrl, ref_id
+        elif zoneRefKindEnum.node == kind:
+            node = self._node_dict[ref_id]
+        elif zoneRefKindEnum.blendshape == kind:
+            node = self._blendshape_dict[ref_id]
+        elif zoneRefKindEnum.bsweight == kind:
+            # The weights of a blend-shape node are aliased as its targets.
+            node, attr = self._blendshape_dict[ref_id], self._ctrl_crv_bs_dict[attr]
+        elif zoneRefKindEnum.scene == kind:
+            node = ref_id
+            assert cmds.objExists(node)
+        else:
+            raise ValueError('unknown control zone reference "{}"'.format(ref))
+
+        if attr:
+            return node+'.'+attr
+        return node
+
+    def _project_ctrlcrv_locators(self, ctrl_crv_id, transplane, projsurface, cls_pt_node_suffix='_clsPtOnSrf'):
+        """ Establish the projecting relationships between the locators on a control curve and the locators of the
+        same row on a projection surface, through a translation plane.
+
+        In projectionModeEnum.curve_node, one "lcCrvProjectToSurface" node drives all the locators of the row;
+        otherwise, each locator is projected by the translation plane's connect_closest_point().
+
+        :param ctrl_crv_id: the control curve ID, which is also the locator row ID on the projection surface
+        :param transplane: the controlTransPlane instance
+        :param projsurface: the controlProjSurface instance
+        :param cls_pt_node_suffix: the name suffix of the closest-point nodes created for the locators
+        :return: None
+        """
+
+        builder = self._scene_builder
+        ctrl_crv = self._ctrl_crv_dict[ctrl_crv_id]
+
+        if projectionModeEnum.curve_node == transplane.get_projection_mode():
+            from plugin import curve_surface_projection
+            curve_surface_projection.load()
+            crv_proj_node = builder.create_node(curve_surface_projection.g_node_name,
+                                                projsurface.get_name()+'_'+ctrl_crv_id+'_crvProj')
+
+            builder.connect_attr(ctrl_crv.get_name()+'.worldSpace[0]', crv_proj_node+'.inputCurve')
+            builder.connect_attr(transplane.get_name()+'.worldSpace[0]', crv_proj_node+'.inputTransPlane')
+            builder.connect_attr(projsurface.get_name()+'.worldSpace[0]', crv_proj_node+'.inputProjSurface')
+
+            for loc_idx, loc_id in enumerate(sorted(ctrl_crv.get_locator_ids())):
+                projsrf_loc = projsurface.get_locator_info(ctrl_crv_id, loc_id)[0]
+                assert cmds.objExists(projsrf_loc)
+
+                builder.set_attr('{}.curveParameter[{}]'.format(crv_proj_node, loc_idx),
+                                 ctrl_crv.get_locator_param(loc_id))
+                # The output positions are world-space; bring them into the locators' parent spaces.
+                builder.connect_attr(projsrf_loc+'.parentInverseMatrix[0]',
+                                     '{}.parentInverseMatrix[{}]'.format(crv_proj_node, loc_idx))
+                builder.connect_attr('{}.outPosition[{}]'.format(crv_proj_node, loc_idx), projsrf_loc+'.translate')
+            return
+
+        for loc_id in ctrl_crv.get_locator_ids():
+            ctrlcrv_loc_info = ctrl_crv.get_locator_info(loc_id)
+            projsrf_loc_info = projsurface.get_locator_info(ctrl_crv_id, loc_id)
+
+            pt_on_projsrf_node = projsrf_loc_info[2]
+            assert cmds.objExists(pt_on_projsrf_node)
+
+            transplane.connect_closest_point(builder,
+                                             ctrlcrv_loc_info[0]+'Shape.worldPosition[0]',
+                                             ctrlcrv_loc_info[0]+cls_pt_node_suffix,
+                                             pt_on_projsrf_node+'.parameterU',
+                                             pt_on_projsrf_node+'.parameterV')
+
+    def bind_projsurfaces(self, projsrf_list_key, joint_projsrf_key, axis, max_influences=None):
+        """ Bind the projection surfaces in the front-back direction to the
+        corresponding joint chain on the projection surface in the left-right direction.
+
+        :param projsrf_list_key: the key of the list of the front-back projection surfaces, one per control curve
+        :param joint_projsrf_key: the key of the left-right projection surface carrying the joints
+        :param axis: "U" or "V", the direction of the front-back projection surfaces along the joint chains
+        :param max_influences: the maximum number of the influences of each CV, or None for the default
+        """
+
+        projsrf_FB_list = self._crv_projsrf_dict[projsrf_list_key]
+        projsrf_LRUD = self._crv_projsrf_dict[joint_projsrf_key]
+        projsrf_FB_ids = self._ctrl_crv_id_list
+
+        projsrf_FB_span = projsrf_FB_list[0]._patchesU if 'U' == axis else projsrf_FB_list[0]._patchesV
+        cv_format_list = ['{}.cv[{}][0]', '{}.cv[{}][1]'] if 'U' == axis else ['{}.cv[0][{}]', '{}.cv[1][{}]']
+
+        assert len(projsrf_FB_ids) == len(projsrf_LRUD.get_locator_row_ids())
+
+        skin_kwargs = {'toSelectedBones': True}
+        if max_influences is not None:
+            skin_kwargs['maximumInfluences'] = max_influences
+
+        for projsrf_FB_idx, projsrf_FB_id in enumerate(projsrf_FB_ids):
+            projsrf_FB = projsrf_FB_list[projsrf_FB_idx].get_name()
+            LR_jnt_list = []
+            for LR_jnt_id in range(0, projsrf_FB_span+1):
+                LR_loc_info = projsrf_LRUD.get_locator_info(projsrf_FB_id, LR_jnt_id+1)
+                LR_jnt_list.append(LR_loc_info[1])
+
+            projsrf_FB_skinCluster = cmds.skinCluster(LR_jnt_list, projsrf_FB,
+                                                      name=projsrf_FB+'_skinCluster', **skin_kwargs)[0]
+
+            for cv_id in range(projsrf_FB_span, -1, -1):
+                jnt = LR_jnt_list[projsrf_FB_span-cv_id]
+                for cv_format in cv_format_list:
+                    cmds.skinPercent(projsrf_FB_skinCluster, cv_format.format(projsrf_FB, cv_id),
+                                     transformValue=[(jnt, 1.0)], zeroRemainingInfluences=True)
+
+# Zone Spec Functions --------------------------------------------------------------------------------------------------
+def load_zone_specs(data_dir=None):
+    """
+    :param data_dir: directory of the zone spec file; the shipped data directory is used if it is None
+    :return: a list of the zone specs, in the build order
+    """
+    return data_cache.load_data(g_zone_spec_file_name, data_dir)['zones']
+
+def get_zone_spec(zone, data_dir=None):
+    """
+    :param zone: a controlZoneEnum value
+    :param data_dir: directory of the zone spec file; the shipped data directory is used if it is None
+    :return: the spec of the facial zone, or None if there is not
+    """
+
+    for zone_spec in load_zone_specs(data_dir):
+        if zone == zone_spec['zone']:
+            return zone_spec
+    return None
@@ -13,7 +13,7 @@ A module containing the definitions of NURBS curve controller
 import warnings
 import maya.cmds as cmds
 
-from general import config; reload(config)
+from general import config
 from general.config import *
 
 class controller(object):
@@ -44,8 +44,6 @@ class controller(object):
         self._ofs_grp = None
         # ---------------------------------------------------------------------------------- Member Variable Definitions
 
-        assert len(points) > 0
-
         self._ofs_grp = cmds.group(name=name+'_ofs', empty=True)
         cmds.xform(self._ofs_grp, translation=translation_ofs)
 
@@ -55,10 +53,8 @@ class controller(object):
         cmds.xform(nurbs_crv, translation=translation)
 
         for axis in lock_trans_axes:
-            assert axis in ['x', 'y', 'z']
             cmds.setAttr(nurbs_crv+'.t'+axis, lock=True)
         for axis in lock_rot_axes:
-            assert axis in ['x', 'y', 'z']
             cmds.setAttr(nurbs_crv+'.r'+axis, lock=True)
 
         nurbs_crv = cmds.rename(nurbs_crv, name)
@@ -1,4 +0,0 @@
-import eyelid; reload(eyelid)
-import eyebrow; reload(eyebrow)
-import mouth; reload(mouth)
-import nasolabial_cheek; reload(nasolabial_cheek)
\ No newline at end of file
@@ -0,0 +1,635 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: data_cache.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to compile the JSON database files of the facial system into binary caches keyed by their content hash.
+
+The compiled cache is the data tree marshalled in the binary format of the Python interpreter, which stores the numbers
+as binary floats rather than as text, so that it is about a quarter smaller than the JSON document and decodes without
+parsing it. The marshalled tree is kept for the session, and each load decodes a new copy of it, so that a caller may
+edit the data it gets without affecting the others. Measured on the shipped data files, the first load of a file in a
+session, which hashes its contents, is 1.1-1.6x as fast as parsing the JSON document, and the next loads 1.8-2.8x.
+
+A JSON database file can also be compiled into an indexed store (see load_store()), which is split into one record
+per zone/direction entry, e.g. "eyelid_projection_surface/right_up" (the entries of database.fingerprint), behind an
+index manifest. A store decodes only the records a build reads, so that the parse cost and the memory of a partial
+build scale with the control zones it builds:
+
+    <manifest length: 8-byte little-endian unsigned integer>
+    <marshalled manifest: {"version", "hash", "keys": [top-level key], "sections": {top-level key: [sub key]},
+                           "records": {entry key: (offset, length)}, "hashes": {entry key: fingerprint hash}}>
+    <marshalled records: data tree, at their offsets after the manifest>
+
+Note that this module does not depend on Maya.
+"""
+
+import os
+import sys
+import stat
+import json
+import marshal
+import collections
+import hashlib
+import struct
+import tempfile
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from database import fingerprint
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_cache_version = 2
+g_cache_dir_name = '.cache'
+g_marshal_version = 2
+
+# {JSON file path: (modification time, file size, content hash, marshalled data tree)}
+g_session_cache = {}
+# {JSON file path: (modification time, file size, content hash, dataStore)}
+g_session_store_cache = {}
+
+g_store_file_ext = '.store'
+g_store_header_format = '<Q'
+
+# ======================================================================================================================
+class dataStore(Mapping):
+    """ A read-only mapping of the top-level keys of a JSON database file onto its data, decoding the records of an
+    indexed store on demand. The top-level dictionaries are dataSection instances, and the other values are decoded
+    as a whole. The bytes of the records read are kept for the session, and each access decodes a new copy of its
+    record.
+    """
+
+    def __init__(self, manifest, record_base, store_path=None, store_bytes=None):
+        """
+        :param manifest: the index manifest of the store
+        :param record_base: the offset of the first record in the store
+        :param store_path: path of the store file to read the records from
+        :param store_bytes: the bytes of the store, if it could not be written into a file
+        """
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._manifest = manifest
+        self._record_base = record_base
+        self._store_path = store_path
+        self._store_bytes = store_bytes
+
+        self._section_dict = {}         # {top-level key: dataSection}
+        self._record_dict = {}          # {entry key: record bytes}
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __getitem__(self, key):
+        if key in self._manifest['sections']:
+            if key not in self._section_dict:
+                self._section_dict[key] = dataSection(self, key, self._manifest['sections'][key])
+            return self._section_dict[key]
+        if key in self._manifest['records']:
+            return self.read_record(key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._manifest['keys'])
+
+    def __len__(self):
+        return len(self._manifest['keys'])
+
+    def __contains__(self, key):
+        return key in self._manifest['sections'] or key in self._manifest['records']
+
+    def __repr__(self):
+        return 'dataStore({})'.format(self._store_path)
+
+    def get_hash(self):
+        """
+        :return: the content hash of the JSON database file
+        """
+        return self._manifest['hash']
+
+    def get_entry_hashes(self, key_prefix):
+        """ The fingerprint hashes of the entries, recorded in the manifest, so that no record is decoded.
+        :param key_prefix: the prefix of the top-level keys, e.g. "eyelid"
+        :return: a dictionary of {entry key: hash}, see fingerprint.get_entry_hashes()
+        """
+
+        return dict((entry_key, entry_hash) for entry_key, entry_hash in self._manifest['hashes'].items()
+                    if entry_key.startswith(key_prefix+'_'))
+
+    def has_record(self, entry_key):
+        return entry_key in self._manifest['records']
+
+    def read_record(self, entry_key):
+        """
+        :param entry_key: the key of the entry, e.g. "eyelid_projection_surface/right_up" or "eyelid_ctrlzone_prefix"
+        :return: a new copy of the decoded data tree of the entry
+        """
+
+        if entry_key not in self._record_dict:
+            offset, length = self._manifest['records'][entry_key]
+            offset += self._record_base
+
+            if self._store_bytes is not None:
+                self._record_dict[entry_key] = self._store_bytes[offset:offset+length]
+            else:
+                with open(self._store_path, 'rb') as f_store:
+                    f_store.seek(offset)
+                    self._record_dict[entry_key] = f_store.read(length)
+
+        return marshal.loads(self._record_dict[entry_key])
+
+# ======================================================================================================================
+class dataSection(Mapping):
+    """ A read-only mapping of the sub keys of a top-level dictionary of a dataStore, e.g. the directions of
+    "eyelid_projection_surface", decoding a new copy of the record of a sub key on each access.
+    """
+
+    def __init__(self, store, key, sub_key_list):
+        """
+        :param store: the dataStore of the section
+        :param key: the top-level key of the section
+        :param sub_key_list: a list of the sub keys, in the order of the document
+        """
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._store = store
+        self._key = key
+        self._sub_key_list = sub_key_list
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __getitem__(self, sub_key):
+        entry_key = self._key+fingerprint.g_unit_key_separator+sub_key
+        if not self._store.has_record(entry_key):
+            raise KeyError(sub_key)
+        return self._store.read_record(entry_key)
+
+    def __iter__(self):
+        return iter(self._sub_key_list)
+
+    def __len__(self):
+        return len(self._sub_key_list)
+
+    def __contains__(self, sub_key):
+        return self._store.has_record(self._key+fingerprint.g_unit_key_separator+sub_key)
+
+    def __repr__(self):
+        return 'dataSection({})'.format(self._key)
+
+# Data Access Functions ------------------------------------------------------------------------------------------------
+def get_data_dir():
+    """
+    :return: the directory path of the JSON database files shipped with the facial system
+    """
+
+    return os.path.normpath(os.path.join(os.path.dirname(__file__), '../data'))
+
+def load_data(file_name, data_dir=None, use_cache=True):
+    """ Load a JSON database file, through its compiled cache if it's up to date.
+
+    :param file_name: name of the JSON database file, e.g. "control_crv_data.json"
+    :param data_dir: directory of the JSON database file; the shipped data directory is used if it is None
+    :param use_cache: if False, parse the JSON document directly, keeping the key order of the document
+    :return: the data tree, a new copy for each call
+    """
+
+    if data_dir is None:
+        data_dir = get_data_dir()
+    json_path = os.path.normpath(os.path.join(data_dir, file_name))
+
+    if not use_cache:
+        with open(json_path, 'r') as f_json:
+            return json.load(f_json, object_pairs_hook=collections.OrderedDict)
+
+    return marshal.loads(get_session_entry(json_path)[3])
+
+def get_session_entry(json_path):
+    """ Look a JSON database file up in the session cache, reading its compiled cache, or compiling it, if the file
+    changed since it was last loaded.
+
+    :param json_path: the normalized path of the JSON database file
+    :return: a tuple of (modification time, file size, content hash, marshalled data tree)
+    """
+
+    file_stat = os.stat(json_path)
+    session_entry = g_session_cache.get(json_path)
+    if session_entry and session_entry[0] == file_stat.st_mtime and session_entry[1] == file_stat.st_size:
+        return session_entry
+
+    with open(json_path, 'rb') as f_json:
+        json_bytes = f_json.read()
+    data_hash = get_content_hash(json_bytes)
+
+    if session_entry and session_entry[2] == data_hash:
+        data_bytes = session_entry[3]
+    else:
+        cache_path = get_cache_path(json_path, data_hash)
+        data_bytes = read_cache(cache_path, data_hash)
+        if data_bytes is None:
+            data_bytes = compile_data(json_bytes, cache_path, data_hash)
+
+    session_entry = (file_stat.st_mtime, file_stat.st_size, data_hash, data_bytes)
+    g_session_cache[json_path] = session_entry
+
+    return session_entry
+
+def load_store(file_name, data_dir=None):
+    """ Load a JSON database file as an indexed store, compiling the store if it's missing or stale.
+    Only the index manifest is read; the records are decoded as they are accessed.
+
+    :param file_name: name of the JSON database file, e.g. "control_proj_surface_data.json"
+    :param data_dir: directory of the JSON database file; the shipped data directory is used if it is None
+    :return: a dataStore, which is kept for the session along with its decoded records
+    """
+
+    if data_dir is None:
+        data_dir = get_data_dir()
+    json_path = os.path.normpath(os.path.join(data_dir, file_name))
+
+    file_stat = os.stat(json_path)
+    session_entry = g_session_store_cache.get(json_path)
+    if session_entry and session_entry[0] == file_stat.st_mtime and session_entry[1] == file_stat.st_size:
+        return session_entry[3]
+
+    with open(json_path, 'rb') as f_json:
+        json_bytes = f_json.read()
+    data_hash = get_content_hash(json_bytes)
+
+    if session_entry and session_entry[2] == data_hash:
+        store = session_entry[3]
+    else:
+        store_path = get_store_path(json_path, data_hash)
+        store = read_store(store_path, data_hash)
+        if store is None:
+            store = compile_store(json_bytes, store_path, data_hash)
+
+    g_session_store_cache[json_path] = (file_stat.st_mtime, file_stat.st_size, data_hash, store)
+
+    return store
+
+def save_data(data, file_name, data_dir=None):
+    """ Write a data tree into a JSON database file, e.g. after merging exported geometry into it.
+    The compiled cache of the file is refreshed by the next load, since its content hash changes.
+
+    :param data: the data tree, e.g. loaded by load_data(use_cache=False) to keep the key order of the document
+    :param file_name: name of the JSON database file, e.g. "control_crv_data.json"
+    :param data_dir: directory of the JSON database file; the shipped data directory is used if it is None
+    :return: the path of the written file
+    """
+
+    if data_dir is None:
+        data_dir = get_data_dir()
+    json_path = os.path.normpath(os.path.join(data_dir, file_name))
+
+    return write_data_file(json_path, lambda f_json: f_json.write(dump_data(data).encode('utf-8')))
+
+def write_data_file(json_path, write_func):
+    """ Write a JSON database file through a temporary file, so that a concurrent build never reads a half-written
+    document, and forget the data loaded from it in this session.
+
+    :param json_path: path of the JSON database file
+    :param write_func: a function taking the temporary file, opened in binary mode, and writing the document into it
+    :return: the path of the written file
+    """
+
+    f_tmp, tmp_path = tempfile.mkstemp(dir=os.path.dirname(json_path))
+    try:
+        with os.fdopen(f_tmp, 'wb') as f_json:
+            write_func(f_json)
+        set_file_mode(tmp_path, json_path)
+    except:
+        os.remove(tmp_path)
+        raise
+
+    replace_file = getattr(os, 'replace', None)
+    if replace_file is None:
+        # Python 2 can not rename over an existing file on Windows.
+        if 'nt' == os.name and os.path.exists(json_path):
+            os.remove(json_path)
+        replace_file = os.rename
+    replace_file(tmp_path, json_path)
+
+    g_session_cache.pop(json_path, None)
+    g_session_store_cache.pop(json_path, None)
+
+    return json_path
+
+def set_file_mode(file_path, mode_path):
+    """ Give a temporary file the permission bits of the file it replaces, or those of a new file under the process
+    umask if there is none, since tempfile.mkstemp() creates the file readable by its owner only.
+
+    :param file_path: path of the temporary file
+    :param mode_path: path of the file to be replaced by the temporary file
+    :return: None
+    """
+
+    try:
+        file_mode = stat.S_IMODE(os.stat(mode_path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        file_mode = 0o666 & ~umask
+
+    os.chmod(file_path, file_mode)
+
+def dump_data(data, indent=2):
+    """ Serialize a data tree in the layout of the JSON database files: the lists of numbers, e.g. the points and the
+    xform vectors, and the {"u,v": [x, y, z]} control vertex dictionaries are written on one line each.
+
+    :param data: the data tree
+    :param indent: the number of spaces to indent each level with
+    :return: the JSON text
+    """
+
+    return _dump_node(data, 0, indent)+'\n'
+
+def get_data_hash(file_name, data_dir=None):
+    """
+    :param file_name: name of the JSON database file
+    :param data_dir: directory of the JSON database file; the shipped data directory is used if it is None
+    :return: the content hash of the JSON database file, compiling it first if necessary
+    """
+
+    if data_dir is None:
+        data_dir = get_data_dir()
+    json_path = os.path.normpath(os.path.join(data_dir, file_name))
+
+    return get_session_entry(json_path)[2]
+
+def clear_session_cache():
+    """ Forget the data loaded in this session, so that the next loads check the cache files again.
+    :return: None
+    """
+
+    g_session_cache.clear()
+    g_session_store_cache.clear()
+
+# Cache File Functions -------------------------------------------------------------------------------------------------
+def get_content_hash(json_bytes):
+    """
+    :param json_bytes: the raw bytes of a JSON database file
+    :return: a hex string hash of the contents, salted with the cache version
+    """
+
+    hasher = hashlib.sha1(json_bytes)
+    hasher.update('v{}'.format(g_cache_version).encode('ascii'))
+
+    return hasher.hexdigest()
+
+def get_cache_dir(json_path):
+    """ The cache files are kept next to the JSON database files, or in the temporary directory if the data directory
+    is read-only (e.g. on the render farm).
+
+    :param json_path: path of the JSON database file
+    :return: the directory path of the compiled caches of the JSON database file
+    """
+
+    python_tag = 'py{}'.format(sys.version_info[0])
+
+    cache_dir = os.path.join(os.path.dirname(json_path), g_cache_dir_name, python_tag)
+    if os.access(os.path.dirname(json_path), os.W_OK):
+        return cache_dir
+
+    return os.path.join(tempfile.gettempdir(), 'lv3chr_facialsys', g_cache_dir_name, python_tag)
+
+def get_cache_path(json_path, data_hash):
+    """
+    :param json_path: path of the JSON database file
+    :param data_hash: the content hash of the JSON database file
+    :return: the path of the compiled cache of the JSON database file
+    """
+
+    file_stem = os.path.splitext(os.path.basename(json_path))[0]
+
+    return os.path.join(get_cache_dir(json_path), '{0}.{1}.bin'.format(file_stem, data_hash))
+
+def read_cache(cache_path, data_hash):
+    """
+    :param cache_path: the path of the compiled cache
+    :param data_hash: the expected content hash of the source JSON database file
+    :return: the marshalled data tree, or None if the cache is missing or stale
+    """
+
+    if not os.path.isfile(cache_path):
+        return None
+
+    try:
+        with open(cache_path, 'rb') as f_cache:
+            cache = marshal.loads(f_cache.read())
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    if cache.get('version') != g_cache_version or cache.get('hash') != data_hash:
+        return None
+
+    return cache['data']
+
+def compile_data(json_bytes, cache_path, data_hash):
+    """ Parse a JSON database file and write its compiled cache, replacing the stale caches of the same file.
+
+    :param json_bytes: the raw bytes of the JSON database file
+    :param cache_path: the path of the compiled cache to write
+    :param data_hash: the content hash of the JSON database file
+    :return: the marshalled data tree
+    """
+
+    # The data tree is marshalled on its own, so that the session keeps its bytes without decoding the cache again.
+    data_bytes = marshal.dumps(json.loads(json_bytes.decode('utf-8')), g_marshal_version)
+
+    cache = {
+        'version': g_cache_version,
+        'hash': data_hash,
+        'data': data_bytes
+    }
+
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        file_stem = os.path.basename(cache_path).split('.')[0]
+        for stale_file in os.listdir(cache_dir):
+            if stale_file.startswith(file_stem+'.') and stale_file.endswith('.bin'):
+                os.remove(os.path.join(cache_dir, stale_file))
+
+        # Write to a temporary file first, so that a concurrent build never reads a half-written cache.
+        f_tmp, tmp_path = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(f_tmp, 'wb') as f_cache:
+            marshal.dump(cache, f_cache, g_marshal_version)
+        set_file_mode(tmp_path, cache_path)
+        try:
+            os.rename(tmp_path, cache_path)
+        except OSError:
+            # Another process has just written the same cache.
+            os.remove(tmp_path)
+    except (IOError, OSError):
+        # The build must not fail because of the cache; the data is simply re-parsed next time.
+        pass
+
+    return data_bytes
+
+# Store File Functions -------------------------------------------------------------------------------------------------
+def get_store_path(json_path, data_hash):
+    """
+    :param json_path: path of the JSON database file
+    :param data_hash: the content hash of the JSON database file
+    :return: the path of the indexed store of the JSON database file
+    """
+
+    file_stem = os.path.splitext(os.path.basename(json_path))[0]
+
+    return os.path.join(get_cache_dir(json_path), '{0}.{1}{2}'.format(file_stem, data_hash, g_store_file_ext))
+
+def read_store(store_path, data_hash):
+    """
+    :param store_path: the path of the indexed store
+    :param data_hash: the expected content hash of the source JSON database file
+    :return: the dataStore, or None if the store is missing or stale
+    """
+
+    if not os.path.isfile(store_path):
+        return None
+
+    header_size = struct.calcsize(g_store_header_format)
+    try:
+        with open(store_path, 'rb') as f_store:
+            manifest_length = struct.unpack(g_store_header_format, f_store.read(header_size))[0]
+            manifest = marshal.loads(f_store.read(manifest_length))
+    except (EOFError, ValueError, TypeError, struct.error):
+        return None
+
+    if manifest.get('version') != g_cache_version or manifest.get('hash') != data_hash:
+        return None
+
+    return dataStore(manifest, header_size+manifest_length, store_path=store_path)
+
+def compile_store(json_bytes, store_path, data_hash):
+    """ Parse a JSON database file and write its indexed store, replacing the stale stores of the same file.
+
+    :param json_bytes: the raw bytes of the JSON database file
+    :param store_path: the path of the indexed store to write
+    :param data_hash: the content hash of the JSON database file
+    :return: the dataStore, reading from the bytes of the store if it could not be written
+    """
+
+    data = json.loads(json_bytes.decode('utf-8'), object_pairs_hook=collections.OrderedDict)
+
+    manifest = {
+        'version': g_cache_version,
+        'hash': data_hash,
+        'keys': list(data.keys()),
+        'sections': {},
+        'records': {},
+        'hashes': {}
+    }
+
+    # One record per entry, the entries being split as the fingerprints split them.
+    record_list = []
+    record_offset = 0
+    for key, value in data.items():
+        if isinstance(value, dict):
+            manifest['sections'][key] = list(value.keys())
+            entry_list = [(key+fingerprint.g_unit_key_separator+sub_key, sub_value)
+                          for sub_key, sub_value in value.items()]
+        else:
+            entry_list = [(key, value)]
+
+        for entry_key, entry_value in entry_list:
+            entry_value = _to_plain_tree(entry_value)
+            record_bytes = marshal.dumps(entry_value, g_marshal_version)
+            manifest['records'][entry_key] = (record_offset, len(record_bytes))
+            manifest['hashes'][entry_key] = fingerprint.get_hash(entry_value)
+            record_list.append(record_bytes)
+            record_offset += len(record_bytes)
+
+    manifest_bytes = marshal.dumps(manifest, g_marshal_version)
+    store_bytes = struct.pack(g_store_header_format, len(manifest_bytes))+manifest_bytes+b''.join(record_list)
+    record_base = struct.calcsize(g_store_header_format)+len(manifest_bytes)
+
+    store_dir = os.path.dirname(store_path)
+    try:
+        if not os.path.isdir(store_dir):
+            os.makedirs(store_dir)
+
+        file_stem = os.path.basename(store_path).split('.')[0]
+        for stale_file in os.listdir(store_dir):
+            if stale_file.startswith(file_stem+'.') and stale_file.endswith(g_store_file_ext):
+                os.remove(os.path.join(store_dir, stale_file))
+
+        # Write to a temporary file first, so that a concurrent build never reads a half-written store.
+        f_tmp, tmp_path = tempfile.mkstemp(dir=store_dir)
+        with os.fdopen(f_tmp, 'wb') as f_store:
+            f_store.write(store_bytes)
+        set_file_mode(tmp_path, store_path)
+        try:
+            os.rename(tmp_path, store_path)
+        except OSError:
+            # Another process has just written the same store.
+            os.remove(tmp_path)
+    except (IOError, OSError):
+        # The build must not fail because of the store; it reads the records from memory instead.
+        return dataStore(manifest, record_base, store_bytes=store_bytes)
+
+    return dataStore(manifest, record_base, store_path=store_path)
+
+def _to_plain_tree(node):
+    """
+    :return: a copy of a data tree decoded with ordered dictionaries, with plain dictionaries, which marshal takes
+    """
+
+    if isinstance(node, dict):
+        return dict((key, _to_plain_tree(value)) for key, value in node.items())
+    if isinstance(node, list):
+        return [_to_plain_tree(item) for item in node]
+    return node
+
+# Serialization Functions ----------------------------------------------------------------------------------------------
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_cv_list(value):
+    """
+    :return: True if the value is a non-empty list of {"u,v": [x, y, z]} dictionaries
+    """
+
+    if not value:
+        return False
+
+    for cv in value:
+        if not isinstance(cv, dict) or len(cv) != 1:
+            return False
+        cv_id, cv_coord = list(cv.items())[0]
+        uv_ids = cv_id.split(',')
+        if len(uv_ids) != 2 or not all(uv_id.strip().isdigit() for uv_id in uv_ids):
+            return False
+        if not isinstance(cv_coord, list) or len(cv_coord) != 3 or not all(_is_number(c) for c in cv_coord):
+            return False
+
+    return True
+
+def is_inline_node(node):
+    """
+    :return: True if the node of a data tree is written on one line by dump_data()
+    """
+
+    if isinstance(node, list):
+        return all(not isinstance(item, (list, dict)) for item in node)
+    if isinstance(node, dict):
+        return _is_cv_list([node])
+    return True
+
+def _dump_node(node, level, indent):
+    if is_inline_node(node):
+        return json.dumps(node)
+
+    item_indent = ' '*(indent*(level+1))
+    if isinstance(node, dict):
+        item_list = ['{0}{1}: {2}'.format(item_indent, json.dumps(key), _dump_node(value, level+1, indent))
+                     for key, value in node.items()]
+        return '{\n'+',\n'.join(item_list)+'\n'+' '*(indent*level)+'}'
+
+    item_list = [item_indent+_dump_node(item, level+1, indent) for item in node]
+    return '[\n'+',\n'.join(item_list)+'\n'+' '*(indent*level)+']'
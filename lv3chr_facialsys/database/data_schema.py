@@ -0,0 +1,524 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: data_schema.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to validate the JSON database files of the facial system against their schema, before a build touches the
+scene.
+
+The schema is described by the JSON spec data/data_schema.json: a schema node has a "type" (dict, list, string, int,
+number, enum, vector3, points or cv_grid) and the constraints of its type, or a "$ref" to one of the "definitions",
+which a dict node may also "extends". A dict node lists its required "keys", the "patterns" of the other keys, the
+schema of the remaining "values", and the named "checks" run on it (see g_check_dict) once its items are valid.
+Each file's schema is compiled once into nested validator closures, so that no schema node is interpreted per value.
+The zone spec, data/control_zone_spec.json, is compiled along with the schema into the key paths of the entries each
+control zone and direction reads, e.g. "mouth_controller/right_up" (see zone_spec.get_data_refs()), all of which a file
+must have, so that a database missing an entry the build reads fails the validation rather than the build.
+
+The coordinates of a point list or a CV grid are type-checked and summed up in one pass over the list (see
+get_coord_error()), and the points are only checked one by one to report the first invalid one.
+The verdict of a file is cached next to its compiled cache, keyed by the content hashes of the file, the schema and the
+zone spec, so that an unchanged database is not validated again. From the command line, e.g. before submitting farm
+builds:
+
+    python data_schema.py --data-dir <character data directory>
+
+whose exit code is 1 if the database is invalid.
+Note that this module does not depend on Maya.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import itertools
+import tempfile
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+# The database package is imported from the facial system's root directory, also when this file is run as a script.
+g_facialsys_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if g_facialsys_dir not in sys.path:
+    sys.path.insert(0, g_facialsys_dir)
+
+from database import data_cache
+from database import zone_spec
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_schema_file_name = 'data_schema.json'
+g_verdict_file_ext = '.verdict'
+g_cv_id_regex = re.compile(r'^\s*[0-9]+\s*,\s*[0-9]+\s*$')
+
+# The JSON database files validated before a build
+g_data_file_name_list = ['control_crv_data.json', 'control_proj_surface_data.json']
+
+try:
+    g_string_types = (str, unicode)
+    g_int_types = (int, long)
+except NameError:
+    g_string_types = (str,)
+    g_int_types = (int,)
+# The exact types of the coordinates, which leave out the booleans
+g_coord_type_set = frozenset(g_int_types+(float,))
+
+# {(schema hash, file name): validator}, the schema hash covering the zone spec, see get_schema_hash()
+g_validator_dict = {}
+# {(JSON file path, content hash, schema hash): a list of the error messages}
+g_verdict_dict = {}
+
+# Validation Functions -------------------------------------------------------------------------------------------------
+def validate_database(data_dir=None, file_name_list=None):
+    """
+    :param data_dir: directory of the JSON database files; the shipped data directory is used if it is None
+    :param file_name_list: a list of the names of the JSON database files; g_data_file_name_list if it is None
+    :return: a list of the error messages of all the files, empty if the database is valid
+    """
+
+    error_list = []
+    for file_name in file_name_list or g_data_file_name_list:
+        error_list.extend(validate_file(file_name, data_dir))
+    return error_list
+
+def validate_file(file_name, data_dir=None):
+    """ Validate a JSON database file, or look its verdict up in the session or in the cache directory.
+
+    :param file_name: name of the JSON database file, e.g. "control_crv_data.json"
+    :param data_dir: directory of the JSON database file; the shipped data directory is used if it is None
+    :return: a list of the error messages, empty if the file is valid
+    """
+
+    if data_dir is None:
+        data_dir = data_cache.get_data_dir()
+    json_path = os.path.normpath(os.path.join(data_dir, file_name))
+
+    # The content hash is read from the manifest of the file's indexed store, without decoding the data.
+    schema_hash = get_schema_hash()
+    data_hash = data_cache.load_store(file_name, data_dir).get_hash()
+
+    verdict_key = (json_path, data_hash, schema_hash)
+    if verdict_key not in g_verdict_dict:
+        verdict_path = get_verdict_path(json_path, data_hash, schema_hash)
+        error_list = read_verdict(verdict_path)
+        if error_list is None:
+            error_list = validate_data(data_cache.load_data(file_name, data_dir), file_name)
+            write_verdict(verdict_path, error_list)
+        g_verdict_dict[verdict_key] = error_list
+
+    return list(g_verdict_dict[verdict_key])
+
+def validate_data(data, file_name):
+    """
+    :param data: the data tree of a JSON database file
+    :param file_name: name of the JSON database file, whose schema to validate against
+    :return: a list of the error messages, empty if the data is valid
+    """
+
+    error_list = []
+    get_validator(file_name)(data, (), error_list)
+    return [file_name+': '+error for error in error_list]
+
+def get_validator(file_name):
+    """
+    :param file_name: name of the JSON database file
+    :return: the compiled validator of the file's schema, a function taking the data, the key path of the data and
+             the list to append the error messages to
+    """
+
+    schema_hash = get_schema_hash()
+    if (schema_hash, file_name) not in g_validator_dict:
+        schema_data = data_cache.load_data(g_schema_file_name)
+        assert file_name in schema_data['files'], 'No schema of "{}" in {}'.format(file_name, g_schema_file_name)
+        schema_validator = compile_schema(schema_data['files'][file_name], schema_data['definitions'], {})
+        data_ref_validator = compile_data_refs(zone_spec.get_data_refs(zone_spec.load_zone_specs()).get(file_name, []))
+
+        def validate_file_data(value, path, error_list):
+            schema_validator(value, path, error_list)
+            data_ref_validator(value, path, error_list)
+
+        g_validator_dict[(schema_hash, file_name)] = validate_file_data
+
+    return g_validator_dict[(schema_hash, file_name)]
+
+def get_schema_hash():
+    """
+    :return: a hex string hash of the contents of the schema and the zone spec, which the validators are compiled from
+    """
+
+    hasher = hashlib.sha1(data_cache.get_data_hash(g_schema_file_name).encode('ascii'))
+    hasher.update(data_cache.get_data_hash(zone_spec.g_zone_spec_file_name).encode('ascii'))
+    return hasher.hexdigest()
+
+def format_error(path, message):
+    return '{}: {}'.format('/'.join([str(key) for key in path]) or '<root>', message)
+
+# Verdict Cache Functions ----------------------------------------------------------------------------------------------
+def get_verdict_path(json_path, data_hash, schema_hash):
+    """
+    :return: the path of the cached verdict of a JSON database file, next to its compiled cache
+    """
+
+    file_stem = os.path.splitext(os.path.basename(json_path))[0]
+    return os.path.join(data_cache.get_cache_dir(json_path),
+                        '{0}.{1}.{2}{3}'.format(file_stem, data_hash, schema_hash[:12], g_verdict_file_ext))
+
+def read_verdict(verdict_path):
+    """
+    :return: the cached list of the error messages, or None if there is no verdict
+    """
+
+    if not os.path.isfile(verdict_path):
+        return None
+
+    try:
+        with open(verdict_path, 'r') as f_verdict:
+            return json.load(f_verdict)
+    except (IOError, ValueError):
+        return None
+
+def write_verdict(verdict_path, error_list):
+    """ Write the verdict of a JSON database file, replacing the stale verdicts of the same file.
+    :return: None
+    """
+
+    verdict_dir = os.path.dirname(verdict_path)
+    try:
+        if not os.path.isdir(verdict_dir):
+            os.makedirs(verdict_dir)
+
+        file_stem = os.path.basename(verdict_path).split('.')[0]
+        for stale_file in os.listdir(verdict_dir):
+            if stale_file.startswith(file_stem+'.') and stale_file.endswith(g_verdict_file_ext):
+                os.remove(os.path.join(verdict_dir, stale_file))
+
+        f_tmp, tmp_path = tempfile.mkstemp(dir=verdict_dir)
+        with os.fdopen(f_tmp, 'w') as f_verdict:
+            json.dump(error_list, f_verdict)
+        data_cache.set_file_mode(tmp_path, verdict_path)
+        try:
+            os.rename(tmp_path, verdict_path)
+        except OSError:
+            # Another process has just written the same verdict.
+            os.remove(tmp_path)
+    except (IOError, OSError):
+        # The build must not fail because of the cache; the data is simply validated again next time.
+        pass
+
+# Schema Compilation Functions -----------------------------------------------------------------------------------------
+def compile_schema(schema, definition_dict, validator_dict):
+    """
+    :param schema: a schema node of the spec
+    :param definition_dict: the "definitions" of the spec
+    :param validator_dict: a dictionary of {definition name: validator} of the definitions compiled so far
+    :return: the validator of the schema node
+    """
+
+    ref_name = schema.get('$ref')
+    if ref_name is not None:
+        if ref_name not in validator_dict:
+            validator_dict[ref_name] = compile_schema(resolve_schema(definition_dict[ref_name], definition_dict),
+                                                      definition_dict, validator_dict)
+        return validator_dict[ref_name]
+
+    schema = resolve_schema(schema, definition_dict)
+    return g_compiler_dict[schema['type']](schema, definition_dict, validator_dict)
+
+def resolve_schema(schema, definition_dict):
+    """
+    :return: the schema node merged with the definition it "extends", if any
+    """
+
+    base_name = schema.get('extends')
+    if base_name is None:
+        return schema
+
+    base_schema = resolve_schema(definition_dict[base_name], definition_dict)
+    merged_schema = dict(base_schema)
+    merged_schema.update(dict((key, value) for key, value in schema.items() if key != 'extends'))
+    for merged_key in ['keys', 'optional']:
+        merged_schema[merged_key] = dict(base_schema.get(merged_key, {}), **schema.get(merged_key, {}))
+    merged_schema['checks'] = base_schema.get('checks', [])+schema.get('checks', [])
+    return merged_schema
+
+def _compile_dict(schema, definition_dict, validator_dict):
+    key_validator_list = [(key, compile_schema(sub_schema, definition_dict, validator_dict))
+                          for key, sub_schema in sorted(schema.get('keys', {}).items())]
+    optional_validator_list = [(key, compile_schema(sub_schema, definition_dict, validator_dict))
+                               for key, sub_schema in sorted(schema.get('optional', {}).items())]
+    pattern_validator_list = [(re.compile(pattern), compile_schema(sub_schema, definition_dict, validator_dict))
+                              for pattern, sub_schema in schema.get('patterns', [])]
+    value_validator = None
+    if 'values' in schema:
+        value_validator = compile_schema(schema['values'], definition_dict, validator_dict)
+    closed = schema.get('closed', False)
+    check_list = [g_check_dict[check_name] for check_name in schema.get('checks', [])]
+
+    known_key_set = set(schema.get('keys', {})).union(schema.get('optional', {}))
+
+    def validate_dict(value, path, error_list):
+        if not isinstance(value, Mapping):
+            error_list.append(format_error(path, 'is not a dictionary'))
+            return
+
+        error_count = len(error_list)
+        for key, validator in key_validator_list:
+            if key in value:
+                validator(value[key], path+(key,), error_list)
+            else:
+                error_list.append(format_error(path, 'misses the "{}" key'.format(key)))
+        for key, validator in optional_validator_list:
+            if key in value:
+                validator(value[key], path+(key,), error_list)
+
+        for key in value:
+            if key in known_key_set:
+                continue
+            for key_regex, validator in pattern_validator_list:
+                if key_regex.search(key):
+                    validator(value[key], path+(key,), error_list)
+                    break
+            else:
+                if value_validator is not None:
+                    value_validator(value[key], path+(key,), error_list)
+                elif closed:
+                    error_list.append(format_error(path+(key,), 'is not an expected key'))
+
+        # The checks may rely on the structure of the dictionary, so they only run on a valid one.
+        if len(error_list) == error_count:
+            for check in check_list:
+                message = check(value)
+                if message:
+                    error_list.append(format_error(path, message))
+
+    return validate_dict
+
+def _compile_list(schema, definition_dict, validator_dict):
+    item_validator = compile_schema(schema['items'], definition_dict, validator_dict)
+    min_length = schema.get('min_length', 0)
+
+    def validate_list(value, path, error_list):
+        if not isinstance(value, list):
+            error_list.append(format_error(path, 'is not a list'))
+            return
+        if len(value) < min_length:
+            error_list.append(format_error(path, 'has less than {} items'.format(min_length)))
+        for item_id, item in enumerate(value):
+            item_validator(item, path+(item_id,), error_list)
+
+    return validate_list
+
+def _compile_string(schema, definition_dict, validator_dict):
+    min_length = schema.get('min_length', 0)
+    string_regex = re.compile(schema['pattern']) if 'pattern' in schema else None
+
+    def validate_string(value, path, error_list):
+        if not isinstance(value, g_string_types):
+            error_list.append(format_error(path, 'is not a string'))
+        elif len(value) < min_length:
+            error_list.append(format_error(path, 'is shorter than {} characters'.format(min_length)))
+        elif string_regex is not None and not string_regex.search(value):
+            error_list.append(format_error(path, '"{}" does not match "{}"'.format(value, string_regex.pattern)))
+
+    return validate_string
+
+def _compile_number(schema, definition_dict, validator_dict):
+    number_types = g_int_types if 'int' == schema['type'] else g_int_types+(float,)
+    min_value = schema.get('min')
+    max_value = schema.get('max')
+
+    def validate_number(value, path, error_list):
+        if not isinstance(value, number_types) or isinstance(value, bool):
+            error_list.append(format_error(path, 'is not a{} {}'.format('n' if 'int' == schema['type'] else '',
+                                                                         schema['type'])))
+        elif not is_finite([value]):
+            error_list.append(format_error(path, 'is not finite'))
+        elif min_value is not None and value < min_value:
+            error_list.append(format_error(path, '{} is less than {}'.format(value, min_value)))
+        elif max_value is not None and value > max_value:
+            error_list.append(format_error(path, '{} is greater than {}'.format(value, max_value)))
+
+    return validate_number
+
+def _compile_enum(schema, definition_dict, validator_dict):
+    value_set = frozenset(schema['values'])
+
+    def validate_enum(value, path, error_list):
+        if value not in value_set:
+            error_list.append(format_error(path, '{} is not one of {}'.format(json.dumps(value),
+                                                                              json.dumps(schema['values']))))
+
+    return validate_enum
+
+def _compile_vector3(schema, definition_dict, validator_dict):
+
+    def validate_vector3(value, path, error_list):
+        if not is_point(value):
+            error_list.append(format_error(path, 'is not a list of 3 finite numbers'))
+
+    return validate_vector3
+
+def _compile_points(schema, definition_dict, validator_dict):
+
+    def validate_points(value, path, error_list):
+        if not isinstance(value, list) or not value:
+            error_list.append(format_error(path, 'is not a non-empty list of points'))
+            return
+
+        error = get_coord_error(value)
+        if error is not None:
+            error_list.append(format_error(path+(error[0],), error[1]))
+
+    return validate_points
+
+def _compile_cv_grid(schema, definition_dict, validator_dict):
+
+    def validate_cv_grid(value, path, error_list):
+        if not isinstance(value, list):
+            error_list.append(format_error(path, 'is not a list of CVs'))
+            return
+
+        for cv_id, cv in enumerate(value):
+            if not isinstance(cv, dict) or 1 != len(cv) or not g_cv_id_regex.search(list(cv.keys())[0]):
+                error_list.append(format_error(path+(cv_id,), 'is not a {"u,v": [x, y, z]} CV'))
+                return
+
+        error = get_coord_error([list(cv.values())[0] for cv in value])
+        if error is not None:
+            error_list.append(format_error(path+(error[0],), 'is not a {"u,v": [x, y, z]} CV'))
+
+    return validate_cv_grid
+
+def compile_data_refs(data_ref_list):
+    """
+    :param data_ref_list: a list of (key path tuple, the control unit and stage reading the entry) of the entries a
+                          file must have, see zone_spec.get_data_refs()
+    :return: the validator of the entries, reporting each missing key once
+    """
+
+    def validate_data_refs(value, path, error_list):
+        missing_key_set = set()
+        for key_path, reader in data_ref_list:
+            node = value
+            for key_id, key in enumerate(key_path):
+                if isinstance(node, Mapping) and key in node:
+                    node = node[key]
+                    continue
+
+                if key_path[:key_id+1] not in missing_key_set:
+                    missing_key_set.add(key_path[:key_id+1])
+                    error_list.append(format_error(path+key_path[:key_id],
+                                                   'misses the "{}" key read by {}'.format(key, reader)))
+                break
+
+    return validate_data_refs
+
+g_compiler_dict = {
+    'dict': _compile_dict,
+    'list': _compile_list,
+    'string': _compile_string,
+    'int': _compile_number,
+    'number': _compile_number,
+    'enum': _compile_enum,
+    'vector3': _compile_vector3,
+    'points': _compile_points,
+    'cv_grid': _compile_cv_grid
+}
+
+# Check Functions ------------------------------------------------------------------------------------------------------
+def is_finite(coords):
+    """
+    :param coords: a list of numbers
+    :return: whether all the numbers are finite, summed up in one pass, as an infinity or a NaN makes the sum one
+    """
+
+    coord_sum = sum(coords)
+    return coord_sum-coord_sum == 0.0
+
+def get_coord_error(point_list):
+    """
+    :param point_list: a list of [x, y, z] points
+    :return: a tuple of (the index of the first invalid point, the error message), or None if all the points are valid
+    """
+
+    if all(isinstance(point, list) and 3 == len(point) for point in point_list):
+        coord_list = list(itertools.chain.from_iterable(point_list))
+        if g_coord_type_set.issuperset(map(type, coord_list)) and is_finite(coord_list):
+            return None
+
+    for point_id, point in enumerate(point_list):
+        if not is_point(point):
+            return point_id, 'is not a list of 3 finite numbers'
+    return None
+
+def is_point(value):
+    return isinstance(value, list) and 3 == len(value) and \
+           all(isinstance(coord, g_int_types+(float,)) and not isinstance(coord, bool) for coord in value) and \
+           is_finite(value)
+
+def check_cv_grid_in_patches(surface_data):
+    """
+    :param surface_data: the data of a surface, which has "degree", "patchesU", "patchesV" and "control_vtx"
+    :return: an error message if a CV of the grid is out of the surface's CV grid, or None
+    """
+
+    cv_grid = surface_data['control_vtx']
+    if not cv_grid:
+        return None
+
+    num_cvs_u = surface_data['patchesU']+surface_data['degree']
+    num_cvs_v = surface_data['patchesV']+surface_data['degree']
+    if len(cv_grid) > num_cvs_u*num_cvs_v:
+        return 'has {} CVs, more than the {}x{} CVs of its patches'.format(len(cv_grid), num_cvs_u, num_cvs_v)
+
+    uv_ids = [int(uv_id) for cv in cv_grid for uv_id in list(cv.keys())[0].split(',')]
+    if min(uv_ids) < 0 or max(uv_ids[0::2]) >= num_cvs_u or max(uv_ids[1::2]) >= num_cvs_v:
+        return 'has CVs out of the {}x{} CVs of its patches'.format(num_cvs_u, num_cvs_v)
+    return None
+
+def check_locators_on_points(curve_data):
+    """
+    :param curve_data: the data of a control curve, which has "points" and "locators"
+    :return: an error message if a locator is pinned beyond the last point of the curve, or None
+    """
+
+    locator_id_list = [locator_data['id'] for locator_data in curve_data['locators']]
+    if locator_id_list and max(locator_id_list) > len(curve_data['points']):
+        return 'has the locator {} beyond its {} points'.format(max(locator_id_list), len(curve_data['points']))
+    return None
+
+# {check name in the spec: function taking the data of a dictionary node and returning an error message or None}
+g_check_dict = {
+    'cv_grid_in_patches': check_cv_grid_in_patches,
+    'locators_on_points': check_locators_on_points
+}
+
+def main(argv=None):
+    """
+    :return: the process exit code
+    """
+
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Validate the JSON database files of the facial system.')
+    arg_parser.add_argument('--data-dir', default=None,
+                            help='directory of the JSON database files; the shipped data directory by default')
+    args = arg_parser.parse_args(argv)
+
+    error_list = validate_database(args.data_dir)
+    if not error_list:
+        sys.stdout.write('The database is valid.\n')
+        return 0
+
+    sys.stdout.write('\n'.join(error_list)+'\n')
+    sys.stdout.write('{} errors.\n'.format(len(error_list)))
+    return 1
+
+if '__main__' == __name__:
+    sys.exit(main())
@@ -0,0 +1,299 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: data_writer.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to write the data of the JSON database files incrementally, e.g. the CV grids, curve points and xforms
+exported from a scene.
+
+A jsonStreamWriter writes a data tree into a file as it goes, in the layout of data_cache.dump_data(): the lists of
+numbers and the {"u,v": [x, y, z]} control vertex dictionaries on one line each, the other containers one item per
+line. The floats are rounded to a fixed number of decimals, and the lists may be given as generators, so that no
+document is ever held as one string.
+
+splice_data() replaces the values at key paths of a JSON database file in place, e.g.
+("eyelid_projection_surface", "right_up", "control_vtx"): the document is only scanned for the spans of those values,
+and the rest of its text is copied over as it is, neither parsed nor re-serialized.
+Note that this module does not depend on Maya.
+"""
+
+import os
+import re
+import json
+import types
+
+from database import data_cache
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_default_float_precision = 8
+g_default_indent = 2
+
+g_whitespace = ' \t\r\n'
+g_special_char_regex = re.compile(r'["\[\]{}]')
+
+# ======================================================================================================================
+class jsonStreamWriter(object):
+    """ A writer of a JSON document, or of a fragment of one, onto a file opened in binary mode.
+    """
+
+    def __init__(self, f_out, float_precision=g_default_float_precision, indent=g_default_indent, level=0):
+        """
+        :param f_out: the file to write to, opened in binary mode
+        :param float_precision: the number of decimals the floats are rounded to; None to write them as they are
+        :param indent: the number of spaces to indent each level with
+        :param level: the indentation level of the first value, e.g. of a value spliced into a document
+        """
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._f_out = f_out
+        self._float_precision = float_precision
+        self._indent = indent
+        self._level = level
+
+        # A list of [closing bracket, the number of items written] of the open containers
+        self._container_stack = []
+        # The number of values written at the top, outside any container
+        self._top_count = 0
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def write_member(self, key, value):
+        """ Write a key and its value into the open dictionary, or as a member fragment at the top.
+        :return: None
+        """
+
+        self._begin_item(key)
+        self._write_node(value)
+
+    def write_item(self, value):
+        """ Write a value into the open list, or as a value at the top.
+        :return: None
+        """
+
+        self._begin_item()
+        self._write_node(value)
+
+    def write_items(self, values, key=None):
+        """ Write a list, one item at a time as they are iterated.
+        :param values: an iterable of the items, e.g. a generator
+        :param key: the key of the list in the open dictionary
+        :return: None
+        """
+
+        self.begin_list(key)
+        for value in values:
+            self.write_item(value)
+        self.end_list()
+
+    def begin_dict(self, key=None):
+        self._begin_item(key)
+        self._open('{', '}')
+
+    def end_dict(self):
+        self._close('}')
+
+    def begin_list(self, key=None):
+        self._begin_item(key)
+        self._open('[', ']')
+
+    def end_list(self):
+        self._close(']')
+
+    def close(self):
+        """ Close the open containers.
+        :return: None
+        """
+
+        while self._container_stack:
+            self._close(self._container_stack[-1][0])
+
+    # Formatting Functions ---------------------------------------------------------------------------------------------
+    def format_inline(self, node):
+        """
+        :return: the JSON text of a node written on one line
+        """
+
+        if isinstance(node, dict):
+            return '{'+', '.join(['{}: {}'.format(json.dumps(key), self.format_inline(value))
+                                  for key, value in node.items()])+'}'
+        if isinstance(node, (list, tuple)):
+            return '['+', '.join([self.format_inline(item) for item in node])+']'
+        if isinstance(node, float) and self._float_precision is not None:
+            return repr(round(node, self._float_precision))
+        return json.dumps(node)
+
+    def _write(self, text):
+        self._f_out.write(text.encode('utf-8'))
+
+    def _write_node(self, node):
+        if isinstance(node, dict):
+            if data_cache.is_inline_node(node):
+                self._write(self.format_inline(node))
+                return
+            self._open('{', '}')
+            for key, value in node.items():
+                self.write_member(key, value)
+            self._close('}')
+
+        elif isinstance(node, (list, tuple)):
+            if data_cache.is_inline_node(list(node)):
+                self._write(self.format_inline(node))
+                return
+            self._open('[', ']')
+            for item in node:
+                self.write_item(item)
+            self._close(']')
+
+        elif isinstance(node, types.GeneratorType):
+            # The items of a generator are written as they come, so the list is never inlined.
+            self._open('[', ']')
+            for item in node:
+                self.write_item(item)
+            self._close(']')
+
+        else:
+            self._write(self.format_inline(node))
+
+    def _begin_item(self, key=None):
+        if self._container_stack:
+            container = self._container_stack[-1]
+            self._write((',\n' if container[1] else '\n')+' '*(self._indent*(self._level+len(self._container_stack))))
+            container[1] += 1
+        elif self._top_count:
+            self._write(',\n'+' '*(self._indent*self._level))
+
+        if not self._container_stack:
+            self._top_count += 1
+        if key is not None:
+            self._write(json.dumps(key)+': ')
+
+    def _open(self, open_bracket, close_bracket):
+        self._write(open_bracket)
+        self._container_stack.append([close_bracket, 0])
+
+    def _close(self, close_bracket):
+        assert self._container_stack and self._container_stack[-1][0] == close_bracket, \
+            'Unbalanced "{}" in the JSON stream'.format(close_bracket)
+
+        item_count = self._container_stack.pop()[1]
+        if item_count:
+            self._write('\n'+' '*(self._indent*(self._level+len(self._container_stack))))
+        self._write(close_bracket)
+
+# Splicing Functions ---------------------------------------------------------------------------------------------------
+def splice_data(value_dict, file_name, data_dir=None, float_precision=g_default_float_precision,
+                indent=g_default_indent):
+    """ Replace the values at key paths of a JSON database file, leaving the rest of the document as it is.
+
+    :param value_dict: a dictionary of {key path: new value}, a key path being a tuple of the dictionary keys leading
+                       to the value, e.g. ("eyelid_projection_surface", "right_up", "control_vtx")
+    :param file_name: name of the JSON database file, e.g. "control_proj_surface_data.json"
+    :param data_dir: directory of the JSON database file; the shipped data directory is used if it is None
+    :param float_precision: the number of decimals the floats of the new values are rounded to
+    :param indent: the number of spaces to indent each level with
+    :return: the path of the written file
+    """
+
+    if data_dir is None:
+        data_dir = data_cache.get_data_dir()
+    json_path = os.path.normpath(os.path.join(data_dir, file_name))
+
+    with open(json_path, 'rb') as f_json:
+        json_text = f_json.read().decode('utf-8')
+
+    span_list = []
+    for key_path, value in value_dict.items():
+        start, end = find_value_span(json_text, key_path)
+        span_list.append((start, end, get_indent_level(json_text, start, indent), value))
+    span_list.sort(key=lambda span: span[0])
+
+    for span_id in range(1, len(span_list)):
+        if span_list[span_id][0] < span_list[span_id-1][1]:
+            raise ValueError('The key paths to splice into "{}" overlap.'.format(json_path))
+
+    def write_spliced(f_json):
+        text_pos = 0
+        for start, end, level, value in span_list:
+            f_json.write(json_text[text_pos:start].encode('utf-8'))
+            jsonStreamWriter(f_json, float_precision, indent, level).write_item(value)
+            text_pos = end
+        f_json.write(json_text[text_pos:].encode('utf-8'))
+
+    return data_cache.write_data_file(json_path, write_spliced)
+
+def find_value_span(json_text, key_path):
+    """
+    :param json_text: the text of a JSON document
+    :param key_path: a tuple of the dictionary keys leading to a value
+    :return: a tuple of the start and end positions of the text of the value
+    """
+
+    text_pos = _skip_whitespace(json_text, 0)
+    for key_id, key in enumerate(key_path):
+        if not json_text.startswith('{', text_pos):
+            raise KeyError('/'.join(key_path[:key_id]) + ' is not a dictionary')
+
+        text_pos = _skip_whitespace(json_text, text_pos+1)
+        while True:
+            if not json_text.startswith('"', text_pos):
+                raise KeyError('/'.join(key_path[:key_id+1]))
+
+            member_key, text_pos = json.decoder.scanstring(json_text, text_pos+1)
+            text_pos = _skip_whitespace(json_text, text_pos)
+            text_pos = _skip_whitespace(json_text, text_pos+1)     # the colon
+            if member_key == key:
+                break
+
+            text_pos = _skip_whitespace(json_text, _skip_value(json_text, text_pos))
+            if json_text.startswith(',', text_pos):
+                text_pos = _skip_whitespace(json_text, text_pos+1)
+
+    return text_pos, _skip_value(json_text, text_pos)
+
+def get_indent_level(json_text, text_pos, indent=g_default_indent):
+    """
+    :return: the indentation level of the line of a position in a JSON document
+    """
+
+    line_start = json_text.rfind('\n', 0, text_pos)+1
+    line_text = json_text[line_start:text_pos]
+    return (len(line_text)-len(line_text.lstrip(' '))) // indent
+
+def _skip_whitespace(json_text, text_pos):
+    while text_pos < len(json_text) and json_text[text_pos] in g_whitespace:
+        text_pos += 1
+    return text_pos
+
+def _skip_value(json_text, text_pos):
+    """
+    :return: the position right after the value starting at a position of a JSON document
+    """
+
+    if json_text.startswith('"', text_pos):
+        return json.decoder.scanstring(json_text, text_pos+1)[1]
+
+    if json_text[text_pos] not in '[{':
+        while text_pos < len(json_text) and json_text[text_pos] not in ',]}'+g_whitespace:
+            text_pos += 1
+        return text_pos
+
+    # Jump from bracket to bracket, skipping over the strings.
+    depth = 0
+    while True:
+        special_char_match = g_special_char_regex.search(json_text, text_pos)
+        if special_char_match is None:
+            raise ValueError('Unterminated JSON value at {}'.format(text_pos))
+
+        text_pos = special_char_match.start()
+        special_char = json_text[text_pos]
+        if '"' == special_char:
+            text_pos = json.decoder.scanstring(json_text, text_pos+1)[1]
+            continue
+
+        depth += 1 if special_char in '[{' else -1
+        text_pos += 1
+        if 0 == depth:
+            return text_pos
@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: fingerprint.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to fingerprint the JSON database of the facial system, so that a rebuild only regenerates what has changed.
+
+The data of each control zone is split into entries, one per zone/direction sub-dictionary of its top-level keys,
+e.g. "eyelid_control_curve/right_up_A" or "nasocheek_projection_surface/right_front_A", and each entry is hashed
+from its canonical JSON text. The entries are grouped into build units: the projection surfaces of a control zone,
+from the projection surface data, and the control zone itself, from the control curve data.
+Note that this module does not depend on Maya.
+"""
+
+import json
+import hashlib
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_ctrl_crv_data_file_name = 'control_crv_data.json'
+g_proj_srf_data_file_name = 'control_proj_surface_data.json'
+
+# {control zone (a controlZoneEnum value): the prefix of its top-level keys in the JSON database files}
+g_zone_data_prefix_dict = {
+    'eyelid': 'eyelid',
+    'eyebrow': 'eyebrow',
+    'mouth': 'mouth',
+    'nasoCheek': 'nasocheek'
+}
+
+g_unit_key_separator = '/'
+
+# ======================================================================================================================
+class buildUnitEnum(object):
+    surfaces = 'surfaces'   # the translation planes and projection surfaces of a control zone
+    zone = 'zone'           # the control curves, controllers and follow controllers of a control zone
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def get_hash(data):
+    """
+    :param data: a JSON serializable data tree
+    :return: the SHA-1 hex digest of the canonical JSON text of the data
+    """
+
+    data_text = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(data_text.encode('utf-8')).hexdigest()
+
+def get_unit_key(unit_type, zone):
+    """
+    :param unit_type: a buildUnitEnum value
+    :param zone: a controlZoneEnum value
+    :return: the key of the build unit, e.g. "surfaces/eyelid"
+    """
+    return unit_type+g_unit_key_separator+zone
+
+def split_unit_key(unit_key):
+    """
+    :return: a tuple of the buildUnitEnum value and the controlZoneEnum value of the build unit
+    """
+    unit_type, zone = unit_key.split(g_unit_key_separator, 1)
+    return unit_type, zone
+
+def get_entry_hashes(data, key_prefix):
+    """ Hash the zone/direction sub-dictionaries of the top-level keys starting with the key prefix.
+    :param data: the data tree of a JSON database file, or its data_cache.dataStore
+    :param key_prefix: the prefix of the top-level keys, e.g. "eyelid"
+    :return: a dictionary of {entry key: hash}, e.g. {"eyelid_control_curve/right_up_A": ...}
+    """
+
+    # An indexed store records the hashes of its entries (see data_cache.dataStore).
+    get_store_entry_hashes = getattr(data, 'get_entry_hashes', None)
+    if get_store_entry_hashes is not None:
+        return get_store_entry_hashes(key_prefix)
+
+    entry_hash_dict = {}
+    for data_key in data:
+        if not data_key.startswith(key_prefix+'_'):
+            continue
+
+        data_value = data[data_key]
+        if isinstance(data_value, dict):
+            for sub_key in data_value:
+                entry_hash_dict[data_key+g_unit_key_separator+sub_key] = get_hash(data_value[sub_key])
+        else:
+            entry_hash_dict[data_key] = get_hash(data_value)
+
+    return entry_hash_dict
+
+def get_fingerprints(ctrl_crv_data, proj_srf_data, zone_list=None):
+    """
+    :param ctrl_crv_data: the data tree of the control curve database file, or its data_cache.dataStore
+    :param proj_srf_data: the data tree of the projection surface database file, or its data_cache.dataStore
+    :param zone_list: a list of the controlZoneEnum values of the control zones; all if it is None
+    :return: a dictionary of {build unit key: {"hash": hash, "entries": {entry key: hash}}}
+    """
+
+    if zone_list is None:
+        zone_list = sorted(g_zone_data_prefix_dict)
+
+    fingerprint_dict = {}
+    for zone in zone_list:
+        key_prefix = g_zone_data_prefix_dict[zone]
+        for unit_type, data in [(buildUnitEnum.surfaces, proj_srf_data), (buildUnitEnum.zone, ctrl_crv_data)]:
+            entry_hash_dict = get_entry_hashes(data, key_prefix)
+            fingerprint_dict[get_unit_key(unit_type, zone)] = {
+                'hash': get_hash(entry_hash_dict),
+                'entries': entry_hash_dict
+            }
+
+    return fingerprint_dict
+
+def diff_fingerprints(old_fingerprint_dict, new_fingerprint_dict):
+    """
+    :param old_fingerprint_dict: the fingerprints recorded on the built rig, see get_fingerprints()
+    :param new_fingerprint_dict: the fingerprints of the current data
+    :return: a dictionary of {build unit key: a sorted list of the added, removed or changed entry keys},
+             of the build units whose fingerprints differ
+    """
+
+    changed_dict = {}
+    for unit_key in set(old_fingerprint_dict) | set(new_fingerprint_dict):
+        old_fingerprint = old_fingerprint_dict.get(unit_key, {'hash': None, 'entries': {}})
+        new_fingerprint = new_fingerprint_dict.get(unit_key, {'hash': None, 'entries': {}})
+        if old_fingerprint['hash'] == new_fingerprint['hash']:
+            continue
+
+        old_entry_dict = old_fingerprint['entries']
+        new_entry_dict = new_fingerprint['entries']
+        changed_dict[unit_key] = sorted([entry_key for entry_key in set(old_entry_dict) | set(new_entry_dict)
+                                         if old_entry_dict.get(entry_key) != new_entry_dict.get(entry_key)])
+
+    return changed_dict
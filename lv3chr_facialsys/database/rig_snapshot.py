@@ -0,0 +1,231 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: rig_snapshot.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module containing the snapshot file of a built facial rig, and the diff of two snapshots.
+
+A snapshot records the final graph of a build: its nodes with their types and parents, the non-default values of
+their attributes, their dynamic attributes and aliases, the geometry of their NURBS shapes, and their connections
+(see general.snapshot_io, which captures a snapshot from the scene and recreates the rig from it). A snapshot is a
+dictionary of lists, so that it is written compactly, one entry per line:
+
+    {"version": 1,
+     "roots": [<name of a root DAG node>, ...],
+     "nodes": [[<name>, <type>, <parent name or null>], ...],          the parents before their children
+     "user_attrs": [[<node>, <attribute>, {<addAttr() flag>: <value>}], ...],
+     "aliases": [[<node>, <alias>, <attribute>], ...],
+     "attrs": [[<plug>, <unitless number or boolean>], ...],
+     "data_attrs": [[<plug>, <setAttr() type or null>, [<value>, ...]], ...],     e.g. the angles, the matrices
+     "locked_attrs": [<plug>, ...],
+     "geometry": [[<shape>, {"type": "nurbsCurve" or "nurbsSurface", ...}], ...],
+     "connections": [[<source plug>, <destination plug>], ...]}
+
+The diff of two snapshots doubles as a regression check of a refactor, e.g. from the command line:
+
+    python rig_snapshot.py before.json after.json --tolerance 1e-5
+
+whose exit code is 1 if the snapshots differ.
+Note that this module does not depend on Maya.
+"""
+
+import os
+import sys
+import json
+
+# The database package is imported from the facial system's root directory, also when this file is run as a script.
+g_facialsys_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if g_facialsys_dir not in sys.path:
+    sys.path.insert(0, g_facialsys_dir)
+
+from database import data_cache
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_snapshot_version = 1
+g_default_tolerance = 1e-6
+
+# The lists of a snapshot, in the order they are written
+g_snapshot_key_list = ['roots', 'nodes', 'user_attrs', 'aliases', 'attrs', 'data_attrs', 'locked_attrs', 'geometry',
+                       'connections']
+
+# ======================================================================================================================
+class snapshotDiffEnum(object):
+    node = 'node'                   # a node added or removed, or its type or parent changed
+    user_attr = 'user_attr'         # a dynamic attribute added, removed or redefined
+    alias = 'alias'                 # an attribute alias
+    attr = 'attr'                   # a unitless numeric or boolean attribute value
+    data_attr = 'data_attr'         # the other attribute values, e.g. an angle or a matrix
+    locked_attr = 'locked_attr'     # an attribute locked or unlocked
+    geometry = 'geometry'           # the geometry of a NURBS shape
+    connection = 'connection'       # the source of a destination plug
+
+# function definitions -------------------------------------------------------------------------------------------------
+def make_snapshot(roots=None):
+    """
+    :param roots: a list of the names of the root DAG nodes of the rig
+    :return: an empty snapshot
+    """
+
+    snapshot = dict((snapshot_key, []) for snapshot_key in g_snapshot_key_list)
+    snapshot['version'] = g_snapshot_version
+    snapshot['roots'] = list(roots or [])
+    return snapshot
+
+def save_snapshot(snapshot, file_path):
+    """ Write a snapshot into a JSON file, one list entry per line.
+    :param snapshot: the snapshot dictionary
+    :param file_path: path of the JSON file
+    :return: the path of the written file
+    """
+
+    line_list = ['{{"version": {}'.format(snapshot['version'])]
+    for snapshot_key in g_snapshot_key_list:
+        entry_list = snapshot.get(snapshot_key, [])
+        if not entry_list:
+            line_list.append(',\n"{}": []'.format(snapshot_key))
+            continue
+        entry_text = ',\n'.join([json.dumps(entry, separators=(',', ':'), sort_keys=True) for entry in entry_list])
+        line_list.append(',\n"{}": [\n{}\n]'.format(snapshot_key, entry_text))
+    line_list.append('}\n')
+
+    # Written through a temporary file, so that a concurrent import never reads a half-written snapshot.
+    file_path = os.path.abspath(file_path)
+    snapshot_dir = os.path.dirname(file_path)
+    if not os.path.isdir(snapshot_dir):
+        os.makedirs(snapshot_dir)
+
+    return data_cache.write_data_file(file_path,
+                                      lambda f_snapshot: f_snapshot.write(''.join(line_list).encode('utf-8')))
+
+def load_snapshot(file_path, use_cache=True):
+    """ Load a snapshot, through the compiled cache of the JSON file like the JSON database files (see data_cache).
+    :param file_path: path of the JSON file
+    :param use_cache: if False, parse the JSON file directly
+    :return: the snapshot dictionary
+    """
+
+    file_path = os.path.abspath(file_path)
+    snapshot = data_cache.load_data(os.path.basename(file_path), os.path.dirname(file_path), use_cache)
+
+    assert g_snapshot_version == snapshot.get('version'), \
+        'Unsupported snapshot version {} of {}'.format(snapshot.get('version'), file_path)
+    return snapshot
+
+# Diff Functions -------------------------------------------------------------------------------------------------------
+def get_snapshot_dicts(snapshot):
+    """
+    :return: a dictionary of {snapshotDiffEnum value: {key: value}} of the entries of a snapshot,
+             keyed by the node names, the plugs, or "<node>.<attribute or alias>"
+    """
+
+    return {
+        snapshotDiffEnum.node: dict((name, [node_type, parent]) for name, node_type, parent in snapshot['nodes']),
+        snapshotDiffEnum.user_attr: dict((node+'.'+attr, attr_flags)
+                                         for node, attr, attr_flags in snapshot['user_attrs']),
+        snapshotDiffEnum.alias: dict((node+'.'+alias, attr) for node, alias, attr in snapshot['aliases']),
+        snapshotDiffEnum.attr: dict((plug, value) for plug, value in snapshot['attrs']),
+        snapshotDiffEnum.data_attr: dict((plug, [data_type, values])
+                                         for plug, data_type, values in snapshot['data_attrs']),
+        snapshotDiffEnum.locked_attr: dict((plug, True) for plug in snapshot['locked_attrs']),
+        snapshotDiffEnum.geometry: dict((shape, geometry) for shape, geometry in snapshot['geometry']),
+        snapshotDiffEnum.connection: dict((dst_plug, src_plug) for src_plug, dst_plug in snapshot['connections'])
+    }
+
+def diff_snapshots(snapshot_a, snapshot_b, tolerance=g_default_tolerance):
+    """ Compare two snapshots. The entries of the nodes added or removed are not reported on their own.
+    :param snapshot_a: the snapshot to compare from, e.g. of the build before a refactor
+    :param snapshot_b: the snapshot to compare to
+    :param tolerance: the absolute difference beyond which two numbers differ
+    :return: a sorted list of (snapshotDiffEnum value, key, value in snapshot A, value in snapshot B),
+             the value being None if the entry is missing from the snapshot
+    """
+
+    dict_a = get_snapshot_dicts(snapshot_a)
+    dict_b = get_snapshot_dicts(snapshot_b)
+
+    node_a_set = set(dict_a[snapshotDiffEnum.node])
+    node_b_set = set(dict_b[snapshotDiffEnum.node])
+    changed_node_set = node_a_set.symmetric_difference(node_b_set)
+
+    diff_list = []
+    for diff_type in sorted(dict_a):
+        entry_a_dict = dict_a[diff_type]
+        entry_b_dict = dict_b[diff_type]
+
+        for key in set(entry_a_dict).union(entry_b_dict):
+            if snapshotDiffEnum.node != diff_type and key.split('.', 1)[0] in changed_node_set:
+                continue
+            value_a = entry_a_dict.get(key)
+            value_b = entry_b_dict.get(key)
+            if not is_close(value_a, value_b, tolerance):
+                diff_list.append((diff_type, key, value_a, value_b))
+
+    diff_list.sort(key=lambda diff: (diff[0], diff[1]))
+    return diff_list
+
+def is_close(value_a, value_b, tolerance=g_default_tolerance):
+    """
+    :return: whether two JSON values are equal, the numbers in them within the tolerance
+    """
+
+    if isinstance(value_a, bool) or isinstance(value_b, bool):
+        return value_a == value_b
+    if isinstance(value_a, (int, float)) and isinstance(value_b, (int, float)):
+        return abs(value_a-value_b) <= tolerance
+    if isinstance(value_a, (list, tuple)) and isinstance(value_b, (list, tuple)):
+        return len(value_a) == len(value_b) and \
+               all(is_close(item_a, item_b, tolerance) for item_a, item_b in zip(value_a, value_b))
+    if isinstance(value_a, dict) and isinstance(value_b, dict):
+        return set(value_a) == set(value_b) and \
+               all(is_close(value_a[key], value_b[key], tolerance) for key in value_a)
+    return value_a == value_b
+
+def format_diff(diff_list, max_value_length=80):
+    """
+    :param diff_list: a list of the differences, see diff_snapshots()
+    :param max_value_length: the length beyond which the values are cut
+    :return: a string of a table of the differences
+    """
+
+    def format_value(value):
+        if value is None:
+            return '-'
+        value_text = json.dumps(value, sort_keys=True)
+        if len(value_text) > max_value_length:
+            value_text = value_text[:max_value_length-3]+'...'
+        return value_text
+
+    line_list = ['{:<12}{:<60}  {}'.format('type', 'key', 'snapshot A -> snapshot B')]
+    for diff_type, key, value_a, value_b in diff_list:
+        line_list.append('{:<12}{:<60}  {} -> {}'.format(diff_type, key, format_value(value_a), format_value(value_b)))
+    return '\n'.join(line_list)
+
+def main(argv=None):
+    """
+    :return: the process exit code
+    """
+
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Compare two snapshots of the facial rig.')
+    arg_parser.add_argument('snapshot_a', help='path of the snapshot to compare from')
+    arg_parser.add_argument('snapshot_b', help='path of the snapshot to compare to')
+    arg_parser.add_argument('--tolerance', type=float, default=g_default_tolerance,
+                            help='the absolute difference beyond which two numbers differ')
+    args = arg_parser.parse_args(argv)
+
+    diff_list = diff_snapshots(load_snapshot(args.snapshot_a), load_snapshot(args.snapshot_b), args.tolerance)
+    if not diff_list:
+        sys.stdout.write('The snapshots are identical.\n')
+        return 0
+
+    sys.stdout.write(format_diff(diff_list)+'\n')
+    sys.stdout.write('{} differences.\n'.format(len(diff_list)))
+    return 1
+
+if '__main__' == __name__:
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: zone_spec.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to read the zone spec of the facial system, data/control_zone_spec.json, without building it.
+
+A control unit of the spec formats the templates of the stage entries with its variables and iterates their "for_each"
+variables as control.control_zone.controlZone does, so that the data entries the stages read from the JSON database
+files are known before a build (see get_data_refs(), which database.data_schema checks the database against).
+
+Note that this module does not depend on Maya.
+"""
+
+import itertools
+
+from database import data_cache
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_zone_spec_file_name = 'control_zone_spec.json'
+
+g_ctrl_crv_data_file_name = 'control_crv_data.json'
+g_proj_srf_data_file_name = 'control_proj_surface_data.json'
+
+# {stage of the zone spec: name of the JSON database file its entries read their "data" from}
+g_stage_data_file_dict = {
+    'surfaces': g_proj_srf_data_file_name,
+    'curves': g_ctrl_crv_data_file_name,
+    'ctrlcrv_bs': g_ctrl_crv_data_file_name,
+    'follow_controller': g_ctrl_crv_data_file_name,
+    'controllers': g_ctrl_crv_data_file_name
+}
+
+# ======================================================================================================================
+class unitSpec(object):
+    """ A control unit of the zone spec, i.e. a direction of a facial zone.
+    """
+
+    def __init__(self, zone_spec, unit_spec):
+        """
+        :param zone_spec: the spec of the facial zone this control unit belongs to
+        :param unit_spec: the spec of this control unit in the zone spec's "units"
+        """
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._zone = zone_spec['zone']
+        self._direction = unit_spec['direction']
+        self._unit_spec = unit_spec
+        self._ctrl_crv_id_list = list(unit_spec['curve_ids'])
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __repr__(self):
+        return NotImplemented
+
+    def get_zone(self):
+        return self._zone
+
+    def get_direction(self):
+        return self._direction
+
+    def get_key(self):
+        """
+        :return: the key of this control unit, e.g. "eyelid_right_up"
+        """
+        return self._zone+'_'+self._direction
+
+    def get_ctrl_crv_ids(self):
+        return list(self._ctrl_crv_id_list)
+
+    def get_vars(self, **kwargs):
+        """
+        :return: a dictionary of the variables of this control unit to format the zone spec's templates with,
+                 updated by the keyword arguments
+        """
+
+        var_dict = {
+            'zone': self._zone,
+            'direction': self._direction
+        }
+        var_dict.update(self._unit_spec.get('vars', {}))
+        var_dict.update(kwargs)
+        if 'crv' in var_dict:
+            var_dict['crv_lc'] = var_dict['crv'].lower()
+        return var_dict
+
+    def iterate(self, stage_spec):
+        """ Iterate the variables of a stage entry of the zone spec, see controlZone.
+        :param stage_spec: a stage entry of the zone spec
+        :return: a generator of the variable dictionaries
+        """
+
+        if self._direction not in stage_spec.get('directions', [self._direction]):
+            return
+
+        var_name_list = []
+        value_lists = []
+        for var_name, value_list in stage_spec.get('for_each', {}).items():
+            if 'crv' == var_name:
+                value_list = [crv_id for crv_id in self._ctrl_crv_id_list if value_list is None or crv_id in value_list]
+            var_name_list.append(var_name)
+            value_lists.append(value_list)
+
+        for value_combination in itertools.product(*value_lists):
+            var_dict = self.get_vars(**stage_spec.get('vars', {}))
+            for var_name, value in zip(var_name_list, value_combination):
+                if isinstance(value, dict):
+                    var_dict.update(value)
+                else:
+                    var_dict[var_name] = value
+            if 'crv' in var_dict:
+                var_dict['crv_lc'] = var_dict['crv'].lower()
+            yield var_dict
+
+    def format(self, template, var_dict):
+        return template.format(**var_dict)
+
+# function definitions -------------------------------------------------------------------------------------------------
+def load_zone_specs(data_dir=None):
+    """
+    :param data_dir: directory of the zone spec file; the shipped data directory is used if it is None
+    :return: a list of the zone specs, in the build order
+    """
+    return data_cache.load_data(g_zone_spec_file_name, data_dir)['zones']
+
+def get_data_refs(zone_spec_list):
+    """ List the data entries the stages of the zone spec read from the JSON database files, for every control unit:
+    the surfaces with their locator scales and bind joints, the control curves, the blend-shape targets, the follow
+    controllers and their follow attributes, and the controllers with their shapes, along with the name prefixes.
+
+    :param zone_spec_list: the "zones" of the zone spec
+    :return: a dictionary of {JSON database file name: a list of (key path tuple, the control unit and stage reading
+             the entry, e.g. "eyelid_right_up/curves")}, without duplicated key paths
+    """
+
+    data_ref_dict = dict((file_name, []) for file_name in set(g_stage_data_file_dict.values()))
+    key_path_set = set()
+
+    def add_ref(stage, key_path, unit):
+        file_name = g_stage_data_file_dict[stage]
+        if (file_name, key_path) not in key_path_set:
+            key_path_set.add((file_name, key_path))
+            data_ref_dict[file_name].append((key_path, unit.get_key()+'/'+stage))
+
+    for zone_spec in zone_spec_list:
+        for unit in [unitSpec(zone_spec, unit_spec) for unit_spec in zone_spec['units']]:
+
+            for srf_spec in zone_spec.get('surfaces', []):
+                srf_key_list = ['name_prefix']
+                if 'projsrf' == srf_spec['kind']:
+                    srf_key_list.extend(['locator_scale', 'bind_joint'])
+                for var_dict in unit.iterate(srf_spec):
+                    for srf_key in srf_key_list:
+                        add_ref('surfaces', (srf_spec['data'], srf_key), unit)
+                    add_ref('surfaces', (srf_spec['data'], unit.format(srf_spec['entry'], var_dict)), unit)
+
+            curve_spec = zone_spec['curves']
+            add_ref('curves', (curve_spec['name_prefix'],), unit)
+            for crv_id in unit.get_ctrl_crv_ids():
+                add_ref('curves', (curve_spec['data'], unit.format(curve_spec['key'], unit.get_vars(crv=crv_id))),
+                        unit)
+
+            for target_spec in zone_spec.get('ctrlcrv_bs', []):
+                add_ref('ctrlcrv_bs', (target_spec['name_prefix'],), unit)
+                for var_dict in unit.iterate(target_spec):
+                    add_ref('ctrlcrv_bs', (target_spec['data'], unit.format(target_spec['key'], var_dict)), unit)
+
+            follow_spec = zone_spec['follow_controller']
+            add_ref('follow_controller', (follow_spec['data'], unit.format(follow_spec['key'], unit.get_vars())), unit)
+            for follow_attr in get_follow_attrs(zone_spec, unit):
+                add_ref('follow_controller', (follow_spec['data'], 'follow_data', follow_attr), unit)
+
+            for controller_spec in zone_spec.get('controllers', []):
+                add_ref('controllers', (controller_spec['name_prefix'],), unit)
+                for var_dict in unit.iterate(controller_spec):
+                    add_ref('controllers', (controller_spec['data'], unit.format(controller_spec['key'], var_dict)),
+                            unit)
+                    add_ref('controllers',
+                            (controller_spec['data'], unit.format(controller_spec['points_key'], var_dict)), unit)
+
+    return data_ref_dict
+
+def get_follow_attrs(zone_spec, unit):
+    """
+    :param zone_spec: the spec of a facial zone
+    :param unit: the unitSpec of a control unit of the zone
+    :return: a list of the follow attributes of the follow controller referred to by the follow blend and the follows
+             of the control unit, i.e. by their "follow:<attribute>" references
+    """
+
+    ref_list = []
+    follow_blend_spec = zone_spec.get('follow_blend')
+    if follow_blend_spec is not None:
+        for follower_spec in follow_blend_spec['followers']:
+            ref_list.extend([unit.format(follower_spec['weight'], var_dict)
+                             for var_dict in unit.iterate(follower_spec)])
+
+    for follow_spec in zone_spec.get('follows', []):
+        for var_dict in unit.iterate(follow_spec):
+            # The weights are given either as values or as the plugs to connect them from.
+            ref_list.extend([unit.format(weight, var_dict) for weight in follow_spec.get('weights', [])
+                             if weight is not None and not isinstance(weight, (int, float))])
+
+    follow_attr_list = []
+    for ref in ref_list:
+        kind, _, follow_attr = ref.partition(':')
+        if 'follow' == kind and follow_attr not in follow_attr_list:
+            follow_attr_list.append(follow_attr)
+    return follow_attr_list
@@ -1 +1,2 @@
-import lv3chr_facialsys_demo; reload(lv3chr_facialsys_demo)
\ No newline at end of file
+import lv3chr_facialsys_demo
+import lv3chr_facialsys_rebuild
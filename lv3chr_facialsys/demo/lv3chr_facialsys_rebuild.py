@@ -0,0 +1,258 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: lv3chr_facialsys_rebuild.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to incrementally rebuild LCA third level characters' facial system, regenerating only the parts whose data
+changed since the last build (demo).
+
+The facial system is built in build units: for each control zone, its translation planes and projection surfaces
+("surfaces/<zone>"), and the control zone itself ("zone/<zone>"). A build records the fingerprints of the JSON database
+(see database.fingerprint) and the nodes created by each build unit on a metadata node. A rebuild compares the
+fingerprints of the current data with the recorded ones, deletes the nodes of the changed build units, and re-creates
+them, which rewires them to the build units kept in the scene.
+
+The directions of a control zone share its corner and follow controllers, so a control zone is rebuilt as a whole,
+while the changed data entries are reported per zone/direction, e.g. "eyelid_control_curve/right_up_A".
+A control zone is rebuilt along with its changed surfaces, and the control zones depending on it (see
+G_CONTROL_ZONE_DEPENDENCY_DICT) along with it. Since the control zones are built from the Python wrappers of their
+surfaces, the surfaces are rebuilt as well if they were not created in this Maya session.
+"""
+
+import sys
+import json
+
+import maya.cmds as cmds
+
+from general import util
+
+from general import config
+from general.config import *
+
+from general import hierarchy
+
+from general import scene_builder
+from general.scene_builder import sceneBuilder
+
+from database import data_cache
+
+from database import fingerprint
+from database.fingerprint import buildUnitEnum
+
+# The demo module keeps the Python wrappers of the surfaces created in this session.
+from demo import lv3chr_facialsys_demo
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_build_info_node = 'lc_facialsys_buildInfo'
+g_build_info_attr = 'buildInfo'
+g_build_info_version = 1
+
+# function definitions -------------------------------------------------------------------------------------------------
+
+def lc3chr_facialsys_rebuild(data_dir=None, force_zone_list=None):
+    """ Build the facial system into the current scene, or rebuild the build units of the facial system in the scene
+    whose data changed since its last build.
+
+    :param data_dir: directory of the character's JSON database files; the shipped data directory is used if it is None
+    :param force_zone_list: a list of the controlZoneEnum values of the control zones to rebuild,
+                            whether their data changed or not
+    :return: a list of the keys of the rebuilt build units, in the build order
+    """
+
+    lv3chr_facialsys_demo.validate_database(data_dir)
+
+    # The indexed stores record the fingerprint hashes of their entries, so no data is decoded to compare them.
+    ctrl_crv_data = data_cache.load_store(fingerprint.g_ctrl_crv_data_file_name, data_dir)
+    proj_srf_data = data_cache.load_store(fingerprint.g_proj_srf_data_file_name, data_dir)
+    fingerprint_dict = fingerprint.get_fingerprints(ctrl_crv_data, proj_srf_data, get_zone_list())
+
+    build_info = read_build_info()
+    if build_info is None:
+        if cmds.objExists(hierarchy.eyelid_grp.get_group_name()):
+            cmds.error('The facial system in the scene has no build information to rebuild it incrementally; '
+                       'build it in a new scene with lc3chr_facialsys_rebuild().')
+
+        changed_dict = dict((unit_key, sorted(fingerprint_dict[unit_key]['entries']))
+                            for unit_key in fingerprint_dict)
+        unit_node_dict = {}
+    else:
+        changed_dict = fingerprint.diff_fingerprints(build_info['fingerprints'], fingerprint_dict)
+        unit_node_dict = build_info['unit_nodes']
+
+    for zone in force_zone_list or []:
+        changed_dict.setdefault(fingerprint.get_unit_key(buildUnitEnum.zone, zone), [])
+
+    rebuild_unit_list = get_rebuild_units(changed_dict)
+    if not rebuild_unit_list:
+        cmds.warning('The facial system is up to date.')
+        return []
+
+    for unit_key in rebuild_unit_list:
+        entry_list = changed_dict.get(unit_key)
+        cmds.warning('Rebuilding "{}": {}'.format(unit_key,
+                                                  ', '.join(entry_list) if entry_list else 'required by its dependencies'))
+
+    cmds.undoInfo(openChunk=True, chunkName='lc3chr_facialsys_rebuild')
+    try:
+        if not cmds.objExists(hierarchy.eyelid_grp.get_group_name()):
+            lv3chr_facialsys_demo.setup_group_hierarchy()
+        lv3chr_facialsys_demo.setup_proj_surface_shader()
+
+        # Tear the build units down in the reverse build order, so that no node is left following a deleted one.
+        for unit_key in reversed(rebuild_unit_list):
+            teardown_unit(unit_node_dict.pop(unit_key, []))
+
+        for unit_key in rebuild_unit_list:
+            unit_node_dict[unit_key] = build_unit(unit_key, data_dir)
+
+        write_build_info(fingerprint_dict, unit_node_dict)
+    except:
+        exc_info = sys.exc_info()
+        cmds.undoInfo(closeChunk=True)
+        cmds.undo()
+        cmds.warning('The facial system rebuild failed and has been undone.')
+        util.reraise(exc_info)
+    cmds.undoInfo(closeChunk=True)
+
+    lv3chr_facialsys_demo.setup_display_layers()
+    cmds.select(deselect=True)
+
+    return rebuild_unit_list
+
+def get_zone_list():
+    """
+    :return: a list of the controlZoneEnum values of all control zones, in the build order
+    """
+    return [getattr(controlZoneEnum, zone_attr) for zone_attr in G_CONTROLZONE_LIST]
+
+def get_rebuild_units(changed_dict):
+    """
+    :param changed_dict: a dictionary of {build unit key: a list of the changed entry keys},
+                         see fingerprint.diff_fingerprints()
+    :return: a list of the keys of the build units to rebuild, in the build order
+    """
+
+    srf_zone_set = set()
+    ctrl_zone_set = set()
+    for unit_key in changed_dict:
+        unit_type, zone = fingerprint.split_unit_key(unit_key)
+        if buildUnitEnum.surfaces == unit_type:
+            srf_zone_set.add(zone)
+        ctrl_zone_set.add(zone)
+
+    # Rebuild the control zones depending on the rebuilt ones.
+    dependency_added = True
+    while dependency_added:
+        dependency_added = False
+        for zone, dependency_list in G_CONTROL_ZONE_DEPENDENCY_DICT.items():
+            if zone not in ctrl_zone_set and ctrl_zone_set.intersection(dependency_list):
+                ctrl_zone_set.add(zone)
+                dependency_added = True
+
+    for zone in ctrl_zone_set:
+        if not has_session_surfaces(zone):
+            srf_zone_set.add(zone)
+
+    zone_list = get_zone_list()
+    rebuild_unit_list = [fingerprint.get_unit_key(buildUnitEnum.surfaces, zone)
+                         for zone in zone_list if zone in srf_zone_set]
+    rebuild_unit_list.extend([fingerprint.get_unit_key(buildUnitEnum.zone, zone)
+                              for zone in zone_list if zone in ctrl_zone_set])
+    return rebuild_unit_list
+
+def has_session_surfaces(zone):
+    """
+    :param zone: a controlZoneEnum value
+    :return: whether the surfaces of the control zone were created in this session and are still in the scene
+    """
+
+    crv_projsrf_dict = lv3chr_facialsys_demo.g_crv_projsrf_dict
+    crv_projsrf_key_list = [crv_projsrf_key for crv_projsrf_key in crv_projsrf_dict
+                            if zone == lv3chr_facialsys_demo.get_crv_projsrf_zone(crv_projsrf_key)]
+    if not crv_projsrf_key_list:
+        return False
+
+    for crv_projsrf_key in crv_projsrf_key_list:
+        crv_projsrf_value = crv_projsrf_dict[crv_projsrf_key]
+        crv_projsrf_list = crv_projsrf_value if crv_projsrf_key.endswith('_list') else [crv_projsrf_value]
+        for crv_projsrf in crv_projsrf_list:
+            if not cmds.objExists(crv_projsrf.get_name()):
+                return False
+
+    return True
+
+def build_unit(unit_key, data_dir=None):
+    """
+    :param unit_key: the key of the build unit, see fingerprint.get_unit_key()
+    :param data_dir: directory of the JSON database files; the shipped data directory is used if it is None
+    :return: a sorted list of the names of the nodes created by the build unit
+    """
+
+    unit_type, zone = fingerprint.split_unit_key(unit_key)
+    existing_node_set = set(cmds.ls())
+
+    if buildUnitEnum.surfaces == unit_type:
+        lv3chr_facialsys_demo.setup_proj_surfaces(data_dir, zone_list=[zone])
+    else:
+        zone_scene_builder = sceneBuilder()
+        try:
+            lv3chr_facialsys_demo.setup_ctrl_zones(zone_scene_builder, data_dir, zone_list=[zone])
+            zone_scene_builder.commit()
+        except:
+            exc_info = sys.exc_info()
+            zone_scene_builder.rollback()
+            util.reraise(exc_info)
+
+    return sorted(set(cmds.ls())-existing_node_set)
+
+def teardown_unit(node_list):
+    """ Delete the nodes of a build unit, those still in the scene.
+    :param node_list: a list of the names of the nodes created by the build unit
+    :return: None
+    """
+
+    existing_node_list = [node for node in node_list if cmds.objExists(node)]
+    if existing_node_list:
+        cmds.delete(existing_node_list)
+
+# Build Information Functions ------------------------------------------------------------------------------------------
+def read_build_info():
+    """
+    :return: the build information dictionary recorded on the metadata node, or None if there is not
+    """
+
+    build_info_plug = g_build_info_node+'.'+g_build_info_attr
+    if not cmds.objExists(build_info_plug):
+        return None
+
+    build_info_text = cmds.getAttr(build_info_plug)
+    if not build_info_text:
+        return None
+
+    build_info = json.loads(build_info_text)
+    if g_build_info_version != build_info.get('version'):
+        return None
+    return build_info
+
+def write_build_info(fingerprint_dict, unit_node_dict):
+    """ Record the build information on the metadata node, creating the node if there is not.
+    :param fingerprint_dict: the fingerprints of the built data, see fingerprint.get_fingerprints()
+    :param unit_node_dict: a dictionary of {build unit key: a list of the names of the nodes created by it}
+    :return: None
+    """
+
+    if not cmds.objExists(g_build_info_node):
+        cmds.createNode('network', name=g_build_info_node)
+    if not cmds.objExists(g_build_info_node+'.'+g_build_info_attr):
+        cmds.addAttr(g_build_info_node, longName=g_build_info_attr, dataType='string')
+
+    build_info = {
+        'version': g_build_info_version,
+        'fingerprints': fingerprint_dict,
+        'unit_nodes': unit_node_dict
+    }
+    cmds.setAttr(g_build_info_node+'.'+g_build_info_attr, json.dumps(build_info, sort_keys=True), type='string')
@@ -1,3 +1,3 @@
-import util; reload(util)
-import config; reload(config)
-import hierarchy; reload(hierarchy)
\ No newline at end of file
+import util
+import config
+import hierarchy
\ No newline at end of file
@@ -0,0 +1,382 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: batch_build.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to build the facial systems of many characters in parallel, each in its own headless mayapy worker process.
+
+The runner reads a manifest of the characters' data directories, and keeps a pool of worker processes busy. Each worker
+builds one character into a new scene, saves the scene, and writes a report with the timings and the error, if any.
+With the recording stand-in of maya.cmds (see recording_cmds), the workers run on the plain Python interpreter, so that
+the scheduling and reporting can be tested without Maya.
+Note that this module does not import Maya, except in the worker processes.
+
+A manifest is a JSON file like:
+    {
+        "output_dir": "rig_scenes",
+        "characters": [
+            "characters/chrA/data",
+            {"name": "chrB", "data_dir": "characters/chrB/data", "scene_path": "rig_scenes/chrB_face.ma"}
+        ]
+    }
+where the relative paths are relative to the manifest file, and a character given as a path is named after its parent
+directory if the path ends with "data". Run it from the command line like:
+    python batch_build.py manifest.json --workers 8 --mayapy "C:/Program Files/Autodesk/Maya2022/bin/mayapy.exe"
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import importlib
+import traceback
+import subprocess
+from multiprocessing.pool import ThreadPool
+
+# global variables -----------------------------------------------------------------------------------------------------
+# The dotted path of the function building a facial system, which takes the data_dir and interactive keyword arguments.
+g_default_build_func = 'demo.lv3chr_facialsys_demo.lc3chr_facialsys_construct'
+g_default_scene_ext = '.mb'
+g_scene_type_dict = {
+    '.mb': 'mayaBinary',
+    '.ma': 'mayaAscii'
+}
+
+# The seconds between the polls of a running worker process
+g_worker_poll_interval = 0.1
+# The number of trailing lines of a worker's log kept in its report, when the worker dies without a report
+g_log_tail_line_count = 20
+
+# ======================================================================================================================
+class batchJobStatusEnum(object):
+    succeeded = 'succeeded'
+    failed = 'failed'           # the build raised an error, which the report records
+    crashed = 'crashed'         # the worker process died without a report
+    timed_out = 'timed_out'     # the worker process was killed after the timeout
+
+# Manifest Functions ---------------------------------------------------------------------------------------------------
+def load_manifest(manifest_path):
+    """
+    :param manifest_path: path of the manifest JSON file
+    :return: a list of job dictionaries of {"name", "data_dir", "scene_path", "build_func"}
+    """
+
+    with open(manifest_path, 'r') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    def get_path(path):
+        return os.path.normpath(os.path.join(manifest_dir, os.path.expanduser(path)))
+
+    output_dir = get_path(manifest.get('output_dir', 'rig_scenes'))
+    build_func = manifest.get('build_func', g_default_build_func)
+
+    job_list = []
+    for character in manifest['characters']:
+        if not isinstance(character, dict):
+            character = {'data_dir': character}
+
+        data_dir = get_path(character['data_dir'])
+        name = character.get('name')
+        if not name:
+            name = os.path.basename(data_dir)
+            if 'data' == name.lower():
+                name = os.path.basename(os.path.dirname(data_dir))
+
+        scene_path = character.get('scene_path')
+        if scene_path:
+            scene_path = get_path(scene_path)
+        else:
+            scene_path = os.path.join(output_dir, name+'_facialsys'+g_default_scene_ext)
+
+        job_list.append({
+            'name': name,
+            'data_dir': data_dir,
+            'scene_path': scene_path,
+            'build_func': character.get('build_func', build_func)
+        })
+
+    job_name_list = [job['name'] for job in job_list]
+    duplicate_name_list = sorted(set(name for name in job_name_list if job_name_list.count(name) > 1))
+    if duplicate_name_list:
+        raise ValueError('Duplicate character names in the manifest: {}'.format(', '.join(duplicate_name_list)))
+
+    return job_list
+
+# Runner Functions -----------------------------------------------------------------------------------------------------
+def run_batch(job_list, worker_count=None, mayapy=None, use_stand_in=False, timeout=None, report_path=None,
+              profile=False):
+    """ Build the facial systems of the jobs in parallel worker processes.
+
+    :param job_list: a list of job dictionaries, see load_manifest()
+    :param worker_count: the number of worker processes running at once; the CPU count is used if it is None
+    :param mayapy: path of the mayapy executable; "mayapy" on the PATH is used if it is None
+    :param use_stand_in: if True, the workers run on this Python interpreter with the recording stand-in of maya.cmds
+    :param timeout: the seconds after which a worker is killed; None means no timeout
+    :param report_path: if given, the batch report is written to this JSON file
+    :param profile: if True, each worker profiles its build and writes the profile reports next to its scene
+                    (see general.profiler)
+    :return: a list of the job reports, in the order of the jobs
+    """
+
+    if worker_count is None:
+        import multiprocessing
+        worker_count = multiprocessing.cpu_count()
+    worker_count = max(1, min(worker_count, len(job_list)))
+
+    interpreter = sys.executable if use_stand_in else (mayapy or 'mayapy')
+
+    start_time = time.time()
+    # The workers are separate processes; the threads of the pool only launch and wait for them.
+    pool = ThreadPool(worker_count)
+    try:
+        job_report_list = pool.map(lambda job: run_job(job, interpreter, use_stand_in, timeout, profile),
+                                   job_list, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    total_time = time.time() - start_time
+
+    if report_path:
+        status_count_dict = {}
+        for job_report in job_report_list:
+            status_count_dict[job_report['status']] = status_count_dict.get(job_report['status'], 0)+1
+
+        batch_report = {
+            'worker_count': worker_count,
+            'interpreter': interpreter,
+            'stand_in': use_stand_in,
+            'total_time': total_time,
+            'status_counts': status_count_dict,
+            'jobs': job_report_list
+        }
+        with open(report_path, 'w') as report_file:
+            json.dump(batch_report, report_file, indent=4, sort_keys=True)
+
+    return job_report_list
+
+def run_job(job, interpreter, use_stand_in=False, timeout=None, profile=False):
+    """ Build the facial system of a job in a new worker process, and wait for it.
+
+    :param job: a job dictionary, see load_manifest()
+    :param interpreter: path of the Python interpreter to run the worker, i.e. mayapy or the stand-in's interpreter
+    :return: the job report dictionary
+    """
+
+    scene_dir = os.path.dirname(job['scene_path'])
+    if scene_dir and not os.path.isdir(scene_dir):
+        try:
+            os.makedirs(scene_dir)
+        except OSError:
+            pass    # made by another worker in the meantime
+
+    work_dir = tempfile.mkdtemp(prefix='lc_facialsys_'+job['name']+'_')
+    job_path = os.path.join(work_dir, 'job.json')
+    report_path = os.path.join(work_dir, 'report.json')
+    log_path = os.path.splitext(job['scene_path'])[0]+'.log'
+
+    worker_job = dict(job)
+    worker_job['stand_in'] = use_stand_in
+    worker_job['profile'] = profile
+    with open(job_path, 'w') as job_file:
+        json.dump(worker_job, job_file)
+
+    # The workers import the facial system's packages from this package's root directory.
+    env = dict(os.environ)
+    facialsys_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([facialsys_dir] + [path for path in [env.get('PYTHONPATH')] if path])
+
+    worker_script = os.path.splitext(os.path.abspath(__file__))[0]+'.py'
+    cmd = [interpreter, worker_script, '--worker', job_path, report_path]
+
+    start_time = time.time()
+    status = None
+    try:
+        with open(log_path, 'w') as log_file:
+            try:
+                worker_proc = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+            except OSError as err:
+                return _get_job_report(job, batchJobStatusEnum.crashed, time.time()-start_time, log_path,
+                                       error='Failed to start the worker "{}": {}'.format(interpreter, err))
+
+            while worker_proc.poll() is None:
+                if timeout is not None and time.time()-start_time > timeout:
+                    worker_proc.kill()
+                    worker_proc.wait()
+                    status = batchJobStatusEnum.timed_out
+                    break
+                time.sleep(g_worker_poll_interval)
+
+        wall_time = time.time() - start_time
+        if status == batchJobStatusEnum.timed_out:
+            return _get_job_report(job, status, wall_time, log_path,
+                                   error='The worker was killed after {} seconds.'.format(timeout))
+
+        if not os.path.isfile(report_path):
+            return _get_job_report(job, batchJobStatusEnum.crashed, wall_time, log_path,
+                                   error='The worker exited with code {} without a report.'.format(
+                                       worker_proc.returncode))
+
+        with open(report_path, 'r') as report_file:
+            job_report = json.load(report_file)
+        job_report['wall_time'] = wall_time
+        job_report['log_path'] = log_path
+        return job_report
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def _get_job_report(job, status, wall_time, log_path, error=None):
+    """
+    :return: a job report made by the runner, for the workers which could not report by themselves
+    """
+
+    log_tail = ''
+    if os.path.isfile(log_path):
+        with open(log_path, 'r') as log_file:
+            log_tail = ''.join(log_file.readlines()[-g_log_tail_line_count:])
+
+    return {
+        'name': job['name'],
+        'data_dir': job['data_dir'],
+        'scene_path': None,
+        'status': status,
+        'error': error,
+        'traceback': log_tail,
+        'timings': {},
+        'wall_time': wall_time,
+        'log_path': log_path
+    }
+
+# Worker Functions -----------------------------------------------------------------------------------------------------
+def run_worker(job_path, report_path):
+    """ The entry point of a worker process: build the facial system of a job into a new scene and save the scene.
+
+    :param job_path: path of the job JSON file written by run_job()
+    :param report_path: path of the report JSON file to write
+    :return: the process exit code
+    """
+
+    with open(job_path, 'r') as job_file:
+        job = json.load(job_file)
+
+    job_report = {
+        'name': job['name'],
+        'data_dir': job['data_dir'],
+        'scene_path': None,
+        'status': batchJobStatusEnum.failed,
+        'error': None,
+        'traceback': None,
+        'timings': {}
+    }
+    timings = job_report['timings']
+
+    maya_standalone = None
+    start_time = time.time()
+    try:
+        if job['stand_in']:
+            # The general package imports maya.cmds on import, so the stand-in is imported from this directory and
+            # installed before anything else of the facial system.
+            import recording_cmds
+            cmds = recording_cmds.install()
+        else:
+            import maya.standalone as maya_standalone
+            maya_standalone.initialize(name='python')
+            import maya.cmds as cmds
+        timings['startup'] = time.time() - start_time
+
+        step_time = time.time()
+        cmds.file(new=True, force=True)
+
+        module_name, func_name = job['build_func'].rsplit('.', 1)
+        build_func = getattr(importlib.import_module(module_name), func_name)
+        if job.get('profile'):
+            from general import profiler
+            profiler.enable(cmds)
+            try:
+                with profiler.scope(job['name']):
+                    build_func(data_dir=job['data_dir'], interactive=False)
+            finally:
+                profiler.disable()
+                job_report['profile_paths'] = profiler.write_reports(
+                    os.path.splitext(job['scene_path'])[0]+'.profile')
+        else:
+            build_func(data_dir=job['data_dir'], interactive=False)
+        timings['build'] = time.time() - step_time
+
+        step_time = time.time()
+        scene_ext = os.path.splitext(job['scene_path'])[1].lower()
+        cmds.file(rename=job['scene_path'])
+        cmds.file(save=True, force=True, type=g_scene_type_dict.get(scene_ext, g_scene_type_dict[g_default_scene_ext]))
+        timings['save'] = time.time() - step_time
+
+        job_report['scene_path'] = job['scene_path']
+        job_report['status'] = batchJobStatusEnum.succeeded
+
+        if job['stand_in']:
+            job_report['command_counts'] = cmds.get_call_counts()
+    except Exception as err:
+        job_report['error'] = '{}: {}'.format(type(err).__name__, err)
+        job_report['traceback'] = traceback.format_exc()
+    timings['total'] = time.time() - start_time
+
+    with open(report_path, 'w') as report_file:
+        json.dump(job_report, report_file, indent=4, sort_keys=True)
+
+    if maya_standalone is not None:
+        try:
+            maya_standalone.uninitialize()
+        except AttributeError:
+            pass    # Maya versions before 2016 have no uninitialize()
+
+    return 0 if batchJobStatusEnum.succeeded == job_report['status'] else 1
+
+def main(argv=None):
+    """ The command line entry point, see the module's documentation.
+    :return: the process exit code
+    """
+
+    import argparse
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv and '--worker' == argv[0]:
+        return run_worker(argv[1], argv[2])
+
+    arg_parser = argparse.ArgumentParser(description='Build the facial systems of the characters in a manifest.')
+    arg_parser.add_argument('manifest', help='path of the manifest JSON file')
+    arg_parser.add_argument('--workers', type=int, default=None, help='the number of worker processes')
+    arg_parser.add_argument('--mayapy', default=None, help='path of the mayapy executable')
+    arg_parser.add_argument('--stand-in', action='store_true', dest='stand_in',
+                            help='run the workers with the recording stand-in of maya.cmds instead of Maya')
+    arg_parser.add_argument('--timeout', type=float, default=None, help='the seconds to allow for each build')
+    arg_parser.add_argument('--report', default=None, help='path of the batch report JSON file to write')
+    arg_parser.add_argument('--profile', action='store_true',
+                            help='profile the builds, writing the profile reports next to the scenes')
+    args = arg_parser.parse_args(argv)
+
+    job_report_list = run_batch(load_manifest(args.manifest),
+                                worker_count=args.workers,
+                                mayapy=args.mayapy,
+                                use_stand_in=args.stand_in,
+                                timeout=args.timeout,
+                                report_path=args.report,
+                                profile=args.profile)
+
+    for job_report in job_report_list:
+        sys.stdout.write('{:<24}{:<12}{:>10.1f}s  {}\n'.format(job_report['name'],
+                                                              job_report['status'],
+                                                              job_report['wall_time'],
+                                                              job_report['error'] or job_report['scene_path']))
+
+    return 0 if all(batchJobStatusEnum.succeeded == job_report['status'] for job_report in job_report_list) else 1
+
+if '__main__' == __name__:
+    sys.exit(main())
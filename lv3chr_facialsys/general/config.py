@@ -12,7 +12,7 @@ A module containing global definitions for the LCA third level character facial
 
 # from enum import Enum, unique # WARNING: enum wasn't added to Python until 3.4
 
-from general import util; reload(util)
+from general import util
 
 # control zones partitioned in directions ------------------------------------------------------------------------------
 # @unique
@@ -162,6 +162,12 @@ G_CONTROL_ZONE_DIRECTION_DICT = {
                                ]
 }
 
+# {control zone: a list of the control zones it depends on}, which must be built before it,
+# e.g. the nasolabial-cheek control zone follows the mouth corner controllers.
+G_CONTROL_ZONE_DEPENDENCY_DICT = {
+    controlZoneEnum.nasocheek: [controlZoneEnum.mouth]
+}
+
 # facial control display settings --------------------------------------------------------------------------------------
 PROJ_SRF_SET = 'proj_plane_set'
 PROJ_SRF_SHADER = 'proj_srf_shader'
@@ -216,4 +222,35 @@ CONTROLLER_LD_COLOR = COLOR_INDEX_LIGHT_RED
 BIND_JOINT_LRUD_COLOR_INDEX = COLOR_INDEX_GRAY
 BIND_JOINT_FB_COLOR_INDEX = COLOR_INDEX_LIGHT_GRAY
 
-G_BIND_JOINT_FB_SCALE_GAIN = 0.6
\ No newline at end of file
+G_BIND_JOINT_FB_SCALE_GAIN = 0.6
+
+# facial system build settings -----------------------------------------------------------------------------------------
+class buildModeEnum(object):
+    """ The ways to construct the NURBS surfaces of the translation planes and projection surfaces.
+    """
+    cmds = 'cmds'   # cmds.nurbsPlane, then set the CVs, transformation and mirroring one command after another
+    api = 'api'     # MFnNurbsSurface.create, with the CVs, transformation and mirroring baked in a single call
+
+G_NURBS_SURFACE_BUILD_MODE = buildModeEnum.api
+
+class projectionModeEnum(object):
+    """ The ways to project the locators on the control curves onto the translation planes.
+    The plug-in node modes are timed against the "closestPointOnSurface" nodes by the benchmark suites in mayapy, see
+    benchmark.eval_suite; keep the native nodes as the default unless those results show the gain.
+    """
+    closest_point_node = 'closestPointOnSurface'    # one "closestPointOnSurface" node per locator
+    lookup_node = 'lcClosestPointLookup'            # one baked "lcClosestPointLookup" node per translation plane
+    curve_node = 'lcCrvProjectToSurface'            # one "lcCrvProjectToSurface" node per control curve and
+                                                    # projection surface, without the "pointOnSurfaceInfo" nodes
+
+G_PROJECTION_MODE = projectionModeEnum.closest_point_node
+
+class followModeEnum(object):
+    """ The ways to compute the follow behaviours of the control zones, i.e. the "follows" and "follow_blend" stages of
+    the zone spec.
+    """
+    utility_nodes = 'utility'   # "plusMinusAverage" and "multiplyDivide" nodes per follower,
+                                # and one "blendShape" node per follower control curve
+    plugin_nodes = 'plugin'     # one "lcFacialFollow" and one "lcCrvFollowBlend" node per control unit
+
+G_FOLLOW_MODE = followModeEnum.utility_nodes
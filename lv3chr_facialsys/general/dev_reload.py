@@ -0,0 +1,275 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: dev_reload.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to hot-reload the facial system's modules while developing it in a Maya session.
+
+The modules of the facial system import each other plainly, so that an import in an artist session is cached.
+In dev mode, reload_modules() reloads the loaded modules whose source files changed since they were loaded, and the
+modules importing them, in the dependency order: a module is reloaded after the modules it imports, so that it binds
+the reloaded ones. Dev mode is off by default; it is turned on by set_dev_mode(True) or the environment variable
+LC_FACIALSYS_DEV=1, e.g. in a developer's userSetup.py:
+
+    from general import dev_reload
+    dev_reload.set_dev_mode(True)
+
+and before running the edited code:
+
+    dev_reload.reload_modules()
+
+The changes are detected by the source file modification times recorded when the modules are imported: in dev mode,
+an import tracker on sys.meta_path records the modification time of each facial system module's source file as it is
+imported, e.g. the modules imported lazily by the tools. The modules imported before dev mode is turned on are tracked
+from when it is turned on; use reload_modules(force=True) to reload all the modules.
+Note that this module does not import Maya.
+"""
+
+import os
+import sys
+import ast
+
+try:
+    from importlib import reload as reload_module
+except ImportError:
+    reload_module = reload
+
+try:
+    from importlib.machinery import PathFinder
+except ImportError:
+    import imp
+    PathFinder = None
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_dev_mode_env_var = 'LC_FACIALSYS_DEV'
+g_dev_mode = os.environ.get(g_dev_mode_env_var, '') not in ['', '0']
+
+# The root directory of the facial system's modules
+g_facialsys_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# {module name: the modification time of its source file when it was loaded}
+g_mtime_dict = {}
+
+# ======================================================================================================================
+class importTracker(object):
+    """ A finder on sys.meta_path recording the source file modification time of each facial system module as it is
+    imported. It finds no module itself, so that the import goes on with the next finders.
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        # Python 3
+        spec = PathFinder.find_spec(fullname, path)
+        if spec is not None and spec.origin:
+            record_mtime(fullname, spec.origin)
+        return None
+
+    def find_module(self, fullname, path=None):
+        # Python 2
+        try:
+            module_file, module_path, _ = imp.find_module(fullname.rpartition('.')[2], path)
+        except ImportError:
+            return None
+
+        if module_file:
+            module_file.close()
+        if os.path.isdir(module_path):
+            module_path = os.path.join(module_path, '__init__.py')
+        record_mtime(fullname, module_path)
+        return None
+
+# function definitions -------------------------------------------------------------------------------------------------
+def set_dev_mode(enabled=True):
+    """ Turn dev mode on or off; the loaded modules are tracked from when it is turned on, and the modules imported
+    from then on as they are imported.
+    :return: None
+    """
+
+    global g_dev_mode
+    g_dev_mode = enabled
+    if enabled:
+        install_import_tracker()
+        track_modules()
+
+def install_import_tracker():
+    """ Insert the import tracker at the front of sys.meta_path, if it is not there yet.
+    :return: None
+    """
+
+    # The tracker of an earlier load of this module is an instance of an earlier importTracker class.
+    if not any(type(finder).__name__ == importTracker.__name__ for finder in sys.meta_path):
+        sys.meta_path.insert(0, importTracker())
+
+def record_mtime(module_name, module_path):
+    """ Record the modification time of a module's source file, if it is a module of the facial system.
+    :param module_name: the full name of the module
+    :param module_path: the path of the module's source or compiled file
+    :return: None
+    """
+
+    if module_path.endswith('.pyc') or module_path.endswith('.pyo'):
+        module_path = module_path[:-1]
+    if os.path.abspath(module_path).startswith(g_facialsys_dir+os.sep) and os.path.isfile(module_path):
+        g_mtime_dict[module_name] = os.path.getmtime(module_path)
+
+def is_dev_mode():
+    return g_dev_mode
+
+def track_modules():
+    """ Record the source file modification times of the loaded modules not tracked yet.
+    :return: None
+    """
+
+    for module_name, module in get_facialsys_modules().items():
+        if module_name not in g_mtime_dict:
+            g_mtime_dict[module_name] = get_source_mtime(module)
+
+def reload_modules(force=False):
+    """ Reload the changed modules of the facial system and the modules importing them, in dev mode.
+    :param force: whether to reload all the loaded modules of the facial system, whether they changed or not
+    :return: a list of the names of the reloaded modules, in the reload order
+    """
+
+    if not g_dev_mode:
+        sys.stderr.write('[dev_reload] Dev mode is off; no module is reloaded.\n')
+        return []
+
+    track_modules()
+    module_dict = get_facialsys_modules()
+    dependency_dict = dict((module_name, get_module_dependencies(module, module_dict))
+                           for module_name, module in module_dict.items())
+
+    if force:
+        reload_set = set(module_dict)
+    else:
+        reload_set = set([module_name for module_name, module in module_dict.items()
+                          if get_source_mtime(module) != g_mtime_dict.get(module_name)])
+
+    # Reload the modules importing the reloaded ones as well, so that they bind the reloaded modules.
+    dependent_added = True
+    while dependent_added:
+        dependent_added = False
+        for module_name, dependency_set in dependency_dict.items():
+            if module_name not in reload_set and reload_set.intersection(dependency_set):
+                reload_set.add(module_name)
+                dependent_added = True
+
+    reload_list = get_dependency_order(reload_set, dependency_dict)
+    for module_name in reload_list:
+        module = sys.modules[module_name]
+        g_mtime_dict[module_name] = get_source_mtime(module)
+        reload_module(module)
+
+    return reload_list
+
+if g_dev_mode:
+    install_import_tracker()
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def get_facialsys_modules():
+    """
+    :return: a dictionary of {module name: module} of the loaded modules under the facial system's root directory,
+             except this one
+    """
+
+    module_dict = {}
+    for module_name, module in list(sys.modules.items()):
+        if module is None or module_name == __name__:
+            continue
+
+        module_path = get_source_path(module)
+        if module_path and os.path.abspath(module_path).startswith(g_facialsys_dir+os.sep):
+            module_dict[module_name] = module
+
+    return module_dict
+
+def get_source_path(module):
+    """
+    :return: the path of the module's source file, or None if the module has no file
+    """
+
+    module_path = getattr(module, '__file__', None)
+    if not module_path:
+        return None
+    if module_path.endswith('.pyc') or module_path.endswith('.pyo'):
+        module_path = module_path[:-1]
+    return module_path
+
+def get_source_mtime(module):
+    """
+    :return: the modification time of the module's source file, or None if it does not exist
+    """
+
+    module_path = get_source_path(module)
+    if not module_path or not os.path.isfile(module_path):
+        return None
+    return os.path.getmtime(module_path)
+
+def get_module_dependencies(module, module_dict):
+    """ Find the facial system's modules imported by a module, from the import statements of its source code.
+    :param module: a loaded module
+    :param module_dict: the loaded modules of the facial system, see get_facialsys_modules()
+    :return: a set of the names of the loaded modules of the facial system imported by the module
+    """
+
+    module_path = get_source_path(module)
+    try:
+        with open(module_path) as module_file:
+            module_tree = ast.parse(module_file.read(), module_path)
+    except (IOError, OSError, SyntaxError):
+        return set()
+
+    # The package of the module, which the relative and the implicit relative imports are resolved against
+    package_name = module.__name__ if hasattr(module, '__path__') else module.__name__.rpartition('.')[0]
+
+    dependency_set = set()
+    for node in ast.walk(module_tree):
+        name_list = []
+        if isinstance(node, ast.Import):
+            name_list = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base_name = node.module or ''
+            if node.level:
+                base_package = package_name.rsplit('.', node.level-1)[0] if node.level > 1 else package_name
+                base_name = '.'.join([name for name in [base_package, base_name] if name])
+            # "from package import module" depends on the module only, not on the package's __init__.
+            for alias in node.names:
+                if base_name+'.'+alias.name in module_dict:
+                    name_list.append(base_name+'.'+alias.name)
+                elif base_name not in name_list:
+                    name_list.append(base_name)
+
+        for name in name_list:
+            for candidate in [package_name+'.'+name if package_name else None, name]:
+                if candidate in module_dict and candidate != module.__name__:
+                    dependency_set.add(candidate)
+                    break
+
+    return dependency_set
+
+def get_dependency_order(module_name_set, dependency_dict):
+    """ Sort the modules so that each comes after the modules it imports; an import cycle is broken by module name.
+    :param module_name_set: a set of the names of the modules to sort
+    :param dependency_dict: a dictionary of {module name: a set of the names of the modules it imports}
+    :return: a list of the module names
+    """
+
+    ordered_list = []
+    visited_set = set()
+
+    def visit(module_name):
+        if module_name in visited_set:
+            return
+        visited_set.add(module_name)
+        for dependency_name in sorted(dependency_dict.get(module_name, [])):
+            if dependency_name in module_name_set:
+                visit(dependency_name)
+        ordered_list.append(module_name)
+
+    for module_name in sorted(module_name_set):
+        visit(module_name)
+
+    return ordered_list
@@ -8,504 +8,196 @@
 
 """
 A module containing group hierarchy information for the LCA third level character facial system
+
+The group hierarchy is described by the JSON spec data/group_hierarchy.json, one tree per control zone. Each group of
+the spec has a key, which names the module global holding its groupTree (e.g. hierarchy.eyelid_ctrlzone_RU_grp), the
+name of the group in the scene, and the kind, direction and row it is looked up by (see get_group()); the control zone
+is given on the zone sub-master groups and inherited by their descendants. The directions are composed of the
+controlZoneDirEnum values like the control zone directions, e.g. "right_up" or "middle_up_dn".
 """
 
-import maya.cmds as cmds
+import collections
+
+from database import data_cache
+
+from general.scene_builder import sceneBuilder
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_hierarchy_data_file_name = 'group_hierarchy.json'
+
+# {group key: groupTree}
+g_group_dict = {}
+# {(control zone, kind, direction, row): groupTree}
+g_group_lookup_dict = {}
+# The zone sub-master groups, in the build order
+g_zone_group_list = []
 
-class groupTree:
+# ======================================================================================================================
+class groupKindEnum(object):
+    zone = 'zone'                   # the zone sub-master group
+    ctrlzone = 'ctrlzone'           # the translation planes of a direction
+    ctrl = 'ctrl'                   # the controllers of a direction
+    ctrlzone_loc = 'ctrlzone_loc'   # the locators on a control curve
+    ctrlcrv_bs = 'ctrlcrv_bs'       # the blend shape targets of the control curves
+    projsrf = 'projsrf'             # the projection surfaces of a direction
+    projsrf_loc = 'projsrf_loc'     # the locators on a projection surface
 
-    def __init__(self, group_name='', child_nodes=[]):
+# ======================================================================================================================
+class groupTree(object):
+
+    def __init__(self, group_name='', child_nodes=None, key=None):
         """
-        :param group_node:string -- the name of the group
+        :param group_name: string -- the name of the group
+        :param child_nodes: a list of the child groupTrees
+        :param key: the key of the group in the spec
         """
-        self._child_nodes = child_nodes
+        self._child_nodes = list(child_nodes) if child_nodes else []
         self._group_name = group_name
+        self._key = key
+
+    def get_key(self):
+        return self._key
 
     def get_group_name(self):
         return self._group_name
 
     def get_child_nodes(self):
-        return self._child_nodes.copy()
-
-    def setup_group_hierarchy(self):
-        cmds.group(name=self._group_name, empty=True)
-
-        for child_node in self._child_nodes:
-            # assert type(child_node) is groupTree
+        return list(self._child_nodes)
 
-            # Recursively construct all child node's hierarchy
-            child_node.setup_group_hierarchy()
-
-            cmds.parent(child_node.get_group_name(), self._group_name)
+    def setup_group_hierarchy(self, scene_builder=None):
+        """ Create the group and its descendants, each directly under its parent.
+        :param scene_builder: the scene builder to queue the creations on;
+                              if it is None, they are committed at once through a new scene builder
+        :return: None
+        """
 
-# Eyelid Rig Group Hierarchy ===========================================================================================
+        commit = scene_builder is None
+        if commit:
+            scene_builder = sceneBuilder()
+
+        # Create the groups parents first, so that each is created under its final parent.
+        group_stack = [(self, None)]
+        while group_stack:
+            group, parent_name = group_stack.pop()
+            scene_builder.create_node('transform', group.get_group_name(), parent=parent_name)
+            group_stack.extend([(child_node, group.get_group_name()) for child_node in reversed(group._child_nodes)])
+
+        if commit:
+            scene_builder.commit()
+
+# Spec Loading Functions -----------------------------------------------------------------------------------------------
+def load_hierarchy(data_dir=None):
+    """ Build the groupTrees from the spec, and bind each to the module global of its key.
+    :param data_dir: directory of the spec file; the shipped data directory is used if it is None
+    :return: None
+    """
+
+    hierarchy_data = data_cache.load_data(g_hierarchy_data_file_name, data_dir)
+
+    for group in g_group_dict.values():
+        globals().pop(group.get_key(), None)
+    g_group_dict.clear()
+    g_group_lookup_dict.clear()
+    del g_zone_group_list[:]
+
+    for group_data in hierarchy_data['groups']:
+        g_zone_group_list.append(load_group(group_data, group_data['zone']))
+
+def load_group(group_data, zone):
+    """
+    :param group_data: the spec of a group and its descendants
+    :param zone: the controlZoneEnum value of the control zone of the group
+    :return: the groupTree of the group
+    """
+
+    group = groupTree(group_data['name'],
+                      [load_group(child_data, zone) for child_data in group_data.get('children', [])],
+                      group_data['key'])
+
+    g_group_dict[group.get_key()] = group
+    g_group_lookup_dict[(zone, group_data['kind'], group_data.get('direction'), group_data.get('row'))] = group
+    globals()[group.get_key()] = group
+
+    return group
+
+# Lookup Functions -----------------------------------------------------------------------------------------------------
+def get_group(zone, kind, direction=None, row=None):
+    """
+    :param zone: a controlZoneEnum value, e.g. "eyelid"
+    :param kind: a groupKindEnum value
+    :param direction: the direction of the group, e.g. "right_up", "middle_up_dn"; None for the zone groups
+    :param row: the row letter of the locator groups, e.g. "A"
+    :return: the groupTree, or None if there is not
+    """
+    return g_group_lookup_dict.get((zone, kind, direction, row))
+
+def get_group_name(zone, kind, direction=None, row=None):
+    """
+    :return: the name of the group, see get_group()
+    """
+
+    group = g_group_lookup_dict.get((zone, kind, direction, row))
+    if group is None:
+        raise KeyError('no "{}" group of the control zone "{}" in the group hierarchy, direction: {}, row: {}'.format(
+            kind, zone, direction, row))
+    return group.get_group_name()
+
+def parent_to_row_groups(parent_func, zone, kind, direction, row_node_list):
+    """ Parent the nodes to the groups of their rows, all the nodes bound for a group in one call.
+    The nodes of the rows without a group are left where they are.
+
+    :param parent_func: cmds.parent, or the parent() of a scene builder
+    :param zone: a controlZoneEnum value
+    :param kind: a groupKindEnum value, e.g. groupKindEnum.projsrf_loc
+    :param direction: the direction of the groups
+    :param row_node_list: a list of (row letter, node name)
+    :return: None
+    """
+
+    row_nodes_dict = collections.OrderedDict()
+    for row, node in row_node_list:
+        row_nodes_dict.setdefault(row, []).append(node)
+
+    for row, node_list in row_nodes_dict.items():
+        group = get_group(zone, kind, direction, row)
+        if group is not None:
+            parent_func(node_list, group.get_group_name())
+
+def get_group_by_key(key):
+    """
+    :param key: the key of the group in the spec, e.g. "eyelid_ctrlzone_RU_grp"
+    :return: the groupTree, or None if there is not
+    """
+    return g_group_dict.get(key)
+
+def setup_group_hierarchy(scene_builder=None):
+    """ Create the group hierarchies of all the control zones.
+    :param scene_builder: the scene builder to queue the creations on;
+                          if it is None, they are committed at once through a new scene builder
+    :return: None
+    """
+
+    commit = scene_builder is None
+    if commit:
+        scene_builder = sceneBuilder()
+
+    for zone_group in g_zone_group_list:
+        zone_group.setup_group_hierarchy(scene_builder)
+
+    if commit:
+        scene_builder.commit()
+
+# Name Prefixes ========================================================================================================
 eyelid_ctrlzone_prefix = 'fm_eyelidProject'
 eyelid_projsrf_prefix = 'fm_eyelidMask'
 
-# translation plane ----------------------------------------------------------------------------------------------------
-eyelid_ctrl_RU_grp = groupTree(eyelid_ctrlzone_prefix+'_RU_ctrl_grp')
-eyelid_ctrlzone_loc_RU_A_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RU_A_grp')
-eyelid_ctrlzone_loc_RU_B_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RU_B_grp')
-eyelid_ctrlzone_loc_RU_C_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RU_C_grp')
-eyelid_ctrlzone_loc_RU_D_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RU_D_grp')
-eyelid_ctrlzone_loc_RU_E_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RU_E_grp')
-eyelid_ctrlzone_loc_RU_F_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RU_F_grp')
-
-eyelid_ctrlzone_RU_grp = groupTree(eyelid_ctrlzone_prefix+'_RU_grp',
-                                   [
-                                       eyelid_ctrl_RU_grp,
-                                       eyelid_ctrlzone_loc_RU_A_grp,
-                                       eyelid_ctrlzone_loc_RU_B_grp,
-                                       eyelid_ctrlzone_loc_RU_C_grp,
-                                       eyelid_ctrlzone_loc_RU_D_grp,
-                                       eyelid_ctrlzone_loc_RU_E_grp,
-                                       eyelid_ctrlzone_loc_RU_F_grp
-                                   ])
-
-eyelid_ctrl_RD_grp = groupTree(eyelid_ctrlzone_prefix+'_RD_ctrl_grp')
-eyelid_ctrlzone_loc_RD_A_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RD_A_grp')
-eyelid_ctrlzone_loc_RD_B_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RD_B_grp')
-eyelid_ctrlzone_loc_RD_C_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RD_C_grp')
-eyelid_ctrlzone_loc_RD_D_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RD_D_grp')
-eyelid_ctrlzone_loc_RD_E_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RD_E_grp')
-eyelid_ctrlzone_loc_RD_F_grp = groupTree(eyelid_ctrlzone_prefix+'Point_RD_F_grp')
-
-eyelid_ctrlzone_RD_grp = groupTree(eyelid_ctrlzone_prefix+'_RD_grp',
-                                   [
-                                       eyelid_ctrl_RD_grp,
-                                       eyelid_ctrlzone_loc_RD_A_grp,
-                                       eyelid_ctrlzone_loc_RD_B_grp,
-                                       eyelid_ctrlzone_loc_RD_C_grp,
-                                       eyelid_ctrlzone_loc_RD_D_grp,
-                                       eyelid_ctrlzone_loc_RD_E_grp,
-                                       eyelid_ctrlzone_loc_RD_F_grp
-                                   ])
-
-eyelid_ctrlcrv_bs_R_grp = groupTree(eyelid_ctrlzone_prefix+'_R_bs_grp')
-
-eyelid_ctrlzone_R_grp = groupTree(eyelid_ctrlzone_prefix+'_R_grp',
-                                  [
-                                      eyelid_ctrlzone_RU_grp,
-                                      eyelid_ctrlzone_RD_grp,
-                                      eyelid_ctrlcrv_bs_R_grp
-                                  ])
-
-eyelid_ctrl_LU_grp = groupTree(eyelid_ctrlzone_prefix+'_LU_ctrl_grp')
-eyelid_ctrlzone_loc_LU_A_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LU_A_grp')
-eyelid_ctrlzone_loc_LU_B_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LU_B_grp')
-eyelid_ctrlzone_loc_LU_C_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LU_C_grp')
-eyelid_ctrlzone_loc_LU_D_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LU_D_grp')
-eyelid_ctrlzone_loc_LU_E_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LU_E_grp')
-eyelid_ctrlzone_loc_LU_F_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LU_F_grp')
-
-
-eyelid_ctrlzone_LU_grp = groupTree(eyelid_ctrlzone_prefix+'_LU_grp',
-                                   [
-                                       eyelid_ctrl_LU_grp,
-                                       eyelid_ctrlzone_loc_LU_A_grp,
-                                       eyelid_ctrlzone_loc_LU_B_grp,
-                                       eyelid_ctrlzone_loc_LU_C_grp,
-                                       eyelid_ctrlzone_loc_LU_D_grp,
-                                       eyelid_ctrlzone_loc_LU_E_grp,
-                                       eyelid_ctrlzone_loc_LU_F_grp
-                                   ])
-
-eyelid_ctrl_LD_grp = groupTree(eyelid_ctrlzone_prefix+'_LD_ctrl_grp')
-eyelid_ctrlzone_loc_LD_A_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LD_A_grp')
-eyelid_ctrlzone_loc_LD_B_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LD_B_grp')
-eyelid_ctrlzone_loc_LD_C_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LD_C_grp')
-eyelid_ctrlzone_loc_LD_D_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LD_D_grp')
-eyelid_ctrlzone_loc_LD_E_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LD_E_grp')
-eyelid_ctrlzone_loc_LD_F_grp = groupTree(eyelid_ctrlzone_prefix+'Point_LD_F_grp')
-
-eyelid_ctrlzone_LD_grp = groupTree(eyelid_ctrlzone_prefix+'_LD_grp',
-                                   [
-                                       eyelid_ctrl_LD_grp,
-                                       eyelid_ctrlzone_loc_LD_A_grp,
-                                       eyelid_ctrlzone_loc_LD_B_grp,
-                                       eyelid_ctrlzone_loc_LD_C_grp,
-                                       eyelid_ctrlzone_loc_LD_D_grp,
-                                       eyelid_ctrlzone_loc_LD_E_grp,
-                                       eyelid_ctrlzone_loc_LD_F_grp
-                                   ])
-
-eyelid_ctrlcrv_bs_L_grp = groupTree(eyelid_ctrlzone_prefix+'_LU_bs_grp')
-
-eyelid_ctrlzone_L_grp = groupTree(eyelid_ctrlzone_prefix+'_L_grp',
-                                  [
-                                      eyelid_ctrlzone_LU_grp,
-                                      eyelid_ctrlzone_LD_grp,
-                                      eyelid_ctrlcrv_bs_L_grp
-                                  ])
-
-# projection surface ---------------------------------------------------------------------------------------------------
-eyelid_projsrf_loc_RU_A_grp = groupTree(eyelid_projsrf_prefix+'_loc_RU_A_grp')
-eyelid_projsrf_loc_RU_B_grp = groupTree(eyelid_projsrf_prefix+'_loc_RU_B_grp')
-eyelid_projsrf_loc_RU_C_grp = groupTree(eyelid_projsrf_prefix+'_loc_RU_C_grp')
-eyelid_projsrf_loc_RU_D_grp = groupTree(eyelid_projsrf_prefix+'_loc_RU_D_grp')
-eyelid_projsrf_loc_RU_E_grp = groupTree(eyelid_projsrf_prefix+'_loc_RU_E_grp')
-eyelid_projsrf_loc_RU_F_grp = groupTree(eyelid_projsrf_prefix+'_loc_RU_F_grp')
-
-eyelid_projsrf_RU_grp = groupTree(eyelid_projsrf_prefix+'_RU_grp',
-                                  [
-                                      eyelid_projsrf_loc_RU_A_grp,
-                                      eyelid_projsrf_loc_RU_B_grp,
-                                      eyelid_projsrf_loc_RU_C_grp,
-                                      eyelid_projsrf_loc_RU_D_grp,
-                                      eyelid_projsrf_loc_RU_E_grp,
-                                      eyelid_projsrf_loc_RU_F_grp
-                                  ])
-
-eyelid_projsrf_loc_RD_A_grp = groupTree(eyelid_projsrf_prefix+'_loc_RD_A_grp')
-eyelid_projsrf_loc_RD_B_grp = groupTree(eyelid_projsrf_prefix+'_loc_RD_B_grp')
-eyelid_projsrf_loc_RD_C_grp = groupTree(eyelid_projsrf_prefix+'_loc_RD_C_grp')
-eyelid_projsrf_loc_RD_D_grp = groupTree(eyelid_projsrf_prefix+'_loc_RD_D_grp')
-eyelid_projsrf_loc_RD_E_grp = groupTree(eyelid_projsrf_prefix+'_loc_RD_E_grp')
-eyelid_projsrf_loc_RD_F_grp = groupTree(eyelid_projsrf_prefix+'_loc_RD_F_grp')
-
-eyelid_projsrf_RD_grp = groupTree(eyelid_projsrf_prefix+'_RD_grp',
-                                  [
-                                      eyelid_projsrf_loc_RD_A_grp,
-                                      eyelid_projsrf_loc_RD_B_grp,
-                                      eyelid_projsrf_loc_RD_C_grp,
-                                      eyelid_projsrf_loc_RD_D_grp,
-                                      eyelid_projsrf_loc_RD_E_grp,
-                                      eyelid_projsrf_loc_RD_F_grp
-                                  ])
-
-eyelid_projsrf_R_grp = groupTree(eyelid_projsrf_prefix+'_R_grp',
-                                 [
-                                     eyelid_projsrf_RU_grp,
-                                     eyelid_projsrf_RD_grp
-                                 ])
-
-eyelid_projsrf_loc_LU_A_grp = groupTree(eyelid_projsrf_prefix+'_loc_LU_A_grp')
-eyelid_projsrf_loc_LU_B_grp = groupTree(eyelid_projsrf_prefix+'_loc_LU_B_grp')
-eyelid_projsrf_loc_LU_C_grp = groupTree(eyelid_projsrf_prefix+'_loc_LU_C_grp')
-eyelid_projsrf_loc_LU_D_grp = groupTree(eyelid_projsrf_prefix+'_loc_LU_D_grp')
-eyelid_projsrf_loc_LU_E_grp = groupTree(eyelid_projsrf_prefix+'_loc_LU_E_grp')
-eyelid_projsrf_loc_LU_F_grp = groupTree(eyelid_projsrf_prefix+'_loc_LU_F_grp')
-
-eyelid_projsrf_LU_grp = groupTree(eyelid_projsrf_prefix+'_LU_grp',
-                                  [
-                                      eyelid_projsrf_loc_LU_A_grp,
-                                      eyelid_projsrf_loc_LU_B_grp,
-                                      eyelid_projsrf_loc_LU_C_grp,
-                                      eyelid_projsrf_loc_LU_D_grp,
-                                      eyelid_projsrf_loc_LU_E_grp,
-                                      eyelid_projsrf_loc_LU_F_grp
-                                  ])
-
-eyelid_projsrf_loc_LD_A_grp = groupTree(eyelid_projsrf_prefix+'_loc_LD_A_grp')
-eyelid_projsrf_loc_LD_B_grp = groupTree(eyelid_projsrf_prefix+'_loc_LD_B_grp')
-eyelid_projsrf_loc_LD_C_grp = groupTree(eyelid_projsrf_prefix+'_loc_LD_C_grp')
-eyelid_projsrf_loc_LD_D_grp = groupTree(eyelid_projsrf_prefix+'_loc_LD_D_grp')
-eyelid_projsrf_loc_LD_E_grp = groupTree(eyelid_projsrf_prefix+'_loc_LD_E_grp')
-eyelid_projsrf_loc_LD_F_grp = groupTree(eyelid_projsrf_prefix+'_loc_LD_F_grp')
-
-eyelid_projsrf_LD_grp = groupTree(eyelid_projsrf_prefix+'_LD_grp',
-                                  [
-                                      eyelid_projsrf_loc_LD_A_grp,
-                                      eyelid_projsrf_loc_LD_B_grp,
-                                      eyelid_projsrf_loc_LD_C_grp,
-                                      eyelid_projsrf_loc_LD_D_grp,
-                                      eyelid_projsrf_loc_LD_E_grp,
-                                      eyelid_projsrf_loc_LD_F_grp
-                                  ])
-
-eyelid_projsrf_L_grp = groupTree(eyelid_projsrf_prefix+'_L_grp',
-                                 [
-                                     eyelid_projsrf_LU_grp,
-                                     eyelid_projsrf_LD_grp
-                                 ])
-
-# eyelid zone sub-master group -----------------------------------------------------------------------------------------
-eyelid_grp = groupTree('eyelid_grp',
-                       [
-                           eyelid_ctrlzone_R_grp,
-                           eyelid_ctrlzone_L_grp,
-                           eyelid_projsrf_R_grp,
-                           eyelid_projsrf_L_grp
-                       ])
-
-# Eyebrow Rig Group Hierarchy ==========================================================================================
 eyebrow_ctrlzone_prefix = 'fm_eyebrowProject'
 eyebrow_projsrf_prefix = 'fm_eyebrowMask'
 
-# translation plane ----------------------------------------------------------------------------------------------------
-eyebrow_ctrl_M_grp = groupTree(eyebrow_ctrlzone_prefix+'_M_ctrl_grp')
-eyebrow_ctrlcrv_bs_R_grp = groupTree(eyebrow_ctrlzone_prefix+'_bs_grp')
-eyebrow_ctrlzone_loc_M_A_grp = groupTree(eyebrow_ctrlzone_prefix+'Point_M_A_grp')
-eyebrow_ctrlzone_loc_M_B_grp = groupTree(eyebrow_ctrlzone_prefix+'Point_M_B_grp')
-eyebrow_ctrlzone_loc_M_C_grp = groupTree(eyebrow_ctrlzone_prefix+'Point_M_C_grp')
-eyebrow_ctrlzone_loc_M_D_grp = groupTree(eyebrow_ctrlzone_prefix+'Point_M_D_grp')
-
-eyebrow_ctrlzone_M_grp = groupTree(eyebrow_ctrlzone_prefix+'_M_grp',
-                                   [
-                                       eyebrow_ctrl_M_grp,
-                                       eyebrow_ctrlcrv_bs_R_grp,
-                                       eyebrow_ctrlzone_loc_M_A_grp,
-                                       eyebrow_ctrlzone_loc_M_B_grp,
-                                       eyebrow_ctrlzone_loc_M_C_grp,
-                                       eyebrow_ctrlzone_loc_M_D_grp
-                                   ])
-
-# projection surface ---------------------------------------------------------------------------------------------------
-eyebrow_projsrf_loc_M_UD_A_grp = groupTree(eyebrow_projsrf_prefix+'_loc_M_UD_A_grp')
-eyebrow_projsrf_loc_M_UD_B_grp = groupTree(eyebrow_projsrf_prefix+'_loc_M_UD_B_grp')
-eyebrow_projsrf_loc_M_UD_C_grp = groupTree(eyebrow_projsrf_prefix+'_loc_M_UD_C_grp')
-eyebrow_projsrf_loc_M_UD_D_grp = groupTree(eyebrow_projsrf_prefix+'_loc_M_UD_D_grp')
-
-eyebrow_projsrf_loc_M_FB_A_grp = groupTree(eyebrow_projsrf_prefix+'_loc_M_FB_A_grp')
-eyebrow_projsrf_loc_M_FB_B_grp = groupTree(eyebrow_projsrf_prefix+'_loc_M_FB_B_grp')
-eyebrow_projsrf_loc_M_FB_C_grp = groupTree(eyebrow_projsrf_prefix+'_loc_M_FB_C_grp')
-eyebrow_projsrf_loc_M_FB_D_grp = groupTree(eyebrow_projsrf_prefix+'_loc_M_FB_D_grp')
-
-eyebrow_projsrf_M_grp = groupTree(eyebrow_projsrf_prefix+'_M_grp',
-                                  [
-                                      eyebrow_projsrf_loc_M_UD_A_grp,
-                                      eyebrow_projsrf_loc_M_UD_B_grp,
-                                      eyebrow_projsrf_loc_M_UD_C_grp,
-                                      eyebrow_projsrf_loc_M_UD_D_grp,
-
-                                      eyebrow_projsrf_loc_M_FB_A_grp,
-                                      eyebrow_projsrf_loc_M_FB_B_grp,
-                                      eyebrow_projsrf_loc_M_FB_C_grp,
-                                      eyebrow_projsrf_loc_M_FB_D_grp
-                                  ])
-
-# eyebrow zone sub-master group ----------------------------------------------------------------------------------------
-eyebrow_grp = groupTree('eyebrow_grp',
-                        [
-                            eyebrow_ctrlzone_M_grp,
-                            eyebrow_projsrf_M_grp
-                        ])
-
-# Mouth Rig Group Hierarchy ============================================================================================
 mouth_ctrlzone_prefix = 'fm_mouthProject'
 mouth_projsrf_prefix = 'fm_mouthMask'
 
-# translation plane ----------------------------------------------------------------------------------------------------
-mouth_ctrl_MU_grp = groupTree(mouth_ctrlzone_prefix+'_MU_ctrl_grp')
-mouth_ctrlzone_loc_MU_A_grp = groupTree(mouth_ctrlzone_prefix+'Point_MU_A_grp')
-mouth_ctrlzone_loc_MU_B_grp = groupTree(mouth_ctrlzone_prefix+'Point_MU_B_grp')
-mouth_ctrlzone_loc_MU_C_grp = groupTree(mouth_ctrlzone_prefix+'Point_MU_C_grp')
-mouth_ctrlcrv_bs_MU_grp = groupTree(mouth_ctrlzone_prefix+'_MU_bs_grp')
-
-mouth_ctrlzone_MU_grp = groupTree(mouth_ctrlzone_prefix+'_MU_grp',
-                                  [
-                                     mouth_ctrl_MU_grp,
-                                     mouth_ctrlzone_loc_MU_A_grp,
-                                     mouth_ctrlzone_loc_MU_B_grp,
-                                     mouth_ctrlzone_loc_MU_C_grp,
-                                     mouth_ctrlcrv_bs_MU_grp
-                                 ])
-
-mouth_ctrl_MD_grp = groupTree(mouth_ctrlzone_prefix+'_MD_ctrl_grp')
-mouth_ctrlzone_loc_MD_A_grp = groupTree(mouth_ctrlzone_prefix+'Point_MD_A_grp')
-mouth_ctrlzone_loc_MD_B_grp = groupTree(mouth_ctrlzone_prefix+'Point_MD_B_grp')
-mouth_ctrlzone_loc_MD_C_grp = groupTree(mouth_ctrlzone_prefix+'Point_MD_C_grp')
-mouth_ctrlzone_loc_MD_D_grp = groupTree(mouth_ctrlzone_prefix+'Point_MD_D_grp')
-mouth_ctrlcrv_bs_MD_grp = groupTree(mouth_ctrlzone_prefix+'_MD_bs_grp')
-
-mouth_ctrlzone_MD_grp = groupTree(mouth_ctrlzone_prefix+'_MD_grp',
-                                  [
-                                      mouth_ctrl_MD_grp,
-                                      mouth_ctrlzone_loc_MD_A_grp,
-                                      mouth_ctrlzone_loc_MD_B_grp,
-                                      mouth_ctrlzone_loc_MD_C_grp,
-                                      mouth_ctrlzone_loc_MD_D_grp,
-                                      mouth_ctrlcrv_bs_MD_grp
-                                  ])
-
-mouth_ctrlzone_M_grp = groupTree(mouth_ctrlzone_prefix+'_M_grp',
-                                 [
-                                   mouth_ctrlzone_MU_grp,
-                                   mouth_ctrlzone_MD_grp,
-                                 ])
-
-# projection surface ---------------------------------------------------------------------------------------------------
-mouth_projsrf_loc_MU_A_grp = groupTree(mouth_projsrf_prefix+'_loc_MU_A_grp')
-mouth_projsrf_loc_MU_B_grp = groupTree(mouth_projsrf_prefix+'_loc_MU_B_grp')
-mouth_projsrf_loc_MU_C_grp = groupTree(mouth_projsrf_prefix+'_loc_MU_C_grp')
-
-mouth_projsrf_loc_MD_A_grp = groupTree(mouth_projsrf_prefix+'_loc_MD_A_grp')
-mouth_projsrf_loc_MD_B_grp = groupTree(mouth_projsrf_prefix+'_loc_MD_B_grp')
-mouth_projsrf_loc_MD_C_grp = groupTree(mouth_projsrf_prefix+'_loc_MD_C_grp')
-mouth_projsrf_loc_MD_D_grp = groupTree(mouth_projsrf_prefix+'_loc_MD_D_grp')
-
-mouth_projsrf_M_grp = groupTree(mouth_projsrf_prefix+'_M_grp',
-                                [
-                                    mouth_projsrf_loc_MU_A_grp,
-                                    mouth_projsrf_loc_MU_B_grp,
-                                    mouth_projsrf_loc_MU_C_grp,
-
-                                    mouth_projsrf_loc_MD_A_grp,
-                                    mouth_projsrf_loc_MD_B_grp,
-                                    mouth_projsrf_loc_MD_C_grp,
-                                    mouth_projsrf_loc_MD_D_grp
-                                ])
-
-# mouth zone sub-master group ------------------------------------------------------------------------------------------
-mouth_grp = groupTree('mouth_grp',
-                      [
-                          mouth_ctrlzone_M_grp,
-                          mouth_projsrf_M_grp
-                      ])
-
-# # Nasolabial Rig Group Hierarchy =======================================================================================
-# nasolabial_ctrlzone_prefix = 'fm_nasolabialProject'
-# nasolabial_projsrf_prefix = 'fm_nasolabialMask'
-#
-# # translation plane ----------------------------------------------------------------------------------------------------
-# nasolabial_ctrlzone_R_grp = groupTree(nasolabial_ctrlzone_prefix+'_R_grp')
-# nasolabial_ctrlzone_L_grp = groupTree(nasolabial_ctrlzone_prefix+'_L_grp')
-#
-# # projection surface ---------------------------------------------------------------------------------------------------
-# nasolabial_projsrf_R_grp = groupTree(nasolabial_projsrf_prefix+'_R_grp')
-# nasolabial_projsrf_L_grp = groupTree(nasolabial_projsrf_prefix+'_L_grp')
-#
-# # nasolabial zone sub-master group -------------------------------------------------------------------------------------
-# nasolabial_grp = groupTree('nasolabial_grp',
-#                            [
-#                                nasolabial_ctrlzone_R_grp,
-#                                nasolabial_ctrlzone_L_grp,
-#                                nasolabial_projsrf_R_grp,
-#                                nasolabial_projsrf_L_grp
-#                            ])
-#
-# # Cheek Rig Group Hierarchy ============================================================================================
-# cheek_ctrlzone_prefix = 'fm_cheekProject'
-# cheek_projsrf_prefix = 'fm_cheekMask'
-#
-# # translation plane ----------------------------------------------------------------------------------------------------
-# cheek_ctrlzone_R_grp = groupTree(cheek_ctrlzone_prefix+'_R_grp')
-# cheek_ctrlzone_L_grp = groupTree(cheek_ctrlzone_prefix+'_L_grp')
-#
-# # projection surface ---------------------------------------------------------------------------------------------------
-# cheek_projsrf_R_grp = groupTree(cheek_projsrf_prefix+'_R_grp')
-# cheek_projsrf_L_grp = groupTree(cheek_projsrf_prefix+'_L_grp')
-#
-# # cheek zone sub-master group ------------------------------------------------------------------------------------------
-# cheek_grp = groupTree('cheek_grp',
-#                       [
-#                           cheek_ctrlzone_R_grp,
-#                           cheek_ctrlzone_L_grp,
-#                           cheek_projsrf_R_grp,
-#                           cheek_projsrf_L_grp
-#                       ])
-
-# Nasolabial-Cheek Group Hierarchy =====================================================================================
 nasocheek_ctrlzone_prefix = 'fm_nasoCheekProject'
 nasocheek_projsrf_prefix = 'fm_nasoCheekMask'
 
-# translation plane ----------------------------------------------------------------------------------------------------
-nasocheek_ctrlcrv_bs_R_grp = groupTree(nasocheek_ctrlzone_prefix+'_R_bs_grp')
-nasocheek_ctrlzone_loc_R_A_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_R_A_grp')
-nasocheek_ctrlzone_loc_R_B_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_R_B_grp')
-nasocheek_ctrlzone_loc_R_C_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_R_C_grp')
-nasocheek_ctrlzone_loc_R_D_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_R_D_grp')
-nasocheek_ctrlzone_loc_R_E_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_R_E_grp')
-nasocheek_ctrlzone_loc_R_F_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_R_F_grp')
-
-nasocheek_ctrlzone_R_grp = groupTree(nasocheek_ctrlzone_prefix+'_R_grp',
-                                     [
-                                         nasocheek_ctrlcrv_bs_R_grp,
-                                         nasocheek_ctrlzone_loc_R_A_grp,
-                                         nasocheek_ctrlzone_loc_R_B_grp,
-                                         nasocheek_ctrlzone_loc_R_C_grp,
-                                         nasocheek_ctrlzone_loc_R_D_grp,
-                                         nasocheek_ctrlzone_loc_R_E_grp,
-                                         nasocheek_ctrlzone_loc_R_F_grp
-                                     ])
-
-nasocheek_ctrlcrv_bs_L_grp = groupTree(nasocheek_ctrlzone_prefix+'_L_bs_grp')
-nasocheek_ctrlzone_loc_L_A_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_L_A_grp')
-nasocheek_ctrlzone_loc_L_B_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_L_B_grp')
-nasocheek_ctrlzone_loc_L_C_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_L_C_grp')
-nasocheek_ctrlzone_loc_L_D_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_L_D_grp')
-nasocheek_ctrlzone_loc_L_E_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_L_E_grp')
-nasocheek_ctrlzone_loc_L_F_grp = groupTree(nasocheek_ctrlzone_prefix+'Point_L_F_grp')
-
-nasocheek_ctrlzone_L_grp = groupTree(nasocheek_ctrlzone_prefix+'_L_grp',
-                                     [
-                                         nasocheek_ctrlcrv_bs_L_grp,
-                                         nasocheek_ctrlzone_loc_L_A_grp,
-                                         nasocheek_ctrlzone_loc_L_B_grp,
-                                         nasocheek_ctrlzone_loc_L_C_grp,
-                                         nasocheek_ctrlzone_loc_L_D_grp,
-                                         nasocheek_ctrlzone_loc_L_E_grp,
-                                         nasocheek_ctrlzone_loc_L_F_grp
-                                     ])
-
-# projection surface ---------------------------------------------------------------------------------------------------
-nasocheek_projsrf_loc_R_LR_A_grp = groupTree(mouth_projsrf_prefix+'_loc_R_LR_A_grp')
-nasocheek_projsrf_loc_R_LR_B_grp = groupTree(mouth_projsrf_prefix+'_loc_R_LR_B_grp')
-nasocheek_projsrf_loc_R_LR_C_grp = groupTree(mouth_projsrf_prefix+'_loc_R_LR_C_grp')
-nasocheek_projsrf_loc_R_LR_D_grp = groupTree(mouth_projsrf_prefix+'_loc_R_LR_D_grp')
-nasocheek_projsrf_loc_R_LR_E_grp = groupTree(mouth_projsrf_prefix+'_loc_R_LR_E_grp')
-nasocheek_projsrf_loc_R_LR_F_grp = groupTree(mouth_projsrf_prefix+'_loc_R_LR_F_grp')
-
-nasocheek_projsrf_loc_R_FB_A_grp = groupTree(mouth_projsrf_prefix+'_loc_R_FB_A_grp')
-nasocheek_projsrf_loc_R_FB_B_grp = groupTree(mouth_projsrf_prefix+'_loc_R_FB_B_grp')
-nasocheek_projsrf_loc_R_FB_C_grp = groupTree(mouth_projsrf_prefix+'_loc_R_FB_C_grp')
-nasocheek_projsrf_loc_R_FB_D_grp = groupTree(mouth_projsrf_prefix+'_loc_R_FB_D_grp')
-nasocheek_projsrf_loc_R_FB_E_grp = groupTree(mouth_projsrf_prefix+'_loc_R_FB_E_grp')
-nasocheek_projsrf_loc_R_FB_F_grp = groupTree(mouth_projsrf_prefix+'_loc_R_FB_F_grp')
-
-nasocheek_projsrf_R_grp = groupTree(nasocheek_projsrf_prefix+'_R_grp',
-                                    [
-                                        nasocheek_projsrf_loc_R_LR_A_grp,
-                                        nasocheek_projsrf_loc_R_LR_B_grp,
-                                        nasocheek_projsrf_loc_R_LR_C_grp,
-                                        nasocheek_projsrf_loc_R_LR_D_grp,
-                                        nasocheek_projsrf_loc_R_LR_E_grp,
-                                        nasocheek_projsrf_loc_R_LR_F_grp,
-
-                                        nasocheek_projsrf_loc_R_FB_A_grp,
-                                        nasocheek_projsrf_loc_R_FB_B_grp,
-                                        nasocheek_projsrf_loc_R_FB_C_grp,
-                                        nasocheek_projsrf_loc_R_FB_D_grp,
-                                        nasocheek_projsrf_loc_R_FB_E_grp,
-                                        nasocheek_projsrf_loc_R_FB_F_grp
-                                    ])
-
-nasocheek_projsrf_loc_L_LR_A_grp = groupTree(mouth_projsrf_prefix+'_loc_L_LR_A_grp')
-nasocheek_projsrf_loc_L_LR_B_grp = groupTree(mouth_projsrf_prefix+'_loc_L_LR_B_grp')
-nasocheek_projsrf_loc_L_LR_C_grp = groupTree(mouth_projsrf_prefix+'_loc_L_LR_C_grp')
-nasocheek_projsrf_loc_L_LR_D_grp = groupTree(mouth_projsrf_prefix+'_loc_L_LR_D_grp')
-nasocheek_projsrf_loc_L_LR_E_grp = groupTree(mouth_projsrf_prefix+'_loc_L_LR_E_grp')
-nasocheek_projsrf_loc_L_LR_F_grp = groupTree(mouth_projsrf_prefix+'_loc_L_LR_F_grp')
-
-nasocheek_projsrf_loc_L_FB_A_grp = groupTree(mouth_projsrf_prefix+'_loc_L_FB_A_grp')
-nasocheek_projsrf_loc_L_FB_B_grp = groupTree(mouth_projsrf_prefix+'_loc_L_FB_B_grp')
-nasocheek_projsrf_loc_L_FB_C_grp = groupTree(mouth_projsrf_prefix+'_loc_L_FB_C_grp')
-nasocheek_projsrf_loc_L_FB_D_grp = groupTree(mouth_projsrf_prefix+'_loc_L_FB_D_grp')
-nasocheek_projsrf_loc_L_FB_E_grp = groupTree(mouth_projsrf_prefix+'_loc_L_FB_E_grp')
-nasocheek_projsrf_loc_L_FB_F_grp = groupTree(mouth_projsrf_prefix+'_loc_L_FB_F_grp')
-
-nasocheek_projsrf_L_grp = groupTree(nasocheek_projsrf_prefix+'_L_grp',
-                                    [
-                                        nasocheek_projsrf_loc_L_LR_A_grp,
-                                        nasocheek_projsrf_loc_L_LR_B_grp,
-                                        nasocheek_projsrf_loc_L_LR_C_grp,
-                                        nasocheek_projsrf_loc_L_LR_D_grp,
-                                        nasocheek_projsrf_loc_L_LR_E_grp,
-                                        nasocheek_projsrf_loc_L_LR_F_grp,
-
-                                        nasocheek_projsrf_loc_L_FB_A_grp,
-                                        nasocheek_projsrf_loc_L_FB_B_grp,
-                                        nasocheek_projsrf_loc_L_FB_C_grp,
-                                        nasocheek_projsrf_loc_L_FB_D_grp,
-                                        nasocheek_projsrf_loc_L_FB_E_grp,
-                                        nasocheek_projsrf_loc_L_FB_F_grp
-                                    ])
-
-# nasolabial-cheek zone sub-master group -------------------------------------------------------------------------------
-nasocheek_grp = groupTree('nasocheek_grp',
-                          [
-                              nasocheek_ctrlzone_R_grp,
-                              nasocheek_ctrlzone_L_grp,
-                              nasocheek_projsrf_R_grp,
-                              nasocheek_projsrf_L_grp
-                          ])
\ No newline at end of file
+load_hierarchy()
@@ -0,0 +1,517 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: profiler.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module containing the build profiler, which times the phases of the facial system construction in nested scopes,
+and counts the maya.cmds calls (per command name) and the node creations (per node type) inside each scope.
+
+The profiler is off by default, in which case a scope costs one flag check, e.g.
+
+    from general import profiler
+
+    with profiler.scope('setup_ctrl_zones'):
+        ...
+
+To profile a build:
+
+    profiler.enable()
+    lc3chr_facialsys_construct()
+    profiler.disable()
+    profiler.write_reports('D:/profile/lv3chr_facialsys')
+
+which writes the JSON report (the scope tree), the CSV report (one row per scope path), the folded stacks for
+flamegraph.pl / speedscope ("*.folded") and the Chrome trace events for chrome://tracing / Perfetto ("*.trace.json").
+Note that this module does not import Maya, so that it can profile the builds run against the recording stand-in.
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_timer = getattr(time, 'perf_counter', time.time)
+
+# The node-creating commands whose first argument is the node type.
+g_node_type_arg_cmd_list = ['createNode', 'shadingNode']
+# The other node-creating commands, counted under their own names as the node types.
+g_node_creation_cmd_list = ['spaceLocator', 'curve', 'nurbsPlane', 'joint', 'group', 'blendShape', 'skinCluster',
+                            'cluster', 'sets', 'createDisplayLayer', 'duplicate', 'instance']
+
+g_report_ext_dict = {
+    'json': '.json',
+    'csv': '.csv',
+    'folded': '.folded',
+    'trace': '.trace.json'
+}
+
+# ======================================================================================================================
+class profileScope(object):
+    """ A timed scope of the build, with the maya.cmds calls and the node creations made inside it directly.
+    """
+
+    def __init__(self, name, parent=None):
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self.name = name
+        self.parent = parent
+        self.child_list = []
+
+        self.start_time = 0.0
+        self.end_time = 0.0
+
+        self.cmd_count_dict = {}    # {command name: the number of calls}
+        self.node_count_dict = {}   # {node type: the number of created nodes}
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __repr__(self):
+        return 'profileScope({}, {:.6f})'.format(self.name, self.get_duration())
+
+    def get_duration(self):
+        """
+        :return: the seconds spent in this scope, including its child scopes
+        """
+        return self.end_time-self.start_time
+
+    def get_self_duration(self):
+        """
+        :return: the seconds spent in this scope, excluding its child scopes
+        """
+        return self.get_duration()-sum([child.get_duration() for child in self.child_list])
+
+    def get_path(self):
+        """
+        :return: a list of the scope names from the root scope down to this one
+        """
+
+        path = []
+        scope = self
+        while scope.parent is not None:
+            path.insert(0, scope.name)
+            scope = scope.parent
+        return path
+
+    def get_total_counts(self):
+        """
+        :return: a tuple of the {command name: count} and {node type: count} dictionaries of this scope,
+                 including its child scopes
+        """
+
+        cmd_count_dict = dict(self.cmd_count_dict)
+        node_count_dict = dict(self.node_count_dict)
+        for child in self.child_list:
+            child_cmd_count_dict, child_node_count_dict = child.get_total_counts()
+            for cmd, count in child_cmd_count_dict.items():
+                cmd_count_dict[cmd] = cmd_count_dict.get(cmd, 0)+count
+            for node_type, count in child_node_count_dict.items():
+                node_count_dict[node_type] = node_count_dict.get(node_type, 0)+count
+        return cmd_count_dict, node_count_dict
+
+    def to_dict(self, origin_time):
+        """
+        :param origin_time: the start time of the profiling session
+        :return: a JSON-serializable dictionary of this scope and its child scopes
+        """
+
+        cmd_count_dict, node_count_dict = self.get_total_counts()
+        return {
+            'name': self.name,
+            'start': self.start_time-origin_time,
+            'duration': self.get_duration(),
+            'self_duration': self.get_self_duration(),
+            'cmd_count': sum(cmd_count_dict.values()),
+            'node_count': sum(node_count_dict.values()),
+            'self_cmd_counts': self.cmd_count_dict,
+            'self_node_counts': self.node_count_dict,
+            'total_cmd_counts': cmd_count_dict,
+            'total_node_counts': node_count_dict,
+            'children': [child.to_dict(origin_time) for child in self.child_list]
+        }
+
+    def iter_scopes(self):
+        """ Walk this scope and its child scopes in depth-first order.
+        """
+
+        yield self
+        for child in self.child_list:
+            for scope in child.iter_scopes():
+                yield scope
+
+# ======================================================================================================================
+class nullScope(object):
+    """ The scope handed out while the profiler is off, doing nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        return False
+
+g_null_scope = nullScope()
+
+class activeScope(object):
+    """ The context manager entering and exiting a profileScope of a buildProfiler.
+    """
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        return self._profiler.push_scope(self._name)
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self._profiler.pop_scope()
+        return False
+
+# ======================================================================================================================
+class buildProfiler(object):
+    """ A build profiler keeps the scope tree of a profiling session.
+
+    While it is enabled, the commands of the maya.cmds module are replaced by counting wrappers.
+    The scene builder counts the node creations when they are queued (see count_node()), since the control zones
+    create their nodes through the scene builder and the builder commits them later, outside the zones' scopes.
+    """
+
+    def __init__(self):
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._enabled = False
+
+        self._root_scope = profileScope('root')
+        self._scope_stack = [self._root_scope]
+
+        # A list of (patched object, attribute name, original attribute or None if the attribute was not owned)
+        self._patch_list = []
+        # While it is greater than zero, the created nodes are not counted, e.g. when the scene builder replays the
+        # node creations which have been counted when queued.
+        self._node_count_pause_depth = 0
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __repr__(self):
+        return NotImplemented
+
+    def is_enabled(self):
+        return self._enabled
+
+    def enable(self, cmds_module=None):
+        """ Start a new profiling session.
+        :param cmds_module: the maya.cmds module (or a stand-in of it) to count the calls of;
+                            if it is None, the "maya.cmds" imported by the facial system is used
+        :return: None
+        """
+
+        if self._enabled:
+            self.disable()
+
+        self._root_scope = profileScope('root')
+        self._root_scope.start_time = g_timer()
+        self._scope_stack = [self._root_scope]
+        self._node_count_pause_depth = 0
+
+        if cmds_module is None:
+            cmds_module = sys.modules.get('maya.cmds')
+        if cmds_module is not None:
+            self._patch_cmds(cmds_module)
+
+        self._enabled = True
+
+    def disable(self):
+        """ End the profiling session and restore the patched functions. The scope tree is kept for the reports.
+        :return: None
+        """
+
+        if not self._enabled:
+            return
+
+        self._enabled = False
+        while len(self._scope_stack) > 1:
+            self.pop_scope()
+        self._root_scope.end_time = g_timer()
+
+        for obj, attr, orig_attr in reversed(self._patch_list):
+            if orig_attr is None:
+                delattr(obj, attr)
+            else:
+                setattr(obj, attr, orig_attr)
+        self._patch_list = []
+
+    def scope(self, name):
+        """
+        :param name: name of the scope, e.g. "setup_ctrl_zones"
+        :return: a context manager timing the code inside it as a child scope of the current scope
+        """
+
+        if not self._enabled:
+            return g_null_scope
+        return activeScope(self, name)
+
+    def push_scope(self, name):
+        """
+        :return: the new profileScope, which becomes the current scope
+        """
+
+        parent_scope = self._scope_stack[-1]
+        new_scope = profileScope(name, parent_scope)
+        parent_scope.child_list.append(new_scope)
+        self._scope_stack.append(new_scope)
+        new_scope.start_time = g_timer()
+        return new_scope
+
+    def pop_scope(self):
+        """
+        :return: the ended profileScope
+        """
+
+        end_time = g_timer()
+        if len(self._scope_stack) <= 1:
+            return None
+        ended_scope = self._scope_stack.pop()
+        ended_scope.end_time = end_time
+        return ended_scope
+
+    def count_cmd(self, cmd, args):
+        """ Count a maya.cmds call into the current scope.
+        :return: None
+        """
+
+        cur_scope = self._scope_stack[-1]
+        cur_scope.cmd_count_dict[cmd] = cur_scope.cmd_count_dict.get(cmd, 0)+1
+
+        if cmd in g_node_type_arg_cmd_list:
+            if args:
+                self.count_node(args[0])
+        elif cmd in g_node_creation_cmd_list:
+            self.count_node(cmd)
+
+    def count_node(self, node_type):
+        """ Count a node creation into the current scope.
+        :return: None
+        """
+
+        if self._node_count_pause_depth > 0:
+            return
+        cur_scope = self._scope_stack[-1]
+        cur_scope.node_count_dict[node_type] = cur_scope.node_count_dict.get(node_type, 0)+1
+
+    def pause_node_count(self):
+        """ Stop counting the node creations until resume_node_count(), e.g. while the scene builder replays the
+        node creations counted when queued.
+
+        :return: None
+        """
+        self._node_count_pause_depth += 1
+
+    def resume_node_count(self):
+        self._node_count_pause_depth = max(0, self._node_count_pause_depth-1)
+
+    def get_root_scope(self):
+        """
+        :return: the root profileScope of the last profiling session
+        """
+        return self._root_scope
+
+    # Patching Functions -----------------------------------------------------------------------------------------------
+    def _patch_attr(self, obj, attr, new_attr):
+        orig_attr = vars(obj).get(attr)
+        self._patch_list.append((obj, attr, orig_attr))
+        setattr(obj, attr, new_attr)
+
+    def _patch_cmds(self, cmds_module):
+        """ Replace the commands of the maya.cmds module with wrappers counting their calls.
+        The facial system's modules look the commands up on every call (cmds.xxx()), so they call the wrappers.
+
+        :return: None
+        """
+
+        for cmd in dir(cmds_module):
+            if cmd.startswith('_'):
+                continue
+            cmd_func = getattr(cmds_module, cmd, None)
+            if not callable(cmd_func) or isinstance(cmd_func, type):
+                continue
+            self._patch_attr(cmds_module, cmd, self._make_cmd_wrapper(cmd, cmd_func))
+
+    def _make_cmd_wrapper(self, cmd, cmd_func):
+        profiler = self
+
+        def cmd_wrapper(*args, **kwargs):
+            profiler.count_cmd(cmd, args)
+            return cmd_func(*args, **kwargs)
+
+        cmd_wrapper.__name__ = cmd
+        cmd_wrapper.__doc__ = cmd_func.__doc__
+        return cmd_wrapper
+
+    # Report Functions -------------------------------------------------------------------------------------------------
+    def get_report(self):
+        """
+        :return: a JSON-serializable dictionary of the scope tree of the last profiling session
+        """
+
+        origin_time = self._root_scope.start_time
+        if self._enabled:
+            self._root_scope.end_time = g_timer()
+        return self._root_scope.to_dict(origin_time)
+
+    def write_json(self, file_path):
+        with open(file_path, 'w') as json_file:
+            json.dump(self.get_report(), json_file, indent=4, sort_keys=True)
+
+    def write_csv(self, file_path):
+        """ Write one row per scope path, merging the scopes of the same path, e.g. the ones entered in a loop.
+        :return: None
+        """
+
+        row_dict = {}   # {scope path: [calls, duration, self duration, cmd count, node count, {node type: count}]}
+        path_list = []
+        for scope in self._root_scope.iter_scopes():
+            if scope is self._root_scope:
+                continue
+
+            path = '/'.join(scope.get_path())
+            if path not in row_dict:
+                row_dict[path] = [0, 0.0, 0.0, 0, 0, {}]
+                path_list.append(path)
+
+            row = row_dict[path]
+            row[0] += 1
+            row[1] += scope.get_duration()
+            row[2] += scope.get_self_duration()
+            row[3] += sum(scope.cmd_count_dict.values())
+            row[4] += sum(scope.node_count_dict.values())
+            for node_type, count in scope.node_count_dict.items():
+                row[5][node_type] = row[5].get(node_type, 0)+count
+
+        with open(file_path, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file, lineterminator='\n')
+            csv_writer.writerow(['scope', 'depth', 'calls', 'total_seconds', 'self_seconds',
+                                 'self_cmd_count', 'self_node_count', 'self_node_types'])
+            for path in path_list:
+                row = row_dict[path]
+                node_types = ' '.join(['{}:{}'.format(node_type, count)
+                                       for node_type, count in sorted(row[5].items())])
+                csv_writer.writerow([path, path.count('/'), row[0], '{:.6f}'.format(row[1]),
+                                     '{:.6f}'.format(row[2]), row[3], row[4], node_types])
+
+    def write_folded_stacks(self, file_path):
+        """ Write the self durations in microseconds as folded stacks ("root;phase;sub-phase 1234"),
+        the input format of flamegraph.pl and speedscope.
+
+        :return: None
+        """
+
+        stack_dict = {}
+        stack_list = []
+        for scope in self._root_scope.iter_scopes():
+            stack = ';'.join(['root']+[name.replace(';', '_').replace(' ', '_') for name in scope.get_path()])
+            if stack not in stack_dict:
+                stack_dict[stack] = 0
+                stack_list.append(stack)
+            stack_dict[stack] += int(round(max(scope.get_self_duration(), 0.0)*1000000.0))
+
+        with open(file_path, 'w') as folded_file:
+            for stack in stack_list:
+                if stack_dict[stack] > 0:
+                    folded_file.write('{} {}\n'.format(stack, stack_dict[stack]))
+
+    def write_chrome_trace(self, file_path):
+        """ Write the scopes as the complete ("X") events of the Trace Event Format,
+        which chrome://tracing, Perfetto and speedscope open as flame charts.
+
+        :return: None
+        """
+
+        origin_time = self._root_scope.start_time
+        event_list = []
+        for scope in self._root_scope.iter_scopes():
+            cmd_count_dict, node_count_dict = scope.get_total_counts()
+            event_list.append({
+                'name': scope.name,
+                'cat': 'build',
+                'ph': 'X',
+                'ts': (scope.start_time-origin_time)*1000000.0,
+                'dur': scope.get_duration()*1000000.0,
+                'pid': os.getpid(),
+                'tid': 0,
+                'args': {
+                    'cmd_count': sum(cmd_count_dict.values()),
+                    'node_count': sum(node_count_dict.values())
+                }
+            })
+
+        with open(file_path, 'w') as trace_file:
+            json.dump({'traceEvents': event_list, 'displayTimeUnit': 'ms'}, trace_file)
+
+    def write_reports(self, base_path):
+        """ Write all the reports, named by the base path with the extensions of g_report_ext_dict.
+        :param base_path: path of the reports without the extensions, e.g. "D:/profile/lv3chr_facialsys"
+        :return: a dictionary of {report kind: file path}
+        """
+
+        report_dir = os.path.dirname(os.path.abspath(base_path))
+        if not os.path.isdir(report_dir):
+            os.makedirs(report_dir)
+
+        path_dict = dict((kind, base_path+ext) for kind, ext in g_report_ext_dict.items())
+        self.write_json(path_dict['json'])
+        self.write_csv(path_dict['csv'])
+        self.write_folded_stacks(path_dict['folded'])
+        self.write_chrome_trace(path_dict['trace'])
+        return path_dict
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+# The profiler of the facial system build. The helper functions below forward to it.
+g_profiler = buildProfiler()
+
+def is_enabled():
+    return g_profiler.is_enabled()
+
+def enable(cmds_module=None):
+    g_profiler.enable(cmds_module)
+
+def disable():
+    g_profiler.disable()
+
+def scope(name):
+    """ Time the code inside the returned context manager as a child scope of the current scope.
+    It returns a shared do-nothing context manager while the profiler is off.
+
+    :param name: name of the scope, e.g. "setup_ctrl_zones"
+    :return: a context manager
+    """
+
+    if not g_profiler._enabled:
+        return g_null_scope
+    return activeScope(g_profiler, name)
+
+def count_node(node_type):
+    """ Count a node creation into the current scope, for the node creations not made by maya.cmds,
+    e.g. the ones queued by the scene builder.
+
+    :return: None
+    """
+
+    if g_profiler._enabled:
+        g_profiler.count_node(node_type)
+
+def pause_node_count():
+    if g_profiler._enabled:
+        g_profiler.pause_node_count()
+
+def resume_node_count():
+    if g_profiler._enabled:
+        g_profiler.resume_node_count()
+
+def get_report():
+    return g_profiler.get_report()
+
+def write_reports(base_path):
+    return g_profiler.write_reports(base_path)
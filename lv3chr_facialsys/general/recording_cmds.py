@@ -0,0 +1,585 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: recording_cmds.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module containing a recording stand-in of maya.cmds, to run the facial system's build code outside Maya.
+
+The stand-in keeps a minimal model of the scene (node names, types, parents, attribute values and connections),
+enough for the build code's queries, and records every command call with its arguments.
+Note that this module does not import Maya, so that it can be used from a plain Python interpreter, e.g.
+
+    from general import recording_cmds
+    stand_in_cmds = recording_cmds.install()
+
+    from general.scene_builder import sceneBuilder
+    builder = sceneBuilder(cmds_backend=stand_in_cmds)
+"""
+
+import sys
+import types
+
+# global variables -----------------------------------------------------------------------------------------------------
+# The node types creating a transform node with a shape node under it.
+g_shape_node_type_dict = {
+    'locator': 'locator',
+    'spaceLocator': 'locator',
+    'curve': 'nurbsCurve',
+    'nurbsPlane': 'nurbsSurface'
+}
+
+# {Python type of a value in the scene model: the attribute type cmds.getAttr(type=True) gives}
+g_attr_type_dict = {
+    bool: 'bool',
+    int: 'long',
+    float: 'double'
+}
+
+# The node types of the DAG nodes, the others being DG nodes.
+g_dag_node_type_list = ['transform', 'joint', 'locator', 'nurbsCurve', 'nurbsSurface', 'mesh']
+
+# ======================================================================================================================
+class recordingNode(object):
+    """ A node of the recording stand-in's scene model.
+    """
+
+    def __init__(self, name, node_type, parent=None):
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self.name = name
+        self.node_type = node_type
+        self.parent = parent
+        self.attr_dict = {}             # {attribute name: value}
+        self.user_attr_dict = {}        # {dynamic attribute name: the keyword arguments of its addAttr()}
+        self.alias_dict = {}            # {alias: attribute name}
+        self.locked_attr_set = set()    # the names of the locked attributes
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __repr__(self):
+        return 'recordingNode({}, {})'.format(self.name, self.node_type)
+
+# ======================================================================================================================
+class recordingCmds(object):
+    """ A stand-in of the maya.cmds module, which records the command calls onto a scene model instead of
+    running them in Maya. The commands it does not model are recorded and return None.
+    """
+
+    def __init__(self):
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        # A list of (command name, arguments tuple, keyword arguments dictionary)
+        self._call_list = []
+
+        self._node_dict = {}            # {node name: recordingNode}
+        self._connection_dict = {}      # {destination plug: source plug}
+        self._name_counter_dict = {}    # {node base name: the last numeric suffix given}
+
+        # The indexes of the queries, built on demand and dropped when the scene model changes
+        self._child_list_dict = None        # {parent node name: [child node name]}
+        self._node_connection_dict = None   # {node name: [(destination plug, source plug)]}
+
+        self._undo_chunk_depth = 0
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __getattr__(self, command):
+        """ Record the calls to the commands which the stand-in does not model.
+        """
+
+        if command.startswith('_'):
+            raise AttributeError(command)
+
+        def record_command(*args, **kwargs):
+            self._record(command, args, kwargs)
+            return None
+
+        return record_command
+
+    # Recording Functions ----------------------------------------------------------------------------------------------
+    def get_calls(self, command=None):
+        """
+        :param command: name of the command, e.g. "connectAttr"; if it is None, all the calls are returned
+        :return: a list of (command name, arguments tuple, keyword arguments dictionary)
+        """
+
+        if command is None:
+            return list(self._call_list)
+        return [call for call in self._call_list if call[0] == command]
+
+    def get_call_counts(self):
+        """
+        :return: a dictionary of {command name: the number of calls}
+        """
+
+        res_dict = {}
+        for call in self._call_list:
+            res_dict[call[0]] = res_dict.get(call[0], 0)+1
+        return res_dict
+
+    def get_node(self, name):
+        """
+        :return: the recordingNode of the given name, or None
+        """
+        return self._node_dict.get(self._get_short_name(name))
+
+    def get_connections(self):
+        """
+        :return: a dictionary of {destination plug: source plug}
+        """
+        return dict(self._connection_dict)
+
+    def reset(self):
+        """ Clear the recorded calls and the scene model.
+        :return: None
+        """
+
+        self._call_list = []
+        self._node_dict = {}
+        self._connection_dict = {}
+        self._name_counter_dict = {}
+        self._child_list_dict = None
+        self._node_connection_dict = None
+        self._undo_chunk_depth = 0
+
+    def _record(self, command, args, kwargs):
+        self._call_list.append((command, args, kwargs))
+
+    # Scene Model Functions --------------------------------------------------------------------------------------------
+    def _get_short_name(self, name):
+        if isinstance(name, (list, tuple)):
+            name = name[0]
+        return name.split('|')[-1]
+
+    def _get_unique_name(self, name):
+        """ Give a node name not in use, as Maya does by numbering the name.
+        """
+
+        if name not in self._node_dict:
+            return name
+
+        base_name = name.rstrip('0123456789')
+        counter = self._name_counter_dict.get(base_name, 0)
+        while True:
+            counter += 1
+            unique_name = '{}{}'.format(base_name, counter)
+            if unique_name not in self._node_dict:
+                self._name_counter_dict[base_name] = counter
+                return unique_name
+
+    def _add_node(self, name, node_type, parent=None):
+        self._child_list_dict = None
+        name = self._get_unique_name(name)
+        self._node_dict[name] = recordingNode(name, node_type, parent)
+        return name
+
+    def _add_shape_node(self, transform_name, shape_type):
+        shape_name = self._add_node(transform_name+'Shape', shape_type, parent=transform_name)
+        return shape_name
+
+    def _get_child_list_dict(self):
+        if self._child_list_dict is None:
+            self._child_list_dict = {}
+            for child_name, child_node in sorted(self._node_dict.items()):
+                self._child_list_dict.setdefault(child_node.parent, []).append(child_name)
+        return self._child_list_dict
+
+    def _get_node_connection_dict(self):
+        if self._node_connection_dict is None:
+            self._node_connection_dict = {}
+            for dst_plug, src_plug in sorted(self._connection_dict.items()):
+                self._node_connection_dict.setdefault(dst_plug.split('.', 1)[0], []).append((dst_plug, src_plug))
+                if src_plug.split('.', 1)[0] != dst_plug.split('.', 1)[0]:
+                    self._node_connection_dict.setdefault(src_plug.split('.', 1)[0], []).append((dst_plug, src_plug))
+        return self._node_connection_dict
+
+    def _split_plug(self, plug):
+        node, attr = plug.split('.', 1)
+        return self._get_short_name(node), attr
+
+    # Modeled Commands -------------------------------------------------------------------------------------------------
+    def createNode(self, node_type, name=None, parent=None, skipSelect=False):
+        self._record('createNode', (node_type,), {'name': name, 'parent': parent})
+        if parent:
+            assert self.objExists(parent), 'No object matches name: {}'.format(parent)
+        return self._add_node(name or node_type+'1', node_type, parent)
+
+    def group(self, *args, **kwargs):
+        self._record('group', args, kwargs)
+        self._child_list_dict = None
+        name = self._add_node(kwargs.get('name', kwargs.get('n', 'group1')), 'transform', kwargs.get('parent'))
+        for child in args:
+            if self.objExists(child):
+                self._node_dict[self._get_short_name(child)].parent = name
+        return name
+
+    def spaceLocator(self, *args, **kwargs):
+        self._record('spaceLocator', args, kwargs)
+        name = self._add_node(kwargs.get('name', kwargs.get('n', 'locator1')), 'transform')
+        self._add_shape_node(name, g_shape_node_type_dict['spaceLocator'])
+        return [name]
+
+    def curve(self, *args, **kwargs):
+        self._record('curve', args, kwargs)
+        name = self._add_node(kwargs.get('name', kwargs.get('n', 'curve1')), 'transform')
+        self._add_shape_node(name, g_shape_node_type_dict['curve'])
+        return name
+
+    def duplicate(self, *args, **kwargs):
+        self._record('duplicate', args, kwargs)
+        node = args[0][0] if isinstance(args[0], (list, tuple)) else args[0]
+        node_name = self._get_short_name(node)
+        assert node_name in self._node_dict, 'No object matches name: {}'.format(node)
+
+        # The duplicate gets the attribute values and the shape nodes of the original, but none of its connections.
+        src_node = self._node_dict[node_name]
+        shape_type_list = [self._node_dict[child_name].node_type
+                           for child_name in self._get_child_list_dict().get(node_name, [])
+                           if self._node_dict[child_name].node_type in g_shape_node_type_dict.values()]
+
+        name = self._add_node(kwargs.get('name', kwargs.get('n', node_name+'1')), src_node.node_type, src_node.parent)
+        self._node_dict[name].attr_dict = dict(src_node.attr_dict)
+        for shape_type in shape_type_list:
+            self._add_shape_node(name, shape_type)
+        return [name]
+
+    def nurbsPlane(self, *args, **kwargs):
+        self._record('nurbsPlane', args, kwargs)
+        name = self._add_node(kwargs.get('name', kwargs.get('n', 'nurbsPlane1')), 'transform')
+        self._add_shape_node(name, g_shape_node_type_dict['nurbsPlane'])
+        return [name, self._add_node('makeNurbPlane1', 'makeNurbPlane')]
+
+    def joint(self, *args, **kwargs):
+        self._record('joint', args, kwargs)
+        return self._add_node(kwargs.get('name', kwargs.get('n', 'joint1')), 'joint')
+
+    def shadingNode(self, node_type, **kwargs):
+        self._record('shadingNode', (node_type,), kwargs)
+        return self._add_node(kwargs.get('name', kwargs.get('n', node_type+'1')), node_type)
+
+    def blendShape(self, *args, **kwargs):
+        self._record('blendShape', args, kwargs)
+        name = self._add_node(kwargs.get('name', kwargs.get('n', 'blendShape1')), 'blendShape')
+        # The targets are aliased as the weight attributes of the blend-shape node.
+        for target_id, target in enumerate(args[:-1]):
+            self._node_dict[name].attr_dict[self._get_short_name(target)] = 0.0
+            self._node_dict[name].alias_dict[self._get_short_name(target)] = 'weight[{}]'.format(target_id)
+            self._node_dict[name].attr_dict['weight[{}]'.format(target_id)] = 0.0
+        weight_list = kwargs.get('weight', kwargs.get('w'))
+        if weight_list and not isinstance(weight_list[0], (list, tuple)):
+            weight_list = [weight_list]
+        for target_id, weight in weight_list or []:
+            self._node_dict[name].attr_dict['weight[{}]'.format(target_id)] = weight
+        return [name]
+
+    def sets(self, *args, **kwargs):
+        self._record('sets', args, kwargs)
+        if kwargs.get('query', kwargs.get('q', False)) or kwargs.get('edit', kwargs.get('e', False)) or \
+           kwargs.get('forceElement', kwargs.get('fe')) or kwargs.get('addElement', kwargs.get('add')):
+            return None
+        return self._add_node(kwargs.get('name', kwargs.get('n', 'set1')), 'objectSet')
+
+    def createDisplayLayer(self, *args, **kwargs):
+        self._record('createDisplayLayer', args, kwargs)
+        return self._add_node(kwargs.get('name', kwargs.get('n', 'layer1')), 'displayLayer')
+
+    def skinCluster(self, *args, **kwargs):
+        self._record('skinCluster', args, kwargs)
+        return [self._add_node(kwargs.get('name', kwargs.get('n', 'skinCluster1')), 'skinCluster')]
+
+    def rename(self, node, new_name, **kwargs):
+        self._record('rename', (node, new_name), kwargs)
+        if isinstance(node, (list, tuple)):
+            node = node[0]
+
+        node_name = self._get_short_name(node)
+        assert node_name in self._node_dict, 'No object matches name: {}'.format(node)
+
+        self._child_list_dict = None
+        rec_node = self._node_dict.pop(node_name)
+        rec_node.name = self._get_unique_name(new_name)
+        self._node_dict[rec_node.name] = rec_node
+
+        for child_node in self._node_dict.values():
+            if child_node.parent == node_name:
+                child_node.parent = rec_node.name
+                # Maya renames the shape nodes along with their transform nodes.
+                if child_node.name == node_name+'Shape':
+                    self._node_dict.pop(child_node.name)
+                    child_node.name = self._get_unique_name(rec_node.name+'Shape')
+                    self._node_dict[child_node.name] = child_node
+
+        return rec_node.name
+
+    def parent(self, *args, **kwargs):
+        self._record('parent', args, kwargs)
+
+        nodes = []
+        for arg in args:
+            nodes.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+
+        parent_node = None
+        if not kwargs.get('world', kwargs.get('w', False)):
+            nodes, parent_node = nodes[:-1], self._get_short_name(nodes[-1])
+            assert parent_node in self._node_dict, 'No object matches name: {}'.format(parent_node)
+
+        self._child_list_dict = None
+        for node in nodes:
+            node_name = self._get_short_name(node)
+            assert node_name in self._node_dict, 'No object matches name: {}'.format(node)
+            self._node_dict[node_name].parent = parent_node
+
+        return nodes
+
+    def objExists(self, name):
+        if '.' in name:
+            node, attr = self._split_plug(name)
+            return node in self._node_dict and attr in self._node_dict[node].attr_dict
+        return self._get_short_name(name) in self._node_dict
+
+    def ls(self, *args, **kwargs):
+        self._record('ls', args, kwargs)
+
+        # The scene model has none of the default nodes of a Maya scene.
+        if kwargs.get('defaultNodes', False):
+            return []
+
+        node_type = kwargs.get('type', kwargs.get('typ'))
+        res_list = []
+        for node_name, rec_node in self._node_dict.items():
+            if node_type and rec_node.node_type != node_type:
+                continue
+            if args and node_name not in [self._get_short_name(arg) for arg in args]:
+                continue
+            res_list.append(node_name)
+        return res_list
+
+    def listRelatives(self, node, **kwargs):
+        self._record('listRelatives', (node,), kwargs)
+        node_name = self._get_short_name(node)
+
+        if kwargs.get('parent', kwargs.get('p', False)):
+            parent_node = self._node_dict[node_name].parent
+            return [parent_node] if parent_node else None
+
+        res_list = list(self._get_child_list_dict().get(node_name, []))
+        if kwargs.get('shapes', kwargs.get('s', False)):
+            res_list = [child_name for child_name in res_list
+                        if self._node_dict[child_name].node_type in g_shape_node_type_dict.values()]
+        return res_list or None
+
+    def delete(self, *args, **kwargs):
+        self._record('delete', args, kwargs)
+
+        # Deleting the construction history keeps the nodes themselves, and the scene model keeps no history.
+        if kwargs.get('constructionHistory', kwargs.get('ch', False)):
+            return
+
+        nodes = []
+        for arg in args:
+            nodes.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+
+        # Gather the nodes along with their descendants, then remove them at once.
+        child_list_dict = self._get_child_list_dict()
+        self._child_list_dict = None
+        self._node_connection_dict = None
+
+        deleted_name_set = set()
+        pending_name_list = [self._get_short_name(node) for node in nodes]
+        while pending_name_list:
+            node_name = pending_name_list.pop()
+            if node_name in deleted_name_set or node_name not in self._node_dict:
+                continue
+            deleted_name_set.add(node_name)
+            pending_name_list.extend(child_list_dict.get(node_name, []))
+
+        for node_name in deleted_name_set:
+            del self._node_dict[node_name]
+
+        # Maya breaks the connections of the deleted nodes.
+        for dst_plug, src_plug in list(self._connection_dict.items()):
+            if dst_plug.split('.', 1)[0] in deleted_name_set or src_plug.split('.', 1)[0] in deleted_name_set:
+                del self._connection_dict[dst_plug]
+
+    def addAttr(self, node, **kwargs):
+        self._record('addAttr', (node,), kwargs)
+        attr = kwargs.get('longName', kwargs.get('ln'))
+        self._node_dict[self._get_short_name(node)].attr_dict[attr] = kwargs.get('defaultValue',
+                                                                                  kwargs.get('dv', 0.0))
+        self._node_dict[self._get_short_name(node)].user_attr_dict[attr] = dict(kwargs)
+
+    def setAttr(self, plug, *values, **kwargs):
+        self._record('setAttr', (plug,)+values, kwargs)
+        node, attr = self._split_plug(plug)
+        assert node in self._node_dict, 'No object matches name: {}'.format(plug)
+
+        if values:
+            self._node_dict[node].attr_dict[attr] = values[0] if 1 == len(values) else values
+
+        lock = kwargs.get('lock', kwargs.get('l'))
+        if lock is not None:
+            if lock:
+                self._node_dict[node].locked_attr_set.add(attr)
+            else:
+                self._node_dict[node].locked_attr_set.discard(attr)
+
+    def getAttr(self, plug, **kwargs):
+        self._record('getAttr', (plug,), kwargs)
+        node, attr = self._split_plug(plug)
+        assert node in self._node_dict, 'No object matches name: {}'.format(plug)
+
+        value = self._node_dict[node].attr_dict.get(attr, 0.0)
+        if kwargs.get('type', False):
+            return g_attr_type_dict.get(type(value), 'double3' if isinstance(value, (list, tuple)) else 'string')
+        return value
+
+    def connectAttr(self, src_plug, dst_plug, **kwargs):
+        self._record('connectAttr', (src_plug, dst_plug), kwargs)
+
+        for plug in (src_plug, dst_plug):
+            assert self._split_plug(plug)[0] in self._node_dict, 'No object matches name: {}'.format(plug)
+
+        dst_plug = '.'.join(self._split_plug(dst_plug))
+        if dst_plug in self._connection_dict and not kwargs.get('force', kwargs.get('f', False)):
+            raise RuntimeError('"{}" is already connected.'.format(dst_plug))
+        self._connection_dict[dst_plug] = '.'.join(self._split_plug(src_plug))
+        self._node_connection_dict = None
+
+    def nodeType(self, node, **kwargs):
+        self._record('nodeType', (node,), kwargs)
+        return self._node_dict[self._get_short_name(node)].node_type
+
+    def objectType(self, node, **kwargs):
+        self._record('objectType', (node,), kwargs)
+        node_type = self._node_dict[self._get_short_name(node)].node_type
+
+        # Only the DAG node type is modeled as a base type.
+        base_type = kwargs.get('isAType', kwargs.get('isa'))
+        if base_type is not None:
+            return base_type == node_type or ('dagNode' == base_type and node_type in g_dag_node_type_list)
+        return node_type
+
+    def listConnections(self, node, **kwargs):
+        self._record('listConnections', (node,), kwargs)
+        node_name = self._get_short_name(node)
+
+        source = kwargs.get('source', kwargs.get('s', True))
+        destination = kwargs.get('destination', kwargs.get('d', True))
+        with_plugs = kwargs.get('plugs', kwargs.get('p', False))
+        with_connections = kwargs.get('connections', kwargs.get('c', False))
+
+        res_list = []
+        for dst_plug, src_plug in self._get_node_connection_dict().get(node_name, []):
+            if source and dst_plug.split('.', 1)[0] == node_name:
+                this_plug, other_plug = dst_plug, src_plug
+            elif destination and src_plug.split('.', 1)[0] == node_name:
+                this_plug, other_plug = src_plug, dst_plug
+            else:
+                continue
+
+            if with_connections:
+                res_list.append(this_plug)
+            res_list.append(other_plug if with_plugs else other_plug.split('.', 1)[0])
+        return res_list or None
+
+    def listAttr(self, node, **kwargs):
+        self._record('listAttr', (node,), kwargs)
+        # The attributes of a plug are listed as those of its node, whose names start with the plug's attribute.
+        node, _, attr_prefix = node.partition('.')
+        rec_node = self._node_dict[self._get_short_name(node)]
+        if attr_prefix:
+            return sorted([attr for attr in rec_node.attr_dict if attr.startswith(attr_prefix)]) or None
+
+        if kwargs.get('userDefined', kwargs.get('ud', False)):
+            return sorted(rec_node.user_attr_dict) or None
+        if kwargs.get('locked', False):
+            return sorted(rec_node.locked_attr_set) or None
+        return sorted([attr for attr in rec_node.attr_dict if attr not in rec_node.alias_dict]) or None
+
+    def attributeQuery(self, attr, **kwargs):
+        self._record('attributeQuery', (attr,), kwargs)
+        rec_node = self._node_dict[self._get_short_name(kwargs.get('node', kwargs.get('n')))]
+
+        # Only the dynamic attributes are modeled; the others default to 0.
+        attr_kwargs = rec_node.user_attr_dict.get(attr, {})
+        if kwargs.get('exists', kwargs.get('ex', False)):
+            return attr in rec_node.attr_dict
+        if kwargs.get('listDefault', kwargs.get('ld', False)):
+            return [attr_kwargs.get('defaultValue', attr_kwargs.get('dv', 0.0))]
+        if kwargs.get('attributeType', kwargs.get('at', False)):
+            return attr_kwargs.get('attributeType', attr_kwargs.get('at', 'double'))
+        if kwargs.get('keyable', kwargs.get('k', False)):
+            return attr_kwargs.get('keyable', attr_kwargs.get('k', False))
+        for query_flag, attr_flag in [('minExists', 'minValue'), ('maxExists', 'maxValue')]:
+            if kwargs.get(query_flag, False):
+                return attr_flag in attr_kwargs
+        for query_flag, attr_flag in [('minimum', 'minValue'), ('maximum', 'maxValue')]:
+            if kwargs.get(query_flag, False):
+                return [attr_kwargs[attr_flag]]
+        return None
+
+    def aliasAttr(self, *args, **kwargs):
+        self._record('aliasAttr', args, kwargs)
+
+        if kwargs.get('query', kwargs.get('q', False)):
+            rec_node = self._node_dict[self._get_short_name(args[0])]
+            res_list = []
+            for alias, attr in sorted(rec_node.alias_dict.items()):
+                res_list.extend([alias, attr])
+            return res_list or None
+
+        alias, plug = args
+        node, attr = self._split_plug(plug)
+        self._node_dict[node].alias_dict[alias] = attr
+
+    def undoInfo(self, *args, **kwargs):
+        self._record('undoInfo', args, kwargs)
+
+        if kwargs.get('openChunk', False):
+            self._undo_chunk_depth += 1
+        elif kwargs.get('closeChunk', False):
+            self._undo_chunk_depth -= 1
+        return True
+
+    def about(self, **kwargs):
+        self._record('about', (), kwargs)
+        if kwargs.get('batch', False):
+            return True
+        return None
+
+    def warning(self, message):
+        self._record('warning', (message,), {})
+        sys.stderr.write('# Warning: {}\n'.format(message))
+
+    def error(self, message):
+        self._record('error', (message,), {})
+        raise RuntimeError(message)
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def install(stand_in_cmds=None):
+    """ Register a recording stand-in as the maya.cmds module (along with an empty maya.mel module),
+    so that the facial system's modules importing maya.cmds run against it.
+    Note that it does nothing to a Python interpreter which has already imported Maya.
+
+    :param stand_in_cmds: a recordingCmds instance; if it is None, a new one is made
+    :return: the recordingCmds instance being maya.cmds
+    """
+
+    if stand_in_cmds is None:
+        stand_in_cmds = recordingCmds()
+
+    if 'maya' in sys.modules and hasattr(sys.modules['maya'], '__path__'):
+        return sys.modules['maya'].cmds
+
+    maya_module = types.ModuleType('maya')
+    maya_module.cmds = stand_in_cmds
+    maya_module.mel = types.ModuleType('maya.mel')
+    maya_module.mel.eval = lambda *args, **kwargs: stand_in_cmds._record('mel.eval', args, kwargs)
+
+    sys.modules['maya'] = maya_module
+    sys.modules['maya.cmds'] = stand_in_cmds
+    sys.modules['maya.mel'] = maya_module.mel
+
+    return stand_in_cmds
@@ -0,0 +1,387 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: scene_builder.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module containing the scene builder, which records the node creations, parenting, connections and attribute edits
+of a rig build and commits them to the scene in one batch.
+
+In Maya, the batch is committed through a single MDagModifier.doIt(), whose undo is recorded as one entry of the undo
+queue by the "lcApiUndo" command. Without the OpenMaya API (e.g. with a recording stand-in of maya.cmds installed),
+the batch is replayed through the maya.cmds functions instead.
+
+Only the recorded operations are batched. The nodes a build reads back before its commit, e.g. the curves, the
+controllers, the blend-shape nodes and the added attributes of the control zones, are created through maya.cmds right
+away; reverting them is left to the caller's undo chunk (see demo.lv3chr_facialsys_demo.lc3chr_facialsys_construct()).
+"""
+
+import re
+import sys
+
+import maya.cmds as cmds
+
+from general import profiler
+from general import util
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_attr_token_regex = re.compile(r'^(\w+)(?:\[(\d+)\])?$')
+
+# ======================================================================================================================
+class sceneBuilderOpEnum(object):
+    create_node = 'createNode'
+    parent = 'parent'
+    connect_attr = 'connectAttr'
+    set_attr = 'setAttr'
+
+# ======================================================================================================================
+class sceneBuilder(object):
+    """ A scene builder queues the utility node creations, parenting, connections and attribute edits of the control
+    zones, and commits them to the scene at once.
+
+    The node names handed out by create_node() can be used in the queued operations right away; they are resolved to
+    the created nodes on commit, even if Maya has to rename the nodes to keep them unique.
+    """
+
+    def __init__(self, cmds_backend=None):
+        """
+        :param cmds_backend: a maya.cmds-like object to replay the operations through;
+                             if it is None, the OpenMaya API is used when available, otherwise maya.cmds.
+        """
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        # A list of (sceneBuilderOpEnum value, arguments tuple, keyword arguments dictionary)
+        self._op_list = []
+        # A list of (callable, arguments tuple, keyword arguments dictionary) to call after the operations committed
+        self._post_commit_list = []
+
+        # {requested node name: actual node name} of the nodes created by the last commit
+        self._node_name_dict = {}
+
+        self._cmds_backend = cmds_backend
+        self._api = None
+        if cmds_backend is None:
+            try:
+                import maya.api.OpenMaya as OpenMaya2
+                self._api = OpenMaya2
+            except ImportError:
+                self._cmds_backend = cmds
+
+        # The modifier of the last commit done through the API, if it could not be put onto the undo queue.
+        self._unrecorded_modifier = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __repr__(self):
+        return NotImplemented
+
+    def get_operation_count(self):
+        """
+        :return: the number of queued operations
+        """
+        return len(self._op_list)
+
+    def get_node_name(self, name):
+        """
+        :param name: the node name requested on create_node()
+        :return: the actual name of the created node after committed
+        """
+        return self._node_name_dict.get(name, name)
+
+    def uses_api(self):
+        """
+        :return: True if the operations are committed through the OpenMaya API
+        """
+        return self._api is not None
+
+    # Operation Recording Functions ------------------------------------------------------------------------------------
+    def create_node(self, node_type, name, parent=None):
+        """
+        :param node_type: the type name of the node, e.g. "multiplyDivide"
+        :param name: name of the node to create
+        :param parent: name of the parent of the DAG node to create; DG nodes should leave it None
+        :return: the requested node name, which the other operations of this builder can refer to
+        """
+
+        self._op_list.append((sceneBuilderOpEnum.create_node, (node_type, name), {'parent': parent}))
+        profiler.count_node(node_type)
+        return name
+
+    def parent(self, nodes, parent_node, relative=False):
+        """ Queue a reparenting operation, as cmds.parent() does.
+        Note that MDagModifier.reparentNode() always keeps the local transformations of the nodes. Without "relative",
+        the commit through the API first edits the translation, rotation and scale of each transform to keep its
+        world-space placement under the new parent; this is done for the transforms and parents existing before the
+        commit, while the nodes created by the same commit, and the joints, keep their local transformations.
+
+        :param nodes: a DAG node name or a list of DAG node names
+        :param parent_node: name of the new parent node
+        :param relative: if True, keep the local transformations of the nodes; otherwise their world-space placement
+        :return: None
+        """
+
+        if not isinstance(nodes, (list, tuple)):
+            nodes = [nodes]
+
+        self._op_list.append((sceneBuilderOpEnum.parent, (list(nodes), parent_node), {'relative': relative}))
+
+    def connect_attr(self, src_plug, dst_plug, force=False):
+        """
+        :param src_plug: the source plug, e.g. "node.translateX"
+        :param dst_plug: the destination plug, e.g. "node.input1X"
+        :param force: if True, break the existing incoming connection of the destination plug
+        :return: None
+        """
+
+        self._op_list.append((sceneBuilderOpEnum.connect_attr, (src_plug, dst_plug), {'force': force}))
+
+    def set_attr(self, plug, value):
+        """
+        :param plug: a numeric or boolean plug, e.g. "node.operation"
+        :param value: the new value of the plug
+        :return: None
+        """
+
+        self._op_list.append((sceneBuilderOpEnum.set_attr, (plug, value), {}))
+
+    def add_post_commit(self, func, *args, **kwargs):
+        """ Queue a call to run after the operations committed,
+        for the build steps which need the committed connections to evaluate, e.g. the skin binding.
+
+        :return: None
+        """
+
+        self._post_commit_list.append((func, args, kwargs))
+
+    # Commit Functions -------------------------------------------------------------------------------------------------
+    def commit(self):
+        """ Commit the queued operations to the scene, then run the post-commit calls.
+        If an operation fails, the operations of this commit are reverted before the error is raised.
+
+        :return: the number of committed operations
+        """
+
+        op_list = self._op_list
+        post_commit_list = self._post_commit_list
+        self._op_list = []
+        self._post_commit_list = []
+
+        if op_list:
+            if self._api:
+                self._commit_api(op_list)
+            else:
+                self._commit_cmds(op_list)
+
+        for func, args, kwargs in post_commit_list:
+            func(*args, **kwargs)
+
+        return len(op_list)
+
+    def rollback(self):
+        """ Drop the queued operations.
+        The committed operations are reverted by undoing them, except for the last commit done through the API
+        which could not be put onto the undo queue; this function reverts it directly. The nodes created through
+        maya.cmds outside of this builder are not reverted.
+
+        :return: None
+        """
+
+        self._op_list = []
+        self._post_commit_list = []
+
+        if self._unrecorded_modifier:
+            self._unrecorded_modifier.undoIt()
+            self._unrecorded_modifier = None
+
+    def _commit_api(self, op_list):
+        """ Commit the operations through one MDagModifier.doIt().
+        :return: None
+        """
+
+        OpenMaya2 = self._api
+
+        modifier = OpenMaya2.MDagModifier()
+        created_node_dict = {}  # {requested node name: MObject}
+
+        try:
+            for op, args, kwargs in op_list:
+                if sceneBuilderOpEnum.create_node == op:
+                    node_type, name = args
+                    if kwargs['parent']:
+                        node_obj = modifier.createNode(node_type,
+                                                       self._get_api_node(kwargs['parent'], created_node_dict))
+                    else:
+                        # MDagModifier.createNode() only creates DAG nodes.
+                        try:
+                            node_obj = OpenMaya2.MDGModifier.createNode(modifier, node_type)
+                        except (RuntimeError, TypeError):
+                            node_obj = modifier.createNode(node_type)
+                    modifier.renameNode(node_obj, name)
+                    created_node_dict[name] = node_obj
+
+                elif sceneBuilderOpEnum.parent == op:
+                    nodes, parent_node = args
+                    parent_obj = self._get_api_node(parent_node, created_node_dict)
+                    for node in nodes:
+                        node_obj = self._get_api_node(node, created_node_dict)
+                        if not kwargs['relative'] and node not in created_node_dict and \
+                           parent_node not in created_node_dict:
+                            self._keep_world_transform(modifier, node_obj, parent_obj)
+                        modifier.reparentNode(node_obj, parent_obj)
+
+                elif sceneBuilderOpEnum.connect_attr == op:
+                    src_plug = self._get_api_plug(args[0], created_node_dict)
+                    dst_plug = self._get_api_plug(args[1], created_node_dict)
+                    if kwargs['force'] and dst_plug.isDestination:
+                        modifier.disconnect(dst_plug.source(), dst_plug)
+                    modifier.connect(src_plug, dst_plug)
+
+                elif sceneBuilderOpEnum.set_attr == op:
+                    plug = self._get_api_plug(args[0], created_node_dict)
+                    value = args[1]
+                    if isinstance(value, bool):
+                        modifier.newPlugValueBool(plug, value)
+                    elif isinstance(value, int):
+                        modifier.newPlugValueInt(plug, value)
+                    else:
+                        modifier.newPlugValueDouble(plug, value)
+
+            modifier.doIt()
+        except:
+            exc_info = sys.exc_info()
+            modifier.undoIt()
+            cmds.warning('[sceneBuilder] Failed to commit the scene operations; the commit has been reverted.')
+            util.reraise(exc_info)
+
+        self._unrecorded_modifier = None
+        self._node_name_dict = dict((name, OpenMaya2.MFnDependencyNode(node_obj).name())
+                                    for name, node_obj in created_node_dict.items())
+
+        # Put the commit onto the undo queue as one entry.
+        try:
+            from plugin import api_undo
+            api_undo.commit(modifier.undoIt, modifier.doIt)
+        except RuntimeError:
+            self._unrecorded_modifier = modifier
+            cmds.warning('[sceneBuilder] The "lcApiUndo" command is unavailable; the commit can not be undone.')
+
+    def _commit_cmds(self, op_list):
+        """ Replay the operations through the maya.cmds-like backend in one undo chunk.
+        :return: None
+        """
+
+        backend = self._cmds_backend
+        self._node_name_dict = {}
+
+        def get_name(name):
+            return self._node_name_dict.get(name, name)
+
+        def get_plug(plug):
+            node, attr = plug.split('.', 1)
+            return get_name(node)+'.'+attr
+
+        backend.undoInfo(openChunk=True, chunkName='sceneBuilder_commit')
+        # The node creations have been counted by the profiler when queued.
+        profiler.pause_node_count()
+        try:
+            for op, args, kwargs in op_list:
+                if sceneBuilderOpEnum.create_node == op:
+                    node_type, name = args
+                    if kwargs['parent']:
+                        node = backend.createNode(node_type, name=name, parent=get_name(kwargs['parent']))
+                    else:
+                        node = backend.createNode(node_type, name=name)
+                    self._node_name_dict[name] = node
+
+                elif sceneBuilderOpEnum.parent == op:
+                    nodes, parent_node = args
+                    backend.parent([get_name(node) for node in nodes], get_name(parent_node),
+                                   relative=kwargs['relative'])
+
+                elif sceneBuilderOpEnum.connect_attr == op:
+                    backend.connectAttr(get_plug(args[0]), get_plug(args[1]), force=kwargs['force'])
+
+                elif sceneBuilderOpEnum.set_attr == op:
+                    backend.setAttr(get_plug(args[0]), args[1])
+        finally:
+            profiler.resume_node_count()
+            backend.undoInfo(closeChunk=True)
+
+    def _keep_world_transform(self, modifier, node_obj, parent_obj):
+        """ Queue the edits of the translation, rotation and scale of a transform, which keep its world-space placement
+        once it is reparented under the parent node. The joints are left as they are.
+        :return: None
+        """
+
+        OpenMaya2 = self._api
+        if not node_obj.hasFn(OpenMaya2.MFn.kTransform) or node_obj.hasFn(OpenMaya2.MFn.kJoint):
+            return
+
+        node_path = OpenMaya2.MDagPath.getAPathTo(node_obj)
+        parent_world_mtx = OpenMaya2.MMatrix()
+        if parent_obj.hasFn(OpenMaya2.MFn.kDagNode):
+            parent_world_mtx = OpenMaya2.MDagPath.getAPathTo(parent_obj).inclusiveMatrix()
+        local_mtx = node_path.inclusiveMatrix() * parent_world_mtx.inverse()
+
+        transform_fn = OpenMaya2.MFnTransform(node_path)
+        if local_mtx.isEquivalent(transform_fn.transformation().asMatrix()):
+            return
+
+        transform_mtx = OpenMaya2.MTransformationMatrix(local_mtx)
+        transform_mtx.reorderRotation(transform_fn.rotationOrder())
+        translation = transform_mtx.translation(OpenMaya2.MSpace.kTransform)
+        rotation = transform_mtx.rotation()
+        scale = transform_mtx.scale(OpenMaya2.MSpace.kTransform)
+
+        for axis_id, axis in enumerate(['X', 'Y', 'Z']):
+            modifier.newPlugValueDouble(transform_fn.findPlug('translate'+axis, False), translation[axis_id])
+            modifier.newPlugValueMAngle(transform_fn.findPlug('rotate'+axis, False),
+                                        OpenMaya2.MAngle(rotation[axis_id]))
+            modifier.newPlugValueDouble(transform_fn.findPlug('scale'+axis, False), scale[axis_id])
+
+    def _get_api_node(self, name, created_node_dict):
+        """
+        :return: the MObject of a node created by this commit, or of an existing node
+        """
+
+        if name in created_node_dict:
+            return created_node_dict[name]
+
+        sel_list = self._api.MSelectionList()
+        sel_list.add(name)
+        return sel_list.getDependNode(0)
+
+    def _get_api_plug(self, plug, created_node_dict):
+        """
+        :param plug: a plug name, e.g. "node.input3D[0].input3Dx"
+        :return: the MPlug
+        """
+
+        OpenMaya2 = self._api
+        node, attr_path = plug.split('.', 1)
+
+        if node not in created_node_dict:
+            # The existing nodes may have attribute aliases, e.g. the blend-shape target weights.
+            sel_list = OpenMaya2.MSelectionList()
+            sel_list.add(plug)
+            return sel_list.getPlug(0)
+
+        # The nodes created by this commit are not in the scene before doIt(), so walk the attribute path by hand.
+        node_fn = OpenMaya2.MFnDependencyNode(created_node_dict[node])
+        res_plug = None
+        for attr_token in attr_path.split('.'):
+            attr_match = g_attr_token_regex.match(attr_token)
+            assert attr_match, 'Invalid attribute name: {}'.format(plug)
+
+            attr_obj = node_fn.attribute(attr_match.group(1))
+            if res_plug is None:
+                res_plug = OpenMaya2.MPlug(created_node_dict[node], attr_obj)
+            else:
+                res_plug = res_plug.child(attr_obj)
+
+            if attr_match.group(2) is not None:
+                res_plug = res_plug.elementByLogicalIndex(int(attr_match.group(2)))
+
+        return res_plug
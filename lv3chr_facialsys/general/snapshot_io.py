@@ -0,0 +1,444 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: snapshot_io.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to capture the built facial rig from the scene into a snapshot, and to recreate the rig from a snapshot
+without running the build (see database.rig_snapshot for the snapshot file).
+
+The rig's nodes are the DAG nodes under its root groups (the zone sub-master groups by default), and the DG nodes
+connected to them directly or through other DG nodes, except the default nodes of the scene, e.g. "time1" or
+"layerManager". The connections to the nodes outside the rig are captured as well, and restored if those nodes exist.
+The geometry of the NURBS shapes without construction history is captured through the OpenMaya API.
+
+A rig is recreated in bulk: the nodes are created through one scene builder commit, then the geometry of the NURBS
+shapes is set through one MDGModifier, then the dynamic attributes and the aliases are added, and the attribute values
+and the connections are set through another commit, all on the undo queue, e.g.
+
+    from general import snapshot_io
+    snapshot_io.export_snapshot('D:/rigs/lv3chr_facial.json')
+    ...
+    snapshot_io.import_snapshot('D:/rigs/lv3chr_facial.json')
+
+Note that only the scalar attributes, the skin clusters' matrices and the string dynamic attributes are captured;
+the other data attributes keep the values the nodes are created with. The unitless values are set through the scene
+builder in bulk, while the linear, angular and time values are set through cmds.setAttr(), in the UI units.
+"""
+
+import sys
+import importlib
+import collections
+
+import maya.cmds as cmds
+try:
+    import maya.api.OpenMaya as OpenMaya2
+except ImportError:
+    OpenMaya2 = None    # e.g. with the recording stand-in of maya.cmds installed
+
+from general import util
+from general import hierarchy
+from general.scene_builder import sceneBuilder
+
+from database import rig_snapshot
+
+# global variables -----------------------------------------------------------------------------------------------------
+# {node type: the names of its matrix attributes to capture}
+g_matrix_attr_dict = {
+    'skinCluster': ['bindPreMatrix', 'geomMatrix']
+}
+
+# {node type of the facial system's plug-ins: the module of the plug-in in the plugin package}
+g_plugin_node_type_dict = {
+    'lcClosestPointLookup': 'closest_point_lookup',
+    'lcCrvFollowBlend': 'curve_follow_blend',
+    'lcCrvProjectToSurface': 'curve_surface_projection',
+    'lcCrv_ProjectToUVPlane': 'curve_uv_projection',
+    'lcFacialFollow': 'facial_follow'
+}
+
+g_geometry_node_type_list = ['nurbsCurve', 'nurbsSurface']
+
+# The attribute types whose values cmds.getAttr() gives in the UI units, while the API takes the internal units.
+g_unit_attr_type_list = ['doubleLinear', 'floatLinear', 'doubleAngle', 'floatAngle', 'time']
+
+# function definitions -------------------------------------------------------------------------------------------------
+def get_default_roots():
+    """
+    :return: a list of the names of the zone sub-master groups in the scene
+    """
+    return [zone_group.get_group_name() for zone_group in hierarchy.g_zone_group_list
+            if cmds.objExists(zone_group.get_group_name())]
+
+def export_snapshot(file_path, roots=None):
+    """ Capture the rig in the scene into a snapshot file.
+    :param file_path: path of the snapshot JSON file
+    :param roots: a list of the names of the root DAG nodes of the rig; the zone sub-master groups if it is None
+    :return: the path of the written file
+    """
+    return rig_snapshot.save_snapshot(capture_snapshot(roots), file_path)
+
+def capture_snapshot(roots=None):
+    """
+    :param roots: a list of the names of the root DAG nodes of the rig; the zone sub-master groups if it is None
+    :return: the snapshot of the rig in the scene, see database.rig_snapshot
+    """
+
+    if roots is None:
+        roots = get_default_roots()
+    snapshot = rig_snapshot.make_snapshot(roots)
+
+    node_list = gather_dag_nodes(roots)
+    node_set = set([node for node, parent in node_list])
+    default_node_set = set(cmds.ls(defaultNodes=True) or [])
+
+    # Gather the DG nodes through the connections, breadth first, along with the connections of all the nodes.
+    connection_dict = collections.OrderedDict()     # {destination plug: source plug}
+    pending_node_list = collections.deque([node for node, parent in node_list])
+    while pending_node_list:
+        node = pending_node_list.popleft()
+
+        for is_source in [True, False]:
+            conn_list = cmds.listConnections(node, connections=True, plugs=True,
+                                             source=is_source, destination=not is_source) or []
+            for this_plug, other_plug in zip(conn_list[::2], conn_list[1::2]):
+                if is_source:
+                    connection_dict[this_plug] = other_plug
+                else:
+                    connection_dict[other_plug] = this_plug
+
+                other_node = other_plug.split('.', 1)[0]
+                if other_node in node_set or other_node in default_node_set or \
+                   cmds.objectType(other_node, isAType='dagNode'):
+                    continue
+
+                check_node_name(other_node)
+                node_set.add(other_node)
+                node_list.append((other_node, None))
+                pending_node_list.append(other_node)
+
+    alias_dict = {}     # {node: {alias: attribute}}
+    for node, parent in node_list:
+        alias_list = cmds.aliasAttr(node, query=True) or []
+        alias_dict[node] = dict(zip(alias_list[::2], alias_list[1::2]))
+        for alias, attr in zip(alias_list[::2], alias_list[1::2]):
+            snapshot['aliases'].append([node, alias, attr])
+
+    def get_plug(plug):
+        node, attr = plug.split('.', 1)
+        return node+'.'+alias_dict.get(node, {}).get(attr, attr)
+
+    dst_plug_set = set()
+    for dst_plug, src_plug in connection_dict.items():
+        dst_plug = get_plug(dst_plug)
+        dst_plug_set.add(dst_plug)
+        snapshot['connections'].append([get_plug(src_plug), dst_plug])
+
+    # The default values are shared by the nodes of a type, except those of the dynamic attributes.
+    default_value_dict = {}     # {(node type, attribute): default value}
+
+    for node, parent in node_list:
+        node_type = cmds.nodeType(node)
+        snapshot['nodes'].append([node, node_type, parent])
+
+        user_attr_list = cmds.listAttr(node, userDefined=True) or []
+        for attr in user_attr_list:
+            attr_flags = get_user_attr_flags(node, attr)
+            if attr_flags is None:
+                cmds.warning('[snapshot_io] Skipped the unsupported dynamic attribute "{}.{}".'.format(node, attr))
+                continue
+            snapshot['user_attrs'].append([node, attr, attr_flags])
+
+            if 'string' == attr_flags.get('dataType') and node+'.'+attr not in dst_plug_set:
+                snapshot['data_attrs'].append([node+'.'+attr, 'string', [cmds.getAttr(node+'.'+attr) or '']])
+
+        for attr in cmds.listAttr(node, multi=True, scalar=True, write=True) or []:
+            plug = node+'.'+attr
+            if plug in dst_plug_set:
+                continue
+            try:
+                value = cmds.getAttr(plug)
+            except (RuntimeError, ValueError):
+                continue
+
+            if isinstance(value, (list, tuple)):
+                snapshot['data_attrs'].append([plug, None, flatten_values(value)])
+                continue
+            if not isinstance(value, (bool, int, float)):
+                continue
+
+            # The attribute name without the indices and the parent attributes, e.g. "weights" of
+            # "weightList[0].weights[2]"
+            attr_name = attr.split('.')[-1].split('[')[0]
+            default_key = (node if attr_name in user_attr_list else node_type, attr_name)
+            if default_key not in default_value_dict:
+                default_value_list = cmds.attributeQuery(attr_name, node=node, listDefault=True) or [None]
+                default_value_dict[default_key] = default_value_list[0]
+            if rig_snapshot.is_close(value, default_value_dict[default_key]):
+                continue
+
+            # The values with units are set through cmds.setAttr(), which takes them in the UI units as captured.
+            if cmds.getAttr(plug, type=True) in g_unit_attr_type_list:
+                snapshot['data_attrs'].append([plug, None, [value]])
+            else:
+                snapshot['attrs'].append([plug, value])
+
+        for attr_name in g_matrix_attr_dict.get(node_type, []):
+            for attr in cmds.listAttr(node+'.'+attr_name, multi=True) or []:
+                if node+'.'+attr not in dst_plug_set:
+                    snapshot['data_attrs'].append([node+'.'+attr, 'matrix', list(cmds.getAttr(node+'.'+attr))])
+
+        for attr in cmds.listAttr(node, locked=True) or []:
+            snapshot['locked_attrs'].append(node+'.'+attr)
+
+        if node_type in g_geometry_node_type_list and node+'.create' not in dst_plug_set and OpenMaya2 is not None:
+            snapshot['geometry'].append([node, get_geometry(node, node_type)])
+
+    return snapshot
+
+def import_snapshot(snapshot):
+    """ Recreate the rig of a snapshot in the scene. If any step fails, the whole import is undone.
+    :param snapshot: the snapshot dictionary, or path of the snapshot JSON file
+    :return: a list of the names of the root DAG nodes of the recreated rig
+    """
+
+    if not isinstance(snapshot, dict):
+        snapshot = rig_snapshot.load_snapshot(snapshot)
+
+    existing_root_list = [root for root in snapshot['roots'] if cmds.objExists(root)]
+    if existing_root_list:
+        cmds.error('The rig to import is already in the scene: {}'.format(', '.join(existing_root_list)))
+
+    load_plugins(set([node_type for node, node_type, parent in snapshot['nodes']]))
+
+    node_parent_dict = dict((node, parent) for node, node_type, parent in snapshot['nodes'])
+    # The geometry is set through the OpenMaya API, which the recording stand-in of maya.cmds has not.
+    geometry_dict = dict((shape, geometry) for shape, geometry in snapshot['geometry']) if OpenMaya2 else {}
+
+    node_builder = sceneBuilder()
+    attr_builder = sceneBuilder()
+    cmds.undoInfo(openChunk=True, chunkName='import_rig_snapshot')
+    try:
+        # Create the nodes, the parents before their children.
+        for node, node_type, parent in snapshot['nodes']:
+            if parent and parent not in node_parent_dict and not cmds.objExists(parent):
+                cmds.warning('[snapshot_io] The parent "{}" of "{}" is not in the scene.'.format(parent, node))
+                parent = None
+            node_builder.create_node(node_type, node, parent=parent)
+        node_builder.commit()
+
+        # {node name in the snapshot: node name in the scene}, which differ if Maya renamed the nodes to be unique
+        node_name_dict = dict((node, node_builder.get_node_name(node)) for node in node_parent_dict)
+
+        def get_name(node):
+            return node_name_dict.get(node, node)
+
+        def get_plug(plug):
+            node, attr = plug.split('.', 1)
+            return get_name(node)+'.'+attr
+
+        if geometry_dict:
+            set_geometry(dict((get_name(shape), geometry) for shape, geometry in geometry_dict.items()))
+
+        for node, attr, attr_flags in snapshot['user_attrs']:
+            cmds.addAttr(get_name(node), longName=attr, **attr_flags)
+        for node, alias, attr in snapshot['aliases']:
+            cmds.aliasAttr(alias, get_name(node)+'.'+attr)
+
+        # Set the attributes, then connect them.
+        for plug, value in snapshot['attrs']:
+            attr_builder.set_attr(get_plug(plug), value)
+
+        missing_node_set = set()
+        for src_plug, dst_plug in snapshot['connections']:
+            plug_node_list = [plug.split('.', 1)[0] for plug in (src_plug, dst_plug)]
+            missing_node_list = [node for node in plug_node_list
+                                 if node not in node_name_dict and not cmds.objExists(node)]
+            if missing_node_list:
+                missing_node_set.update(missing_node_list)
+                continue
+            attr_builder.connect_attr(get_plug(src_plug), get_plug(dst_plug), force=True)
+        attr_builder.commit()
+
+        if missing_node_set:
+            cmds.warning('[snapshot_io] Skipped the connections to the nodes not in the scene: {}'.format(
+                ', '.join(sorted(missing_node_set))))
+
+        for plug, data_type, values in snapshot['data_attrs']:
+            if data_type:
+                cmds.setAttr(get_plug(plug), *values, type=data_type)
+            else:
+                cmds.setAttr(get_plug(plug), *values)
+
+        for plug in snapshot['locked_attrs']:
+            cmds.setAttr(get_plug(plug), lock=True)
+    except:
+        exc_info = sys.exc_info()
+        node_builder.rollback()
+        attr_builder.rollback()
+        cmds.undoInfo(closeChunk=True)
+        cmds.undo()
+        cmds.warning('The rig snapshot import failed and has been undone.')
+        util.reraise(exc_info)
+    cmds.undoInfo(closeChunk=True)
+
+    return [get_name(root) for root in snapshot['roots']]
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def check_node_name(node):
+    """ A snapshot refers to the nodes by their names, which must be unique.
+    """
+
+    if '|' in node:
+        cmds.error('The node name "{}" is not unique; the rig can not be captured.'.format(node))
+
+def gather_dag_nodes(roots):
+    """
+    :param roots: a list of the names of the root DAG nodes
+    :return: a list of (DAG node, parent node) of the roots and their descendants, the parents before their children
+    """
+
+    node_list = []
+    pending_node_list = collections.deque()
+    for root in roots:
+        check_node_name(root)
+        root_parent_list = cmds.listRelatives(root, parent=True) or [None]
+        pending_node_list.append((root, root_parent_list[0]))
+
+    while pending_node_list:
+        node, parent = pending_node_list.popleft()
+        node_list.append((node, parent))
+
+        for child_node in cmds.listRelatives(node, children=True) or []:
+            check_node_name(child_node)
+            pending_node_list.append((child_node, node))
+
+    return node_list
+
+def flatten_values(values):
+    """
+    :return: a list of the numbers of a value returned by cmds.getAttr(), e.g. [(x, y, z)] of a double3 attribute
+    """
+
+    value_list = []
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            value_list.extend(flatten_values(value))
+        else:
+            value_list.append(value)
+    return value_list
+
+def get_user_attr_flags(node, attr):
+    """
+    :return: a dictionary of the cmds.addAttr() flags recreating a dynamic attribute,
+             or None if the attribute is not a numeric or a string one
+    """
+
+    attr_type = cmds.attributeQuery(attr, node=node, attributeType=True)
+    if 'typed' == attr_type:
+        if 'string' != cmds.getAttr(node+'.'+attr, type=True):
+            return None
+        return {'dataType': 'string'}
+    if attr_type in ['compound', 'message'] or cmds.attributeQuery(attr, node=node, multi=True):
+        return None
+
+    attr_flags = {
+        'attributeType': attr_type,
+        'keyable': bool(cmds.attributeQuery(attr, node=node, keyable=True))
+    }
+    if 'enum' != attr_type:
+        attr_flags['defaultValue'] = cmds.attributeQuery(attr, node=node, listDefault=True)[0]
+    else:
+        attr_flags['enumName'] = ':'.join(cmds.attributeQuery(attr, node=node, listEnum=True) or [])
+    if cmds.attributeQuery(attr, node=node, minExists=True):
+        attr_flags['minValue'] = cmds.attributeQuery(attr, node=node, minimum=True)[0]
+    if cmds.attributeQuery(attr, node=node, maxExists=True):
+        attr_flags['maxValue'] = cmds.attributeQuery(attr, node=node, maximum=True)[0]
+    return attr_flags
+
+def get_geometry(shape, node_type):
+    """
+    :param shape: name of a NURBS curve or surface shape
+    :param node_type: "nurbsCurve" or "nurbsSurface"
+    :return: a dictionary of the geometry of the shape in its object space, see create_geometry_data()
+    """
+
+    sel_list = OpenMaya2.MSelectionList()
+    sel_list.add(shape)
+    shape_dag_path = sel_list.getDagPath(0)
+
+    if 'nurbsCurve' == node_type:
+        nurbs_fn = OpenMaya2.MFnNurbsCurve(shape_dag_path)
+        geometry = {
+            'degree': nurbs_fn.degree,
+            'form': nurbs_fn.form,
+            'knots': list(nurbs_fn.knots())
+        }
+    else:
+        nurbs_fn = OpenMaya2.MFnNurbsSurface(shape_dag_path)
+        geometry = {
+            'degree': [nurbs_fn.degreeInU, nurbs_fn.degreeInV],
+            'form': [nurbs_fn.formInU, nurbs_fn.formInV],
+            'knots': [list(nurbs_fn.knotsInU()), list(nurbs_fn.knotsInV())]
+        }
+
+    # The CVs of a surface are listed with the V index varying fastest.
+    geometry['type'] = node_type
+    geometry['cvs'] = [coord for cv_pt in nurbs_fn.cvPositions(OpenMaya2.MSpace.kObject)
+                       for coord in (cv_pt.x, cv_pt.y, cv_pt.z)]
+    return geometry
+
+def create_geometry_data(geometry):
+    """
+    :param geometry: a dictionary of the geometry, see get_geometry()
+    :return: the MObject of a NURBS curve or surface data wrapper holding the geometry
+    """
+
+    cv_coords = geometry['cvs']
+    cv_pts = OpenMaya2.MPointArray([OpenMaya2.MPoint(cv_coords[idx], cv_coords[idx+1], cv_coords[idx+2])
+                                    for idx in range(0, len(cv_coords), 3)])
+
+    if 'nurbsCurve' == geometry['type']:
+        data_obj = OpenMaya2.MFnNurbsCurveData().create()
+        OpenMaya2.MFnNurbsCurve().create(cv_pts, geometry['knots'], geometry['degree'], geometry['form'],
+                                         False, False, data_obj)
+    else:
+        data_obj = OpenMaya2.MFnNurbsSurfaceData().create()
+        OpenMaya2.MFnNurbsSurface().create(cv_pts, geometry['knots'][0], geometry['knots'][1],
+                                           geometry['degree'][0], geometry['degree'][1],
+                                           geometry['form'][0], geometry['form'][1],
+                                           False, data_obj)
+    return data_obj
+
+def set_geometry(shape_geometry_dict):
+    """ Set the geometry of the NURBS shapes without construction history through their "cached" attributes, as the
+    Maya ASCII files do, by one MDGModifier put onto the undo queue.
+
+    :param shape_geometry_dict: a dictionary of {name of the shape: a dictionary of the geometry, see get_geometry()}
+    :return: None
+    """
+
+    modifier = OpenMaya2.MDGModifier()
+    for shape, geometry in sorted(shape_geometry_dict.items()):
+        sel_list = OpenMaya2.MSelectionList()
+        sel_list.add(shape+'.cached')
+        modifier.newPlugValue(sel_list.getPlug(0), create_geometry_data(geometry))
+    modifier.doIt()
+
+    try:
+        from plugin import api_undo
+        api_undo.commit(modifier.undoIt, modifier.doIt)
+    except RuntimeError:
+        cmds.warning('[snapshot_io] The "lcApiUndo" command is unavailable; the geometry can not be undone.')
+
+def load_plugins(node_type_set):
+    """ Load the facial system's plug-ins defining the node types.
+    :return: None
+    """
+
+    for node_type, plugin_module_name in sorted(g_plugin_node_type_dict.items()):
+        if node_type in node_type_set:
+            importlib.import_module('plugin.'+plugin_module_name).load()
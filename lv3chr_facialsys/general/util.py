@@ -10,6 +10,7 @@
 A module containing utility functions used by the LCA third level character facial system
 """
 
+import sys
 import maya.cmds as cmds
 
 def get_class_name(obj_or_class):
@@ -81,4 +82,22 @@ def get_ctrl_zone_dir(zone_dir_dict):
     # Replace the "left_right" or "right_left" with "middle".
     dir_whole = dir_whole.replace('left_right', 'middle').replace('right_left', 'middle')
 
-    return (dir_whole, dir_abbr)
\ No newline at end of file
+    return (dir_whole, dir_abbr)
+
+# The three-argument raise statement of Python 2 is a syntax error in Python 3.
+if sys.version_info[0] < 3:
+    exec('def _reraise(exc_type, exc_value, exc_traceback):\n'
+         '    raise exc_type, exc_value, exc_traceback\n')
+else:
+    def _reraise(exc_type, exc_value, exc_traceback):
+        raise exc_value.with_traceback(exc_traceback)
+
+def reraise(exc_info):
+    """ Raise an exception caught earlier again with its original traceback, e.g. after rolling back a failed build,
+    which may have raised and handled other exceptions in the meantime.
+
+    :param exc_info: the tuple of (type, value, traceback) returned by sys.exc_info() when the exception was caught
+    :return: None
+    """
+
+    _reraise(exc_info[0], exc_info[1], exc_info[2])
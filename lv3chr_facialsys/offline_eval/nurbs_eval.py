@@ -0,0 +1,501 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: nurbs_eval.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to evaluate the NURBS curves and surfaces of the facial system with vectorized NumPy code.
+
+The knot vectors are built the way Maya builds them: cmds.curve() parameterizes a curve by the CV indices,
+and cmds.nurbsPlane() parameterizes a plane over [0, 1] in both directions.
+All the evaluation functions take arrays of parameters, and the CV arrays may have leading batch dimensions,
+so that a batch of poses is evaluated in one call.
+Note that this module does not depend on Maya.
+"""
+
+import math
+
+import numpy as np
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_supported_degree_list = [1, 3]
+
+# Whether the CVs set on a cmds.nurbsPlane() with construction history are kept as tweaks relative to the default CV
+# positions, see get_nurbs_plane_topology() of the control module, which probes it in Maya.
+g_cv_tweak_is_relative = True
+
+# The parameter samples per span to seed the closest point search with.
+g_closest_point_seed_count = 4
+g_closest_point_iteration_count = 8
+# The parameter change under which the search of a point has converged and is not iterated any more.
+g_closest_point_tolerance = 1e-12
+# The number of query points to search for at once, which bounds the memory of the seed distance tables.
+g_closest_point_chunk_size = 2048
+
+# ======================================================================================================================
+class nurbsCurve(object):
+    """ An open, non-rational NURBS curve, built like cmds.curve(degree, point) does.
+    """
+
+    def __init__(self, degree, points, translation=(0.0, 0.0, 0.0)):
+        """
+        :param degree: the curve degree, 1 or 3
+        :param points: a list of [x, y, z] CV coordinates
+        :param translation: the translation of the curve's transform node
+        """
+
+        assert degree in g_supported_degree_list
+        assert len(points) > degree
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._degree = degree
+        self._knots = get_curve_knots(degree, len(points))
+        # The CV coordinates in object space, and the translation of the transform node
+        self._cvs = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self._translation = np.asarray(translation, dtype=np.float64).reshape(3)
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __repr__(self):
+        return NotImplemented
+
+    def get_degree(self):
+        return self._degree
+
+    def get_knots(self):
+        return self._knots
+
+    def get_cvs(self):
+        """
+        :return: the CV coordinates in object space, in an array of shape (CV count, 3)
+        """
+        return self._cvs
+
+    def get_translation(self):
+        return self._translation
+
+    def evaluate(self, params, cvs=None):
+        """
+        :param params: an array of curve parameters
+        :param cvs: the object space CV coordinates of shape (..., CV count, 3) to evaluate with;
+                    the curve's own CVs are used if it is None
+        :return: the world-space positions of shape (..., parameter count, 3)
+        """
+
+        if cvs is None:
+            cvs = self._cvs
+        return evaluate_curve(self._degree, self._knots, cvs, params) + self._translation
+
+# ======================================================================================================================
+class nurbsSurface(object):
+    """ An open, non-rational NURBS surface, built like the create_nurbs_plane() function of the control module does:
+    the CVs are frozen with the transformation, reversed in U if mirrored along x-axis, then scaled by the mirror.
+    The CVs are kept in world space, with the U index varying slowest.
+    """
+
+    def __init__(self, degree, patchesU, patchesV, cvs, knots_u=None, knots_v=None):
+        """
+        :param cvs: the world-space CV coordinates, in an array of shape (CV count in U, CV count in V, 3)
+        :param knots_u: the U knots in Maya's format; the uniform knots over [0, 1] are used if it is None
+        :param knots_v: the V knots in Maya's format; the uniform knots over [0, 1] are used if it is None
+        """
+
+        assert degree in g_supported_degree_list
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._degree = degree
+        self._patchesU = patchesU
+        self._patchesV = patchesV
+
+        self._knots_u = get_plane_knots(degree, patchesU) if knots_u is None else np.asarray(knots_u, np.float64)
+        self._knots_v = get_plane_knots(degree, patchesV) if knots_v is None else np.asarray(knots_v, np.float64)
+
+        self._cvs = np.asarray(cvs, dtype=np.float64)
+        assert self._cvs.shape == (patchesU+degree, patchesV+degree, 3)
+
+        # The (U parameters, V parameters, transposed positions, negative half squared lengths of the positions) grid to
+        # seed the closest point search with, built on the first search; the positions are in single precision, which
+        # only picks the seeds.
+        self._seed_grid = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def __repr__(self):
+        return NotImplemented
+
+    def get_degree(self):
+        return self._degree
+
+    def get_patches(self):
+        """
+        :return: a tuple of (patch count in U, patch count in V)
+        """
+        return self._patchesU, self._patchesV
+
+    def get_knots(self):
+        """
+        :return: a tuple of (U knots, V knots) in Maya's format
+        """
+        return self._knots_u, self._knots_v
+
+    def get_cvs(self):
+        """
+        :return: the world-space CV coordinates, in an array of shape (CV count in U, CV count in V, 3)
+        """
+        return self._cvs
+
+    def get_param_range(self):
+        """
+        :return: a tuple of (min U, max U, min V, max V)
+        """
+        return self._knots_u[0], self._knots_u[-1], self._knots_v[0], self._knots_v[-1]
+
+    def evaluate(self, params_u, params_v, cvs=None):
+        """
+        :param params_u: an array of U parameters
+        :param params_v: an array of V parameters in the same shape as params_u
+        :param cvs: the world-space CV coordinates to evaluate with, see evaluate_surface();
+                    the surface's own CVs are used if it is None
+        :return: the world-space positions in the shape of the parameters plus the coordinate dimension
+        """
+
+        if cvs is None:
+            cvs = self._cvs
+        return evaluate_surface(self._degree, self._knots_u, self._knots_v, cvs, params_u, params_v)
+
+    def closest_point(self, points):
+        """ Find the closest points on the surface to the given points, as the "closestPointOnSurface" node does.
+        Each search is seeded by the nearest sample of a parameter grid, then refined by Gauss-Newton iterations
+        clamped to the parameter range, until its parameters converge.
+
+        :param points: an array of world-space positions of shape (..., 3)
+        :return: a tuple of (U parameters, V parameters, closest positions), shaped like the given points
+        """
+
+        points = np.asarray(points, dtype=np.float64)
+        batch_shape = points.shape[:-1]
+        points = points.reshape(-1, 3)
+
+        if self._seed_grid is None:
+            min_u, max_u, min_v, max_v = self.get_param_range()
+            grid_u, grid_v = np.meshgrid(np.linspace(min_u, max_u, self._patchesU*g_closest_point_seed_count+1),
+                                         np.linspace(min_v, max_v, self._patchesV*g_closest_point_seed_count+1),
+                                         indexing='ij')
+            grid_u = grid_u.ravel()
+            grid_v = grid_v.ravel()
+            grid_pts = self.evaluate(grid_u, grid_v)
+            self._seed_grid = (grid_u, grid_v, grid_pts.T.astype(np.float32),
+                               (-0.5*np.einsum('ij,ij->i', grid_pts, grid_pts)).astype(np.float32))
+
+        grid_u, grid_v, grid_pts_t, grid_pts_half_sqr_len = self._seed_grid
+        points_32 = points.astype(np.float32)
+
+        res_u = np.empty(len(points))
+        res_v = np.empty(len(points))
+        for chunk_start in range(0, len(points), g_closest_point_chunk_size):
+            chunk = slice(chunk_start, chunk_start+g_closest_point_chunk_size)
+            # -|p - g|^2/2 without the -|p|^2/2 term, which is the same for all the seeds of a point
+            seed_closeness = points_32[chunk].dot(grid_pts_t)
+            seed_closeness += grid_pts_half_sqr_len
+            seed_ids = np.argmax(seed_closeness, axis=1)
+            res_u[chunk] = grid_u[seed_ids]
+            res_v[chunk] = grid_v[seed_ids]
+
+        min_u, max_u, min_v, max_v = self.get_param_range()
+        # The indices of the points still searched for
+        active_ids = np.arange(len(points))
+        for _ in range(g_closest_point_iteration_count):
+            active_u = res_u[active_ids]
+            active_v = res_v[active_ids]
+            pos, deriv_u, deriv_v = evaluate_surface_derivs(self._degree, self._knots_u, self._knots_v, self._cvs,
+                                                            active_u, active_v)
+            diff = pos - points[active_ids]
+
+            # Solve the 2x2 normal equations J^T J d = -J^T r of each point.
+            a = np.einsum('ij,ij->i', deriv_u, deriv_u)
+            b = np.einsum('ij,ij->i', deriv_u, deriv_v)
+            c = np.einsum('ij,ij->i', deriv_v, deriv_v)
+            f = np.einsum('ij,ij->i', diff, deriv_u)
+            g = np.einsum('ij,ij->i', diff, deriv_v)
+
+            det = a*c - b*b
+            valid = np.abs(det) > 1e-12
+            det = np.where(valid, det, 1.0)
+            delta_u = np.where(valid, (b*g - c*f)/det, 0.0)
+            delta_v = np.where(valid, (b*f - a*g)/det, 0.0)
+
+            next_u = np.clip(active_u + delta_u, min_u, max_u)
+            next_v = np.clip(active_v + delta_v, min_v, max_v)
+            res_u[active_ids] = next_u
+            res_v[active_ids] = next_v
+
+            active_ids = active_ids[np.maximum(np.abs(next_u - active_u), np.abs(next_v - active_v)) >
+                                    g_closest_point_tolerance]
+            if 0 == len(active_ids):
+                break
+
+        res_pts = self.evaluate(res_u, res_v)
+        return res_u.reshape(batch_shape), res_v.reshape(batch_shape), res_pts.reshape(batch_shape+(3,))
+
+# Knot Vector Functions ------------------------------------------------------------------------------------------------
+def get_curve_knots(degree, cv_count):
+    """
+    :return: the knots in Maya's format of a curve created by cmds.curve(), i.e. without the two end knots,
+             e.g. [0, 1, 2, 3] for 4 CVs of degree 1 and [0, 0, 0, 1, 1, 1] for 4 CVs of degree 3
+    """
+
+    span_count = cv_count - degree
+    return np.asarray([0.0]*(degree-1) + list(range(span_count+1)) + [float(span_count)]*(degree-1),
+                      dtype=np.float64)
+
+def get_plane_knots(degree, patch_count):
+    """
+    :return: the knots in Maya's format of a cmds.nurbsPlane() direction, which are uniform over [0, 1]
+    """
+
+    return np.asarray([0.0]*(degree-1) + [float(idx)/patch_count for idx in range(patch_count+1)] + [1.0]*(degree-1),
+                      dtype=np.float64)
+
+def get_full_knots(knots):
+    """
+    :param knots: the knots in Maya's format
+    :return: the knot vector with the two end knots, as the textbook NURBS formulation has
+    """
+
+    return np.concatenate([knots[:1], knots, knots[-1:]])
+
+def reverse_knots(knots):
+    """
+    :return: the knots of a reversed direction, as cmds.reverseSurface() does
+    """
+
+    return knots[0] + knots[-1] - knots[::-1]
+
+# Basis Function Evaluation Functions ----------------------------------------------------------------------------------
+def find_spans(degree, full_knots, params):
+    """
+    :param full_knots: the knot vector with the two end knots
+    :return: the knot span index of each parameter, clamped to the valid spans
+    """
+
+    cv_count = len(full_knots) - degree - 1
+    spans = np.searchsorted(full_knots, params, side='right') - 1
+    return np.clip(spans, degree, cv_count-1)
+
+def evaluate_basis(degree, full_knots, spans, params):
+    """ The vectorized Cox-de Boor recursion.
+
+    :return: the non-zero basis function values of shape (parameter count, degree+1)
+    """
+
+    params = np.asarray(params, dtype=np.float64)
+    basis = np.zeros(params.shape+(degree+1,))
+    basis[..., 0] = 1.0
+    left = np.zeros(params.shape+(degree+1,))
+    right = np.zeros(params.shape+(degree+1,))
+
+    for j in range(1, degree+1):
+        left[..., j] = params - full_knots[spans+1-j]
+        right[..., j] = full_knots[spans+j] - params
+        saved = np.zeros(params.shape)
+        for r in range(j):
+            denom = right[..., r+1] + left[..., j-r]
+            temp = np.where(denom != 0.0, basis[..., r]/np.where(denom != 0.0, denom, 1.0), 0.0)
+            basis[..., r] = saved + right[..., r+1]*temp
+            saved = left[..., j-r]*temp
+        basis[..., j] = saved
+
+    return basis
+
+def evaluate_basis_derivs(degree, full_knots, spans, params):
+    """
+    :return: a tuple of the non-zero basis function values and their first derivatives,
+             each of shape (parameter count, degree+1)
+    """
+
+    basis = evaluate_basis(degree, full_knots, spans, params)
+    lower_basis = evaluate_basis(degree-1, full_knots, spans, params)
+
+    derivs = np.zeros_like(basis)
+    for k in range(degree+1):
+        knot_id = spans - degree + k
+        if k > 0:
+            denom = full_knots[knot_id+degree] - full_knots[knot_id]
+            derivs[..., k] += np.where(denom != 0.0, lower_basis[..., k-1]/np.where(denom != 0.0, denom, 1.0), 0.0)
+        if k < degree:
+            denom = full_knots[knot_id+degree+1] - full_knots[knot_id+1]
+            derivs[..., k] -= np.where(denom != 0.0, lower_basis[..., k]/np.where(denom != 0.0, denom, 1.0), 0.0)
+
+    return basis, derivs*degree
+
+# Curve and Surface Evaluation Functions -------------------------------------------------------------------------------
+def evaluate_curve(degree, knots, cvs, params):
+    """
+    :param knots: the knots in Maya's format
+    :param cvs: the CV coordinates of shape (..., CV count, 3)
+    :param params: an array of curve parameters of shape (parameter count,)
+    :return: the positions of shape (..., parameter count, 3)
+    """
+
+    full_knots = get_full_knots(knots)
+    params = np.asarray(params, dtype=np.float64).ravel()
+    spans = find_spans(degree, full_knots, params)
+    basis = evaluate_basis(degree, full_knots, spans, params)
+
+    cv_ids = spans[:, np.newaxis] - degree + np.arange(degree+1)
+    return np.einsum('pk,...pkc->...pc', basis, np.asarray(cvs)[..., cv_ids, :])
+
+def evaluate_surface(degree, knots_u, knots_v, cvs, params_u, params_v):
+    """
+    :param knots_u: the U knots in Maya's format
+    :param knots_v: the V knots in Maya's format
+    :param cvs: the CV coordinates of shape (CV count in U, CV count in V, 3), or of shape
+                (batch..., CV count in U, CV count in V, 3) to evaluate each batch of parameters on its own CVs
+    :param params_u: an array of U parameters, of shape (batch..., parameter count) if the CVs are batched
+    :param params_v: an array of V parameters in the same shape as params_u
+    :return: the positions in the shape of the parameters plus the coordinate dimension
+    """
+
+    full_knots_u = get_full_knots(knots_u)
+    full_knots_v = get_full_knots(knots_v)
+    params_u = np.asarray(params_u, dtype=np.float64)
+    params_v = np.asarray(params_v, dtype=np.float64)
+    params_shape = params_u.shape
+    params_u = params_u.ravel()
+    params_v = params_v.ravel()
+
+    spans_u = find_spans(degree, full_knots_u, params_u)
+    spans_v = find_spans(degree, full_knots_v, params_v)
+    basis_u = evaluate_basis(degree, full_knots_u, spans_u, params_u)
+    basis_v = evaluate_basis(degree, full_knots_v, spans_v, params_v)
+
+    cv_ids_u = (spans_u[:, np.newaxis] - degree + np.arange(degree+1))[:, :, np.newaxis]
+    cv_ids_v = (spans_v[:, np.newaxis] - degree + np.arange(degree+1))[:, np.newaxis, :]
+
+    cvs = np.asarray(cvs, dtype=np.float64)
+    if cvs.ndim > 3:
+        assert params_shape[:-1] == cvs.shape[:-3]
+        cvs = cvs.reshape((-1,)+cvs.shape[-3:])
+        batch_ids = np.repeat(np.arange(len(cvs)), params_shape[-1])[:, np.newaxis, np.newaxis]
+        patch_cvs = cvs[batch_ids, cv_ids_u, cv_ids_v, :]
+    else:
+        patch_cvs = cvs[cv_ids_u, cv_ids_v, :]
+
+    # Contract the U direction first, which is much faster than contracting both directions in one einsum() call.
+    row_cvs = np.einsum('pa,pabc->pbc', basis_u, patch_cvs)
+    return np.einsum('pb,pbc->pc', basis_v, row_cvs).reshape(params_shape+(3,))
+
+def evaluate_surface_derivs(degree, knots_u, knots_v, cvs, params_u, params_v):
+    """
+    :param cvs: the CV coordinates of shape (CV count in U, CV count in V, 3)
+    :return: a tuple of the positions, the U derivatives and the V derivatives, each of shape (parameter count, 3)
+    """
+
+    full_knots_u = get_full_knots(knots_u)
+    full_knots_v = get_full_knots(knots_v)
+
+    spans_u = find_spans(degree, full_knots_u, params_u)
+    spans_v = find_spans(degree, full_knots_v, params_v)
+    basis_u, derivs_u = evaluate_basis_derivs(degree, full_knots_u, spans_u, params_u)
+    basis_v, derivs_v = evaluate_basis_derivs(degree, full_knots_v, spans_v, params_v)
+
+    cv_ids_u = (spans_u[:, np.newaxis] - degree + np.arange(degree+1))[:, :, np.newaxis]
+    cv_ids_v = (spans_v[:, np.newaxis] - degree + np.arange(degree+1))[:, np.newaxis, :]
+    patch_cvs = cvs[cv_ids_u, cv_ids_v, :]
+
+    row_cvs = np.einsum('pa,pabc->pbc', basis_u, patch_cvs)
+    row_derivs = np.einsum('pa,pabc->pbc', derivs_u, patch_cvs)
+    return (np.einsum('pb,pbc->pc', basis_v, row_cvs),
+            np.einsum('pb,pbc->pc', basis_v, row_derivs),
+            np.einsum('pb,pbc->pc', derivs_v, row_cvs))
+
+# NURBS Plane Construction Functions -----------------------------------------------------------------------------------
+def get_xform_matrix(translation, rotation, scale):
+    """
+    :param rotation: the Euler rotation angles in degrees, in the XYZ rotation order
+    :return: the 4x4 transformation matrix which transforms the row vectors, as Maya's matrices do
+    """
+
+    rx, ry, rz = [math.radians(angle) for angle in rotation]
+
+    rot_x = np.array([[1.0, 0.0, 0.0], [0.0, math.cos(rx), math.sin(rx)], [0.0, -math.sin(rx), math.cos(rx)]])
+    rot_y = np.array([[math.cos(ry), 0.0, -math.sin(ry)], [0.0, 1.0, 0.0], [math.sin(ry), 0.0, math.cos(ry)]])
+    rot_z = np.array([[math.cos(rz), math.sin(rz), 0.0], [-math.sin(rz), math.cos(rz), 0.0], [0.0, 0.0, 1.0]])
+
+    xform_mat = np.identity(4)
+    xform_mat[:3, :3] = np.diag(np.asarray(scale, dtype=np.float64)).dot(rot_x).dot(rot_y).dot(rot_z)
+    xform_mat[3, :3] = translation
+    return xform_mat
+
+def get_plane_default_cvs(degree, patchesU, patchesV):
+    """ The default CV positions of a cmds.nurbsPlane() of the unit width along the x-axis, whose U direction runs
+    along -Z and V direction along +Y. The CVs are placed at the Greville abscissae, which keeps the plane flat and
+    uniformly parameterized.
+
+    :return: the CV coordinates, in an array of shape (CV count in U, CV count in V, 3)
+    """
+
+    def get_greville_coords(knots):
+        full_knots = get_full_knots(knots)
+        return np.asarray([np.mean(full_knots[idx+1:idx+degree+1]) for idx in range(len(full_knots)-degree-1)])
+
+    coords_u = 0.5 - get_greville_coords(get_plane_knots(degree, patchesU))
+    coords_v = get_greville_coords(get_plane_knots(degree, patchesV)) - 0.5
+
+    cv_coords = np.zeros((len(coords_u), len(coords_v), 3))
+    cv_coords[:, :, 1] = coords_v[np.newaxis, :]
+    cv_coords[:, :, 2] = coords_u[:, np.newaxis]
+    return cv_coords
+
+def create_nurbs_plane(degree = 1,
+                       patchesU = 4,
+                       patchesV = 6,
+                       translation = [0.0, 0.0, 0.0],
+                       rotation = [0.0, 0.0, 0.0],
+                       scale = [1.0, 1.0, 1.0],
+                       mirror = [1, 1, 1],
+                       cv_list = [],
+                       cv_tweak_is_relative = None):
+    """ Build the surface which the control module's create_nurbs_plane() function creates in Maya.
+
+    :param cv_list: a list of CV coordinates formatted in [{"u,v": [x, y, z]}]
+    :param cv_tweak_is_relative: if True, the CV coordinates are offsets from the default CV positions,
+                                 as Maya keeps the CVs set on a plane with construction history;
+                                 g_cv_tweak_is_relative is used if it is None
+    :return: a nurbsSurface instance
+    """
+
+    if cv_tweak_is_relative is None:
+        cv_tweak_is_relative = g_cv_tweak_is_relative
+
+    cv_coords = get_plane_default_cvs(degree, patchesU, patchesV)
+    for cv_coord_dict in cv_list:
+        cv_coord_idx = list(cv_coord_dict.keys())[0]
+        idx_u, idx_v = [int(idx) for idx in cv_coord_idx.split(',')]
+
+        cv_coord = np.asarray(cv_coord_dict[cv_coord_idx], dtype=np.float64)
+        assert cv_coord.shape == (3,)
+        if cv_tweak_is_relative:
+            cv_coords[idx_u, idx_v] += cv_coord
+        else:
+            cv_coords[idx_u, idx_v] = cv_coord
+
+    # Bake the transformation, like cmds.makeIdentity(apply=True) does.
+    xform_mat = get_xform_matrix(translation, rotation, scale)
+    cv_coords = cv_coords.dot(xform_mat[:3, :3]) + xform_mat[3, :3]
+
+    knots_u = get_plane_knots(degree, patchesU)
+    knots_v = get_plane_knots(degree, patchesV)
+
+    # Reverse the U direction if mirroring along x-axis, like cmds.reverseSurface(direction=0) does.
+    if mirror[0] < 0:
+        cv_coords = cv_coords[::-1]
+        knots_u = reverse_knots(knots_u)
+
+    # The mirror is the scale of the transform node, about the pivot left at the frozen translation,
+    # so apply it to get the world-space CVs.
+    pivot = np.asarray(translation, dtype=np.float64)
+    cv_coords = pivot + (cv_coords - pivot)*np.asarray(mirror, dtype=np.float64)
+
+    return nurbsSurface(degree, patchesU, patchesV, cv_coords, knots_u, knots_v)
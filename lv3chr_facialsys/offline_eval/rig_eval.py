@@ -0,0 +1,741 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: rig_eval.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to evaluate the projection-surface rig of the facial system without Maya.
+
+The rig evaluator rebuilds the chain the control zones build in Maya from the zone spec data/control_zone_spec.json and
+the two JSON database files: controllers -> blend-shaped control curves -> "pointOnCurveInfo" locators ->
+"closestPointOnSurface" on the translation planes -> "pointOnSurfaceInfo" locators on the projection surfaces ->
+bind joints. The front-back projection surfaces are rigidly skinned to the joints of the left-right projection
+surfaces, bound in the default pose.
+
+The stages of the zone spec are read as controlZone reads them (see control.control_zone), with the same templates,
+iterations and references; the "surfaces" stage lists the translation planes and the projection surfaces the facial
+system demo creates, by their keys in the "projections" stage. The follows and the follow blends are evaluated as their
+utility nodes and blend-shapes compute them (see config.followModeEnum), and the translations of the controllers driven
+by the follows are not inputs.
+All the stages up to the locators are linear in the controller translations for given follow attribute values,
+so the evaluator captures them in a matrix, which is evaluated once per attribute values, and the locators of a batch
+of poses are one matrix product away from the controller translations.
+
+A batch of controller poses is evaluated at once, e.g.
+
+    evaluator = rigEvaluator()
+    poses = numpy.zeros((frame_count, len(evaluator.get_controller_names()), 3))
+    joint_positions = evaluator.evaluate(poses)  # (frame count, joint count, 3), see get_joint_names()
+
+Note that this module does not depend on Maya.
+"""
+
+import numpy as np
+
+from database import data_cache
+from database.zone_spec import unitSpec
+from offline_eval import nurbs_eval
+from offline_eval.nurbs_eval import nurbsCurve
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_ctrl_crv_data_file_name = 'control_crv_data.json'
+g_proj_srf_data_file_name = 'control_proj_surface_data.json'
+# The zone spec of the control module, which can not be imported without Maya
+g_zone_spec_file_name = 'control_zone_spec.json'
+
+# The number of poses evaluated at once, which bounds the memory of the evaluation of a large batch of poses.
+g_pose_chunk_size = 1024
+
+g_axis_list = ['X', 'Y', 'Z']
+
+# The inputs of the plugs evaluated from the zone spec
+class plugInputEnum(object):
+    connection = 'connection'   # (connection, the source plug)
+    value = 'value'             # (value, the constant value)
+    follow = 'follow'           # (follow, the driver tuple, the axis index, the constant scale, the weight)
+
+# ======================================================================================================================
+class specUnit(unitSpec):
+    """ A control unit of the zone spec, which resolves the references of its stage entries as controlZone does, to
+    the names of the controllers, their plugs, the follow attributes, the geometry keys of the control curves and the
+    blend-shape target curves, e.g. "eyelid_right_up|curve:A", and the plug keys of the blend-shape weights,
+    e.g. "eyelid_right_up|curve.right_end_up".
+    """
+
+    def __init__(self, zone_spec, unit_spec):
+        """
+        :param zone_spec: the spec of the facial zone this control unit belongs to
+        :param unit_spec: the spec of this control unit in the zone spec's "units"
+        """
+
+        super(specUnit, self).__init__(zone_spec, unit_spec)
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        # {control curve ID: name}, {controller ID: name}, and the name of the follow controller
+        self._ctrl_crv_dict = {}
+        self._controller_dict = {}
+        self._follow_ctrl = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def set_ctrl_crv_name(self, crv_id, name):
+        self._ctrl_crv_dict[crv_id] = name
+
+    def set_controller_name(self, ctrl_id, name):
+        self._controller_dict[ctrl_id] = name
+
+    def set_follow_ctrl(self, name):
+        self._follow_ctrl = name
+
+    def get_vars(self, **kwargs):
+        """
+        :return: a dictionary of the variables of this control unit, along with the names of its control curves,
+                 controllers and follow controller, updated by the keyword arguments
+        """
+
+        var_dict = {
+            'curves': dict(self._ctrl_crv_dict),
+            'controllers': dict(self._controller_dict),
+            'follow_ctrl': self._follow_ctrl
+        }
+        var_dict.update(kwargs)
+        return super(specUnit, self).get_vars(**var_dict)
+
+    def resolve_ref(self, ref):
+        """
+        :param ref: a reference to a control element of this control unit, "<zoneRefKindEnum value>:<ID>[.<attribute>]"
+        :return: the name of the node or the plug, or the key of the geometry or the plug referred to
+        """
+
+        kind, ref_id = ref.split(':', 1)
+        ref_id, _, attr = ref_id.partition('.')
+
+        if 'curve' == kind or 'bstarget' == kind:
+            assert not attr, 'Invalid geometry reference: {}'.format(ref)
+            return self.get_key()+'|'+kind+':'+ref_id
+        elif 'controller' == kind:
+            node = self._controller_dict[ref_id]
+        elif 'follow' == kind:
+            node, attr = self._follow_ctrl, ref_id
+        elif 'blendshape' == kind or 'bsweight' == kind:
+            # The weights of a blend-shape node are keyed by its targets' IDs.
+            node = self.get_key()+'|'+ref_id
+        elif 'scene' == kind:
+            node = ref_id
+        else:
+            raise ValueError('the offline rig evaluator does not evaluate the control zone reference "{}"'.format(ref))
+
+        if attr:
+            return node+'.'+attr
+        return node
+
+# ======================================================================================================================
+class rigEvaluator(object):
+    """ A rig evaluator reproduces the facial system's bind joint positions from the controller translations.
+    """
+
+    def __init__(self, ctrl_crv_data=None, proj_srf_data=None, zone_list=None, zone_spec_list=None):
+        """
+        :param ctrl_crv_data: the data tree of "control_crv_data.json", or its data_cache.dataStore;
+                              its store is loaded from the database if it is None
+        :param proj_srf_data: the data tree of "control_proj_surface_data.json", or its data_cache.dataStore;
+                              its store is loaded if it is None
+        :param zone_list: a list of the control zones to evaluate, i.e. the controlZoneEnum values; all the zones of
+                          the zone spec if it is None
+        :param zone_spec_list: the "zones" of the zone spec; the shipped zone spec is loaded if it is None
+        """
+
+        if ctrl_crv_data is None:
+            ctrl_crv_data = data_cache.load_store(g_ctrl_crv_data_file_name)
+        if proj_srf_data is None:
+            proj_srf_data = data_cache.load_store(g_proj_srf_data_file_name)
+        if zone_spec_list is None:
+            zone_spec_list = data_cache.load_data(g_zone_spec_file_name)['zones']
+        if zone_list is None:
+            zone_list = [zone_spec['zone'] for zone_spec in zone_spec_list]
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._ctrl_crv_data = ctrl_crv_data
+        self._proj_srf_data = proj_srf_data
+        self._zone_list = list(zone_list)
+
+        # The names of the controllers whose translations are the inputs, in the order of the pose arrays
+        self._controller_list = []
+        # {controller translation plug, e.g. "fm_eyelidProject_RUB_ctrl.translateX": (controller index, axis index)}
+        self._input_plug_dict = {}
+        # {attribute name, e.g. "fm_R_eyelidProject_ctrl.eyelid_up_follow_b": default value}
+        self._attr_dict = {}
+        # {plug name or key: its input, a tuple of (plugInputEnum value, ...)}
+        # The plugs without inputs are the controller translations, the attributes or zero.
+        self._plug_input_dict = {}
+
+        # {geometry key: (object space CVs of shape (CV count, 3), a list of (weight plug, target geometry key))}
+        # The blend-shapes and the follow blends offset the CVs by the weighted offsets of the target geometries from
+        # the original CVs.
+        self._geometry_dict = {}
+
+        # The control curves carrying the locators, a list of (geometry key, nurbsCurve instance, locator parameters,
+        # locator indices), and the locator count
+        self._loc_crv_list = []
+        self._loc_count = 0
+        # {control unit key: {control curve ID: (locator IDs, locator indices)}}
+        self._unit_loc_dict = {}
+
+        # {surface key, e.g. "eyelid_translation_plane.right_up": nurbsSurface instance}
+        self._surface_dict = {}
+        # {translation plane or projection surface key in the zone spec, e.g. "eyelid_transplane_RU": surface key,
+        #  or a list of surface keys for a key ending with "_list"}
+        self._crv_projsrf_dict = {}
+
+        # The bind joint names in the order of the evaluated positions
+        self._joint_list = []
+        # {projection surface key: {(locator row ID, locator column ID): joint index}}
+        self._srf_joint_dict = {}
+        # {projection surface key: array of its joint indices}
+        self._srf_joint_ids_dict = {}
+
+        # {translation plane key: (locator indices, joint indices)}
+        # The locators are projected onto the translation plane to get the parameters of the joints' locators.
+        self._projection_dict = {}
+
+        # {skinned projection surface key: (influence joint indices, CV U indices, CV V indices)}
+        # Each CV follows its influence joint rigidly.
+        self._skin_dict = {}
+        # The bind joint positions in the default pose, which the skinned projection surfaces are bound in
+        self._bind_joint_pos = None
+
+        # The (attribute values, locator matrix, locator offsets) of the last attribute values the locators were
+        # evaluated with, see _get_locator_matrix()
+        self._locator_matrix_cache = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+        zone_spec_dict = dict((zone_spec['zone'], zone_spec) for zone_spec in zone_spec_list)
+        for zone in self._zone_list:
+            assert zone in zone_spec_dict, 'Invalid control zone: {}'.format(zone)
+            for unit_spec in zone_spec_dict[zone]['units']:
+                self._setup_unit(zone_spec_dict[zone], specUnit(zone_spec_dict[zone], unit_spec))
+
+        # The controllers driven by the follows are not inputs.
+        driven_ctrl_set = set([plug.rsplit('.', 1)[0] for plug in self._plug_input_dict])
+        self._controller_list = [ctrl for ctrl in self._controller_list if ctrl not in driven_ctrl_set]
+        for ctrl_id, ctrl in enumerate(self._controller_list):
+            for axis_id, axis in enumerate(g_axis_list):
+                self._input_plug_dict[ctrl+'.translate'+axis] = (ctrl_id, axis_id)
+
+        for srf_key, srf_joint_ids in self._srf_joint_dict.items():
+            self._srf_joint_ids_dict[srf_key] = np.asarray(sorted(srf_joint_ids.values()), dtype=np.intp)
+        for transplane_key, (loc_id_list, joint_id_list) in self._projection_dict.items():
+            self._projection_dict[transplane_key] = (np.concatenate(loc_id_list), np.concatenate(joint_id_list))
+
+        self._bind_joint_pos = self._evaluate_joints(np.zeros((1, len(self._controller_list), 3)), {},
+                                                     skinned=False)[0]
+
+    def __repr__(self):
+        return NotImplemented
+
+    def get_zone_list(self):
+        return list(self._zone_list)
+
+    def get_controller_names(self):
+        """
+        :return: the controller names, in the order of the controllers in the pose arrays
+        """
+        return list(self._controller_list)
+
+    def get_joint_names(self):
+        """
+        :return: the bind joint names, in the order of the joints in the evaluated positions
+        """
+        return list(self._joint_list)
+
+    def get_attr_names(self):
+        return sorted(self._attr_dict.keys())
+
+    def get_attr(self, attr):
+        """
+        :param attr: the attribute name, e.g. "fm_R_eyelidProject_ctrl.eyelid_up_follow_b"
+        :return: the value used when evaluate() is not given one
+        """
+        return self._attr_dict[attr]
+
+    def set_attr(self, attr, value):
+        """ Set the value of a follow attribute used when evaluate() is not given one.
+        Note that the skinned projection surfaces stay bound in the pose of the initial attribute values.
+        """
+
+        assert attr in self._attr_dict, 'Invalid attribute: {}'.format(attr)
+        self._attr_dict[attr] = float(value)
+
+    # Evaluation Functions ---------------------------------------------------------------------------------------------
+    def evaluate(self, poses, attr_values=None):
+        """
+        :param poses: the controller translations, either in an array of shape (pose count, controller count, 3)
+                      or (controller count, 3) ordered as get_controller_names(),
+                      or in a dictionary of {controller name: translation(s) of shape (3,) or (pose count, 3)},
+                      in which the missing controllers stay at the origin
+        :param attr_values: a dictionary of {attribute name: value or values of shape (pose count,)}
+                            overriding the follow attribute values
+        :return: the world-space bind joint positions of shape (pose count, joint count, 3),
+                 ordered as get_joint_names()
+        """
+
+        pose_array = self._get_pose_array(poses)
+        attr_values = attr_values or {}
+        for attr in attr_values:
+            assert attr in self._attr_dict, 'Invalid attribute: {}'.format(attr)
+
+        joint_pos = np.empty((len(pose_array), len(self._joint_list), 3))
+        for chunk_start in range(0, len(pose_array), g_pose_chunk_size):
+            chunk = slice(chunk_start, chunk_start+g_pose_chunk_size)
+            chunk_attr_values = dict((attr, value if 0 == np.ndim(value) else np.asarray(value)[chunk])
+                                     for attr, value in attr_values.items())
+            joint_pos[chunk] = self._evaluate_joints(pose_array[chunk], chunk_attr_values, skinned=True)
+        return joint_pos
+
+    def evaluate_dict(self, poses, attr_values=None):
+        """
+        :return: a dictionary of {bind joint name: world-space positions of shape (pose count, 3)}
+        """
+
+        joint_pos = self.evaluate(poses, attr_values)
+        return dict((joint, joint_pos[:, joint_id]) for joint_id, joint in enumerate(self._joint_list))
+
+    def _get_pose_array(self, poses):
+        """
+        :return: the controller translations in an array of shape (pose count, controller count, 3)
+        """
+
+        if isinstance(poses, dict):
+            pose_count = 1
+            for trans in poses.values():
+                trans = np.asarray(trans)
+                if trans.ndim > 1:
+                    pose_count = max(pose_count, trans.shape[0])
+
+            pose_array = np.zeros((pose_count, len(self._controller_list), 3))
+            for ctrl, trans in poses.items():
+                assert ctrl in self._controller_list, 'Invalid controller: {}'.format(ctrl)
+                pose_array[:, self._controller_list.index(ctrl)] = trans
+            return pose_array
+
+        pose_array = np.asarray(poses, dtype=np.float64)
+        if 2 == pose_array.ndim:
+            pose_array = pose_array[np.newaxis]
+        assert pose_array.shape[1:] == (len(self._controller_list), 3)
+        return pose_array
+
+    def _evaluate_joints(self, pose_array, attr_values, skinned):
+        """
+        :param skinned: if False, the skinned projection surfaces are not evaluated and their joints are left zero
+        :return: the world-space bind joint positions of shape (pose count, joint count, 3)
+        """
+
+        pose_count = len(pose_array)
+
+        # The locators of all the poses in one matrix product, unless the attribute values vary by pose.
+        if all([0 == np.ndim(value) for value in attr_values.values()]):
+            loc_matrix, loc_offsets = self._get_locator_matrix(attr_values)
+            loc_pos = (pose_array.reshape(pose_count, -1).dot(loc_matrix) + loc_offsets).reshape(pose_count, -1, 3)
+        else:
+            loc_pos = self._evaluate_locators(pose_array, attr_values)
+
+        # Project the locators onto the translation planes, all the locators of a plane at once.
+        joint_params_u = np.zeros((pose_count, len(self._joint_list)))
+        joint_params_v = np.zeros((pose_count, len(self._joint_list)))
+
+        for transplane_key, (loc_ids, joint_ids) in self._projection_dict.items():
+            params_u, params_v = self._surface_dict[transplane_key].closest_point(loc_pos[:, loc_ids])[:2]
+            joint_params_u[:, joint_ids] = params_u
+            joint_params_v[:, joint_ids] = params_v
+
+        # Evaluate the locators on the projection surfaces, which the bind joints are parented to.
+        joint_pos = np.zeros((pose_count, len(self._joint_list), 3))
+
+        for projsrf_key, joint_ids in self._srf_joint_ids_dict.items():
+            if projsrf_key in self._skin_dict:
+                continue
+            joint_pos[:, joint_ids] = self._surface_dict[projsrf_key].evaluate(joint_params_u[:, joint_ids],
+                                                                               joint_params_v[:, joint_ids])
+
+        if not skinned:
+            return joint_pos
+
+        for projsrf_key, (influence_ids, cv_ids_u, cv_ids_v) in self._skin_dict.items():
+            joint_ids = self._srf_joint_ids_dict[projsrf_key]
+            projsrf = self._surface_dict[projsrf_key]
+
+            srf_cvs = np.repeat(projsrf.get_cvs()[np.newaxis], pose_count, axis=0)
+            srf_cvs[:, cv_ids_u, cv_ids_v] += joint_pos[:, influence_ids] - self._bind_joint_pos[influence_ids]
+
+            joint_pos[:, joint_ids] = projsrf.evaluate(joint_params_u[:, joint_ids],
+                                                       joint_params_v[:, joint_ids],
+                                                       srf_cvs)
+
+        return joint_pos
+
+    def _get_locator_matrix(self, attr_values):
+        """ The locator positions are affine in the controller translations for given attribute values, so they are
+        captured by evaluating the locators of the default pose and the poses of each translation axis set to 1.
+
+        :param attr_values: a dictionary of {attribute name: value} overriding the attribute values
+        :return: a tuple of (the locator matrix of shape (controller count*3, locator count*3),
+                 the locator offsets of shape (locator count*3,)), which map the flattened controller translations to
+                 the flattened world-space locator positions
+        """
+
+        attr_value_tuple = tuple([float(attr_values.get(attr, self._attr_dict[attr]))
+                                  for attr in sorted(self._attr_dict)])
+        if self._locator_matrix_cache is None or attr_value_tuple != self._locator_matrix_cache[0]:
+            input_count = 3*len(self._controller_list)
+            basis_pose_array = np.zeros((input_count+1, input_count))
+            basis_pose_array[1:] = np.identity(input_count)
+
+            loc_pos = self._evaluate_locators(basis_pose_array.reshape(input_count+1, -1, 3),
+                                              dict(zip(sorted(self._attr_dict), attr_value_tuple)))
+            loc_pos = loc_pos.reshape(input_count+1, -1)
+            self._locator_matrix_cache = (attr_value_tuple, loc_pos[1:] - loc_pos[0], loc_pos[0])
+
+        return self._locator_matrix_cache[1:]
+
+    def _evaluate_locators(self, pose_array, attr_values):
+        """ Evaluate the plugs and the geometries of the zone spec, then the locators on the control curves.
+        :return: the world-space locator positions of shape (pose count, locator count, 3)
+        """
+
+        pose_count = len(pose_array)
+        plug_value_dict = {}
+        geometry_cvs_dict = {}
+
+        def get_plug_value(plug):
+            if plug in plug_value_dict:
+                return plug_value_dict[plug]
+
+            plug_input = self._plug_input_dict.get(plug)
+            if plug_input is None:
+                if plug in self._input_plug_dict:
+                    ctrl_id, axis_id = self._input_plug_dict[plug]
+                    value = pose_array[:, ctrl_id, axis_id]
+                elif plug in self._attr_dict:
+                    value = np.broadcast_to(np.asarray(attr_values.get(plug, self._attr_dict[plug]), dtype=np.float64),
+                                            (pose_count,))
+                else:
+                    value = np.zeros(pose_count)
+            elif plugInputEnum.connection == plug_input[0]:
+                value = get_plug_value(plug_input[1])
+            elif plugInputEnum.value == plug_input[0]:
+                value = np.full(pose_count, plug_input[1])
+            else:
+                # The average translation of the drivers, scaled by the constant scale and weighted.
+                driver_tuple, axis_id, scale, weight = plug_input[1:]
+                value = sum([get_plug_value(driver+'.translate'+g_axis_list[axis_id]) for driver in driver_tuple])
+                value = value*(scale/len(driver_tuple))
+                if isinstance(weight, (int, float)):
+                    value = value*weight
+                elif weight is not None:
+                    value = value*get_plug_value(weight)
+
+            plug_value_dict[plug] = value
+            return value
+
+        def get_geometry_cvs(geometry):
+            if geometry in geometry_cvs_dict:
+                return geometry_cvs_dict[geometry]
+
+            orig_cvs, deformer_list = self._geometry_dict[geometry]
+            cvs = np.repeat(orig_cvs[np.newaxis], pose_count, axis=0)
+            for weight_plug, target in deformer_list:
+                cvs += get_plug_value(weight_plug)[:, np.newaxis, np.newaxis]*(get_geometry_cvs(target) - orig_cvs)
+
+            geometry_cvs_dict[geometry] = cvs
+            return cvs
+
+        loc_pos = np.zeros((pose_count, self._loc_count, 3))
+        for geometry, ctrl_crv, loc_params, loc_ids in self._loc_crv_list:
+            loc_pos[:, loc_ids] = ctrl_crv.evaluate(loc_params, get_geometry_cvs(geometry))
+        return loc_pos
+
+    # Rig Construction Functions ---------------------------------------------------------------------------------------
+    def _add_surface(self, srf_type, srf_dir, mirror=(1, 1, 1)):
+        """ Build a translation plane or a projection surface, as the facial system demo does,
+        and register the bind joints of the projection surface's locators.
+
+        :param srf_type: the surface data key, e.g. "eyelid_translation_plane"
+        :param srf_dir: the direction key of the surface data, e.g. "right_up"
+        :return: the surface key
+        """
+
+        srf_key = srf_type+'.'+srf_dir
+        if srf_key in self._surface_dict:
+            return srf_key
+
+        srf_type_data = self._proj_srf_data[srf_type]
+        srf_data = srf_type_data[srf_dir]
+
+        self._surface_dict[srf_key] = nurbs_eval.create_nurbs_plane(degree = srf_data['degree'],
+                                                                    patchesU = srf_data['patchesU'],
+                                                                    patchesV = srf_data['patchesV'],
+                                                                    translation = srf_data['xform']['translation'],
+                                                                    rotation = srf_data['xform']['rotation'],
+                                                                    scale = srf_data['xform']['scale'],
+                                                                    mirror = mirror,
+                                                                    cv_list = srf_data['control_vtx'])
+
+        if 'locators' in srf_data:
+            name_prefix = srf_type_data['name_prefix']
+            bind_joint_suffix = srf_type_data['bind_joint']['suffix']
+            srf_joint_dict = self._srf_joint_dict.setdefault(srf_key, {})
+
+            for loc_dict in srf_data['locators']:
+                loc_row_id, loc_col_id = loc_dict['id'].split('_')
+                # The same naming as the controlProjSurface class
+                bind_jnt_name = name_prefix+'_'+loc_dict['name'].rsplit('_', 1)[0]+'_'+bind_joint_suffix
+
+                srf_joint_dict[(str(loc_row_id), int(loc_col_id))] = len(self._joint_list)
+                self._joint_list.append(bind_jnt_name)
+
+        return srf_key
+
+    def _add_controller(self, ctrl):
+        if ctrl not in self._controller_list:
+            self._controller_list.append(ctrl)
+        return ctrl
+
+    def _add_geometry(self, geometry, cvs):
+        self._geometry_dict[geometry] = (np.asarray(cvs, dtype=np.float64).reshape(-1, 3), [])
+
+    def _add_deformer_target(self, geometry, weight_plug, target):
+        """ Offset a geometry by the weighted offset of a target geometry from the geometry's original CVs,
+        as a target of a blend-shape node does.
+        """
+
+        assert self._geometry_dict[geometry][0].shape == self._geometry_dict[target][0].shape, \
+            'Invalid blend-shape target: {}'.format(target)
+        self._geometry_dict[geometry][1].append((weight_plug, target))
+
+    def _get_surface(self, projection_key, list_idx):
+        """
+        :param projection_key: a translation plane or projection surface key in the zone spec
+        :param list_idx: the index of the surface, if the key is of a list of surfaces
+        :return: the surface key
+        """
+
+        srf_key = self._crv_projsrf_dict[projection_key]
+        if isinstance(srf_key, list):
+            srf_key = srf_key[list_idx]
+        return srf_key
+
+    # Control Unit Setup Functions -------------------------------------------------------------------------------------
+    def _setup_unit(self, zone_spec, unit):
+        """ Set a control unit up from its zone spec, one stage after another as controlZone.build() does.
+        :param unit: the specUnit instance
+        """
+
+        assert not zone_spec.get('nodes'), 'The offline rig evaluator does not evaluate the utility nodes.'
+
+        self._setup_surfaces(zone_spec, unit)
+        self._setup_ctrl_curves(zone_spec, unit)
+        self._setup_ctrlcrv_bs_targets(zone_spec, unit)
+        self._setup_follow_controller(zone_spec, unit)
+        self._setup_controllers(zone_spec, unit)
+        self._setup_blendshapes(zone_spec, unit)
+        self._setup_follow_blend(zone_spec, unit)
+        self._setup_connections(zone_spec, unit)
+        self._setup_follows(zone_spec, unit)
+        self._setup_projections(zone_spec, unit)
+        self._setup_projsurface_binds(zone_spec, unit)
+
+    def _setup_surfaces(self, zone_spec, unit):
+        """ Build the translation planes and the projection surfaces of the "surfaces" stage, which the control units
+        sharing them build only once.
+        """
+
+        unit_crv_projsrf_dict = {}
+        for srf_spec in zone_spec.get('surfaces', []):
+            for var_dict in unit.iterate(srf_spec):
+                srf_key = self._add_surface(srf_spec['data'], unit.format(srf_spec['entry'], var_dict),
+                                            srf_spec.get('mirror', [1, 1, 1]))
+
+                projection_key = unit.format(srf_spec['key'], var_dict)
+                if projection_key.endswith('_list'):
+                    unit_crv_projsrf_dict.setdefault(projection_key, []).append(srf_key)
+                else:
+                    unit_crv_projsrf_dict[projection_key] = srf_key
+
+        for projection_key, srf_key in unit_crv_projsrf_dict.items():
+            self._crv_projsrf_dict.setdefault(projection_key, srf_key)
+
+    def _setup_ctrl_curves(self, zone_spec, unit):
+        curve_spec = zone_spec['curves']
+        ctrlcrv_data = self._ctrl_crv_data[curve_spec['data']]
+        name_prefix = self._ctrl_crv_data[curve_spec['name_prefix']]
+
+        unit_loc_dict = self._unit_loc_dict.setdefault(unit.get_key(), {})
+        for crv_id in unit.get_ctrl_crv_ids():
+            dir_ctrlcrv_data = ctrlcrv_data[unit.format(curve_spec['key'], unit.get_vars(crv=crv_id))]
+            unit.set_ctrl_crv_name(crv_id, name_prefix+'_'+dir_ctrlcrv_data['name'])
+
+            geometry = unit.resolve_ref('curve:'+crv_id)
+            ctrl_crv = nurbsCurve(ctrlcrv_data['degree'], dir_ctrlcrv_data['points'],
+                                  dir_ctrlcrv_data['xform']['translation'])
+            self._add_geometry(geometry, ctrl_crv.get_cvs())
+
+            # The locators are pinned at the parameters of their IDs minus 1, see controlCurve.get_locator_param().
+            loc_id_list = [int(loc_dict['id']) for loc_dict in dir_ctrlcrv_data['locators']]
+            loc_ids = np.arange(self._loc_count, self._loc_count+len(loc_id_list), dtype=np.intp)
+            self._loc_count += len(loc_id_list)
+
+            self._loc_crv_list.append((geometry, ctrl_crv, np.asarray(loc_id_list, dtype=np.float64)-1.0, loc_ids))
+            unit_loc_dict[crv_id] = (loc_id_list, loc_ids)
+
+    def _setup_ctrlcrv_bs_targets(self, zone_spec, unit):
+        for target_spec in zone_spec.get('ctrlcrv_bs', []):
+            ctrlcrv_bs_data = self._ctrl_crv_data[target_spec['data']]
+            for var_dict in unit.iterate(target_spec):
+                dir_ctrlcrv_bs_data = ctrlcrv_bs_data[unit.format(target_spec['key'], var_dict)]
+                # The blend-shape nodes blend the targets in object space.
+                self._add_geometry(unit.resolve_ref('bstarget:'+unit.format(target_spec['id'], var_dict)),
+                                   dir_ctrlcrv_bs_data['points'])
+
+    def _setup_follow_controller(self, zone_spec, unit):
+        follow_spec = zone_spec['follow_controller']
+        follow_ctrl_data = self._ctrl_crv_data[follow_spec['data']]
+        follow_ctrl = follow_ctrl_data[unit.format(follow_spec['key'], unit.get_vars())]['name']
+        unit.set_follow_ctrl(follow_ctrl)
+
+        for follow_attr, follow_val in follow_ctrl_data['follow_data'].items():
+            self._attr_dict.setdefault(follow_ctrl+'.'+follow_attr, float(follow_val))
+
+    def _setup_controllers(self, zone_spec, unit):
+        for controller_spec in zone_spec.get('controllers', []):
+            controller_data = self._ctrl_crv_data[controller_spec['data']]
+            name_prefix = self._ctrl_crv_data[controller_spec['name_prefix']]
+
+            for var_dict in unit.iterate(controller_spec):
+                dir_ctrl_data = controller_data[unit.format(controller_spec['key'], var_dict)]
+                unit.set_controller_name(unit.format(controller_spec['id'], var_dict),
+                                         self._add_controller(name_prefix+'_'+dir_ctrl_data['name']))
+
+        for attr_spec in zone_spec.get('controller_attrs', []):
+            for var_dict in unit.iterate(attr_spec):
+                ctrl = unit.resolve_ref('controller:'+unit.format(attr_spec['controller'], var_dict))
+                for attr, default_value in attr_spec['attrs'].items():
+                    self._attr_dict[ctrl+'.'+attr] = float(default_value)
+
+    def _setup_blendshapes(self, zone_spec, unit):
+        for bs_spec in zone_spec.get('blendshapes', []):
+            for var_dict in unit.iterate(bs_spec):
+                base = unit.resolve_ref(unit.format(bs_spec['base'], var_dict))
+                bs_node = unit.resolve_ref('blendshape:'+unit.format(bs_spec['id'], var_dict))
+
+                # The weights of the blend-shape node are keyed by the IDs of its targets.
+                target_plug_dict = {}
+                for target_ref in bs_spec['targets']:
+                    target_ref = unit.format(target_ref, var_dict)
+                    target_plug_dict[target_ref] = bs_node+'.'+target_ref.split(':', 1)[1]
+                    self._add_deformer_target(base, target_plug_dict[target_ref], unit.resolve_ref(target_ref))
+
+                # The initial weights are given either as values or as the plugs to read them from.
+                for target_ref, weight in bs_spec.get('weights', {}).items():
+                    if not isinstance(weight, (int, float)):
+                        weight = self._attr_dict.get(unit.resolve_ref(unit.format(weight, var_dict)), 0.0)
+                    self._plug_input_dict[target_plug_dict[unit.format(target_ref, var_dict)]] = \
+                        (plugInputEnum.value, float(weight))
+
+    def _setup_follow_blend(self, zone_spec, unit):
+        """ Blend the follower control curves towards the source control curve by their follow weights,
+        as the blend-shape nodes or the "lcCrvFollowBlend" node do.
+        """
+
+        follow_blend_spec = zone_spec.get('follow_blend')
+        if follow_blend_spec is None:
+            return
+
+        source = unit.resolve_ref('curve:'+unit.format(follow_blend_spec['source'], unit.get_vars()))
+        for follower_spec in follow_blend_spec['followers']:
+            for var_dict in unit.iterate(follower_spec):
+                self._add_deformer_target(unit.resolve_ref('curve:'+unit.format(follower_spec['curve'], var_dict)),
+                                          unit.resolve_ref(unit.format(follower_spec['weight'], var_dict)), source)
+
+    def _setup_connections(self, zone_spec, unit):
+        for connection_spec in zone_spec.get('connections', []):
+            for var_dict in unit.iterate(connection_spec):
+                for src_ref, dst_ref in connection_spec['plugs']:
+                    self._plug_input_dict[unit.resolve_ref(unit.format(dst_ref, var_dict))] = \
+                        (plugInputEnum.connection, unit.resolve_ref(unit.format(src_ref, var_dict)))
+
+    def _setup_follows(self, zone_spec, unit):
+        """ Drive the outputs of the followers, each by the average translation of its drivers, as the utility nodes
+        or the "lcFacialFollow" node do. The drivers from the scene are inputs, unless the evaluated zones build them.
+        """
+
+        for follow_spec in zone_spec.get('follows', []):
+            for var_dict in unit.iterate(follow_spec):
+                driver_tuple = tuple([unit.resolve_ref(unit.format(driver, var_dict))
+                                      for driver in follow_spec['drivers']])
+                for driver_ref, driver in zip(follow_spec['drivers'], driver_tuple):
+                    if driver_ref.startswith('scene:'):
+                        self._add_controller(driver)
+
+                weight_list = [weight if weight is None or isinstance(weight, (int, float))
+                               else unit.resolve_ref(unit.format(weight, var_dict))
+                               for weight in follow_spec.get('weights', [None, None, None])]
+                scale_list = follow_spec.get('scale', [1.0, 1.0, 1.0])
+
+                for axis_id, output in enumerate(follow_spec['outputs']):
+                    if output is not None:
+                        self._plug_input_dict[unit.resolve_ref(unit.format(output, var_dict))] = \
+                            (plugInputEnum.follow, driver_tuple, axis_id, float(scale_list[axis_id]),
+                             weight_list[axis_id])
+
+    def _setup_projections(self, zone_spec, unit):
+        """ Project the locators on the control curves onto the translation planes, to get the parameters of the
+        locators of the same rows on the projection surfaces.
+        """
+
+        unit_loc_dict = self._unit_loc_dict[unit.get_key()]
+        for crv_idx, crv_id in enumerate(unit.get_ctrl_crv_ids()):
+            var_dict = unit.get_vars(crv=crv_id)
+            loc_id_list, loc_ids = unit_loc_dict[crv_id]
+
+            for projection_spec in zone_spec.get('projections', []):
+                # A list of translation planes or projection surfaces is indexed by the control curve,
+                # unless the index is given.
+                transplane_key = self._get_surface(unit.format(projection_spec['transplane'], var_dict),
+                                                   projection_spec.get('transplane_index', crv_idx))
+                projsrf_key = self._get_surface(unit.format(projection_spec['projsurface'], var_dict),
+                                                projection_spec.get('projsurface_index', crv_idx))
+
+                srf_joint_dict = self._srf_joint_dict[projsrf_key]
+                joint_ids = np.asarray([srf_joint_dict[(crv_id, loc_id)] for loc_id in loc_id_list], dtype=np.intp)
+
+                projection = self._projection_dict.setdefault(transplane_key, ([], []))
+                projection[0].append(loc_ids)
+                projection[1].append(joint_ids)
+
+    def _setup_projsurface_binds(self, zone_spec, unit):
+        """ Bind the front-back projection surfaces to the joints of the left-right projection surface,
+        as controlZone.bind_projsurfaces() does: each row or column of CVs follows a joint, in reversed order.
+        """
+
+        for bind_spec in zone_spec.get('projsurface_binds', []):
+            var_dict = unit.get_vars()
+            projsrf_LR_key = self._crv_projsrf_dict[unit.format(bind_spec['joint_projsurface'], var_dict)]
+            srf_joint_dict = self._srf_joint_dict[projsrf_LR_key]
+
+            for projsrf_FB_idx, projsrf_FB_id in enumerate(unit.get_ctrl_crv_ids()):
+                projsrf_FB_key = self._get_surface(unit.format(bind_spec['projsurface'], var_dict), projsrf_FB_idx)
+                projsrf_FB_patches = self._surface_dict[projsrf_FB_key].get_patches()
+                projsrf_FB_span = projsrf_FB_patches[0] if 'U' == bind_spec['axis'] else projsrf_FB_patches[1]
+
+                influence_id_list = []
+                cv_id_list = []
+                for cv_id in range(projsrf_FB_span+1):
+                    for cv_sub_id in [0, 1]:
+                        influence_id_list.append(srf_joint_dict[(projsrf_FB_id, projsrf_FB_span-cv_id+1)])
+                        cv_id_list.append((cv_id, cv_sub_id) if 'U' == bind_spec['axis'] else (cv_sub_id, cv_id))
+
+                self._skin_dict[projsrf_FB_key] = (np.asarray(influence_id_list, dtype=np.intp),
+                                                   np.asarray([cv_id[0] for cv_id in cv_id_list], dtype=np.intp),
+                                                   np.asarray([cv_id[1] for cv_id in cv_id_list], dtype=np.intp))
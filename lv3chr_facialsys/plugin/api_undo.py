@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: api_undo.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A scripted command plug-in to put the scene modifications done through the OpenMaya API 2.0 onto Maya's undo queue.
+
+The modifications (e.g. MDGModifier.doIt()) are done by the caller first; then commit() hands their undo and redo
+functions over to an instance of the "lcApiUndo" command, which Maya keeps in the undo queue.
+"""
+
+import os
+import sys
+import types
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as OpenMaya2
+
+def maya_useNewAPI():
+    """ Tell Maya that this plug-in uses the Python API 2.0 objects.
+    """
+    pass
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_command_name = 'lcApiUndo'
+
+# Maya loads this file as a plug-in under a different module instance from the one imported by the facial system,
+# so the pending modifications are exchanged through a module shared in sys.modules.
+g_shared_module_name = 'lv3chr_facialsys_api_undo_shared'
+if g_shared_module_name not in sys.modules:
+    sys.modules[g_shared_module_name] = types.ModuleType(g_shared_module_name)
+    sys.modules[g_shared_module_name].pending = None
+g_shared = sys.modules[g_shared_module_name]
+
+# ======================================================================================================================
+class lcApiUndoCmd(OpenMaya2.MPxCommand):
+    """ An undoable command holding the undo and redo functions of one batch of API modifications.
+    """
+
+    def __init__(self):
+        OpenMaya2.MPxCommand.__init__(self)
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._undo = None
+        self._redo = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def doIt(self, args):
+        # The modifications have already been done by the caller.
+        self._undo, self._redo = g_shared.pending
+        g_shared.pending = None
+
+    def undoIt(self):
+        self._undo()
+
+    def redoIt(self):
+        self._redo()
+
+    def isUndoable(self):
+        return True
+
+def cmdCreator():
+    return lcApiUndoCmd()
+
+# Initialize the script plug-in.
+def initializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject, 'Light Chaser Animation Studios', '1.0')
+    try:
+        mplugin.registerCommand(g_command_name, cmdCreator)
+    except:
+        sys.stderr.write('Failed to register command: {}'.format(g_command_name))
+        raise
+
+# Uninitialize the script plug-in.
+def uninitializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject)
+    try:
+        mplugin.deregisterCommand(g_command_name)
+    except:
+        sys.stderr.write('Failed to deregister command: {}'.format(g_command_name))
+        raise
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def commit(undo, redo):
+    """ Record a batch of API modifications, which has already been done, onto Maya's undo queue.
+
+    :param undo: a callable reverting the modifications, e.g. MDGModifier.undoIt
+    :param redo: a callable re-doing the modifications, e.g. MDGModifier.doIt
+    :return: None
+    """
+
+    plugin_path = os.path.splitext(__file__)[0]+'.py'
+    if not cmds.pluginInfo(os.path.basename(plugin_path), query=True, loaded=True):
+        cmds.loadPlugin(plugin_path, quiet=True)
+
+    g_shared.pending = (undo, redo)
+    getattr(cmds, g_command_name)()
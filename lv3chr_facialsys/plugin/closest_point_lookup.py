@@ -0,0 +1,303 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: closest_point_lookup.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A dependency node plug-in answering all the closest-point queries onto a translation plane in one compute.
+
+A "lcClosestPointLookup" node takes the world-space surface of a translation plane and an array of positions, and
+outputs the U and V parameters of the closest points, as an array of "closestPointOnSurface" nodes would do.
+The node bakes a k-d tree over dense samples of the surface the first time it computes after the surface changed;
+each query is then seeded by the nearest sample and refined by a few Gauss-Newton steps clamped to the parameter range.
+Since the translation planes have no construction history, the lookup is baked once per rig build.
+"""
+
+import os
+import sys
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as OpenMaya2
+
+def maya_useNewAPI():
+    """ Tell Maya that this plug-in uses the Python API 2.0 objects.
+    """
+    pass
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_node_name = 'lcClosestPointLookup'
+g_node_id = OpenMaya2.MTypeId(0x1ca00001)
+
+# The parameter samples per span to build the lookup with.
+g_default_sample_count = 4
+g_default_iteration_count = 4
+
+# ======================================================================================================================
+class closestPointLookup(object):
+    """ A k-d tree over the samples of a NURBS surface, answering closest-point queries with a refinement step.
+    """
+
+    def __init__(self, surface_obj, sample_count=g_default_sample_count):
+        """
+        :param surface_obj: the MObject of the NURBS surface data to sample
+        :param sample_count: the number of parameter samples per span in each direction
+        """
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        # A copy of the surface, since the data handed to compute() is owned by the data block.
+        self._srf_data = OpenMaya2.MFnNurbsSurfaceData().create()
+        self._srf_fn = OpenMaya2.MFnNurbsSurface(OpenMaya2.MFnNurbsSurface().copy(surface_obj, self._srf_data))
+        self._range_u = self._srf_fn.knotDomainInU
+        self._range_v = self._srf_fn.knotDomainInV
+
+        # A list of ((U parameter, V parameter), (x, y, z)) of the samples
+        self._sample_list = []
+        # The k-d tree nodes in tuples of (sample index, split axis, left child, right child)
+        self._kdtree = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+        count_u = max(self._srf_fn.numSpansInU*sample_count, 1)
+        count_v = max(self._srf_fn.numSpansInV*sample_count, 1)
+        for idx_u in range(count_u+1):
+            param_u = self._range_u[0] + (self._range_u[1]-self._range_u[0]) * idx_u/float(count_u)
+            for idx_v in range(count_v+1):
+                param_v = self._range_v[0] + (self._range_v[1]-self._range_v[0]) * idx_v/float(count_v)
+                pos = self._srf_fn.getPointAtParam(param_u, param_v, OpenMaya2.MSpace.kObject)
+                self._sample_list.append(((param_u, param_v), (pos.x, pos.y, pos.z)))
+
+        self._kdtree = self._build_kdtree(list(range(len(self._sample_list))), 0)
+
+    def __repr__(self):
+        return NotImplemented
+
+    def get_sample_count(self):
+        return len(self._sample_list)
+
+    def closest_param(self, pos, iteration_count=g_default_iteration_count):
+        """
+        :param pos: a position in the space of the surface data, in a tuple of (x, y, z)
+        :return: a tuple of the (U, V) parameters of the closest point on the surface
+        """
+
+        param_u, param_v = self._sample_list[self._find_nearest_sample(pos)][0]
+
+        for _ in range(iteration_count):
+            srf_pos, deriv_u, deriv_v = self._srf_fn.getDerivativesAtParam(param_u, param_v,
+                                                                            OpenMaya2.MSpace.kObject)
+            diff = OpenMaya2.MVector(srf_pos.x-pos[0], srf_pos.y-pos[1], srf_pos.z-pos[2])
+
+            # Solve the 2x2 normal equations J^T J d = -J^T r.
+            a = deriv_u * deriv_u
+            b = deriv_u * deriv_v
+            c = deriv_v * deriv_v
+            f = diff * deriv_u
+            g = diff * deriv_v
+
+            det = a*c - b*b
+            if abs(det) < 1e-12:
+                break
+
+            delta_u = (b*g - c*f) / det
+            delta_v = (b*f - a*g) / det
+            param_u = min(max(param_u+delta_u, self._range_u[0]), self._range_u[1])
+            param_v = min(max(param_v+delta_v, self._range_v[0]), self._range_v[1])
+
+            if abs(delta_u) < 1e-7 and abs(delta_v) < 1e-7:
+                break
+
+        return param_u, param_v
+
+    def _build_kdtree(self, sample_ids, depth):
+        if not sample_ids:
+            return None
+
+        axis = depth % 3
+        sample_ids.sort(key=lambda sample_id: self._sample_list[sample_id][1][axis])
+        median = len(sample_ids) // 2
+
+        return (sample_ids[median],
+                axis,
+                self._build_kdtree(sample_ids[:median], depth+1),
+                self._build_kdtree(sample_ids[median+1:], depth+1))
+
+    def _find_nearest_sample(self, pos):
+        """
+        :return: the index of the sample nearest to the position
+        """
+
+        best_id = -1
+        best_sqr_dist = float('inf')
+
+        node_stack = [self._kdtree]
+        while node_stack:
+            node = node_stack.pop()
+            if node is None:
+                continue
+
+            sample_id, axis, left_node, right_node = node
+            sample_pos = self._sample_list[sample_id][1]
+
+            sqr_dist = (sample_pos[0]-pos[0])**2 + (sample_pos[1]-pos[1])**2 + (sample_pos[2]-pos[2])**2
+            if sqr_dist < best_sqr_dist:
+                best_id = sample_id
+                best_sqr_dist = sqr_dist
+
+            split_dist = pos[axis] - sample_pos[axis]
+            near_node, far_node = (left_node, right_node) if split_dist < 0 else (right_node, left_node)
+
+            # The far side is visited after the near side, and only if the splitting plane is within the best distance.
+            if split_dist*split_dist < best_sqr_dist:
+                node_stack.append(far_node)
+            node_stack.append(near_node)
+
+        return best_id
+
+# ======================================================================================================================
+class lcClosestPointLookupNode(OpenMaya2.MPxNode):
+    """ A node projecting an array of positions onto a NURBS surface through a baked closestPointLookup.
+    """
+
+    # Attribute Definitions --------------------------------------------------------------------------------------------
+    aInputSurface = None
+    aSampleCount = None
+    aIterationCount = None
+    aInPosition = None
+    aParameterU = None
+    aParameterV = None
+    # -------------------------------------------------------------------------------------------- Attribute Definitions
+
+    def __init__(self):
+        OpenMaya2.MPxNode.__init__(self)
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        self._lookup = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def setDependentsDirty(self, plug, plug_array):
+        # Drop the baked lookup once the surface or the sampling changes; it is baked again on the next compute.
+        if plug.attribute() == lcClosestPointLookupNode.aInputSurface or \
+           plug.attribute() == lcClosestPointLookupNode.aSampleCount:
+            self._lookup = None
+        return OpenMaya2.MPxNode.setDependentsDirty(self, plug, plug_array)
+
+    def compute(self, plug, data):
+        if plug.attribute() != lcClosestPointLookupNode.aParameterU and \
+           plug.attribute() != lcClosestPointLookupNode.aParameterV:
+            return None
+
+        if self._lookup is None:
+            surface_obj = data.inputValue(lcClosestPointLookupNode.aInputSurface).asNurbsSurface()
+            if surface_obj.isNull():
+                return None
+            sample_count = data.inputValue(lcClosestPointLookupNode.aSampleCount).asInt()
+            self._lookup = closestPointLookup(surface_obj, sample_count)
+
+        iteration_count = data.inputValue(lcClosestPointLookupNode.aIterationCount).asInt()
+
+        in_pos_array_handle = data.inputArrayValue(lcClosestPointLookupNode.aInPosition)
+        param_u_builder = data.outputArrayValue(lcClosestPointLookupNode.aParameterU).builder()
+        param_v_builder = data.outputArrayValue(lcClosestPointLookupNode.aParameterV).builder()
+
+        for idx in range(len(in_pos_array_handle)):
+            in_pos_array_handle.jumpToPhysicalElement(idx)
+            logical_idx = in_pos_array_handle.elementLogicalIndex()
+            in_pos = in_pos_array_handle.inputValue().asDouble3()
+
+            param_u, param_v = self._lookup.closest_param(in_pos, iteration_count)
+            param_u_builder.addElement(logical_idx).setDouble(param_u)
+            param_v_builder.addElement(logical_idx).setDouble(param_v)
+
+        param_u_handle = data.outputArrayValue(lcClosestPointLookupNode.aParameterU)
+        param_u_handle.set(param_u_builder)
+        param_u_handle.setAllClean()
+        param_v_handle = data.outputArrayValue(lcClosestPointLookupNode.aParameterV)
+        param_v_handle.set(param_v_builder)
+        param_v_handle.setAllClean()
+
+        data.setClean(plug)
+
+def nodeCreator():
+    return lcClosestPointLookupNode()
+
+def nodeInitializer():
+    typed_attr_fn = OpenMaya2.MFnTypedAttribute()
+    numeric_attr_fn = OpenMaya2.MFnNumericAttribute()
+
+    lcClosestPointLookupNode.aInputSurface = typed_attr_fn.create('inputSurface', 'is',
+                                                                  OpenMaya2.MFnData.kNurbsSurface)
+    typed_attr_fn.storable = False
+
+    lcClosestPointLookupNode.aSampleCount = numeric_attr_fn.create('sampleCount', 'sc',
+                                                                   OpenMaya2.MFnNumericData.kInt,
+                                                                   g_default_sample_count)
+    numeric_attr_fn.setMin(1)
+
+    lcClosestPointLookupNode.aIterationCount = numeric_attr_fn.create('iterationCount', 'ic',
+                                                                      OpenMaya2.MFnNumericData.kInt,
+                                                                      g_default_iteration_count)
+    numeric_attr_fn.setMin(0)
+
+    lcClosestPointLookupNode.aInPosition = numeric_attr_fn.create('inPosition', 'ip',
+                                                                  OpenMaya2.MFnNumericData.k3Double)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.usesArrayDataBuilder = True
+
+    lcClosestPointLookupNode.aParameterU = numeric_attr_fn.create('parameterU', 'u',
+                                                                  OpenMaya2.MFnNumericData.kDouble)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.usesArrayDataBuilder = True
+    numeric_attr_fn.writable = False
+    numeric_attr_fn.storable = False
+
+    lcClosestPointLookupNode.aParameterV = numeric_attr_fn.create('parameterV', 'v',
+                                                                  OpenMaya2.MFnNumericData.kDouble)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.usesArrayDataBuilder = True
+    numeric_attr_fn.writable = False
+    numeric_attr_fn.storable = False
+
+    for attr in [lcClosestPointLookupNode.aInputSurface,
+                 lcClosestPointLookupNode.aSampleCount,
+                 lcClosestPointLookupNode.aIterationCount,
+                 lcClosestPointLookupNode.aInPosition,
+                 lcClosestPointLookupNode.aParameterU,
+                 lcClosestPointLookupNode.aParameterV]:
+        lcClosestPointLookupNode.addAttribute(attr)
+
+    for in_attr in [lcClosestPointLookupNode.aInputSurface,
+                    lcClosestPointLookupNode.aSampleCount,
+                    lcClosestPointLookupNode.aIterationCount,
+                    lcClosestPointLookupNode.aInPosition]:
+        lcClosestPointLookupNode.attributeAffects(in_attr, lcClosestPointLookupNode.aParameterU)
+        lcClosestPointLookupNode.attributeAffects(in_attr, lcClosestPointLookupNode.aParameterV)
+
+# Initialize the script plug-in.
+def initializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject, 'Light Chaser Animation Studios', '1.0')
+    try:
+        mplugin.registerNode(g_node_name, g_node_id, nodeCreator, nodeInitializer)
+    except:
+        sys.stderr.write('Failed to register node: {}'.format(g_node_name))
+        raise
+
+# Uninitialize the script plug-in.
+def uninitializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject)
+    try:
+        mplugin.deregisterNode(g_node_id)
+    except:
+        sys.stderr.write('Failed to deregister node: {}'.format(g_node_name))
+        raise
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def load():
+    """ Load this file as a plug-in, if it has not been loaded.
+    :return: None
+    """
+
+    plugin_path = os.path.splitext(__file__)[0]+'.py'
+    if not cmds.pluginInfo(os.path.basename(plugin_path), query=True, loaded=True):
+        cmds.loadPlugin(plugin_path, quiet=True)
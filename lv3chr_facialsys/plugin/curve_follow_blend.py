@@ -0,0 +1,176 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: curve_follow_blend.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A dependency node plug-in blending all the follower control curves of a control zone towards a source curve in one
+compute.
+
+A "lcCrvFollowBlend" node replaces the "blendShape" node each follower control curve had, with the source control
+curve as its only target. It takes the object-space source curve, e.g. the blend-shaped control curve A, and the
+original shapes of the follower curves, and outputs each follower curve blended towards the source by its follow
+weight, as its blendShape node would do:
+
+    outputCurve[i] = baseCurve[i] + followWeight[i] * (inputCurve - baseCurve[i])
+
+The source curve is read once per compute for all the followers, and the original shapes, which have no construction
+history, are read once per rig build.
+"""
+
+import os
+import sys
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as OpenMaya2
+
+def maya_useNewAPI():
+    """ Tell Maya that this plug-in uses the Python API 2.0 objects.
+    """
+    pass
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_node_name = 'lcCrvFollowBlend'
+g_node_id = OpenMaya2.MTypeId(0x1ca00004)
+
+# ======================================================================================================================
+class lcCrvFollowBlendNode(OpenMaya2.MPxNode):
+    """ A node blending an array of curves towards a source curve of the same CVs, each by its own weight.
+    """
+
+    # Attribute Definitions --------------------------------------------------------------------------------------------
+    aInputCurve = None
+    aBaseCurve = None
+    aFollowWeight = None
+    aOutputCurve = None
+    # -------------------------------------------------------------------------------------------- Attribute Definitions
+
+    def __init__(self):
+        OpenMaya2.MPxNode.__init__(self)
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        # {logical index: (CV positions, knots, degree, form)} of the original shapes of the follower curves
+        self._base_dict = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def setDependentsDirty(self, plug, plug_array):
+        # Drop the read original shapes once one of them changes; they are read again on the next compute.
+        if plug.attribute() == lcCrvFollowBlendNode.aBaseCurve:
+            self._base_dict = None
+        return OpenMaya2.MPxNode.setDependentsDirty(self, plug, plug_array)
+
+    def compute(self, plug, data):
+        if plug.attribute() != lcCrvFollowBlendNode.aOutputCurve:
+            return None
+
+        if self._base_dict is None:
+            self._base_dict = {}
+            base_array_handle = data.inputArrayValue(lcCrvFollowBlendNode.aBaseCurve)
+            for idx in range(len(base_array_handle)):
+                base_array_handle.jumpToPhysicalElement(idx)
+                base_obj = base_array_handle.inputValue().asNurbsCurve()
+                if base_obj.isNull():
+                    continue
+                base_fn = OpenMaya2.MFnNurbsCurve(base_obj)
+                self._base_dict[base_array_handle.elementLogicalIndex()] = (
+                    base_fn.cvPositions(OpenMaya2.MSpace.kObject), base_fn.knots(), base_fn.degree, base_fn.form)
+
+        source_cvs = None
+        source_obj = data.inputValue(lcCrvFollowBlendNode.aInputCurve).asNurbsCurve()
+        if not source_obj.isNull():
+            source_cvs = OpenMaya2.MFnNurbsCurve(source_obj).cvPositions(OpenMaya2.MSpace.kObject)
+
+        weight_dict = {}
+        weight_array_handle = data.inputArrayValue(lcCrvFollowBlendNode.aFollowWeight)
+        for idx in range(len(weight_array_handle)):
+            weight_array_handle.jumpToPhysicalElement(idx)
+            weight_dict[weight_array_handle.elementLogicalIndex()] = weight_array_handle.inputValue().asDouble()
+
+        out_crv_handle = data.outputArrayValue(lcCrvFollowBlendNode.aOutputCurve)
+        out_crv_builder = out_crv_handle.builder()
+
+        for logical_idx in sorted(self._base_dict):
+            base_cvs, knots, degree, form = self._base_dict[logical_idx]
+            weight = weight_dict.get(logical_idx, 0.0)
+
+            # A follower whose CVs do not match the source's is left in its original shape.
+            out_cvs = base_cvs
+            if source_cvs is not None and len(source_cvs) == len(base_cvs) and 0.0 != weight:
+                out_cvs = OpenMaya2.MPointArray([base_cv + (source_cv-base_cv)*weight
+                                                 for base_cv, source_cv in zip(base_cvs, source_cvs)])
+
+            out_crv_data = OpenMaya2.MFnNurbsCurveData().create()
+            OpenMaya2.MFnNurbsCurve().create(out_cvs, knots, degree, form, False, True, out_crv_data)
+            out_crv_builder.addElement(logical_idx).setMObject(out_crv_data)
+
+        out_crv_handle.set(out_crv_builder)
+        out_crv_handle.setAllClean()
+
+        data.setClean(plug)
+
+def nodeCreator():
+    return lcCrvFollowBlendNode()
+
+def nodeInitializer():
+    typed_attr_fn = OpenMaya2.MFnTypedAttribute()
+    numeric_attr_fn = OpenMaya2.MFnNumericAttribute()
+
+    lcCrvFollowBlendNode.aInputCurve = typed_attr_fn.create('inputCurve', 'ic', OpenMaya2.MFnData.kNurbsCurve)
+    typed_attr_fn.storable = False
+
+    lcCrvFollowBlendNode.aBaseCurve = typed_attr_fn.create('baseCurve', 'bc', OpenMaya2.MFnData.kNurbsCurve)
+    typed_attr_fn.array = True
+    typed_attr_fn.storable = False
+
+    lcCrvFollowBlendNode.aFollowWeight = numeric_attr_fn.create('followWeight', 'fw',
+                                                                OpenMaya2.MFnNumericData.kDouble, 0.0)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.keyable = True
+
+    lcCrvFollowBlendNode.aOutputCurve = typed_attr_fn.create('outputCurve', 'oc', OpenMaya2.MFnData.kNurbsCurve)
+    typed_attr_fn.array = True
+    typed_attr_fn.usesArrayDataBuilder = True
+    typed_attr_fn.writable = False
+    typed_attr_fn.storable = False
+
+    for attr in [lcCrvFollowBlendNode.aInputCurve,
+                 lcCrvFollowBlendNode.aBaseCurve,
+                 lcCrvFollowBlendNode.aFollowWeight,
+                 lcCrvFollowBlendNode.aOutputCurve]:
+        lcCrvFollowBlendNode.addAttribute(attr)
+
+    for in_attr in [lcCrvFollowBlendNode.aInputCurve,
+                    lcCrvFollowBlendNode.aBaseCurve,
+                    lcCrvFollowBlendNode.aFollowWeight]:
+        lcCrvFollowBlendNode.attributeAffects(in_attr, lcCrvFollowBlendNode.aOutputCurve)
+
+# Initialize the script plug-in.
+def initializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject, 'Light Chaser Animation Studios', '1.0')
+    try:
+        mplugin.registerNode(g_node_name, g_node_id, nodeCreator, nodeInitializer)
+    except:
+        sys.stderr.write('Failed to register node: {}'.format(g_node_name))
+        raise
+
+# Uninitialize the script plug-in.
+def uninitializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject)
+    try:
+        mplugin.deregisterNode(g_node_id)
+    except:
+        sys.stderr.write('Failed to deregister node: {}'.format(g_node_name))
+        raise
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def load():
+    """ Load this file as a plug-in, if it has not been loaded.
+    :return: None
+    """
+
+    plugin_path = os.path.splitext(__file__)[0]+'.py'
+    if not cmds.pluginInfo(os.path.basename(plugin_path), query=True, loaded=True):
+        cmds.loadPlugin(plugin_path, quiet=True)
@@ -0,0 +1,209 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: curve_surface_projection.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A dependency node plug-in projecting all the locators of a control curve onto a projection surface in one compute.
+
+A "lcCrvProjectToSurface" node replaces the node chain built for each locator of a control curve:
+    pointOnCurveInfo -> locator -> closestPointOnSurface -> pointOnSurfaceInfo
+It takes the control curve, its translation plane and the projection surface, evaluates the curve at the locators'
+parameters, finds the closest points on the translation plane through a baked closestPointLookup, and outputs the
+positions at the same UV parameters on the projection surface, which drive the projection surface's locators directly.
+The world-space positions are brought into the locators' parent spaces by the "parentInverseMatrix" elements of the
+same logical indices as the "curveParameter" ones; an element without it outputs the world-space position.
+"""
+
+import os
+import sys
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as OpenMaya2
+
+from plugin.closest_point_lookup import closestPointLookup
+from plugin.closest_point_lookup import g_default_sample_count, g_default_iteration_count
+
+def maya_useNewAPI():
+    """ Tell Maya that this plug-in uses the Python API 2.0 objects.
+    """
+    pass
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_node_name = 'lcCrvProjectToSurface'
+g_node_id = OpenMaya2.MTypeId(0x1ca00002)
+
+# ======================================================================================================================
+class lcCrvProjectToSurfaceNode(OpenMaya2.MPxNode):
+    """ A node projecting the points at an array of parameters on a curve onto a projection surface, through the
+    closest points on a translation plane.
+    """
+
+    # Attribute Definitions --------------------------------------------------------------------------------------------
+    aInputCurve = None
+    aCurveParameter = None
+    aInputTransPlane = None
+    aInputProjSurface = None
+    aParentInverseMatrix = None
+    aSampleCount = None
+    aIterationCount = None
+    aOutPosition = None
+    # -------------------------------------------------------------------------------------------- Attribute Definitions
+
+    def __init__(self):
+        OpenMaya2.MPxNode.__init__(self)
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        # The closestPointLookup of the translation plane
+        self._lookup = None
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def setDependentsDirty(self, plug, plug_array):
+        # Drop the baked lookup once the translation plane or the sampling changes.
+        if plug.attribute() == lcCrvProjectToSurfaceNode.aInputTransPlane or \
+           plug.attribute() == lcCrvProjectToSurfaceNode.aSampleCount:
+            self._lookup = None
+        return OpenMaya2.MPxNode.setDependentsDirty(self, plug, plug_array)
+
+    def compute(self, plug, data):
+        if plug.attribute() != lcCrvProjectToSurfaceNode.aOutPosition:
+            return None
+
+        curve_obj = data.inputValue(lcCrvProjectToSurfaceNode.aInputCurve).asNurbsCurve()
+        projsrf_obj = data.inputValue(lcCrvProjectToSurfaceNode.aInputProjSurface).asNurbsSurface()
+        if curve_obj.isNull() or projsrf_obj.isNull():
+            return None
+
+        if self._lookup is None:
+            transplane_obj = data.inputValue(lcCrvProjectToSurfaceNode.aInputTransPlane).asNurbsSurface()
+            if transplane_obj.isNull():
+                return None
+            sample_count = data.inputValue(lcCrvProjectToSurfaceNode.aSampleCount).asInt()
+            self._lookup = closestPointLookup(transplane_obj, sample_count)
+
+        iteration_count = data.inputValue(lcCrvProjectToSurfaceNode.aIterationCount).asInt()
+
+        curve_fn = OpenMaya2.MFnNurbsCurve(curve_obj)
+        projsrf_fn = OpenMaya2.MFnNurbsSurface(projsrf_obj)
+
+        crv_param_array_handle = data.inputArrayValue(lcCrvProjectToSurfaceNode.aCurveParameter)
+        parent_inv_mtx_array_handle = data.inputArrayValue(lcCrvProjectToSurfaceNode.aParentInverseMatrix)
+        out_pos_handle = data.outputArrayValue(lcCrvProjectToSurfaceNode.aOutPosition)
+        out_pos_builder = out_pos_handle.builder()
+
+        for idx in range(len(crv_param_array_handle)):
+            crv_param_array_handle.jumpToPhysicalElement(idx)
+            logical_idx = crv_param_array_handle.elementLogicalIndex()
+            crv_param = crv_param_array_handle.inputValue().asDouble()
+
+            crv_pos = curve_fn.getPointAtParam(crv_param, OpenMaya2.MSpace.kObject)
+            param_u, param_v = self._lookup.closest_param((crv_pos.x, crv_pos.y, crv_pos.z), iteration_count)
+            srf_pos = projsrf_fn.getPointAtParam(param_u, param_v, OpenMaya2.MSpace.kObject)
+
+            try:
+                parent_inv_mtx_array_handle.jumpToLogicalElement(logical_idx)
+                srf_pos = srf_pos * parent_inv_mtx_array_handle.inputValue().asMatrix()
+            except RuntimeError:
+                pass
+
+            out_pos_builder.addElement(logical_idx).set3Double(srf_pos.x, srf_pos.y, srf_pos.z)
+
+        out_pos_handle.set(out_pos_builder)
+        out_pos_handle.setAllClean()
+
+        data.setClean(plug)
+
+def nodeCreator():
+    return lcCrvProjectToSurfaceNode()
+
+def nodeInitializer():
+    typed_attr_fn = OpenMaya2.MFnTypedAttribute()
+    numeric_attr_fn = OpenMaya2.MFnNumericAttribute()
+    matrix_attr_fn = OpenMaya2.MFnMatrixAttribute()
+
+    lcCrvProjectToSurfaceNode.aInputCurve = typed_attr_fn.create('inputCurve', 'ic', OpenMaya2.MFnData.kNurbsCurve)
+    typed_attr_fn.storable = False
+
+    lcCrvProjectToSurfaceNode.aCurveParameter = numeric_attr_fn.create('curveParameter', 'cp',
+                                                                       OpenMaya2.MFnNumericData.kDouble)
+    numeric_attr_fn.array = True
+
+    lcCrvProjectToSurfaceNode.aInputTransPlane = typed_attr_fn.create('inputTransPlane', 'itp',
+                                                                      OpenMaya2.MFnData.kNurbsSurface)
+    typed_attr_fn.storable = False
+
+    lcCrvProjectToSurfaceNode.aInputProjSurface = typed_attr_fn.create('inputProjSurface', 'ips',
+                                                                       OpenMaya2.MFnData.kNurbsSurface)
+    typed_attr_fn.storable = False
+
+    lcCrvProjectToSurfaceNode.aParentInverseMatrix = matrix_attr_fn.create('parentInverseMatrix', 'pim',
+                                                                           OpenMaya2.MFnMatrixAttribute.kDouble)
+    matrix_attr_fn.array = True
+    matrix_attr_fn.storable = False
+
+    lcCrvProjectToSurfaceNode.aSampleCount = numeric_attr_fn.create('sampleCount', 'sc',
+                                                                    OpenMaya2.MFnNumericData.kInt,
+                                                                    g_default_sample_count)
+    numeric_attr_fn.setMin(1)
+
+    lcCrvProjectToSurfaceNode.aIterationCount = numeric_attr_fn.create('iterationCount', 'itc',
+                                                                       OpenMaya2.MFnNumericData.kInt,
+                                                                       g_default_iteration_count)
+    numeric_attr_fn.setMin(0)
+
+    lcCrvProjectToSurfaceNode.aOutPosition = numeric_attr_fn.create('outPosition', 'op',
+                                                                    OpenMaya2.MFnNumericData.k3Double)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.usesArrayDataBuilder = True
+    numeric_attr_fn.writable = False
+    numeric_attr_fn.storable = False
+
+    for attr in [lcCrvProjectToSurfaceNode.aInputCurve,
+                 lcCrvProjectToSurfaceNode.aCurveParameter,
+                 lcCrvProjectToSurfaceNode.aInputTransPlane,
+                 lcCrvProjectToSurfaceNode.aInputProjSurface,
+                 lcCrvProjectToSurfaceNode.aParentInverseMatrix,
+                 lcCrvProjectToSurfaceNode.aSampleCount,
+                 lcCrvProjectToSurfaceNode.aIterationCount,
+                 lcCrvProjectToSurfaceNode.aOutPosition]:
+        lcCrvProjectToSurfaceNode.addAttribute(attr)
+
+    for in_attr in [lcCrvProjectToSurfaceNode.aInputCurve,
+                    lcCrvProjectToSurfaceNode.aCurveParameter,
+                    lcCrvProjectToSurfaceNode.aInputTransPlane,
+                    lcCrvProjectToSurfaceNode.aInputProjSurface,
+                    lcCrvProjectToSurfaceNode.aParentInverseMatrix,
+                    lcCrvProjectToSurfaceNode.aSampleCount,
+                    lcCrvProjectToSurfaceNode.aIterationCount]:
+        lcCrvProjectToSurfaceNode.attributeAffects(in_attr, lcCrvProjectToSurfaceNode.aOutPosition)
+
+# Initialize the script plug-in.
+def initializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject, 'Light Chaser Animation Studios', '1.0')
+    try:
+        mplugin.registerNode(g_node_name, g_node_id, nodeCreator, nodeInitializer)
+    except:
+        sys.stderr.write('Failed to register node: {}'.format(g_node_name))
+        raise
+
+# Uninitialize the script plug-in.
+def uninitializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject)
+    try:
+        mplugin.deregisterNode(g_node_id)
+    except:
+        sys.stderr.write('Failed to deregister node: {}'.format(g_node_name))
+        raise
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def load():
+    """ Load this file as a plug-in, if it has not been loaded.
+    :return: None
+    """
+
+    plugin_path = os.path.splitext(__file__)[0]+'.py'
+    if not cmds.pluginInfo(os.path.basename(plugin_path), query=True, loaded=True):
+        cmds.loadPlugin(plugin_path, quiet=True)
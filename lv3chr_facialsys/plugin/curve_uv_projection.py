@@ -0,0 +1,301 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: curve_uv_projection.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A dependency node plug-in mapping the CV coordinates of curves into the UV space of a plane within U & V boundaries.
+
+This is the OpenMaya API 2.0 port of deprecated/rigLib/dependencyNodes/lcCrv_ProjectToUVPlane.py, with the same node
+type name, type ID and attributes, so that the scenes using the old node load with this one.
+Unlike the old node, the output curve data of each element is kept along with the topology (CV count, degree, form and
+knot values) it was created with; while the topology of an input curve stays, only the CV positions of the kept data
+are updated, and only the output elements whose input curves are dirty are recomputed. The CVs are remapped as a whole
+array with NumPy, where the Maya version ships it.
+"""
+
+import os
+import sys
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as OpenMaya2
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def maya_useNewAPI():
+    """ Tell Maya that this plug-in uses the Python API 2.0 objects.
+    """
+    pass
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_node_name = 'lcCrv_ProjectToUVPlane'
+g_node_id = OpenMaya2.MTypeId(0x1ca00000)
+
+# {planeDirection enum value: (the CV coordinate index mapped to U, the CV coordinate index mapped to V)}
+g_plane_dir_axes_dict = {
+    0: (0, 1),  # xy
+    1: (2, 1),  # yz
+}
+
+# ======================================================================================================================
+class lcCrv_ProjectToUVPlaneNode(OpenMaya2.MPxNode):
+    """ A node mapping the CVs of an array of curves to (U, V, 0) coordinates.
+    """
+
+    # Attribute Definitions --------------------------------------------------------------------------------------------
+    aUStartBoundary = None
+    aUEndBoundary = None
+    aUBoundary = None
+    aVStartBoundary = None
+    aVEndBoundary = None
+    aVBoundary = None
+
+    aReverseU = None
+    aReverseV = None
+    aPlaneDirection = None
+
+    aInputCurves = None
+    aOutputCurves = None
+    # -------------------------------------------------------------------------------------------- Attribute Definitions
+
+    def __init__(self):
+        OpenMaya2.MPxNode.__init__(self)
+
+        # Member Variable Definitions ----------------------------------------------------------------------------------
+        # {logical index: (topology key, output curve data MObject)}
+        self._output_cache_dict = {}
+        # ---------------------------------------------------------------------------------- Member Variable Definitions
+
+    def setDependentsDirty(self, plug, plug_array):
+        # Dirty only the output element of the dirty input curve element, rather than the whole output array.
+        if plug.attribute() != lcCrv_ProjectToUVPlaneNode.aInputCurves:
+            return OpenMaya2.MPxNode.setDependentsDirty(self, plug, plug_array)
+
+        out_array_plug = OpenMaya2.MPlug(self.thisMObject(), lcCrv_ProjectToUVPlaneNode.aOutputCurves)
+
+        if plug.isElement:
+            plug_array.append(out_array_plug.elementByLogicalIndex(plug.logicalIndex()))
+        else:
+            for idx in range(out_array_plug.numElements()):
+                plug_array.append(out_array_plug.elementByPhysicalIndex(idx))
+        plug_array.append(out_array_plug)
+
+        return OpenMaya2.MPxNode.setDependentsDirty(self, plug, plug_array)
+
+    def compute(self, plug, data):
+        if plug.attribute() != lcCrv_ProjectToUVPlaneNode.aOutputCurves:
+            return None
+
+        mapping = self._get_mapping(data)
+
+        in_array_handle = data.inputArrayValue(lcCrv_ProjectToUVPlaneNode.aInputCurves)
+        out_array_handle = data.outputArrayValue(lcCrv_ProjectToUVPlaneNode.aOutputCurves)
+
+        if plug.isElement:
+            logical_idx_list = [plug.logicalIndex()]
+        else:
+            logical_idx_list = []
+            for idx in range(len(in_array_handle)):
+                in_array_handle.jumpToPhysicalElement(idx)
+                logical_idx_list.append(in_array_handle.elementLogicalIndex())
+
+            # Forget the curves whose input elements have been removed.
+            for logical_idx in list(self._output_cache_dict.keys()):
+                if logical_idx not in logical_idx_list:
+                    del self._output_cache_dict[logical_idx]
+
+        for logical_idx in logical_idx_list:
+            try:
+                in_array_handle.jumpToLogicalElement(logical_idx)
+            except RuntimeError:
+                continue
+
+            out_crv_data = self._map_curve(logical_idx, in_array_handle.inputValue().asNurbsCurve(), mapping)
+            if out_crv_data is None:
+                continue
+
+            try:
+                out_array_handle.jumpToLogicalElement(logical_idx)
+                out_handle = out_array_handle.outputValue()
+                out_handle.setMObject(out_crv_data)
+                out_handle.setClean()
+            except RuntimeError:
+                # The output element does not exist yet: add it through the array data builder.
+                builder = out_array_handle.builder()
+                out_handle = builder.addElement(logical_idx)
+                out_handle.setMObject(out_crv_data)
+                out_handle.setClean()
+                out_array_handle.set(builder)
+
+        # Only the whole-array evaluation cleans all the elements; an element evaluation cleans its own element.
+        if not plug.isElement:
+            out_array_handle.setAllClean()
+        data.setClean(plug)
+
+    def _get_mapping(self, data):
+        """
+        :return: a tuple of (U axis index, V axis index, U scale, U offset, V scale, V offset), with which the UV
+                 coordinates of a CV are (cv[U axis index]*U scale+U offset, cv[V axis index]*V scale+V offset)
+        """
+
+        u_start = data.inputValue(lcCrv_ProjectToUVPlaneNode.aUStartBoundary).asDouble()
+        u_end = data.inputValue(lcCrv_ProjectToUVPlaneNode.aUEndBoundary).asDouble()
+        v_start = data.inputValue(lcCrv_ProjectToUVPlaneNode.aVStartBoundary).asDouble()
+        v_end = data.inputValue(lcCrv_ProjectToUVPlaneNode.aVEndBoundary).asDouble()
+        reverse_u = data.inputValue(lcCrv_ProjectToUVPlaneNode.aReverseU).asBool()
+        reverse_v = data.inputValue(lcCrv_ProjectToUVPlaneNode.aReverseV).asBool()
+        plane_dir = data.inputValue(lcCrv_ProjectToUVPlaneNode.aPlaneDirection).asShort()
+
+        u_axis, v_axis = g_plane_dir_axes_dict.get(plane_dir, g_plane_dir_axes_dict[0])
+
+        # As the old node did, a reversed parameter is negated.
+        u_scale = (-1.0 if reverse_u else 1.0) / (abs(u_end-u_start) or 1.0)
+        v_scale = (-1.0 if reverse_v else 1.0) / (abs(v_end-v_start) or 1.0)
+
+        return u_axis, v_axis, u_scale, -u_start*u_scale, v_scale, -v_start*v_scale
+
+    def _map_curve(self, logical_idx, in_crv_obj, mapping):
+        """
+        :return: the output curve data MObject of the input curve element, or None if the input is not a curve
+        """
+
+        if in_crv_obj.isNull():
+            return None
+
+        u_axis, v_axis, u_scale, u_offset, v_scale, v_offset = mapping
+
+        in_crv_fn = OpenMaya2.MFnNurbsCurve(in_crv_obj)
+        in_cvs = in_crv_fn.cvPositions(OpenMaya2.MSpace.kObject)
+
+        if np is not None:
+            in_cv_array = np.array(in_cvs, dtype=float).reshape(-1, 4)
+            out_cv_array = np.zeros_like(in_cv_array)
+            out_cv_array[:, 0] = in_cv_array[:, u_axis]*u_scale+u_offset
+            out_cv_array[:, 1] = in_cv_array[:, v_axis]*v_scale+v_offset
+            out_cv_array[:, 3] = 1.0
+            out_cvs = OpenMaya2.MPointArray(out_cv_array.tolist())
+        else:
+            out_cvs = OpenMaya2.MPointArray([OpenMaya2.MPoint(cv[u_axis]*u_scale+u_offset, cv[v_axis]*v_scale+v_offset)
+                                             for cv in in_cvs])
+
+        knots = in_crv_fn.knots()
+        topology_key = (in_crv_fn.numCVs, in_crv_fn.degree, in_crv_fn.form, tuple(knots))
+        cached = self._output_cache_dict.get(logical_idx)
+
+        if cached is not None and cached[0] == topology_key:
+            out_crv_data = cached[1]
+            OpenMaya2.MFnNurbsCurve(out_crv_data).setCVPositions(out_cvs, OpenMaya2.MSpace.kObject)
+            return out_crv_data
+
+        # The topology changed: rebuild the output curve data with the knots of the input curve.
+        out_crv_data = OpenMaya2.MFnNurbsCurveData().create()
+        OpenMaya2.MFnNurbsCurve().create(out_cvs,
+                                         knots,
+                                         in_crv_fn.degree,
+                                         in_crv_fn.form,
+                                         True,
+                                         True,
+                                         out_crv_data)
+        self._output_cache_dict[logical_idx] = (topology_key, out_crv_data)
+        return out_crv_data
+
+def nodeCreator():
+    return lcCrv_ProjectToUVPlaneNode()
+
+def nodeInitializer():
+    numeric_attr_fn = OpenMaya2.MFnNumericAttribute()
+    enum_attr_fn = OpenMaya2.MFnEnumAttribute()
+    generic_attr_fn = OpenMaya2.MFnGenericAttribute()
+
+    lcCrv_ProjectToUVPlaneNode.aUStartBoundary = numeric_attr_fn.create('uStartBoundary', 'usb',
+                                                                        OpenMaya2.MFnNumericData.kDouble, -1.0)
+    lcCrv_ProjectToUVPlaneNode.aUEndBoundary = numeric_attr_fn.create('uEndBoundary', 'ueb',
+                                                                      OpenMaya2.MFnNumericData.kDouble, 1.0)
+    lcCrv_ProjectToUVPlaneNode.aUBoundary = numeric_attr_fn.create('uBoundary', 'ub',
+                                                                   lcCrv_ProjectToUVPlaneNode.aUStartBoundary,
+                                                                   lcCrv_ProjectToUVPlaneNode.aUEndBoundary)
+    numeric_attr_fn.keyable = True
+
+    lcCrv_ProjectToUVPlaneNode.aVStartBoundary = numeric_attr_fn.create('vStartBoundary', 'vsb',
+                                                                        OpenMaya2.MFnNumericData.kDouble, -1.0)
+    lcCrv_ProjectToUVPlaneNode.aVEndBoundary = numeric_attr_fn.create('vEndBoundary', 'veb',
+                                                                      OpenMaya2.MFnNumericData.kDouble, 1.0)
+    lcCrv_ProjectToUVPlaneNode.aVBoundary = numeric_attr_fn.create('vBoundary', 'vb',
+                                                                   lcCrv_ProjectToUVPlaneNode.aVStartBoundary,
+                                                                   lcCrv_ProjectToUVPlaneNode.aVEndBoundary)
+    numeric_attr_fn.keyable = True
+
+    lcCrv_ProjectToUVPlaneNode.aReverseU = numeric_attr_fn.create('reverseU', 'ru',
+                                                                  OpenMaya2.MFnNumericData.kBoolean, False)
+    numeric_attr_fn.keyable = True
+    lcCrv_ProjectToUVPlaneNode.aReverseV = numeric_attr_fn.create('reverseV', 'rv',
+                                                                  OpenMaya2.MFnNumericData.kBoolean, False)
+    numeric_attr_fn.keyable = True
+
+    lcCrv_ProjectToUVPlaneNode.aPlaneDirection = enum_attr_fn.create('planeDirection', 'pld', 0)
+    enum_attr_fn.addField('xy', 0)
+    enum_attr_fn.addField('yz', 1)
+    enum_attr_fn.keyable = True
+
+    lcCrv_ProjectToUVPlaneNode.aInputCurves = generic_attr_fn.create('inputCurves', 'icrvs')
+    generic_attr_fn.addDataType(OpenMaya2.MFnData.kNurbsCurve)
+    generic_attr_fn.array = True
+    generic_attr_fn.storable = False
+
+    lcCrv_ProjectToUVPlaneNode.aOutputCurves = generic_attr_fn.create('outputCurves', 'ocrvs')
+    generic_attr_fn.addDataType(OpenMaya2.MFnData.kNurbsCurve)
+    generic_attr_fn.array = True
+    generic_attr_fn.usesArrayDataBuilder = True
+    generic_attr_fn.writable = False
+    generic_attr_fn.storable = False
+
+    for attr in [lcCrv_ProjectToUVPlaneNode.aUBoundary,
+                 lcCrv_ProjectToUVPlaneNode.aVBoundary,
+                 lcCrv_ProjectToUVPlaneNode.aReverseU,
+                 lcCrv_ProjectToUVPlaneNode.aReverseV,
+                 lcCrv_ProjectToUVPlaneNode.aPlaneDirection,
+                 lcCrv_ProjectToUVPlaneNode.aInputCurves,
+                 lcCrv_ProjectToUVPlaneNode.aOutputCurves]:
+        lcCrv_ProjectToUVPlaneNode.addAttribute(attr)
+
+    # The input curves dirty the output curves element by element in setDependentsDirty().
+    for in_attr in [lcCrv_ProjectToUVPlaneNode.aUBoundary,
+                    lcCrv_ProjectToUVPlaneNode.aVBoundary,
+                    lcCrv_ProjectToUVPlaneNode.aReverseU,
+                    lcCrv_ProjectToUVPlaneNode.aReverseV,
+                    lcCrv_ProjectToUVPlaneNode.aPlaneDirection]:
+        lcCrv_ProjectToUVPlaneNode.attributeAffects(in_attr, lcCrv_ProjectToUVPlaneNode.aOutputCurves)
+
+# Initialize the script plug-in.
+def initializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject, 'Light Chaser Animation Studios', '1.0')
+    try:
+        mplugin.registerNode(g_node_name, g_node_id, nodeCreator, nodeInitializer)
+    except:
+        sys.stderr.write('Failed to register node: {}'.format(g_node_name))
+        raise
+
+# Uninitialize the script plug-in.
+def uninitializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject)
+    try:
+        mplugin.deregisterNode(g_node_id)
+    except:
+        sys.stderr.write('Failed to deregister node: {}'.format(g_node_name))
+        raise
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def load():
+    """ Load this file as a plug-in, if it has not been loaded.
+    :return: None
+    """
+
+    plugin_path = os.path.splitext(__file__)[0]+'.py'
+    if not cmds.pluginInfo(os.path.basename(plugin_path), query=True, loaded=True):
+        cmds.loadPlugin(plugin_path, quiet=True)
@@ -0,0 +1,186 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: facial_follow.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A dependency node plug-in computing all the follow behaviours of a control zone in one compute.
+
+A "lcFacialFollow" node replaces the "multiplyDivide" and "plusMinusAverage" nodes a control zone builds to make its
+controls follow the translations of its controllers, e.g. the eye corners following their adjacent eyelid controllers,
+or the cheek blend-shape weights following the average of the mouth corner controllers.
+The node takes an array of driver translations. Each follower, by its logical index, averages a range of them, then
+scales the result per axis by its follow weights (typically connected from the follow attributes) and by its constant
+scales (e.g. -1 to mirror an axis):
+
+    outTranslate[i] = followScale[i] * followWeight[i] *
+                      average(inTranslate[driverStart[i]], ..., inTranslate[driverStart[i]+driverCount[i]-1])
+"""
+
+import os
+import sys
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as OpenMaya2
+
+def maya_useNewAPI():
+    """ Tell Maya that this plug-in uses the Python API 2.0 objects.
+    """
+    pass
+
+# global variables -----------------------------------------------------------------------------------------------------
+g_node_name = 'lcFacialFollow'
+g_node_id = OpenMaya2.MTypeId(0x1ca00003)
+
+# ======================================================================================================================
+class lcFacialFollowNode(OpenMaya2.MPxNode):
+    """ A node weighting the averages of ranges of an array of driver translations, one per follower.
+    """
+
+    # Attribute Definitions --------------------------------------------------------------------------------------------
+    aInTranslate = None
+    aDriverStart = None
+    aDriverCount = None
+    aFollowWeight = None
+    aFollowScale = None
+    aOutTranslate = None
+    # -------------------------------------------------------------------------------------------- Attribute Definitions
+
+    def __init__(self):
+        OpenMaya2.MPxNode.__init__(self)
+
+    def compute(self, plug, data):
+        if plug.attribute() != lcFacialFollowNode.aOutTranslate and \
+           (not plug.isChild or plug.parent().attribute() != lcFacialFollowNode.aOutTranslate):
+            return None
+
+        in_trans_dict = read_array_values(data.inputArrayValue(lcFacialFollowNode.aInTranslate), 'asDouble3')
+        driver_start_dict = read_array_values(data.inputArrayValue(lcFacialFollowNode.aDriverStart), 'asInt')
+        driver_count_dict = read_array_values(data.inputArrayValue(lcFacialFollowNode.aDriverCount), 'asInt')
+        follow_weight_dict = read_array_values(data.inputArrayValue(lcFacialFollowNode.aFollowWeight), 'asDouble3')
+        follow_scale_dict = read_array_values(data.inputArrayValue(lcFacialFollowNode.aFollowScale), 'asDouble3')
+
+        out_trans_handle = data.outputArrayValue(lcFacialFollowNode.aOutTranslate)
+        out_trans_builder = out_trans_handle.builder()
+
+        # The followers are the logical indices whose driver ranges are set.
+        for follower_idx in sorted(driver_count_dict):
+            driver_start = driver_start_dict.get(follower_idx, 0)
+            driver_count = driver_count_dict[follower_idx]
+
+            avg_trans = [0.0, 0.0, 0.0]
+            for driver_idx in range(driver_start, driver_start+driver_count):
+                driver_trans = in_trans_dict.get(driver_idx, (0.0, 0.0, 0.0))
+                for axis in range(3):
+                    avg_trans[axis] += driver_trans[axis]
+
+            follow_weight = follow_weight_dict.get(follower_idx, (1.0, 1.0, 1.0))
+            follow_scale = follow_scale_dict.get(follower_idx, (1.0, 1.0, 1.0))
+            out_trans = [avg_trans[axis]/max(driver_count, 1)*follow_weight[axis]*follow_scale[axis]
+                         for axis in range(3)]
+
+            out_trans_builder.addElement(follower_idx).set3Double(out_trans[0], out_trans[1], out_trans[2])
+
+        out_trans_handle.set(out_trans_builder)
+        out_trans_handle.setAllClean()
+
+        data.setClean(plug)
+
+def read_array_values(array_handle, value_getter):
+    """
+    :param array_handle: the MArrayDataHandle of an input array attribute
+    :param value_getter: the name of the MDataHandle method reading an element's value, e.g. "asDouble3"
+    :return: a dictionary of {logical index: value} of the elements of the array
+    """
+
+    value_dict = {}
+    for idx in range(len(array_handle)):
+        array_handle.jumpToPhysicalElement(idx)
+        value_dict[array_handle.elementLogicalIndex()] = getattr(array_handle.inputValue(), value_getter)()
+    return value_dict
+
+def nodeCreator():
+    return lcFacialFollowNode()
+
+def create_double3_attr(numeric_attr_fn, long_name, short_name, default_value):
+    """
+    :return: the MObject of a double3 attribute whose children are suffixed with "X", "Y" and "Z"
+    """
+
+    child_attr_list = [numeric_attr_fn.create(long_name+axis, short_name+axis.lower(),
+                                              OpenMaya2.MFnNumericData.kDouble, default_value)
+                       for axis in ['X', 'Y', 'Z']]
+    return numeric_attr_fn.create(long_name, short_name, child_attr_list[0], child_attr_list[1], child_attr_list[2])
+
+def nodeInitializer():
+    numeric_attr_fn = OpenMaya2.MFnNumericAttribute()
+
+    lcFacialFollowNode.aInTranslate = create_double3_attr(numeric_attr_fn, 'inTranslate', 'it', 0.0)
+    numeric_attr_fn.array = True
+
+    lcFacialFollowNode.aDriverStart = numeric_attr_fn.create('driverStart', 'ds', OpenMaya2.MFnNumericData.kInt, 0)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.setMin(0)
+
+    lcFacialFollowNode.aDriverCount = numeric_attr_fn.create('driverCount', 'dc', OpenMaya2.MFnNumericData.kInt, 1)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.setMin(1)
+
+    lcFacialFollowNode.aFollowWeight = create_double3_attr(numeric_attr_fn, 'followWeight', 'fw', 1.0)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.keyable = True
+
+    lcFacialFollowNode.aFollowScale = create_double3_attr(numeric_attr_fn, 'followScale', 'fs', 1.0)
+    numeric_attr_fn.array = True
+
+    lcFacialFollowNode.aOutTranslate = create_double3_attr(numeric_attr_fn, 'outTranslate', 'ot', 0.0)
+    numeric_attr_fn.array = True
+    numeric_attr_fn.usesArrayDataBuilder = True
+    numeric_attr_fn.writable = False
+    numeric_attr_fn.storable = False
+
+    for attr in [lcFacialFollowNode.aInTranslate,
+                 lcFacialFollowNode.aDriverStart,
+                 lcFacialFollowNode.aDriverCount,
+                 lcFacialFollowNode.aFollowWeight,
+                 lcFacialFollowNode.aFollowScale,
+                 lcFacialFollowNode.aOutTranslate]:
+        lcFacialFollowNode.addAttribute(attr)
+
+    for in_attr in [lcFacialFollowNode.aInTranslate,
+                    lcFacialFollowNode.aDriverStart,
+                    lcFacialFollowNode.aDriverCount,
+                    lcFacialFollowNode.aFollowWeight,
+                    lcFacialFollowNode.aFollowScale]:
+        lcFacialFollowNode.attributeAffects(in_attr, lcFacialFollowNode.aOutTranslate)
+
+# Initialize the script plug-in.
+def initializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject, 'Light Chaser Animation Studios', '1.0')
+    try:
+        mplugin.registerNode(g_node_name, g_node_id, nodeCreator, nodeInitializer)
+    except:
+        sys.stderr.write('Failed to register node: {}'.format(g_node_name))
+        raise
+
+# Uninitialize the script plug-in.
+def uninitializePlugin(mobject):
+    mplugin = OpenMaya2.MFnPlugin(mobject)
+    try:
+        mplugin.deregisterNode(g_node_id)
+    except:
+        sys.stderr.write('Failed to deregister node: {}'.format(g_node_name))
+        raise
+
+# Helper Functions -----------------------------------------------------------------------------------------------------
+def load():
+    """ Load this file as a plug-in, if it has not been loaded.
+    :return: None
+    """
+
+    plugin_path = os.path.splitext(__file__)[0]+'.py'
+    if not cmds.pluginInfo(os.path.basename(plugin_path), query=True, loaded=True):
+        cmds.loadPlugin(plugin_path, quiet=True)
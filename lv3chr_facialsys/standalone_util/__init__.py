@@ -1,3 +1,60 @@
-import controller; reload(controller)
-import geometry; reload(geometry)
-import locator; reload(locator)
\ No newline at end of file
+"""
+The standalone utility tools of the facial system.
+
+The submodules are not imported with the package; a submodule is imported the first time one of its commands is run,
+or when it is imported explicitly, e.g. "from standalone_util import locator". No submodule touches the scene on import.
+The commands are registered in g_command_dict, e.g. run_command('create_mesh_vertex_locators') for a shelf button.
+"""
+
+import importlib
+
+# {command name: (submodule name, function name)}
+g_command_dict = {
+    'ctrl_add_offset': ('controller', 'ctrl_add_offset'),
+
+    'copy_transform': ('geometry', 'copy_transform'),
+    'copy_curve_CVs': ('geometry', 'copy_curve_CVs'),
+    'flatten_NURBS_surface': ('geometry', 'flatten_NURBS_surface'),
+    'export_nurbs_srf_CVs': ('geometry', 'export_nurbs_srf_CVs'),
+    'export_nurbs_crv_CVs': ('geometry', 'export_nurbs_crv_CVs'),
+
+    'create_mesh_vertex_locators': ('locator', 'create_mesh_vertex_locators'),
+    'create_surface_CV_locators': ('locator', 'create_surface_CV_locators'),
+    'create_curve_CV_locators': ('locator', 'create_curve_CV_locators'),
+    'create_locators_at_components': ('locator', 'create_locators_at_components'),
+    'create_joint_at_locator': ('locator', 'create_joint_at_locator'),
+
+    'skin_plane_to_joints': ('skin_weight', 'skin_plane_to_joints'),
+}
+
+def get_module(module_name):
+    """
+    :param module_name: the name of a submodule, e.g. "locator"
+    :return: the submodule, imported if it has not been
+    """
+    return importlib.import_module(__name__+'.'+module_name)
+
+def get_command(command_name):
+    """
+    :param command_name: a key of g_command_dict
+    :return: the function of the command
+    """
+
+    if command_name not in g_command_dict:
+        raise KeyError('unknown standalone utility command "{}"'.format(command_name))
+
+    module_name, func_name = g_command_dict[command_name]
+    return getattr(get_module(module_name), func_name)
+
+def run_command(command_name, *args, **kwargs):
+    """ Run a registered command, importing its submodule if it has not been.
+    :param command_name: a key of g_command_dict
+    :return: the return value of the command
+    """
+    return get_command(command_name)(*args, **kwargs)
+
+def list_commands():
+    """
+    :return: a sorted list of the registered command names
+    """
+    return sorted(g_command_dict)
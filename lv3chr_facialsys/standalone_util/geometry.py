@@ -10,87 +10,259 @@
 A module to query geometry information
 """
 
+import io
+import sys
+import math
+import collections
+
 import maya.cmds as cmds
+import maya.api.OpenMaya as OpenMaya2
+
+from database import data_cache
+from database import data_writer
 
 g_float_precision = 8
 
-def get_nurbs_srf_CVs():
-    """
-    :return: a string containing the control vertices' coordinates of a selected NURBS surface
-    stored in a list of dictionary, formatted in [{"u, v": [x, y, z]}], which will be used by
-    the Projection Surface data JSON document to re-construct the surface
+g_proj_srf_data_file_name = 'control_proj_surface_data.json'
+g_ctrl_crv_data_file_name = 'control_crv_data.json'
+
+def get_nurbs_srf_CVs(file_path=None):
+    """ Write the "control_vtx" member of the selected NURBS surface, the list of {"u,v": [x, y, z]} dictionaries used
+    by the Projection Surface data JSON document to re-construct the surface.
+
+    :param file_path: path of the file to write the member into; if it is None, it is printed out
+    :return: the JSON text of the member, or the file path if it is written into a file
     """
+
     nurbs_srf = cmds.ls(selection=True)[0]
     nurbs_srf_spanU = cmds.getAttr(nurbs_srf+'.spansU')
     nurbs_srf_spanV = cmds.getAttr(nurbs_srf+'.spansV')
 
-    nurbs_srf_CVs = ''
-
-    for idx_u in range(nurbs_srf_spanU+1):
-        for idx_v in range(nurbs_srf_spanV+1):
-            cv_coord = cmds.pointPosition(nurbs_srf+'.cv[{0}][{1}]'.format(idx_u, idx_v))[0]
-            cv_coord_x = round(float(cv_coord[0]), g_float_precision)
-            cv_coord_y = round(float(cv_coord[1]), g_float_precision)
-            cv_coord_z = round(float(cv_coord[2]), g_float_precision)
-            nurbs_srf_CVs += '{{"{0},{1}": [{2:.8f}, {3:.8f}, {4:.8f}]}},\n'.format(idx_u, idx_v,
-                                                                                    cv_coord_x, cv_coord_y, cv_coord_z)
-        nurbs_srf_CVs += '\n'
+    def iterate_cvs():
+        for idx_u in range(nurbs_srf_spanU+1):
+            for idx_v in range(nurbs_srf_spanV+1):
+                cv_coord = cmds.pointPosition(nurbs_srf+'.cv[{0}][{1}]'.format(idx_u, idx_v))[0]
+                yield {'{0},{1}'.format(idx_u, idx_v): round_coords(cv_coord)}
 
-    nurbs_srf_CVs = nurbs_srf_CVs[:-3]  # Get rid of the trailing two '\n' and a ','
-    cmds.warning(nurbs_srf_CVs)
+    return write_json_fragment(lambda writer: writer.write_member('control_vtx', iterate_cvs()), file_path)
 
-    return nurbs_srf_CVs
+def get_nurbs_crv_CVs(file_path=None):
+    """ Write the "points" member of the selected NURBS curve, as used by the control curve data JSON document.
+    :param file_path: path of the file to write the member into; if it is None, it is printed out
+    :return: the JSON text of the member, or the file path if it is written into a file
+    """
 
-def get_nurbs_crv_CVs():
     nurbs_crv = cmds.ls(selection=True)[0]
     nurbs_crv_span = cmds.getAttr(nurbs_crv+'.spans')
 
-    nurbs_crv_CVs = ''
+    def iterate_cvs():
+        for idx in range(nurbs_crv_span+1):
+            yield round_coords(cmds.getAttr(nurbs_crv+'.cv[{}]'.format(idx))[0])
 
-    for idx in range(nurbs_crv_span+1):
-        cv_coord = cmds.getAttr(nurbs_crv+'.cv[{}]'.format(idx))[0]
-        cv_coord_x = round(float(cv_coord[0]), g_float_precision)
-        cv_coord_y = round(float(cv_coord[1]), g_float_precision)
-        cv_coord_z = round(float(cv_coord[2]), g_float_precision)
-        nurbs_crv_CVs += '[{0}, {1}, {2}],\n'.format(cv_coord_x, cv_coord_y, cv_coord_z)
+    return write_json_fragment(lambda writer: writer.write_member('points', iterate_cvs()), file_path)
 
-    cmds.warning(nurbs_crv_CVs)
-    return nurbs_crv_CVs
+def write_json_fragment(write_func, file_path=None):
+    """ Stream a JSON fragment into a file, or print it out at once, with the floats rounded to g_float_precision.
+    :param write_func: a function taking a data_writer.jsonStreamWriter and writing the fragment with it
+    :param file_path: path of the file to write the fragment into; if it is None, it is printed out
+    :return: the JSON text of the fragment, or the file path if it is written into a file
+    """
 
-def get_transform_string():
-    sel_transform = cmds.ls(sl=True)[0]
+    if file_path:
+        with open(file_path, 'wb') as f_fragment:
+            write_func(data_writer.jsonStreamWriter(f_fragment, g_float_precision))
+        cmds.warning('Written into "{}".'.format(file_path))
+        return file_path
+
+    f_fragment = io.BytesIO()
+    write_func(data_writer.jsonStreamWriter(f_fragment, g_float_precision))
+    fragment = f_fragment.getvalue().decode('utf-8')
+    sys.stdout.write(fragment+'\n')
+
+    return fragment
+
+def export_nurbs_srf_CVs(data_dir=None, node_list=None, entry_dict=None):
+    """ Write the control vertices of the selected NURBS surfaces into the "control_vtx" lists of their entries in the
+    projection surface data file, e.g. after editing the translation planes and projection surfaces of a built rig.
+
+    The CVs of each surface are read in one MFnNurbsSurface.cvPositions() call, and brought back into the space of
+    the "control_vtx" list by undoing the entry's xform and mirroring, as control_proj_surface.create_nurbs_plane()
+    applies them, so that rebuilding the rig from the data gives the edited surface.
+
+    :param data_dir: directory of the JSON database files; the shipped data directory is used if it is None
+    :param node_list: a list of the surfaces' transform nodes; the selected nodes are exported if it is None
+    :param entry_dict: a dictionary of {node: (data key, entry key)}, e.g.
+                       {"mySrf": ("nasocheek_projection_surface", "right_front_A")}, for the surfaces not named
+                       after their entries as the rig names them
+    :return: a list of the (data key, entry key) of the written entries
+    """
+
+    from control import control_proj_surface
+
+    def read_cvs(nurbs_srf, entry_data):
+        nurbs_srf_fn = OpenMaya2.MFnNurbsSurface(get_shape_dag_path(nurbs_srf))
+        num_cvs_u = nurbs_srf_fn.numCVsInU
+        num_cvs_v = nurbs_srf_fn.numCVsInV
+
+        degree = entry_data['degree']
+        num_cvs_u_expected = entry_data['patchesU']+degree
+        num_cvs_v_expected = entry_data['patchesV']+degree
+        if (num_cvs_u, num_cvs_v) != (num_cvs_u_expected, num_cvs_v_expected):
+            cmds.warning('"{}" has {}x{} CVs, but its data entry has {}x{}; it is skipped.'.format(
+                nurbs_srf, num_cvs_u, num_cvs_v, num_cvs_u_expected, num_cvs_v_expected))
+            return None
+
+        cv_pts = nurbs_srf_fn.cvPositions(OpenMaya2.MSpace.kObject)
+
+        # A surface mirrored along the x-axis has its U direction reversed.
+        if cmds.getAttr(nurbs_srf+'.scaleX') < 0.0:
+            cv_pts = [cv_pts[idx_u*num_cvs_v + idx_v]
+                      for idx_u in reversed(range(num_cvs_u))
+                      for idx_v in range(num_cvs_v)]
+
+        # Undo the baked transformation.
+        xform_data = entry_data['xform']
+        xform_mat = OpenMaya2.MTransformationMatrix()
+        xform_mat.setScale(xform_data['scale'], OpenMaya2.MSpace.kTransform)
+        xform_mat.setRotation(OpenMaya2.MEulerRotation(*[math.radians(angle) for angle in xform_data['rotation']]))
+        xform_mat.setTranslation(OpenMaya2.MVector(xform_data['translation']), OpenMaya2.MSpace.kTransform)
+        xform_inv_mat = xform_mat.asMatrixInverse()
+
+        num_cvs_u, num_cvs_v, knots_u, knots_v, default_cv_coords, cv_tweak_is_relative = \
+            control_proj_surface.get_nurbs_plane_topology(degree, entry_data['patchesU'], entry_data['patchesV'])
+
+        cv_list = []
+        for idx_u in range(num_cvs_u):
+            for idx_v in range(num_cvs_v):
+                cv_id = idx_u*num_cvs_v + idx_v
+                cv_pt = OpenMaya2.MPoint(cv_pts[cv_id])*xform_inv_mat
+                cv_coord = [cv_pt.x, cv_pt.y, cv_pt.z]
+                if cv_tweak_is_relative:
+                    cv_coord = [coord-default_coord for coord, default_coord in zip(cv_coord,
+                                                                                   default_cv_coords[cv_id])]
+                cv_list.append({'{},{}'.format(idx_u, idx_v): round_coords(cv_coord)})
+        return cv_list
+
+    return export_CVs(g_proj_srf_data_file_name, 'control_vtx', read_cvs, data_dir, node_list, entry_dict)
+
+def export_nurbs_crv_CVs(data_dir=None, node_list=None, entry_dict=None):
+    """ Write the control vertices of the selected NURBS curves into the "points" lists of their entries in the
+    control curve data file, e.g. after editing the control curves of a built rig.
+    The CVs of each curve are read in one MFnNurbsCurve.cvPositions() call, in the object space of the curve.
+
+    :param data_dir: directory of the JSON database files; the shipped data directory is used if it is None
+    :param node_list: a list of the curves' transform nodes; the selected nodes are exported if it is None
+    :param entry_dict: a dictionary of {node: (data key, entry key)}, e.g.
+                       {"myCrv": ("eyelid_control_curve_bs", "right_right_end_left")}, for the curves not named
+                       after their entries as the rig names them, like the blend-shape target curves
+    :return: a list of the (data key, entry key) of the written entries
+    """
+
+    def read_cvs(nurbs_crv, entry_data):
+        nurbs_crv_fn = OpenMaya2.MFnNurbsCurve(get_shape_dag_path(nurbs_crv))
+        return [round_coords([cv_pt.x, cv_pt.y, cv_pt.z])
+                for cv_pt in nurbs_crv_fn.cvPositions(OpenMaya2.MSpace.kObject)]
+
+    return export_CVs(g_ctrl_crv_data_file_name, 'points', read_cvs, data_dir, node_list, entry_dict)
+
+def export_CVs(file_name, cv_key, read_cvs, data_dir=None, node_list=None, entry_dict=None):
+    """ Read the CVs of the nodes and splice them into their entries of a JSON database file, in place: the rest of
+    the document is left as it is, neither parsed nor re-serialized (see data_writer.splice_data()).
+
+    :param file_name: name of the JSON database file
+    :param cv_key: the key of the CV list in the entries, "control_vtx" or "points"
+    :param read_cvs: a function taking a node and its entry's data, and returning the CV list, or None to skip it
+    :return: a list of the (data key, entry key) of the written entries
+    """
+
+    if node_list is None:
+        node_list = cmds.ls(selection=True, transforms=True)
+    if not node_list:
+        cmds.error('Must select the NURBS geometry to export the control vertices of.')
+        return []
+
+    # The entries are looked up in the compiled cache of the document.
+    data = data_cache.load_data(file_name, data_dir)
+    node_entry_dict = get_node_entry_dict(data, cv_key)
+    node_entry_dict.update(entry_dict or {})
+
+    cv_list_dict = {}
+    written_entry_list = []
+    for node in node_list:
+        entry_key_pair = node_entry_dict.get(node.split('|')[-1])
+        if entry_key_pair is None:
+            cmds.warning('"{}" matches no entry of "{}"; it is skipped.'.format(node, file_name))
+            continue
+
+        entry_data = data[entry_key_pair[0]][entry_key_pair[1]]
+        cv_list = read_cvs(node, entry_data)
+        if cv_list is None:
+            continue
+
+        cv_list_dict[tuple(entry_key_pair)+(cv_key,)] = cv_list
+        written_entry_list.append(tuple(entry_key_pair))
+
+    if written_entry_list:
+        json_path = data_writer.splice_data(cv_list_dict, file_name, data_dir, g_float_precision)
+        cmds.warning('Exported {} entries into "{}".'.format(len(written_entry_list), json_path))
+
+    return written_entry_list
+
+def get_node_entry_dict(data, cv_key):
+    """ Name the nodes of the entries holding a CV list, as the rig names them: the name prefix of the entry's data
+    key, or the control zone prefix of the control curve data, followed by the entry's name.
+
+    :param data: the data tree of a JSON database file
+    :param cv_key: the key of the CV list in the entries, "control_vtx" or "points"
+    :return: a dictionary of {node name: (data key, entry key)}, of the node names matching one entry only
+    """
+
+    node_entry_dict = {}
+    ambiguous_node_set = set()
+    for data_key, data_value in data.items():
+        if not isinstance(data_value, dict):
+            continue
+
+        name_prefix = data_value.get('name_prefix', data.get(data_key.split('_')[0]+'_ctrlzone_prefix'))
+        if not name_prefix:
+            continue
 
-    sel_translation = cmds.getAttr(sel_transform+'.translate')[0]
-    sel_translation_x = round(float(sel_translation[0]), g_float_precision)
-    sel_translation_y = round(float(sel_translation[1]), g_float_precision)
-    sel_translation_z = round(float(sel_translation[2]), g_float_precision)
+        for entry_key, entry_data in data_value.items():
+            if not isinstance(entry_data, dict) or cv_key not in entry_data or 'name' not in entry_data:
+                continue
 
-    sel_translation_str = '"translation": [{0}, {1}, {2}],\n'.format(
-        sel_translation_x, sel_translation_y, sel_translation_z
-    )
+            node_name = name_prefix+'_'+entry_data['name']
+            if node_name in node_entry_dict:
+                ambiguous_node_set.add(node_name)
+            node_entry_dict[node_name] = (data_key, entry_key)
 
-    sel_rotation = cmds.getAttr(sel_transform+'.rotate')[0]
-    sel_rotation_x = round(float(sel_rotation[0]), g_float_precision)
-    sel_rotation_y = round(float(sel_rotation[1]), g_float_precision)
-    sel_rotation_z = round(float(sel_rotation[2]), g_float_precision)
+    for node_name in ambiguous_node_set:
+        del node_entry_dict[node_name]
 
-    sel_rotation_str = '"rotation": [{0}, {1}, {2}],\n'.format(
-        sel_rotation_x,sel_rotation_y, sel_rotation_z
-    )
+    return node_entry_dict
 
-    sel_scale = cmds.getAttr(sel_transform+'.scale')[0]
-    sel_scale_x = round(float(sel_scale[0]), g_float_precision)
-    sel_scale_y = round(float(sel_scale[1]), g_float_precision)
-    sel_scale_z = round(float(sel_scale[2]), g_float_precision)
+def get_shape_dag_path(node):
+    sel_list = OpenMaya2.MSelectionList()
+    sel_list.add(node)
+    return sel_list.getDagPath(0).extendToShape()
 
-    sel_scale_str = '"scale": [{0}, {1}, {2}]\n'.format(
-        sel_scale_x, sel_scale_y, sel_scale_z
-    )
+def round_coords(coords):
+    return [round(float(coord), g_float_precision) for coord in coords]
+
+def get_transform_string(file_path=None):
+    """ Write the "xform" member of the selected transform node, as used by the JSON database documents.
+    :param file_path: path of the file to write the member into; if it is None, it is printed out
+    :return: the JSON text of the member, or the file path if it is written into a file
+    """
+
+    sel_transform = cmds.ls(sl=True)[0]
 
-    sel_transform_str = sel_translation_str + sel_rotation_str + sel_scale_str
-    cmds.warning(sel_transform_str)
+    xform_data = collections.OrderedDict()
+    xform_data['translation'] = round_coords(cmds.getAttr(sel_transform+'.translate')[0])
+    xform_data['rotation'] = round_coords(cmds.getAttr(sel_transform+'.rotate')[0])
+    xform_data['scale'] = round_coords(cmds.getAttr(sel_transform+'.scale')[0])
 
-    return sel_transform_str
+    return write_json_fragment(lambda writer: writer.write_member('xform', xform_data), file_path)
 
 def copy_transform(translation=True, rotation=True, scale=False, delete_source=False):
     '''
@@ -137,99 +309,187 @@ def copy_transform(translation=True, rotation=True, scale=False, delete_source=F
         cmds.delete(src_transform)
 
 
-def copy_curve_CVs(transform_offset=(0.0, 0.0, 0.0), axis_x=True, axis_y=True, axis_z=True):
-    sel_transform_list = cmds.ls(sl=True)
-    sel_curve_shape_list = []
-    for sel_transform in sel_transform_list:
-        sel_curve_shape = cmds.listRelatives(sel_transform, shapes=True)[0]
-        if 'nurbsCurve' != cmds.objectType(sel_curve_shape):
+def copy_curve_CVs(transform_offset=(0.0, 0.0, 0.0), axis_x=True, axis_y=True, axis_z=True, node_list=None):
+    """ Copy the CV coordinates of the firstly selected NURBS curve to the other selected ones, as one undoable
+    operation. The CVs are read and written as whole arrays, and the axes to copy are masked with NumPy, or point by
+    point if NumPy is not installed.
+
+    :param transform_offset: the offset added to the source CV coordinates
+    :param axis_x: Copy the x coordinates
+    :param axis_y: Copy the y coordinates
+    :param axis_z: Copy the z coordinates
+    :param node_list: a list of the curves' transform nodes, the source one first; the selected nodes if it is None
+    :return: None
+    """
+
+    np = import_numpy()
+
+    if node_list is None:
+        node_list = cmds.ls(sl=True)
+    if len(node_list) < 2:
+        cmds.error('Must select a source NURBS curve and the target NURBS curves to copy the CVs to.')
+        return
+
+    crv_dag_path_list = []
+    for node in node_list:
+        crv_dag_path = get_shape_dag_path(node)
+        if not crv_dag_path.hasFn(OpenMaya2.MFn.kNurbsCurve):
             cmds.error('Must select NURBS curves to copy control vertices coordinates.')
             return
-        sel_curve_shape_list.append(sel_curve_shape)
+        crv_dag_path_list.append(crv_dag_path)
 
-    src_curve_shape = sel_curve_shape_list[0]
-    src_cv_count = cmds.getAttr(src_curve_shape+'.spans') + 1
+    axis_mask = [axis_x, axis_y, axis_z]
+    src_cvs = get_CV_array(crv_dag_path_list[0])
 
-    tar_curve_shape_list = sel_curve_shape_list[1:]
-    for tar_curve_shape in tar_curve_shape_list:
-        tar_cv_count = cmds.getAttr(tar_curve_shape+'.spans') + 1
-        if tar_cv_count != src_cv_count:
+    cv_edit_list = []
+    for tar_crv_dag_path in crv_dag_path_list[1:]:
+        tar_cvs = get_CV_array(tar_crv_dag_path)
+        if len(tar_cvs) != len(src_cvs):
             cmds.error('The target NURBS curves must have the same number of CVs with the source NURBS curve')
             return
 
-        for cv_id in range(src_cv_count):
-            src_cv = [sum(item) for item in zip(cmds.getAttr(src_curve_shape+'.cv[{}]'.format(cv_id))[0], transform_offset)]
-            #cmds.warning('source_cv[{}]: {}'.format(cv_id, src_cv))
-            #cmds.warning('target_cv[{}]: {}'.format(cv_id, cmds.getAttr(tar_curve_shape+'.cv[{}]'.format(cv_id))))
-            tar_cv = list(cmds.getAttr(tar_curve_shape+'.cv[{}]'.format(cv_id))[0])
-            if axis_x:
-                tar_cv[0] = src_cv[0]
-            if axis_y:
-                tar_cv[1] = src_cv[1]
-            if axis_z:
-                tar_cv[2] = src_cv[2]
-
-            cmds.setAttr(tar_curve_shape+'.cv[{}]'.format(cv_id), tar_cv[0], tar_cv[1], tar_cv[2])
-
-def flatten_NURBS_surface(axis='y', flip_UV=False, reverse_dir=False, make_plane=False):
-    srf_transform = cmds.ls(sl=True)[0]
-    srf_shape = cmds.listRelatives(srf_transform, shapes=True)[0]
-    srf_span_U = cmds.getAttr(srf_shape+'.spansU')
-    srf_span_V = cmds.getAttr(srf_shape+'.spansV')
-    base_coord = cmds.getAttr(srf_shape + '.cv[0][0]')
-
-    cv_span_row = srf_span_U
-    cv_span_col = srf_span_V
-    if flip_UV:
-        cv_span_row = srf_span_V
-        cv_span_col = srf_span_U
-
-    # cv_col_iter_start = 1
-    # cv_col_iter_end = cv_span_col
-    # if reverse_dir:
-    #     cv_col_iter_start = 0
-    #     cv_col_iter_end = cv_span_col-1
-
-    for cv_row_id in range(0, cv_span_row+1):
-        row_base_coord = base_coord
-        if reverse_dir:
-            if flip_UV:
-                row_base_coord = list(cmds.getAttr(srf_shape+'.cv[{}][{}]'.format(cv_span_col, cv_row_id))[0])
-            else:
-                row_base_coord = list(cmds.getAttr(srf_shape+'.cv[{}][{}]'.format(cv_row_id, cv_span_col))[0])
+        if np is not None:
+            new_cvs = np.where(axis_mask, src_cvs+np.asarray(transform_offset, dtype=float), tar_cvs)
         else:
-            if flip_UV:
-                row_base_coord = list(cmds.getAttr(srf_shape+'.cv[0][{}]'.format(cv_row_id))[0])
-            else:
-                row_base_coord = list(cmds.getAttr(srf_shape+'.cv[{}][0]'.format(cv_row_id))[0])
+            new_cvs = OpenMaya2.MPointArray([OpenMaya2.MPoint([src_cv[axis_id]+transform_offset[axis_id]
+                                                               if axis_mask[axis_id] else tar_cv[axis_id]
+                                                               for axis_id in range(3)])
+                                             for src_cv, tar_cv in zip(src_cvs, tar_cvs)])
+        cv_edit_list.append((tar_crv_dag_path, new_cvs))
+
+    set_CV_arrays(cv_edit_list)
+
+def flatten_NURBS_surface(axis='y', flip_UV=False, reverse_dir=False, make_plane=False, node_list=None):
+    """ Flatten the selected NURBS surfaces along an axis, as one undoable operation. Each row of CVs is flattened
+    to the coordinate of its first CV, or all CVs to the coordinate of the first CV of the surface.
+    The CVs are read and written as whole arrays, and sliced with NumPy, or edited point by point if NumPy is not
+    installed.
+
+    :param axis: the axis to flatten along, "x", "y" or "z"
+    :param flip_UV: if True, the rows run along the U direction instead of the V direction
+    :param reverse_dir: if True, each row is flattened to the coordinate of its last CV instead
+    :param make_plane: if True, all CVs are flattened to the coordinate of the surface's first CV
+    :param node_list: a list of the surfaces' transform nodes; the selected nodes if it is None
+    :return: None
+    """
+
+    np = import_numpy()
+
+    if node_list is None:
+        node_list = cmds.ls(sl=True)
+    if not node_list:
+        cmds.error('Must select the NURBS surfaces to flatten.')
+        return
+
+    axis_id = 'xyz'.index(axis)
+
+    cv_edit_list = []
+    for node in node_list:
+        srf_dag_path = get_shape_dag_path(node)
+        if not srf_dag_path.hasFn(OpenMaya2.MFn.kNurbsSurface):
+            cmds.error('Must select NURBS surfaces to flatten.')
+            return
 
-        for cv_col_id in range(0, cv_span_col+1):
-            cv_U_id = cv_row_id
-            cv_V_id = cv_col_id
-            if flip_UV:
-                cv_U_id = cv_col_id
-                cv_V_id = cv_row_id
+        srf_fn = OpenMaya2.MFnNurbsSurface(srf_dag_path)
+        num_cvs_u = srf_fn.numCVsInU
+        num_cvs_v = srf_fn.numCVsInV
+        base_id = -1 if reverse_dir else 0
 
-            cv_orig_coord = list(cmds.getAttr(srf_shape+'.cv[{}][{}]'.format(cv_U_id, cv_V_id))[0])
+        if np is not None:
+            # The CV grid is indexed by [U][V].
+            cvs = get_CV_array(srf_dag_path).reshape(num_cvs_u, num_cvs_v, 3)
 
             if make_plane:
-                if 'x' == axis:
-                    cmds.setAttr(srf_shape+'.cv[{}][{}]'.format(cv_U_id, cv_V_id),
-                                 base_coord[0], cv_orig_coord[1], cv_orig_coord[2])
-                elif 'y' == axis:
-                    cmds.setAttr(srf_shape+'.cv[{}][{}]'.format(cv_U_id, cv_V_id),
-                                 cv_orig_coord[0], base_coord[1], cv_orig_coord[2])
-                elif 'z' == axis:
-                    cmds.setAttr(srf_shape+'.cv[{}][{}]'.format(cv_U_id, cv_V_id),
-                                 cv_orig_coord[0], cv_orig_coord[1], base_coord[2])
+                cvs[:, :, axis_id] = cvs[0, 0, axis_id]
+            elif flip_UV:
+                cvs[:, :, axis_id] = cvs[base_id, :, axis_id].copy()[np.newaxis, :]
             else:
-                cv_flat_coord = cv_orig_coord
-                if 'x' == axis:
-                    cv_flat_coord[0] = row_base_coord[0]
-                elif 'y' == axis:
-                    cv_flat_coord[1] = row_base_coord[1]
-                elif 'z' == axis:
-                    cv_flat_coord[2] = row_base_coord[2]
-
-                cmds.setAttr(srf_shape+'.cv[{}][{}]'.format(cv_U_id, cv_V_id),
-                             cv_flat_coord[0], cv_flat_coord[1], cv_flat_coord[2])
\ No newline at end of file
+                cvs[:, :, axis_id] = cvs[:, base_id, axis_id].copy()[:, np.newaxis]
+
+            cv_edit_list.append((srf_dag_path, cvs.reshape(-1, 3)))
+            continue
+
+        # The CV of the grid position [U][V] is at index U * numCVsInV + V.
+        cvs = get_CV_array(srf_dag_path)
+        base_coord_list = [cvs[0][axis_id]]*(num_cvs_u*num_cvs_v)
+        if not make_plane:
+            base_u_id_list = [base_id % num_cvs_u]*num_cvs_u if flip_UV else range(num_cvs_u)
+            base_v_id_list = range(num_cvs_v) if flip_UV else [base_id % num_cvs_v]*num_cvs_v
+            base_coord_list = [cvs[base_u_id_list[u_id]*num_cvs_v + base_v_id_list[v_id]][axis_id]
+                               for u_id in range(num_cvs_u) for v_id in range(num_cvs_v)]
+
+        for cv_id, base_coord in enumerate(base_coord_list):
+            cv_pt = cvs[cv_id]
+            cv_pt[axis_id] = base_coord
+            cvs[cv_id] = cv_pt
+
+        cv_edit_list.append((srf_dag_path, cvs))
+
+    set_CV_arrays(cv_edit_list)
+
+def import_numpy():
+    """
+    :return: the numpy module, or None if it is not installed, as in the Maya versions not shipping it
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def get_CV_array(dag_path):
+    """
+    :param dag_path: the MDagPath of a NURBS curve or surface shape
+    :return: a NumPy array of the object-space CV coordinates, of the shape (CV count, 3);
+             the MPointArray of the CVs if NumPy is not installed
+    """
+
+    cv_pts = get_nurbs_fn(dag_path).cvPositions(OpenMaya2.MSpace.kObject)
+
+    np = import_numpy()
+    if np is None:
+        return cv_pts
+    return np.array([[cv_pt.x, cv_pt.y, cv_pt.z] for cv_pt in cv_pts], dtype=float)
+
+def set_CV_arrays(cv_edit_list):
+    """ Set the CVs of NURBS curves and surfaces, putting all the edits onto the undo queue as one entry.
+    :param cv_edit_list: a list of (the MDagPath of a NURBS curve or surface shape,
+                         a NumPy array or an MPointArray of its new object-space CV coordinates)
+    :return: None
+    """
+
+    from plugin import api_undo
+
+    edit_list = []
+    for dag_path, cvs in cv_edit_list:
+        old_cv_pts = get_nurbs_fn(dag_path).cvPositions(OpenMaya2.MSpace.kObject)
+        new_cv_pts = cvs
+        if not isinstance(cvs, OpenMaya2.MPointArray):
+            new_cv_pts = OpenMaya2.MPointArray([OpenMaya2.MPoint(*cv_coord) for cv_coord in cvs.tolist()])
+        edit_list.append((dag_path, old_cv_pts, new_cv_pts))
+
+    def set_cv_pts(pts_id):
+        for edit in edit_list:
+            nurbs_fn = get_nurbs_fn(edit[0])
+            nurbs_fn.setCVPositions(edit[pts_id], OpenMaya2.MSpace.kObject)
+            if isinstance(nurbs_fn, OpenMaya2.MFnNurbsCurve):
+                nurbs_fn.updateCurve()
+            else:
+                nurbs_fn.updateSurface()
+
+    set_cv_pts(2)
+    try:
+        api_undo.commit(lambda: set_cv_pts(1), lambda: set_cv_pts(2))
+    except RuntimeError:
+        cmds.warning('The "{}" command is unavailable; the CV edits can not be undone.'.format(
+            api_undo.g_command_name))
+
+def get_nurbs_fn(dag_path):
+    """
+    :return: an MFnNurbsCurve or MFnNurbsSurface function set of the shape
+    """
+
+    if dag_path.hasFn(OpenMaya2.MFn.kNurbsCurve):
+        return OpenMaya2.MFnNurbsCurve(dag_path)
+    return OpenMaya2.MFnNurbsSurface(dag_path)
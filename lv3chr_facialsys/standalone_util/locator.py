@@ -15,178 +15,201 @@ import string
 import maya.cmds as cmds
 import maya.api.OpenMaya as OpenMaya2
 
-def get_type_and_id(sel_list, single_indexed=True):
-    '''
-    :param sel_list: an instance of MSelectionList class
-    :param single_indexed: if the component ID is a single integer
-    :return: selected MObjects' MFN function set type ID (integer) and component ID list
-    '''
-
-    compo_dag_path, component = sel_list.getComponent(0)
-    compo_fn_type_id = component.apiType()
-    id_compo_fn = None
-    if single_indexed:
-        id_compo_fn = OpenMaya2.MFnSingleIndexedComponent(component)
-    else:
-        id_compo_fn = OpenMaya2.MFnDoubleIndexedComponent(component)
-    compo_id_list = id_compo_fn.getElements()
-
-    return compo_fn_type_id, compo_id_list
-
-def create_locator(name_prefix, id, local_scale, color_id, modifier):
-    '''
-    :param name_prefix: the prefix of the locator, e.g. fm_eyelidMask_LU
-    :param id: the identifier of the locator, e.g. A1
-    :param modifier: instance of the MDagModifier class
-    :return: a MObjectHandle to the locator created
-    '''
-
-    assert isinstance(local_scale, list)
-    assert len(local_scale) == 3
+# global variables -----------------------------------------------------------------------------------------------------
+g_locator_color_id = 1
+g_bind_joint_color_id = 3
+g_bind_joint_radius = 0.5
+
+def create_locators_at_components(sel_list=None, name_prefix='fm_Mask', local_scale=(0.03, 0.03, 0.03),
+                                  color_id=g_locator_color_id, create_bind_joint=False):
+    """ Create locators each on a selected mesh's vertex or a NURBS object's control vertex, for all the selected
+    components at once. The positions of each geometry are fetched in one call and moved into world space by its
+    inclusive matrix, and all the locators, along with their bind joints, are created by one MDagModifier.doIt(),
+    which is one entry of the undo queue.
+
+    :param sel_list: an instance of the MSelectionList class; the active selection is used if it is None
+    :param name_prefix: the prefix of the locators, e.g. fm_eyelidMask_LU
+    :param local_scale: the local scale of the locator shapes
+    :param color_id: the override color index of the locator shapes
+    :param create_bind_joint: whether to create a bind joint under each locator, like create_joint_at_locator()
+    :return: a list of the names of the created locators
+    """
+
+    if sel_list is None:
+        sel_list = OpenMaya2.MGlobal.getActiveSelectionList()
+
+    loc_id_list = []
+    loc_pts = OpenMaya2.MPointArray()
+    for sel_id in range(sel_list.length()):
+        compo_dag_path, component = sel_list.getComponent(sel_id)
+        if component.isNull():
+            continue
 
-    loc_obj = modifier.createNode('locator')
-    loc_handle = OpenMaya2.MObjectHandle(loc_obj)
-    loc_name = '{}_{}_loc'.format(name_prefix, id)
-    modifier.renameNode(loc_obj, loc_name)
-    modifier.doIt()
+        compo_loc_id_list, compo_pts = get_component_positions(compo_dag_path, component)
+        if not compo_loc_id_list:
+            continue
+
+        # Move the positions into world space.
+        geo_wmat = compo_dag_path.inclusiveMatrix()
+        loc_id_list.extend(compo_loc_id_list)
+        for compo_pt in compo_pts:
+            loc_pts.append(compo_pt*geo_wmat)
+
+    if not loc_id_list:
+        cmds.warning('Please select vertices or control vertices.')
+        return []
 
-    dag_path = OpenMaya2.MDagPath()
-    loc_dag_path = dag_path.getAPathTo(loc_obj)
-    loc_shape_dag_path = loc_dag_path.extendToShape()
-    loc_shape_obj = loc_shape_dag_path.node()
-    modifier.renameNode(loc_shape_obj, loc_name+'Shape')
+    modifier = OpenMaya2.MDagModifier()
+    loc_handle_list = create_locators(name_prefix, loc_id_list, loc_pts, local_scale, color_id, create_bind_joint,
+                                      modifier)
     modifier.doIt()
 
-    loc_shape_fn = OpenMaya2.MFnDependencyNode(loc_shape_obj)
-    loc_shape_local_sclx = loc_shape_fn.findPlug('localScaleX', False)
-    loc_shape_local_scly = loc_shape_fn.findPlug('localScaleY', False)
-    loc_shape_local_sclz = loc_shape_fn.findPlug('localScaleZ', False)
-    loc_shape_local_sclx.setFloat(local_scale[0])
-    loc_shape_local_scly.setFloat(local_scale[1])
-    loc_shape_local_sclz.setFloat(local_scale[2])
-
-    cmds.setAttr(loc_name+'Shape.overrideEnabled', True)
-    cmds.setAttr(loc_name+'Shape.overrideColor', color_id)
-
-    return loc_handle
-
-def create_locator_at_vertex(sel_list, compo_fn_type_id, name_prefix, vtx_id_list, loc_scale, modifier):
-    '''
-    Create locators each on a selected mesh's vertex or a NURBS object's control vertex
-    :param sel_list: an instance of the MSelectionList class
-    :param compo_fn_type: the selected components' MFn function set type
-    :param vtx_id_list: the indices of the selected CVs
+    try:
+        from plugin import api_undo
+        api_undo.commit(modifier.undoIt, modifier.doIt)
+    except RuntimeError:
+        cmds.warning('The "lcApiUndo" command is unavailable; the locator creation can not be undone.')
+
+    return [OpenMaya2.MFnDagNode(loc_handle.object()).partialPathName() for loc_handle in loc_handle_list]
+
+def get_component_positions(dag_path, component):
+    """
+    :param dag_path: the MDagPath of the geometry of the components
+    :param component: the MObject of the selected vertices or control vertices
+    :return: a tuple of (a list of the locator identifiers, e.g. ["A1", "A2"],
+             an MPointArray of the object-space positions of the components)
+    """
+
+    compo_fn_type_id = component.apiType()
+    pt_id_list = []
+    loc_id_list = []
+    pts = []
+
+    if OpenMaya2.MFn.kMeshVertComponent == compo_fn_type_id:
+        pt_id_list = OpenMaya2.MFnSingleIndexedComponent(component).getElements()
+        loc_id_list = [str(vtx_id+1) for vtx_id in pt_id_list]
+        pts = OpenMaya2.MFnMesh(dag_path).getPoints(OpenMaya2.MSpace.kObject)
+
+    elif OpenMaya2.MFn.kSurfaceCVComponent == compo_fn_type_id:
+        nbs_srf_fn = OpenMaya2.MFnNurbsSurface(dag_path)
+        num_cvs_v = nbs_srf_fn.numCVsInV
+        cv_uv_id_list = OpenMaya2.MFnDoubleIndexedComponent(component).getElements()
+        pt_id_list = [cv_u_id*num_cvs_v + cv_v_id for cv_u_id, cv_v_id in cv_uv_id_list]
+        # The locator's ID is composed of the CV row letter and the CV column number.
+        loc_id_list = [string.ascii_uppercase[cv_u_id]+str(cv_v_id+1) for cv_u_id, cv_v_id in cv_uv_id_list]
+        pts = nbs_srf_fn.cvPositions(OpenMaya2.MSpace.kObject)
+
+    elif OpenMaya2.MFn.kCurveCVComponent == compo_fn_type_id:
+        pt_id_list = OpenMaya2.MFnSingleIndexedComponent(component).getElements()
+        loc_id_list = [str(cv_id+1) for cv_id in pt_id_list]
+        pts = OpenMaya2.MFnNurbsCurve(dag_path).cvPositions(OpenMaya2.MSpace.kObject)
+
+    return loc_id_list, OpenMaya2.MPointArray([pts[pt_id] for pt_id in pt_id_list])
+
+def create_locators(name_prefix, loc_id_list, loc_pts, local_scale, color_id, create_bind_joint, modifier):
+    """ Queue the creation of locators, and of their bind joints, onto a modifier, which the caller does.
+    The transformations and display overrides are set through the modifier's plug values.
+
+    :param name_prefix: the prefix of the locators, e.g. fm_eyelidMask_LU
+    :param loc_id_list: a list of the identifiers of the locators, e.g. ["A1", "A2"]
+    :param loc_pts: an MPointArray of the world-space positions of the locators
     :param modifier: an instance of the MDagModifier class
+    :return: a list of MObjectHandles to the locators' transform nodes
+    """
+
+    assert len(local_scale) == 3
+
+    loc_handle_list = []
+    for loc_id, loc_pos in zip(loc_id_list, loc_pts):
+        loc_name = '{}_{}_loc'.format(name_prefix, loc_id)
+
+        loc_obj = modifier.createNode('transform')
+        loc_shape_obj = modifier.createNode('locator', loc_obj)
+        modifier.renameNode(loc_obj, loc_name)
+        modifier.renameNode(loc_shape_obj, loc_name+'Shape')
+
+        set_plug_values(modifier, loc_obj, [('translateX', loc_pos.x),
+                                            ('translateY', loc_pos.y),
+                                            ('translateZ', loc_pos.z)])
+        set_plug_values(modifier, loc_shape_obj, [('localScaleX', local_scale[0]),
+                                                  ('localScaleY', local_scale[1]),
+                                                  ('localScaleZ', local_scale[2]),
+                                                  ('overrideEnabled', True),
+                                                  ('overrideColor', color_id)])
+
+        if create_bind_joint:
+            bind_jnt_obj = modifier.createNode('joint', loc_obj)
+            modifier.renameNode(bind_jnt_obj, '{}_{}_bind'.format(name_prefix, loc_id))
+            set_plug_values(modifier, bind_jnt_obj, [('radius', g_bind_joint_radius),
+                                                     ('overrideEnabled', True),
+                                                     ('overrideColor', g_bind_joint_color_id)])
+
+        loc_handle_list.append(OpenMaya2.MObjectHandle(loc_obj))
+
+    return loc_handle_list
+
+def set_plug_values(modifier, node_obj, attr_value_list):
+    """
+    :param modifier: an instance of the MDGModifier or MDagModifier class
+    :param node_obj: the MObject of the node
+    :param attr_value_list: a list of (attribute name, bool, int or float value)
     :return: None
-    '''
-
-    vtx_pos = [0, 0, 0]
-    loc_id = ''
-
-    loc_trans = [0, 0, 0]
-    loc_handle = None
-
-    for vtx_id in vtx_id_list:
-
-        if OpenMaya2.MFn.kMeshVertComponent == compo_fn_type_id:
-            # Get vertex's position
-            mesh_dag_path = sel_list.getDagPath(0)
-            mesh_fn = OpenMaya2.MFnMesh(mesh_dag_path)
-            vtx_pt = mesh_fn.getPoint(vtx_id, OpenMaya2.MSpace.kObject)
-
-            vtx_pos = vtx_pt
-            loc_id = str(vtx_id+1)
-
-        elif OpenMaya2.MFn.kSurfaceCVComponent == compo_fn_type_id:
-            # Get control vertex's position
-            nbs_srf_dag_path = sel_list.getDagPath(0)
-            nbs_srf_fn = OpenMaya2.MFnNurbsSurface(nbs_srf_dag_path)
-            cv_pos = nbs_srf_fn.cvPosition(vtx_id[0], vtx_id[1], OpenMaya2.MSpace.kObject)
-
-            # Compose the locator's ID
-            loc_id_row_list = list(string.ascii_uppercase)
-            loc_id_row = loc_id_row_list[vtx_id[0]]
-            loc_id_col = str(vtx_id[1]+1)
-
-            vtx_pos = cv_pos
-            loc_id = loc_id_row+loc_id_col
-
-        elif OpenMaya2.MFn.kCurveCVComponent == compo_fn_type_id:
-            # Get control vertex's position
-            nbs_crv_dag_path = sel_list.getDagPath(0)
-            nbs_crv_fn = OpenMaya2.MFnNurbsCurve(nbs_crv_dag_path)
-            cv_pos = nbs_crv_fn.cvPosition(vtx_id, OpenMaya2.MSpace.kObject)
-
-            vtx_pos = cv_pos
-            loc_id = str(vtx_id+1)
-
-        geo_node = sel_list.getDependNode(0)
-        geo_node_fn = OpenMaya2.MFnDependencyNode(geo_node)
-
-        geo_wmat_plug_arr = geo_node_fn.findPlug('worldMatrix', False)
-        geo_wmat_plug = geo_wmat_plug_arr.elementByLogicalIndex(0)
-        geo_wmat_obj = geo_wmat_plug.asMObject()
-
-        geo_wmat_data_fn = OpenMaya2.MFnMatrixData(geo_wmat_obj)
-        geo_wmat = geo_wmat_data_fn.matrix()
-
-        # Construct the transformation matrix for the locator
-        loc_mat_data = [
-            1, 0, 0, 0,
-            0, 1, 0, 0,
-            0, 0, 1, 0,
-            vtx_pos.x, vtx_pos.y, vtx_pos.z, vtx_pos.w
-        ]
-
-        loc_mat = OpenMaya2.MMatrix(loc_mat_data) * geo_wmat
-        loc_trans_mat = OpenMaya2.MTransformationMatrix(loc_mat)
-        loc_trans = loc_trans_mat.translation(OpenMaya2.MSpace.kWorld)
-
-        loc_handle = create_locator(name_prefix, loc_id, loc_scale, 1, modifier)
-
-        if loc_handle.isValid():
-            loc_node = loc_handle.object()
-            loc_node_fn = OpenMaya2.MFnDependencyNode(loc_node)
-
-            loc_transx_plug = loc_node_fn.findPlug('translateX', False)
-            loc_transy_plug = loc_node_fn.findPlug('translateY', False)
-            loc_transz_plug = loc_node_fn.findPlug('translateZ', False)
-            loc_transx_plug.setFloat(loc_trans.x)
-            loc_transy_plug.setFloat(loc_trans.y)
-            loc_transz_plug.setFloat(loc_trans.z)
-
-# Test codes for creating locators at mesh's vertices
-sel_list = OpenMaya2.MGlobal.getActiveSelectionList()
-compo_fn_type_id, compo_id_list = get_type_and_id(sel_list, single_indexed=True)
-modifier = OpenMaya2.MDagModifier()
-
-if compo_fn_type_id == OpenMaya2.MFn.kMeshVertComponent:
-    create_locator_at_vertex(sel_list, compo_fn_type_id, 'fm_Mask', compo_id_list, [0.03, 0.03, 0.03], modifier)
-    print("Done! Vertex locator/s created and placed!")
-else:
-    print("Please select a vertex")
-
-# Test codes for creating locators at NURBS surface's CVs
-sel_list = OpenMaya2.MGlobal.getActiveSelectionList()
-compo_fn_type_id, compo_id_list = get_type_and_id(sel_list, single_indexed=False)
-modifier = OpenMaya2.MDagModifier()
-
-if compo_fn_type_id == OpenMaya2.MFn.kSurfaceCVComponent:
-    create_locator_at_vertex(sel_list, compo_fn_type_id, 'fm_Mask', compo_id_list, [0.03, 0.03, 0.03], modifier)
-    print("Done! CV locator/s created and placed!")
-else:
-    print("Please select a control vertex")
-
-# Test codes for creating locators at NURBS curve's CVs
-sel_list = OpenMaya2.MGlobal.getActiveSelectionList()
-compo_fn_type_id, compo_id_list = get_type_and_id(sel_list, single_indexed=True)
-modifier = OpenMaya2.MDagModifier()
-
-if compo_fn_type_id == OpenMaya2.MFn.kCurveCVComponent:
-    create_locator_at_vertex(sel_list, compo_fn_type_id, 'fm_ProjectPlane', compo_id_list, [0.0, 0.0, 0.2], modifier)
-    print("Done! CV locator/s created and placed!")
-else:
-    print("Please select a control vertex")
+    """
+
+    node_fn = OpenMaya2.MFnDependencyNode(node_obj)
+    for attr, value in attr_value_list:
+        plug = node_fn.findPlug(attr, False)
+        if isinstance(value, bool):
+            modifier.newPlugValueBool(plug, value)
+        elif isinstance(value, int):
+            modifier.newPlugValueInt(plug, value)
+        else:
+            modifier.newPlugValueDouble(plug, value)
+
+# Tool Functions -------------------------------------------------------------------------------------------------------
+def create_mesh_vertex_locators():
+    """ Create locators at the selected mesh's vertices.
+    :return: a list of the names of the created locators
+    """
+    return create_locators_at_selection(OpenMaya2.MFn.kMeshVertComponent, 'fm_Mask', (0.03, 0.03, 0.03),
+                                        'Please select a vertex')
+
+def create_surface_CV_locators():
+    """ Create locators at the selected NURBS surface's control vertices.
+    :return: a list of the names of the created locators
+    """
+    return create_locators_at_selection(OpenMaya2.MFn.kSurfaceCVComponent, 'fm_Mask', (0.03, 0.03, 0.03),
+                                        'Please select a control vertex')
+
+def create_curve_CV_locators():
+    """ Create locators at the selected NURBS curve's control vertices.
+    :return: a list of the names of the created locators
+    """
+    return create_locators_at_selection(OpenMaya2.MFn.kCurveCVComponent, 'fm_ProjectPlane', (0.0, 0.0, 0.2),
+                                        'Please select a control vertex')
+
+def create_locators_at_selection(compo_fn_type_id, name_prefix, local_scale, warning_msg):
+    """
+    :param compo_fn_type_id: the MFn function set type of the components to create locators at
+    :param warning_msg: the message to warn with if the components selected are not of the type
+    :return: a list of the names of the created locators
+    """
+
+    sel_list = OpenMaya2.MGlobal.getActiveSelectionList()
+    if sel_list.length() == 0:
+        cmds.warning(warning_msg)
+        return []
+
+    # Check all the selected items before any locator is created.
+    for sel_id in range(sel_list.length()):
+        component = sel_list.getComponent(sel_id)[1]
+        if component.isNull() or component.apiType() != compo_fn_type_id:
+            cmds.warning(warning_msg)
+            return []
+
+    loc_list = create_locators_at_components(sel_list, name_prefix, local_scale)
+    print('Done! {} locator/s created and placed!'.format(len(loc_list)))
+    return loc_list
 
 # ----------------------------------------------------------------------------------------------------------------------
 def create_joint_at_locator():
@@ -1,12 +1,42 @@
+#
+# Copyright (c) 2022 Light Chaser Animation Studios. All Rights Reserved.
+#
+# File Name: standalone_util.skin_weight.py
+# Author: Sheng (Raymond) Liao
+# Date: February 2022
+#
+
+"""
+A module to manipulate skin weights
+"""
+
 import maya.cmds as cmds
 
-jnt_list = cmds.ls(sl=True)[:-1]
-nurbs_plane = cmds.ls(sl=True)[-1]
+def skin_plane_to_joints():
+    """ Bind the last selected NURBS plane to the other selected joints.
+    :return: None
+    """
+
+    sel_list = cmds.ls(sl=True)
+    if len(sel_list) < 2:
+        cmds.warning('Please select the joints and then the NURBS plane.')
+        return
+
+    jnt_list = sel_list[:-1]
+    nurbs_plane = sel_list[-1]
+
+    # Each pair of CVs across the plane follows one joint, the last pair the first joint.
+    jnt_count = len(jnt_list)
+    u_cv_count = len(cmds.ls(nurbs_plane+'.cv[*][0]', flatten=True))
+    v_cv_count = len(cmds.ls(nurbs_plane+'.cv[0][*]', flatten=True))
+    if 2 != u_cv_count or jnt_count != v_cv_count:
+        cmds.error('The NURBS plane must have 2 CVs across and one row of CVs per joint: '
+                   '{} x {} CVs for {} joints.'.format(u_cv_count, v_cv_count, jnt_count))
 
-cmds.skinCluster(jnt_list, nurbs_plane, toSelectedBones=True, name=nurbs_plane+'_skinCluster')
-for vtx_idx in range(8, -1):
-    vtx_1 = '{}.vtx[0,{}]'.format(nurbs_plane, vtx_idx)
-    vtx_2 = '{}.vtx[1,{}]'.format(nurbs_plane, vtx_idx)
-    jnt = jnt_list[8-vtx_idx]
-    cmds.skinPercent(nurbs_plane+'_skinCluster', vtx_1, transformValue=[(jnt, 1.0)], zeroRemainingInfluences=True)
-    cmds.skinPercent(nurbs_plane+'_skinCluster', vtx_2, transformValue=[(jnt, 1.0)], zeroRemainingInfluences=True)
\ No newline at end of file
+    cmds.skinCluster(jnt_list, nurbs_plane, toSelectedBones=True, name=nurbs_plane+'_skinCluster')
+    for vtx_idx in range(jnt_count-1, -1, -1):
+        vtx_1 = '{}.cv[0][{}]'.format(nurbs_plane, vtx_idx)
+        vtx_2 = '{}.cv[1][{}]'.format(nurbs_plane, vtx_idx)
+        jnt = jnt_list[jnt_count-1-vtx_idx]
+        cmds.skinPercent(nurbs_plane+'_skinCluster', vtx_1, transformValue=[(jnt, 1.0)], zeroRemainingInfluences=True)
+        cmds.skinPercent(nurbs_plane+'_skinCluster', vtx_2, transformValue=[(jnt, 1.0)], zeroRemainingInfluences=True)
@@ -10,5 +10,9 @@ if is_lca_machine:
 if lcrig_lv3chr_facialsys_dir not in sys.path:
     sys.path.append(lcrig_lv3chr_facialsys_dir)
 
-from demo import lv3chr_facialsys_demo; reload(lv3chr_facialsys_demo)
+from general import dev_reload
+if dev_reload.is_dev_mode():
+    dev_reload.reload_modules()
+
+from demo import lv3chr_facialsys_demo
 lv3chr_facialsys_demo.lc3chr_facialsys_construct()
\ No newline at end of file